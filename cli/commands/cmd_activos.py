@@ -0,0 +1,26 @@
+"""
+CLI Activos
+
+- construir: Copia hercules/static a hercules/static/dist con el hash en el nombre, .gz, .br y manifiesto.
+"""
+
+import click
+
+from lib.activos import DIRECTORIO_DIST, brotli, construir as construir_activos
+
+
+@click.group()
+def cli():
+    """Activos"""
+
+
+@click.command()
+def construir():
+    """Construir los activos con hash y sus versiones comprimidas"""
+    manifiesto = construir_activos()
+    click.echo(click.style(f"Se construyeron {len(manifiesto)} activos en {DIRECTORIO_DIST}", fg="green"))
+    if brotli is None:
+        click.echo(click.style("AVISO: Sin brotli sólo se crearon las versiones .gz", fg="yellow"))
+
+
+cli.add_command(construir)
@@ -0,0 +1,32 @@
+"""
+CLI Archivo - Archivo
+
+- actualizar_estadisticas: Actualizar el cubo de estadísticas de solicitudes y remesas
+
+Programe cada pocos minutos, sólo recalcula los días con registros modificados
+
+    cli arc_archivos actualizar-estadisticas
+
+Para recalcular toda la historia
+
+    cli arc_archivos actualizar-estadisticas --completo
+"""
+
+import click
+
+from hercules.blueprints.arc_archivos.tasks import actualizar_estadisticas as actualizar_estadisticas_task
+
+
+@click.group()
+def cli():
+    """Archivo - Archivo"""
+
+
+@click.command()
+@click.option("--completo", is_flag=True, default=False, help="Recalcular toda la historia")
+def actualizar_estadisticas(completo):
+    """Actualizar el cubo de estadísticas de solicitudes y remesas"""
+    click.echo(actualizar_estadisticas_task(completo))
+
+
+cli.add_command(actualizar_estadisticas)
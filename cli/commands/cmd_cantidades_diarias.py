@@ -0,0 +1,46 @@
+"""
+CLI Cantidades Diarias
+
+- reconstruir: Recalcular las cantidades diarias de una o de todas las fuentes
+
+Para llenar la tabla por primera vez, sin --dias se recalcula toda la historia
+
+    cli cantidades_diarias reconstruir
+
+Para corregir las modificaciones masivas programe cada pocos minutos
+
+    cli cantidades_diarias reconstruir --dias 2
+"""
+
+from datetime import date, timedelta
+
+import click
+
+from hercules.app import create_app
+from hercules.blueprints.cantidades_diarias.fuentes import FUENTES, reconstruir as reconstruir_fuente
+from hercules.extensions import database
+
+app = create_app()
+app.app_context().push()
+database.app = app
+
+
+@click.group()
+def cli():
+    """Cantidades Diarias"""
+
+
+@click.command()
+@click.option("--tabla", default=None, type=click.Choice(list(FUENTES)), help="Sólo esta fuente")
+@click.option("--dias", default=None, type=int, help="Sólo los últimos días")
+def reconstruir(tabla, dias):
+    """Recalcular las cantidades diarias"""
+    desde = date.today() - timedelta(days=dias) if dias else None
+    tablas = [tabla] if tabla else list(FUENTES)
+    for nombre in tablas:
+        cantidad = reconstruir_fuente(nombre, desde)
+        click.echo(f"  {nombre}: {cantidad} renglones")
+    click.echo("Termina reconstruir las cantidades diarias.")
+
+
+cli.add_command(reconstruir)
@@ -0,0 +1,51 @@
+"""
+CLI Contenidos
+
+- extraer: Extraer por lotes el texto de los archivos PDF que aún no lo tienen
+
+Se puede interrumpir y volver a ejecutar, continúa con los registros pendientes
+
+    cli contenidos extraer sentencias --lote 100
+    cli contenidos extraer edictos --limite 1000
+"""
+
+import click
+
+from hercules.app import create_app
+from hercules.blueprints.edictos.models import Edicto
+from hercules.blueprints.sentencias.models import Sentencia
+from hercules.extensions import database
+from lib.contenidos import LOTE, extraer_pendientes
+
+app = create_app()
+app.app_context().push()
+database.app = app
+
+# Tabla: (modelo, variable de configuración con el depósito)
+MODELOS = {
+    "edictos": (Edicto, "CLOUD_STORAGE_DEPOSITO_EDICTOS"),
+    "sentencias": (Sentencia, "CLOUD_STORAGE_DEPOSITO_SENTENCIAS"),
+}
+
+
+@click.group()
+def cli():
+    """Contenidos"""
+
+
+@click.command()
+@click.argument("tabla", type=click.Choice(list(MODELOS)))
+@click.option("--lote", default=LOTE, type=int, help="Cantidad de registros por lote")
+@click.option("--limite", default=None, type=int, help="Cantidad máxima de registros a procesar")
+def extraer(tabla, lote, limite):
+    """Extraer por lotes el texto de los archivos PDF que aún no lo tienen"""
+    modelo, configuracion = MODELOS[tabla]
+    bucket_name = app.config.get(configuracion)
+    if not bucket_name:
+        click.echo(f"ERROR: No está definida la configuración {configuracion}")
+        return
+    procesados, con_texto = extraer_pendientes(modelo, bucket_name, lote, limite)
+    click.echo(f"Se procesaron {procesados} {tabla}, {con_texto} con texto.")
+
+
+cli.add_command(extraer)
@@ -0,0 +1,113 @@
+"""
+CLI DataTables
+
+- medir: Mide los bytes por renglón y el tiempo de serialización de los listados más grandes.
+"""
+
+import gzip
+import json
+import sys
+import time
+
+import click
+from flask_login import login_user
+from tabulate import tabulate
+
+from hercules.app import create_app
+from hercules.blueprints.usuarios.models import Usuario
+from hercules.extensions import database
+from lib.respuestas_json import BROTLI_CALIDAD, GZIP_NIVEL, brotli, en_columnas, orjson, volcar_json
+
+app = create_app()
+app.app_context().push()
+database.app = app
+
+LISTADOS = (
+    "arc_documentos.datatable_json",
+    "bitacoras.datatable_json",
+    "edictos.datatable_json",
+    "entradas_salidas.datatable_json",
+    "listas_de_acuerdos.datatable_json",
+    "sentencias.datatable_json",
+    "soportes_tickets.datatable_json",
+)
+
+
+@click.group()
+def cli():
+    """DataTables"""
+
+
+def _consultar_listado(vista, usuario: Usuario, renglones: int) -> dict:
+    """Ejecutar la vista del listado como lo haría una petición de DataTables"""
+    formulario = {"draw": "1", "start": "0", "length": str(renglones)}
+    with app.test_request_context(method="POST", data=formulario):
+        login_user(usuario)
+        salida = vista()
+    if isinstance(salida, dict):
+        return salida
+    return json.loads(salida.get_data())  # Las vistas con cache entregan la respuesta ya elaborada
+
+
+def _medir_serializacion(serializar, contenido, repeticiones: int) -> tuple[bytes, float]:
+    """Serializar varias veces, entrega el cuerpo y los milisegundos promedio"""
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        cuerpo = serializar(contenido)
+    return cuerpo, (time.perf_counter() - inicio) * 1000 / repeticiones
+
+
+@click.command()
+@click.option("--email", required=True, help="Usuario con permiso para ver los listados")
+@click.option("--listado", "listados", multiple=True, default=LISTADOS, help="Endpoint del listado, se puede repetir")
+@click.option("--renglones", default=100, help="Renglones por página")
+@click.option("--repeticiones", default=20, help="Repeticiones para promediar el tiempo")
+def medir(email, listados, renglones, repeticiones):
+    """Medir bytes por renglón y tiempo de serialización por formato, serializador y compresión"""
+    usuario = Usuario.query.filter_by(email=email).first()
+    if usuario is None:
+        click.echo(click.style(f"No existe el usuario {email}", fg="red"))
+        sys.exit(1)
+    serializadores = [("json", lambda contenido: json.dumps(contenido, default=str).encode("utf-8"))]
+    if orjson is not None:
+        serializadores.append(("orjson", volcar_json))
+    resultados = []
+    for listado in listados:
+        vista = app.view_functions.get(listado)
+        if vista is None:
+            click.echo(click.style(f"AVISO: No existe el listado {listado}", fg="yellow"))
+            continue
+        salida = _consultar_listado(vista, usuario, renglones)
+        data = salida.get("aaData", [])
+        if len(data) == 0:
+            click.echo(click.style(f"AVISO: El listado {listado} no tiene renglones", fg="yellow"))
+            continue
+        formatos = [("renglones", salida)]
+        columnas = en_columnas(data)
+        if columnas is not None:
+            encabezado = {llave: valor for llave, valor in salida.items() if llave != "aaData"}
+            formatos.append(("columnas", {**encabezado, **columnas}))
+        for formato, contenido in formatos:
+            for nombre, serializar in serializadores:
+                cuerpo, milisegundos = _medir_serializacion(serializar, contenido, repeticiones)
+                bytes_gzip = len(gzip.compress(cuerpo, compresslevel=GZIP_NIVEL))
+                bytes_brotli = len(brotli.compress(cuerpo, quality=BROTLI_CALIDAD)) if brotli is not None else None
+                resultados.append(
+                    [
+                        listado,
+                        formato,
+                        nombre,
+                        len(data),
+                        len(cuerpo) // len(data),
+                        bytes_gzip // len(data),
+                        bytes_brotli // len(data) if bytes_brotli is not None else "-",
+                        round(milisegundos, 2),
+                    ]
+                )
+    encabezados = ["Listado", "Formato", "Serializador", "Renglones", "Bytes/renglón", "gzip", "brotli", "ms"]
+    click.echo(tabulate(resultados, headers=encabezados))
+    if orjson is None or brotli is None:
+        click.echo(click.style("AVISO: Instale orjson y brotli para comparar todas las opciones", fg="yellow"))
+
+
+cli.add_command(medir)
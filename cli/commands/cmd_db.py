@@ -57,7 +57,10 @@ from cli.commands.respaldar_oficinas import respaldar_oficinas
 from cli.commands.respaldar_roles_permisos import respaldar_roles_permisos
 from cli.commands.respaldar_usuarios_roles import respaldar_usuarios_roles
 from hercules.app import create_app
+from hercules.blueprints.tareas.models import Tarea
 from hercules.extensions import database
+from lib.busqueda import preparar_busqueda
+from lib.indices import preparar_indices
 from lib.safe_string import safe_clave, safe_string
 
 app = create_app()
@@ -118,6 +121,33 @@ def reiniciar(ctx):
     ctx.invoke(alimentar)
 
 
+@click.command()
+def preparar_busqueda_texto():
+    """Agregar las columnas e índices de búsqueda de texto completo a las tablas existentes"""
+    tablas = preparar_busqueda()
+    click.echo(f"Termina preparar la búsqueda de texto completo en {', '.join(tablas)}.")
+
+
+@click.command()
+def preparar_indices_activos():
+    """Crear sin bloquear las escrituras los índices parciales de los registros activos"""
+    creados, rehechos = preparar_indices()
+    for nombre in rehechos:
+        click.echo(click.style(f"  Se rehizo el índice inválido {nombre}", fg="yellow"))
+    click.echo(f"Termina preparar índices parciales: {len(creados)} creados y {len(rehechos)} rehechos.")
+
+
+@click.command()
+def preparar_medicion_tareas():
+    """Agregar las columnas de la medición a la tabla tareas existente"""
+    with database.engine.begin() as conexion:
+        for nombre in Tarea.COLUMNAS_MEDICION:
+            columna = Tarea.__table__.c[nombre]
+            tipo = columna.type.compile(dialect=conexion.dialect)
+            conexion.exec_driver_sql(f"ALTER TABLE {Tarea.__tablename__} ADD COLUMN IF NOT EXISTS {nombre} {tipo}")
+    click.echo(f"Termina preparar las columnas {', '.join(Tarea.COLUMNAS_MEDICION)} en {Tarea.__tablename__}.")
+
+
 @click.command()
 @click.option("--inventarios", is_flag=True, help="Respaldar inventarios")
 def respaldar(inventarios: bool):
@@ -280,6 +310,9 @@ def generar_sicgd_csv(anio_mes, cloud_storage):
 cli.add_command(inicializar)
 cli.add_command(alimentar)
 cli.add_command(reiniciar)
+cli.add_command(preparar_busqueda_texto)
+cli.add_command(preparar_indices_activos)
+cli.add_command(preparar_medicion_tareas)
 cli.add_command(respaldar)
 cli.add_command(copiar)
 cli.add_command(generar_sicgd_csv)
@@ -0,0 +1,38 @@
+"""
+CLI Expedientes Índices
+
+- reconstruir: Reconstruir el índice de expedientes de una o de todas las fuentes
+
+    cli expedientes_indices reconstruir
+    cli expedientes_indices reconstruir --tabla sentencias
+"""
+
+import click
+
+from hercules.app import create_app
+from hercules.blueprints.expedientes_indices.fuentes import FUENTES, reconstruir as reconstruir_fuente
+from hercules.extensions import database
+
+app = create_app()
+app.app_context().push()
+database.app = app
+
+
+@click.group()
+def cli():
+    """Expedientes Índices"""
+
+
+@click.command()
+@click.option("--tabla", default=None, type=click.Choice(list(FUENTES)), help="Sólo esta fuente")
+@click.option("--lote", default=1000, type=int, help="Cantidad de registros por lote")
+def reconstruir(tabla, lote):
+    """Reconstruir el índice de expedientes"""
+    tablas = [tabla] if tabla else list(FUENTES)
+    for nombre in tablas:
+        cantidad = reconstruir_fuente(nombre, lote)
+        click.echo(f"  {nombre}: {cantidad} renglones")
+    click.echo("Termina reconstruir el índice de expedientes.")
+
+
+cli.add_command(reconstruir)
@@ -6,11 +6,17 @@ CLI Ofi Documentos
 - enviar_email: Envía un e-mail utilizando Sendgrid.
 - enviar_whatsapp: Envía un mensaje por WhatsApp.
 - convertir_pdf: Convierte un documento a formato PDF.
+- medir_listado: Compara los bytes y la memoria de una página del listado con y sin el contenido.
 """
 
 import sys
+import time
+import tracemalloc
 
 import click
+from sqlalchemy import func
+from sqlalchemy.orm import undefer_group
+from tabulate import tabulate
 
 from hercules.blueprints.ofi_documentos.communications.send_to_efirma import enviar_a_efirma
 from hercules.blueprints.ofi_documentos.communications.send_to_gemini import enviar_a_gemini
@@ -18,6 +24,8 @@ from hercules.blueprints.ofi_documentos.communications.send_to_sendgrid import e
 from hercules.blueprints.ofi_documentos.communications.send_to_whatsapp import enviar_a_whatsapp
 from hercules.blueprints.ofi_documentos.conversions.convert_to_pdf import convertir_a_pdf
 from hercules.blueprints.ofi_documentos.conversions.back_to_draft import regresar_a_borrador
+from hercules.blueprints.ofi_documentos.models import OfiDocumento
+from hercules.extensions import database
 from lib.exceptions import MyAnyError
 
 
@@ -108,9 +116,38 @@ def regresar_borrador(ofi_documento_id):
     click.echo(click.style(mensaje_termino, fg="green"))
 
 
+@click.command()
+@click.option("--renglones", default=50, help="Renglones por página")
+def medir_listado(renglones):
+    """Medir una página del listado sólo con las columnas de resumen y con el contenido"""
+    columnas = (OfiDocumento.contenido_html, OfiDocumento.contenido_md, OfiDocumento.contenido_sfdt)
+    resultados = []
+    for perfil, opciones in (("resumen", []), ("con contenido", [undefer_group("contenido")])):
+        database.session.expunge_all()
+        tracemalloc.start()
+        inicio = time.perf_counter()
+        consulta = OfiDocumento.query.options(*opciones).filter_by(estatus="A")
+        registros = consulta.order_by(OfiDocumento.creado.desc()).limit(renglones).all()
+        milisegundos = (time.perf_counter() - inicio) * 1000
+        _, memoria_pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        # Bytes de las columnas de contenido que se cargaron
+        ids = [registro.id for registro in registros]
+        contenido_bytes = 0
+        if opciones and ids:
+            html, md, sfdt = [func.coalesce(func.pg_column_size(columna), 0) for columna in columnas]
+            consulta_tamanos = database.session.query(func.sum(html + md + sfdt))
+            contenido_bytes = consulta_tamanos.filter(OfiDocumento.id.in_(ids)).scalar() or 0
+        resultados.append([perfil, len(registros), contenido_bytes, round(memoria_pico / 1024), round(milisegundos, 1)])
+    click.echo(tabulate(resultados, headers=["Perfil", "Renglones", "Contenido bytes", "Memoria pico KB", "ms"]))
+    if resultados[1][3] > 0:
+        click.echo(f"Reducción de memoria por página: {100 - resultados[0][3] * 100 // resultados[1][3]}%")
+
+
 cli.add_command(convertir_pdf)
 cli.add_command(enviar_efirma)
 cli.add_command(enviar_email)
 cli.add_command(enviar_gemini)
 cli.add_command(enviar_whatsapp)
+cli.add_command(medir_listado)
 cli.add_command(regresar_borrador)
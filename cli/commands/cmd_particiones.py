@@ -0,0 +1,93 @@
+"""
+CLI Particiones
+
+- convertir: Convertir una tabla existente en particionada por mes
+- crear: Crear las particiones de los siguientes meses
+- archivar: Archivar en GCS y quitar las particiones más antiguas que la retención
+
+Programe cada mes
+
+    cli particiones crear
+    cli particiones archivar --meses 24
+
+Para archivar se necesita la variable de entorno
+
+    # Google Cloud Storage para los archivos de las particiones
+    CLOUD_STORAGE_DEPOSITO_RESPALDOS=
+"""
+
+import os
+import sys
+
+import click
+from dotenv import load_dotenv
+
+from hercules.app import create_app
+from hercules.extensions import database
+from lib.exceptions import MyAnyError
+from lib.particiones import (
+    MESES_ADELANTE,
+    MESES_RETENCION,
+    archivar_particiones,
+    convertir_tabla,
+    preparar_particiones,
+    tablas_particionadas,
+)
+
+app = create_app()
+app.app_context().push()
+database.app = app
+
+load_dotenv()  # Take environment variables from .env
+CLOUD_STORAGE_DEPOSITO_RESPALDOS = os.environ.get("CLOUD_STORAGE_DEPOSITO_RESPALDOS")
+
+TABLAS = {tabla.name: tabla for tabla in tablas_particionadas()}
+
+
+@click.group()
+def cli():
+    """Particiones"""
+
+
+@click.command()
+@click.argument("tabla", type=click.Choice(list(TABLAS)))
+def convertir(tabla):
+    """Convertir una tabla existente en particionada por mes"""
+    click.echo(f"Convirtiendo {tabla} en particionada por mes...")
+    cantidad = convertir_tabla(TABLAS[tabla])
+    if cantidad == 0:
+        click.echo(f"  {tabla} ya está particionada o no existe")
+        return
+    click.echo(f"  Se copiaron {cantidad} registros, revise y elimine la tabla {tabla}_anterior")
+
+
+@click.command()
+@click.option("--meses", default=MESES_ADELANTE, type=int, help="Cantidad de meses por adelantado")
+def crear(meses):
+    """Crear las particiones de los siguientes meses"""
+    creadas = preparar_particiones(meses)
+    click.echo(f"Se crearon {len(creadas)} particiones: {', '.join(creadas)}")
+
+
+@click.command()
+@click.option("--meses", default=MESES_RETENCION, type=int, help="Cantidad de meses que se conservan")
+@click.option("--tabla", default=None, type=click.Choice(list(TABLAS)), help="Archivar sólo esta tabla")
+def archivar(meses, tabla):
+    """Archivar en GCS y quitar las particiones más antiguas que la retención"""
+    if not CLOUD_STORAGE_DEPOSITO_RESPALDOS:
+        click.echo("ERROR: No está definida la variable de entorno CLOUD_STORAGE_DEPOSITO_RESPALDOS")
+        sys.exit(1)
+    for nombre in [tabla] if tabla else list(TABLAS):
+        try:
+            urls = archivar_particiones(nombre, CLOUD_STORAGE_DEPOSITO_RESPALDOS, meses)
+        except MyAnyError as error:
+            click.echo(click.style(f"  {nombre}: {error}", fg="red"))
+            sys.exit(1)
+        for url in urls:
+            click.echo(f"  {url}")
+        click.echo(f"{nombre}: se archivaron {len(urls)} particiones")
+
+
+cli.add_command(convertir)
+cli.add_command(crear)
+cli.add_command(archivar)
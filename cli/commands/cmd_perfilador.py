@@ -0,0 +1,79 @@
+"""
+CLI Perfilador
+
+- activar: Activa el perfilador para un endpoint, un usuario o un comando de RQ
+- desactivar: Desactiva el perfilador para un endpoint, un usuario o un comando de RQ
+- mostrar: Muestra los perfiladores activos y los perfiles más recientes
+"""
+
+import sys
+
+import click
+from tabulate import tabulate
+
+from hercules.app import create_app
+from hercules.extensions import database
+from lib.perfilador import ACTIVOS_TTL_SEGUNDOS, activar as activar_perfilador, consultar_activos, consultar_perfiles
+from lib.perfilador import desactivar as desactivar_perfilador
+
+app = create_app()
+app.app_context().push()
+database.app = app
+
+
+@click.group()
+def cli():
+    """Perfilador"""
+
+
+def _elegir(endpoint: str, usuario: str, comando: str) -> tuple[str, str]:
+    """Entregar el tipo y nombre de la única opción dada"""
+    dadas = (("endpoint", endpoint), ("usuario", usuario), ("comando", comando))
+    opciones = [(tipo, nombre) for tipo, nombre in dadas if nombre]
+    if len(opciones) != 1:
+        click.echo(click.style("Dé sólo una opción: --endpoint, --usuario o --comando", fg="red"))
+        sys.exit(1)
+    return opciones[0]
+
+
+@click.command()
+@click.option("--endpoint", default="", help="Endpoint, por ejemplo sentencias.datatable_json")
+@click.option("--usuario", default="", help="e-mail del usuario")
+@click.option("--comando", default="", help="Comando de RQ, por ejemplo ofi_documentos.tasks.lanzar_convertir_a_pdf")
+@click.option("--fraccion", default=1.0, type=click.FloatRange(0.0, 1.0), help="Fracción de peticiones o tareas a perfilar")
+def activar(endpoint, usuario, comando, fraccion):
+    """Activar el perfilador"""
+    tipo, nombre = _elegir(endpoint, usuario, comando)
+    if tipo == "endpoint" and nombre not in app.view_functions:
+        click.echo(click.style(f"No existe el endpoint {nombre}", fg="red"))
+        sys.exit(1)
+    activar_perfilador(tipo, nombre, fraccion)
+    click.echo(f"Perfilador activo para {tipo} {nombre} con fracción {fraccion}, aplica en {ACTIVOS_TTL_SEGUNDOS} segundos")
+
+
+@click.command()
+@click.option("--endpoint", default="", help="Endpoint, por ejemplo sentencias.datatable_json")
+@click.option("--usuario", default="", help="e-mail del usuario")
+@click.option("--comando", default="", help="Comando de RQ, por ejemplo ofi_documentos.tasks.lanzar_convertir_a_pdf")
+def desactivar(endpoint, usuario, comando):
+    """Desactivar el perfilador"""
+    tipo, nombre = _elegir(endpoint, usuario, comando)
+    desactivar_perfilador(tipo, nombre)
+    click.echo(f"Perfilador desactivado para {tipo} {nombre}")
+
+
+@click.command()
+@click.option("--cantidad", default=20, help="Cantidad de perfiles a mostrar")
+def mostrar(cantidad):
+    """Mostrar los perfiladores activos y los perfiles más recientes"""
+    activos = [llave.split(":", 1) + [fraccion] for llave, fraccion in sorted(consultar_activos().items())]
+    click.echo(tabulate(activos, headers=["Tipo", "Nombre", "Fracción"]))
+    click.echo()
+    perfiles = consultar_perfiles(cantidad)
+    renglones = [[p["creado"], p["tipo"], p["nombre"], p["usuario"], p["segundos"], p["muestras"], p["id"]] for p in perfiles]
+    click.echo(tabulate(renglones, headers=["Creado", "Tipo", "Nombre", "Usuario", "Segundos", "Muestras", "ID"]))
+
+
+cli.add_command(activar)
+cli.add_command(desactivar)
+cli.add_command(mostrar)
@@ -0,0 +1,135 @@
+"""
+CLI Planes
+
+- revisar: Ejecutar EXPLAIN de las combinaciones de filtros de los datatable_json
+
+Falla (termina con código 1) si algún plan recorre secuencialmente una tabla con más
+registros que el umbral. Conviene ejecutarlo con una base de datos con datos reales
+o alimentada, después de ANALYZE para que las estadísticas estén al día.
+
+    cli planes revisar
+    cli planes revisar --umbral 50000 --tabla sentencias
+"""
+
+import json
+import sys
+from datetime import date, datetime, timedelta
+from itertools import combinations
+
+import click
+from sqlalchemy import func, text
+from tabulate import tabulate
+
+from hercules.app import create_app
+from hercules.blueprints.audiencias import views as audiencias
+from hercules.blueprints.bitacoras import views as bitacoras
+from hercules.blueprints.edictos import views as edictos
+from hercules.blueprints.glosas import views as glosas
+from hercules.blueprints.listas_de_acuerdos import views as listas_de_acuerdos
+from hercules.blueprints.ofi_documentos import views as ofi_documentos
+from hercules.blueprints.sentencias import views as sentencias
+from hercules.extensions import database
+
+app = create_app()
+app.app_context().push()
+database.app = app
+
+UMBRAL = 10000
+LIMITE = 10  # Igual que el rows_per_page de los datatables
+
+# Los filtros y el orden se declaran junto a cada datatable_json
+LISTADOS = {
+    vista.LISTADO.modelo.__tablename__: vista.LISTADO
+    for vista in (audiencias, bitacoras, edictos, glosas, listas_de_acuerdos, ofi_documentos, sentencias)
+}
+
+
+def _mas_frecuente(modelo, columna: str):
+    """El valor más frecuente de la columna entre los activos, para consultar como lo haría un usuario"""
+    atributo = getattr(modelo, columna)
+    consulta = database.session.query(atributo).filter(modelo.estatus == "A").group_by(atributo)
+    return consulta.order_by(func.count().desc()).limit(1).scalar()
+
+
+def _rango(modelo, columna: str):
+    """Los últimos 30 días con registros en la columna de fechas"""
+    hasta = database.session.query(func.max(getattr(modelo, columna))).filter(modelo.estatus == "A").scalar()
+    if hasta is None:
+        hasta = datetime.now() if columna == "tiempo" else date.today()
+    return hasta - timedelta(days=30), hasta
+
+
+def _combinaciones(tabla: str):
+    """Entregar (descripción, consulta) por cada combinación de filtros del datatable_json"""
+    listado = LISTADOS[tabla]
+    modelo, columnas, columna_fecha = listado.modelo, listado.filtros, listado.fecha
+    valores = {columna: _mas_frecuente(modelo, columna) for columna in columnas}
+    filtros = [[columna] for columna in columnas if valores[columna] is not None]
+    if columna_fecha is not None:
+        filtros.append([columna_fecha])
+        filtros += [[columna, columna_fecha] for columna in columnas if valores[columna] is not None]
+    filtros += [list(par) for par in combinations([columna for columna in columnas if valores[columna] is not None], 2)]
+    for filtro in [[]] + filtros:
+        consulta = modelo.query.filter(modelo.estatus == "A")
+        for columna in filtro:
+            if columna == columna_fecha:
+                desde, hasta = _rango(modelo, columna_fecha)
+                consulta = consulta.filter(getattr(modelo, columna) >= desde).filter(getattr(modelo, columna) <= hasta)
+            else:
+                consulta = consulta.filter(getattr(modelo, columna) == valores[columna])
+        consulta = consulta.order_by(listado.orden_descendente()).limit(LIMITE)
+        yield ", ".join(["estatus"] + filtro), consulta
+
+
+def _recorrer(nodo: dict):
+    """Recorrer los nodos del plan"""
+    yield nodo
+    for hijo in nodo.get("Plans", []):
+        yield from _recorrer(hijo)
+
+
+def _cantidad_estimada(relacion: str) -> int:
+    """Cantidad estimada de registros de la tabla según las estadísticas"""
+    cantidad = database.session.execute(text("SELECT reltuples FROM pg_class WHERE relname = :t"), {"t": relacion}).scalar()
+    return int(cantidad or 0)
+
+
+@click.group()
+def cli():
+    """Planes"""
+
+
+@click.command()
+@click.option("--umbral", default=UMBRAL, type=int, help="Cantidad de registros a partir de la cual falla un Seq Scan")
+@click.option("--tabla", default=None, type=click.Choice(list(LISTADOS)), help="Revisar sólo esta tabla")
+def revisar(umbral, tabla):
+    """Ejecutar EXPLAIN de las combinaciones de filtros de los datatable_json"""
+    tablas = [tabla] if tabla else list(LISTADOS)
+    renglones = []
+    fallos = 0
+    for nombre in tablas:
+        for descripcion, consulta in _combinaciones(nombre):
+            sql = consulta.statement.compile(dialect=database.engine.dialect, compile_kwargs={"literal_binds": True})
+            plan = database.session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            nodos = list(_recorrer(plan[0]["Plan"]))
+            recorridos = [
+                nodo["Relation Name"]
+                for nodo in nodos
+                if nodo["Node Type"] == "Seq Scan" and _cantidad_estimada(nodo["Relation Name"]) > umbral
+            ]
+            indices = sorted({nodo["Index Name"] for nodo in nodos if "Index Name" in nodo})
+            if recorridos:
+                fallos += 1
+            renglones.append(
+                [nombre, descripcion, ", ".join(indices), "FALLA Seq Scan " + ", ".join(recorridos) if recorridos else "Bien"]
+            )
+    click.echo(tabulate(renglones, ["Tabla", "Filtros", "Índices", "Resultado"], tablefmt="github"))
+    if fallos > 0:
+        click.echo(click.style(f"  {fallos} planes recorren secuencialmente tablas con más de {umbral} registros", fg="red"))
+        sys.exit(1)
+    click.echo(click.style(f"  {len(renglones)} planes sin recorridos secuenciales de tablas grandes", fg="green"))
+
+
+cli.add_command(revisar)
@@ -0,0 +1,453 @@
+"""
+CLI Rendimiento
+
+- sembrar: Inserta datos sintéticos en volúmenes de producción en una base de datos local
+- medir: Mide los caminos más usados y guarda los resultados en un archivo JSON
+- comparar: Compara dos archivos de resultados y señala las regresiones
+
+Primero alimente los catálogos y después siembre los datos sintéticos
+
+    cli db reiniciar
+    cli rendimiento sembrar --bitacoras 2000000 --sentencias 300000
+
+Mida en cada commit y compare contra el anterior
+
+    cli rendimiento medir --email administrador@pjecz.gob.mx
+    cli rendimiento comparar rendimiento/anterior.json rendimiento/actual.json
+"""
+
+import inspect
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timedelta
+from io import BytesIO
+from itertools import accumulate
+from pathlib import Path
+
+import click
+from faker import Faker
+from flask_login import login_user
+from openpyxl import Workbook
+from sqlalchemy import insert, select, text
+from sqlalchemy.engine import make_url
+from tabulate import tabulate
+from xhtml2pdf import pisa
+
+from hercules.app import create_app
+from hercules.blueprints.autoridades.models import Autoridad
+from hercules.blueprints.bitacoras.models import Bitacora
+from hercules.blueprints.cantidades_diarias.fuentes import FUENTES, reconstruir as reconstruir_fuente
+from hercules.blueprints.edictos.models import Edicto
+from hercules.blueprints.listas_de_acuerdos.models import ListaDeAcuerdo
+from hercules.blueprints.materias_tipos_juicios.models import MateriaTipoJuicio
+from hercules.blueprints.modulos.models import Modulo
+from hercules.blueprints.oficinas.models import Oficina
+from hercules.blueprints.roles.models import Rol
+from hercules.blueprints.sentencias.models import Sentencia
+from hercules.blueprints.usuarios.models import Usuario
+from hercules.blueprints.usuarios_roles.models import UsuarioRol
+from hercules.extensions import database
+from lib.cache import invalidar_tablas
+from lib.particiones import crear_particiones, tablas_particionadas
+from lib.safe_string import safe_email, safe_expediente, safe_string, safe_text
+
+app = create_app()
+app.app_context().push()
+database.app = app
+
+HOSTS_LOCALES = ("localhost", "127.0.0.1", "::1", None)
+DOMINIO_SINTETICO = "rendimiento.local"
+DIRECTORIO_RESULTADOS = "rendimiento"
+ANIOS = 3  # Los registros sintéticos se reparten en los últimos años
+DATATABLES = (
+    "bitacoras.datatable_json",
+    "edictos.datatable_json",
+    "listas_de_acuerdos.datatable_json",
+    "sentencias.datatable_json",
+)
+TABLEROS = (
+    "autoridades.tablero_json",
+    "sentencias.dashboard_amounts_per_autoridad_json",
+    "sentencias.dashboard_amounts_per_day_json",
+)
+
+
+@click.group()
+def cli():
+    """Rendimiento"""
+
+
+def _pesos_acumulados(cantidad: int) -> list:
+    """Pesos acumulados como la ley de Zipf, pocas autoridades o usuarios concentran la mayoría de los registros"""
+    return list(accumulate(1 / (posicion + 1) for posicion in range(cantidad)))
+
+
+def _insertar(modelo, cantidad: int, lote: int, elaborar) -> None:
+    """Insertar por lotes los renglones que entrega elaborar(cantidad)"""
+    click.echo(f"  {modelo.__tablename__}: ", nl=False)
+    hechos = 0
+    while hechos < cantidad:
+        solicitados = min(lote, cantidad - hechos)
+        renglones = elaborar(solicitados)
+        if renglones:
+            database.session.execute(insert(modelo), renglones)
+            database.session.commit()
+        hechos += solicitados
+        click.echo(click.style("+", fg="green"), nl=False)
+    click.echo(f" {hechos}")
+
+
+@click.command()
+@click.option("--bitacoras", default=2_000_000, help="Cantidad de bitácoras")
+@click.option("--sentencias", default=300_000, help="Cantidad de sentencias")
+@click.option("--edictos", default=300_000, help="Cantidad de edictos")
+@click.option("--listas", default=300_000, help="Cantidad de listas de acuerdos")
+@click.option("--usuarios", default=2_000, help="Cantidad de usuarios con roles al azar")
+@click.option("--lote", default=10_000, help="Renglones por inserción")
+@click.option("--semilla", default=0, help="Semilla para repetir los mismos datos")
+@click.option("--forzar", is_flag=True, help="Sembrar aunque la base de datos no sea local")
+def sembrar(bitacoras, sentencias, edictos, listas, usuarios, lote, semilla, forzar):
+    """Sembrar datos sintéticos"""
+    if make_url(app.config["SQLALCHEMY_DATABASE_URI"]).host not in HOSTS_LOCALES and not forzar:
+        click.echo(click.style("La base de datos no es local, use --forzar si está seguro", fg="red"))
+        sys.exit(1)
+    azar = random.Random(semilla)
+    faker = Faker("es_MX")
+    faker.seed_instance(semilla)
+    autoridades_ids = database.session.execute(
+        select(Autoridad.id).where(Autoridad.es_jurisdiccional == True).where(Autoridad.estatus == "A")
+    ).scalars().all()
+    modulos_ids = database.session.execute(select(Modulo.id)).scalars().all()
+    roles_ids = database.session.execute(select(Rol.id).where(Rol.estatus == "A")).scalars().all()
+    oficinas_ids = database.session.execute(select(Oficina.id)).scalars().all()
+    materias_tipos_juicios_ids = database.session.execute(select(MateriaTipoJuicio.id)).scalars().all()
+    if not (autoridades_ids and modulos_ids and roles_ids and oficinas_ids and materias_tipos_juicios_ids):
+        click.echo(click.style("Faltan los catálogos, ejecute primero cli db alimentar", fg="red"))
+        sys.exit(1)
+    azar.shuffle(autoridades_ids)
+    pesos_autoridades = _pesos_acumulados(len(autoridades_ids))
+
+    def autoridades_al_azar(cantidad: int) -> list:
+        """Autoridades para cada renglón del lote, unas cuantas con la mayoría"""
+        return azar.choices(autoridades_ids, cum_weights=pesos_autoridades, k=cantidad)
+
+    descripciones = [safe_string(faker.sentence(nb_words=12)) for _ in range(1000)]
+    hoy = date.today()
+
+    def fecha_al_azar() -> date:
+        """Fecha en los últimos años, más registros en los recientes"""
+        return hoy - timedelta(days=int(azar.triangular(0, 365 * ANIOS, 0)))
+
+    def creado_del_dia(fecha: date) -> datetime:
+        """Tiempo al azar del día, para creado y modificado, los tableros agrupan por creado"""
+        return datetime.combine(fecha, datetime.min.time()) + timedelta(seconds=azar.randint(0, 86399))
+
+    def expediente_al_azar(fecha: date) -> tuple[str, int, int]:
+        """Expediente, año y número"""
+        numero = azar.randint(1, 2000)
+        return f"{numero}/{fecha.year}", fecha.year, numero
+
+    # Usuarios sintéticos con sus roles, de 1 a 4 roles por usuario
+    click.echo("Sembrando datos sintéticos")
+    siguiente = database.session.execute(select(Usuario.id).order_by(Usuario.id.desc()).limit(1)).scalar() or 0
+    ultimo_usuario_id = siguiente
+
+    def elaborar_usuarios(cantidad: int) -> list:
+        nonlocal siguiente
+        renglones = []
+        for autoridad_id in autoridades_al_azar(cantidad):
+            siguiente += 1
+            renglones.append(
+                {
+                    "autoridad_id": autoridad_id,
+                    "oficina_id": azar.choice(oficinas_ids),
+                    "email": f"sintetico-{siguiente}@{DOMINIO_SINTETICO}",
+                    "nombres": safe_string(faker.first_name()),
+                    "apellido_paterno": safe_string(faker.last_name()),
+                    "apellido_materno": safe_string(faker.last_name()),
+                    "workspace": "EXTERNO",
+                }
+            )
+        return renglones
+
+    _insertar(Usuario, usuarios, lote, elaborar_usuarios)
+    usuarios_ids = database.session.execute(select(Usuario.id).where(Usuario.id > ultimo_usuario_id)).scalars().all()
+    pendientes = list(usuarios_ids)
+
+    def elaborar_usuarios_roles(cantidad: int) -> list:
+        renglones = []
+        for usuario_id in pendientes[:cantidad]:
+            for rol_id in azar.sample(roles_ids, min(azar.randint(1, 4), len(roles_ids))):
+                renglones.append({"usuario_id": usuario_id, "rol_id": rol_id, "descripcion": "SINTETICO"})
+        del pendientes[:cantidad]
+        return renglones
+
+    _insertar(UsuarioRol, len(usuarios_ids), lote, elaborar_usuarios_roles)
+    pesos_usuarios = _pesos_acumulados(len(usuarios_ids))
+
+    def elaborar_bitacoras(cantidad: int) -> list:
+        renglones = []
+        for usuario_id in azar.choices(usuarios_ids, cum_weights=pesos_usuarios, k=cantidad):
+            creado = creado_del_dia(fecha_al_azar())
+            renglones.append(
+                {
+                    "creado": creado,
+                    "modificado": creado,
+                    "modulo_id": azar.choice(modulos_ids),
+                    "usuario_id": usuario_id,
+                    "descripcion": azar.choice(descripciones),
+                    "url": "/",
+                }
+            )
+        return renglones
+
+    def elaborar_sentencias(cantidad: int) -> list:
+        renglones = []
+        for autoridad_id in autoridades_al_azar(cantidad):
+            fecha = fecha_al_azar()
+            expediente, expediente_anio, expediente_num = expediente_al_azar(fecha)
+            creado = creado_del_dia(fecha)
+            renglones.append(
+                {
+                    "creado": creado,
+                    "modificado": creado,
+                    "autoridad_id": autoridad_id,
+                    "materia_tipo_juicio_id": azar.choice(materias_tipos_juicios_ids),
+                    "sentencia": f"{azar.randint(1, 999)}/{fecha.year}",
+                    "sentencia_fecha": fecha,
+                    "expediente": expediente,
+                    "expediente_anio": expediente_anio,
+                    "expediente_num": expediente_num,
+                    "fecha": fecha,
+                    "descripcion": azar.choice(descripciones),
+                    "es_perspectiva_genero": azar.random() < 0.05,
+                }
+            )
+        return renglones
+
+    def elaborar_edictos(cantidad: int) -> list:
+        renglones = []
+        for autoridad_id in autoridades_al_azar(cantidad):
+            fecha = fecha_al_azar()
+            expediente, _, _ = expediente_al_azar(fecha)
+            creado = creado_del_dia(fecha)
+            renglones.append(
+                {
+                    "creado": creado,
+                    "modificado": creado,
+                    "autoridad_id": autoridad_id,
+                    "fecha": fecha,
+                    "descripcion": azar.choice(descripciones),
+                    "expediente": expediente,
+                    "numero_publicacion": f"{azar.randint(1, 3)}/{fecha.year}",
+                }
+            )
+        return renglones
+
+    def elaborar_listas(cantidad: int) -> list:
+        renglones = []
+        for autoridad_id in autoridades_al_azar(cantidad):
+            fecha = fecha_al_azar()
+            creado = creado_del_dia(fecha)
+            renglones.append(
+                {
+                    "creado": creado,
+                    "modificado": creado,
+                    "autoridad_id": autoridad_id,
+                    "fecha": fecha,
+                    "descripcion": "LISTA DE ACUERDOS",
+                }
+            )
+        return renglones
+
+    # Crear las particiones de los meses sembrados, sin ellas los registros irían a la partición default
+    tablas = ["usuarios", "usuarios_roles", "bitacoras", "sentencias", "edictos", "listas_de_acuerdos"]
+    with database.engine.begin() as conexion:
+        for tabla in tablas_particionadas():
+            if tabla.name in tablas:
+                crear_particiones(conexion, tabla.name, hoy - timedelta(days=365 * ANIOS), hoy)
+
+    _insertar(Bitacora, bitacoras, lote, elaborar_bitacoras)
+    _insertar(Sentencia, sentencias, lote, elaborar_sentencias)
+    _insertar(Edicto, edictos, lote, elaborar_edictos)
+    _insertar(ListaDeAcuerdo, listas, lote, elaborar_listas)
+
+    # Invalidar los caches y recalcular las cantidades diarias de los tableros
+    invalidar_tablas(*tablas)
+    for tabla in tablas:
+        if tabla in FUENTES:
+            reconstruir_fuente(tabla, None)
+    for tabla in tablas:
+        database.session.execute(text(f"ANALYZE {tabla}"))  # Que el planificador no use las estadísticas previas
+    database.session.commit()
+    click.echo("Termina sembrar.")
+
+
+def _medir(funcion, repeticiones: int, calentamiento: int, preparar=None) -> dict:
+    """Ejecutar la función varias veces y entregar las estadísticas en milisegundos, como pytest-benchmark"""
+    tiempos = []
+    for ronda in range(calentamiento + repeticiones):
+        argumento = preparar() if preparar is not None else None
+        inicio = time.perf_counter()
+        funcion(argumento)
+        transcurrido = (time.perf_counter() - inicio) * 1000
+        database.session.remove()  # Cada ronda sin los registros ya cargados en la sesión
+        if ronda >= calentamiento:
+            tiempos.append(transcurrido)
+    tiempos.sort()
+    return {
+        "rondas": len(tiempos),
+        "min": round(tiempos[0], 3),
+        "mediana": round(statistics.median(tiempos), 3),
+        "media": round(statistics.fmean(tiempos), 3),
+        "p95": round(tiempos[min(len(tiempos) - 1, int(len(tiempos) * 0.95))], 3),
+        "max": round(tiempos[-1], 3),
+        "desviacion": round(statistics.pstdev(tiempos), 3),
+    }
+
+
+def _vista(endpoint: str, usuario_id: int, con_cache: bool, metodo: str, datos: dict):
+    """Función que ejecuta la vista como una petición del usuario, sin decoradores ni cache si no con_cache"""
+    vista = app.view_functions[endpoint] if con_cache else inspect.unwrap(app.view_functions[endpoint])
+
+    def ejecutar(_):
+        with app.test_request_context(method=metodo, data=datos if metodo == "POST" else None):
+            login_user(database.session.get(Usuario, usuario_id))
+            vista()
+
+    return ejecutar
+
+
+def _elaborar_oficio_html(faker: Faker) -> str:
+    """HTML de un oficio sintético de dos páginas con una tabla, como los que convierte ofi_documentos"""
+    parrafos = "".join(f"<p>{faker.paragraph(nb_sentences=8)}</p>" for _ in range(12))
+    renglones = "".join(f"<tr><td>{faker.name()}</td><td>{faker.date()}</td><td>{faker.city()}</td></tr>" for _ in range(20))
+    tabla = f"<table class='content-table'>{renglones}</table>"
+    return f"<html><head><style>@page {{ size: letter portrait; }}</style></head><body>{parrafos}{tabla}</body></html>"
+
+
+@click.command()
+@click.option("--email", required=True, help="Usuario con permisos para los listados y tableros")
+@click.option("--repeticiones", default=20, help="Rondas medidas de cada caso")
+@click.option("--calentamiento", default=2, help="Rondas sin medir antes de cada caso")
+@click.option("--renglones", default=100, help="Renglones por página en los listados")
+@click.option("--con-cache", is_flag=True, help="Medir las vistas con sus decoradores y cache")
+@click.option("--salida", default=DIRECTORIO_RESULTADOS, help="Directorio para el archivo JSON")
+def medir(email, repeticiones, calentamiento, renglones, con_cache, salida):
+    """Medir listados, tableros, permisos, normalizadores, PDF y exportación"""
+    usuario = Usuario.query.filter_by(email=safe_email(email)).first()
+    if usuario is None:
+        click.echo(click.style(f"No existe el usuario {email}", fg="red"))
+        sys.exit(1)
+    usuario_id = usuario.id
+    faltantes = [endpoint for endpoint in DATATABLES + TABLEROS if endpoint not in app.view_functions]
+    if faltantes:
+        click.echo(click.style(f"No existen los endpoints {', '.join(faltantes)}", fg="red"))
+        sys.exit(1)
+    faker = Faker("es_MX")
+    faker.seed_instance(0)
+    casos = {}
+    formulario = {"draw": "1", "start": "0", "length": str(renglones)}
+    for endpoint in DATATABLES:
+        casos[endpoint] = _vista(endpoint, usuario_id, con_cache, "POST", formulario), None
+    for endpoint in TABLEROS:
+        casos[endpoint] = _vista(endpoint, usuario_id, con_cache, "GET", {}), None
+
+    # Permisos y menú, con el usuario recién consultado como al iniciar cada petición
+    def consultar_usuario():
+        return database.session.get(Usuario, usuario_id)
+
+    casos["usuarios.permisos"] = (lambda usuario: usuario.permisos), consultar_usuario
+    casos["usuarios.modulos_menu_principal"] = (lambda usuario: usuario.modulos_menu_principal), consultar_usuario
+
+    # Normalizadores sobre 1,000 textos
+    textos = [faker.sentence(nb_words=20) for _ in range(1000)]
+    expedientes = [f"{faker.random_int(1, 9999)}/{faker.year()}" for _ in range(1000)]
+    correos = [faker.email() for _ in range(1000)]
+    casos["safe_string"] = (lambda _: [safe_string(texto) for texto in textos]), None
+    casos["safe_text"] = (lambda _: [safe_text(texto) for texto in textos]), None
+    casos["safe_expediente"] = (lambda _: [safe_expediente(expediente) for expediente in expedientes]), None
+    casos["safe_email"] = (lambda _: [safe_email(correo) for correo in correos]), None
+
+    # PDF con xhtml2pdf como ofi_documentos y exportación XLSX con openpyxl de 5,000 bitácoras, sin subirlos
+    oficio_html = _elaborar_oficio_html(faker)
+    casos["pdf.oficio"] = (lambda _: pisa.CreatePDF(oficio_html, dest=BytesIO())), None
+
+    def exportar_xlsx(_):
+        libro = Workbook()
+        hoja = libro.active
+        hoja.append(["CREADO", "USUARIO", "MODULO", "DESCRIPCION"])
+        consulta = Bitacora.query.order_by(Bitacora.id.desc()).limit(5000)
+        for bitacora in consulta:
+            hoja.append([bitacora.creado, bitacora.usuario.email, bitacora.modulo.nombre, bitacora.descripcion])
+        libro.save(BytesIO())
+
+    casos["xlsx.bitacoras"] = exportar_xlsx, None
+
+    # Medir
+    resultados = {}
+    for nombre, (funcion, preparar) in casos.items():
+        click.echo(f"  {nombre}: ", nl=False)
+        try:
+            resultados[nombre] = _medir(funcion, repeticiones, calentamiento, preparar)
+        except Exception as error:
+            database.session.rollback()
+            click.echo(click.style(f"ERROR {error}", fg="red"))
+            continue
+        click.echo(f"{resultados[nombre]['mediana']} ms")
+
+    # Guardar el archivo JSON con el commit
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = ""
+    ahora = datetime.now()
+    documento = {
+        "commit": commit,
+        "fecha": ahora.isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "con_cache": con_cache,
+        "renglones": renglones,
+        "resultados": resultados,
+    }
+    Path(salida).mkdir(parents=True, exist_ok=True)
+    archivo = Path(salida, f"{ahora:%Y%m%d%H%M%S}-{commit[:8] or 'sin-commit'}.json")
+    archivo.write_text(json.dumps(documento, indent=2, ensure_ascii=False), encoding="utf-8")
+    click.echo(click.style(f"Resultados en {archivo}", fg="green"))
+
+
+@click.command()
+@click.argument("anterior", type=click.Path(exists=True, dir_okay=False))
+@click.argument("actual", type=click.Path(exists=True, dir_okay=False))
+@click.option("--umbral", default=0.10, help="Fracción de aumento de la mediana que se considera regresión")
+def comparar(anterior, actual, umbral):
+    """Comparar dos archivos de resultados, termina con error si hay regresiones"""
+    antes = json.loads(Path(anterior).read_text(encoding="utf-8"))
+    despues = json.loads(Path(actual).read_text(encoding="utf-8"))
+    renglones = []
+    regresiones = 0
+    for nombre, resultado in despues["resultados"].items():
+        previo = antes["resultados"].get(nombre)
+        if previo is None or previo["mediana"] == 0:
+            renglones.append([nombre, "-", resultado["mediana"], "-", ""])
+            continue
+        cambio = resultado["mediana"] / previo["mediana"] - 1
+        es_regresion = cambio > umbral
+        regresiones += es_regresion
+        marca = click.style("REGRESION", fg="red") if es_regresion else ""
+        renglones.append([nombre, previo["mediana"], resultado["mediana"], f"{cambio:+.1%}", marca])
+    click.echo(f"{antes['commit'][:8]} -> {despues['commit'][:8]}")
+    click.echo(tabulate(renglones, headers=["Caso", "Mediana antes ms", "Mediana ahora ms", "Cambio", ""]))
+    if regresiones > 0:
+        click.echo(click.style(f"{regresiones} regresiones mayores a {umbral:.0%}", fg="red"))
+        sys.exit(1)
+
+
+cli.add_command(sembrar)
+cli.add_command(medir)
+cli.add_command(comparar)
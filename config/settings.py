@@ -79,6 +79,7 @@ class Settings(BaseSettings):
     HOST: str = get_secret("HOST")
     MAX_CONTENT_LENGTH: int | None = get_secret("MAX_CONTENT_LENGTH", None)  # Incrementar los formularios
     MAX_FORM_MEMORY_SIZE: int = int(get_secret("MAX_FORM_MEMORY_SIZE", "24")) * MEGABYTE  # Incrementar los formularios
+    METRICAS_TOKEN: str = get_secret("METRICAS_TOKEN")  # Si está vacío no se exponen las métricas
     MUNICIPIO_CLAVE: str = get_secret("MUNICIPIO_CLAVE", "030")
     REDIS_URL: str = get_secret("REDIS_URL", "redis://127.0.0.1:6379")
     SALT: str = get_secret("SALT")
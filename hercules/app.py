@@ -4,7 +4,7 @@ Flask App
 
 import rq
 from flask import Flask
-from redis import Redis
+from jinja2 import FileSystemBytecodeCache
 
 from config.settings import Settings
 from hercules.blueprints.abogados.views import abogados
@@ -48,6 +48,7 @@ from hercules.blueprints.exh_exhortos_respuestas_archivos.views import exh_exhor
 from hercules.blueprints.exh_exhortos_respuestas_videos.views import exh_exhortos_respuestas_videos
 from hercules.blueprints.exh_externos.views import exh_externos
 from hercules.blueprints.exh_tipos_diligencias.views import exh_tipos_diligencias
+from hercules.blueprints.expedientes_indices.views import expedientes_indices
 from hercules.blueprints.fin_vales.views import fin_vales
 from hercules.blueprints.funcionarios.views import funcionarios
 from hercules.blueprints.funcionarios_oficinas.views import funcionarios_oficinas
@@ -98,6 +99,13 @@ from hercules.blueprints.usuarios_nominas.views import usuarios_nominas
 from hercules.blueprints.usuarios_roles.views import usuarios_roles
 from hercules.blueprints.vsp_digitalizaciones.views import vsp_digitalizaciones
 from hercules.extensions import csrf, database, login_manager, moment
+from lib.activos import registrar as registrar_activos
+from lib.fragmentos import menu_principal, tareas_en_progreso
+from lib.metricas import RedisMedido
+from lib.metricas import registrar as registrar_metricas
+from lib.perfilador import registrar as registrar_perfilador
+from lib.respuestas_json import ProveedorJSON, comprimir_respuesta
+from lib.trazas_sql import registrar as registrar_trazas_sql
 
 
 def create_app():
@@ -105,11 +113,27 @@ def create_app():
     # Definir app
     app = Flask(__name__, instance_relative_config=True)
 
+    # Guardar las plantillas compiladas en archivos, las comparten los procesos de todas las carpetas de plantillas
+    app.jinja_options = {**app.jinja_options, "bytecode_cache": FileSystemBytecodeCache()}
+
     # Cargar la configuración
     app.config.from_object(Settings())
 
+    # Medir latencia, SQL, bytes y llamadas a Redis y GCS por endpoint
+    registrar_metricas(app)
+
+    # Guardar las sentencias SQL de las peticiones lentas o de las que solicite un administrador
+    registrar_trazas_sql(app)
+
+    # Perfilar por muestreo los endpoints y usuarios activados con cli perfilador
+    registrar_perfilador(app)
+
+    # Serializar JSON con orjson si está instalado y comprimir las respuestas JSON
+    app.json = ProveedorJSON(app)
+    app.after_request(comprimir_respuesta)
+
     # Redis
-    app.redis = Redis.from_url(app.config["REDIS_URL"])
+    app.redis = RedisMedido.from_url(app.config["REDIS_URL"])
     app.task_queue = rq.Queue(app.config["TASK_QUEUE"], connection=app.redis, default_timeout=3000)
 
     # Registrar blueprints
@@ -150,6 +174,7 @@ def create_app():
     app.register_blueprint(exh_exhortos_respuestas_videos)
     app.register_blueprint(exh_externos)
     app.register_blueprint(exh_tipos_diligencias)
+    app.register_blueprint(expedientes_indices)
     app.register_blueprint(edictos)
     app.register_blueprint(edictos_acuses)
     app.register_blueprint(entradas_salidas)
@@ -203,6 +228,13 @@ def create_app():
     app.register_blueprint(usuarios_roles)
     app.register_blueprint(vsp_digitalizaciones)
 
+    # Activos con hash en el nombre y versiones comprimidas, servidos en /activos
+    registrar_activos(app)
+
+    # Fragmentos de la plantilla guardados en Redis
+    app.add_template_global(menu_principal)
+    app.add_template_global(tareas_en_progreso)
+
     # Inicializar extensiones
     extensions(app)
 
@@ -3,11 +3,13 @@ Abogados, modelos
 """
 
 from datetime import date
+from typing import Optional
 
 from sqlalchemy import String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from hercules.extensions import database
+from lib.nombres import columna_nombre_buscador, columna_nombre_fonetico, indices_nombres
 from lib.universal_mixin import UniversalMixin
 
 
@@ -17,6 +19,9 @@ class Abogado(database.Model, UniversalMixin):
     # Nombre de la tabla
     __tablename__ = "abogados"
 
+    # Índices para la búsqueda por nombre
+    __table_args__ = indices_nombres("abogados")
+
     # Clave primaria
     id: Mapped[int] = mapped_column(primary_key=True)
 
@@ -26,6 +31,10 @@ class Abogado(database.Model, UniversalMixin):
     libro: Mapped[str] = mapped_column(String(24))
     nombre: Mapped[str] = mapped_column(String(256))
 
+    # Columnas generadas para la búsqueda por nombre
+    nombre_buscador: Mapped[Optional[str]] = columna_nombre_buscador("nombre")
+    nombre_fonetico: Mapped[Optional[str]] = columna_nombre_fonetico("nombre")
+
     def __repr__(self):
         """Representación"""
         return f"<Abogado {self.id}>"
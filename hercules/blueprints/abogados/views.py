@@ -10,10 +10,11 @@ from flask_login import current_user, login_required
 from hercules.blueprints.abogados.forms import AbogadoForm
 from hercules.blueprints.abogados.models import Abogado
 from hercules.blueprints.bitacoras.models import Bitacora
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
+from lib.nombres import filtrar_por_nombre
 from lib.safe_string import safe_message, safe_string
 
 MODULO = "ABOGADOS"
@@ -48,7 +49,7 @@ def datatable_json():
     if "libro" in request.form:
         consulta = consulta.filter_by(libro=safe_string(request.form["libro"]))
     if "nombre" in request.form:
-        consulta = consulta.filter(Abogado.nombre.contains(safe_string(request.form["nombre"])))
+        consulta = filtrar_por_nombre(consulta, Abogado, safe_string(request.form["nombre"]))
     registros = consulta.order_by(Abogado.id.desc()).offset(start).limit(rows_per_page).all()
     total = consulta.count()
     # Elaborar datos para DataTable
@@ -113,7 +114,7 @@ def new():
         )
         abogado.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nuevo abogado registrado {abogado.nombre} con número {abogado.numero}"),
             url=url_for("abogados.detail", abogado_id=abogado.id),
@@ -137,7 +138,7 @@ def edit(abogado_id):
         abogado.fecha = form.fecha.data
         abogado.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Editado abogado registrado {abogado.nombre}"),
             url=url_for("abogados.detail", abogado_id=abogado.id),
@@ -160,7 +161,7 @@ def delete(abogado_id):
     if abogado.estatus == "A":
         abogado.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado abogado registrado {abogado.nombre}"),
             url=url_for("abogados.detail", abogado_id=abogado.id),
@@ -178,7 +179,7 @@ def recover(abogado_id):
     if abogado.estatus == "B":
         abogado.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado abogado registrado {abogado.nombre}"),
             url=url_for("abogados.detail", abogado_id=abogado.id),
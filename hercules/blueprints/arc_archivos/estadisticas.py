@@ -0,0 +1,140 @@
+"""
+Archivo - Archivo, estadísticas
+
+Las estadísticas de solicitudes y remesas se toman del cubo arc_estadisticas, con la
+cantidad por tipo, día, autoridad, archivista y estado. Los distritos y las instancias
+se obtienen de la autoridad, así cada pantalla agrupa unos cuantos cientos de renglones
+en lugar de recorrer arc_solicitudes y arc_remesas.
+
+El cubo se actualiza en el fondo, sólo se recalculan los días de los registros
+modificados desde la actualización anterior, programe cada pocos minutos
+
+    cli arc_archivos actualizar-estadisticas
+"""
+
+from datetime import datetime, timedelta
+
+from flask import current_app
+from redis.exceptions import RedisError
+from sqlalchemy import Date, cast, delete, distinct, func, literal, select
+
+from hercules.blueprints.arc_archivos.models import ArcEstadistica
+from hercules.blueprints.arc_remesas.models import ArcRemesa
+from hercules.blueprints.arc_solicitudes.models import ArcSolicitud
+from hercules.blueprints.autoridades.models import Autoridad
+from hercules.blueprints.distritos.models import Distrito
+from hercules.blueprints.usuarios.models import Usuario
+from hercules.extensions import database
+
+FUENTES = {
+    "solicitudes": ArcSolicitud,
+    "remesas": ArcRemesa,
+}
+
+# Estados que no se cuentan en los totales, distritos, instancias y archivistas
+ESTADOS_EXCLUIDOS = {
+    "solicitudes": ("CANCELADO",),
+    "remesas": ("CANCELADO", "PENDIENTE"),
+}
+
+LLAVE_ACTUALIZADO = "arc_estadisticas:actualizado"
+
+# Se vuelven a tomar los registros modificados en este margen antes de la marca, por las transacciones
+# que iniciaron antes de la actualización y terminaron después, su modificado es el inicio de la transacción
+MARGEN = timedelta(minutes=15)
+
+
+def _leer_actualizado() -> datetime | None:
+    """Tiempo de la actualización anterior, None si no hay o no se puede leer"""
+    try:
+        valor = current_app.redis.get(LLAVE_ACTUALIZADO)
+    except RedisError:
+        return None
+    return datetime.fromisoformat(valor.decode()) if valor else None
+
+
+def actualizar(completo: bool = False) -> int:
+    """Recalcular los días con registros modificados desde la actualización anterior, entrega la cantidad de renglones"""
+    actualizado = None if completo else _leer_actualizado()
+    cubo = ArcEstadistica.__table__
+    conexion = database.session.connection()
+    # La marca se toma del reloj de la base de datos, el mismo de la columna modificado
+    inicio = conexion.execute(select(func.localtimestamp())).scalar() - MARGEN
+    cantidad = 0
+    for tipo, modelo in FUENTES.items():
+        dia = cast(modelo.creado, Date)
+        borrar = delete(cubo).where(cubo.c.tipo == tipo)
+        consulta = select(literal(tipo), dia, modelo.autoridad_id, modelo.usuario_asignado_id, modelo.estado, func.count())
+        consulta = consulta.where(modelo.estatus == "A")
+        if actualizado is not None:
+            dias = select(distinct(dia)).where(modelo.modificado >= actualizado).scalar_subquery()
+            borrar = borrar.where(cubo.c.dia.in_(dias))
+            consulta = consulta.where(dia.in_(dias))
+        consulta = consulta.group_by(dia, modelo.autoridad_id, modelo.usuario_asignado_id, modelo.estado)
+        conexion.execute(borrar)
+        columnas = ["tipo", "dia", "autoridad_id", "usuario_asignado_id", "estado", "cantidad"]
+        cantidad += conexion.execute(cubo.insert().from_select(columnas, consulta)).rowcount
+    database.session.commit()
+    try:
+        current_app.redis.set(LLAVE_ACTUALIZADO, inicio.isoformat())
+    except RedisError:
+        pass  # La siguiente vez se toma la marca anterior y se recalculan más días
+    return cantidad
+
+
+def _rebanada(tipo: str, fecha_desde: str | None, fecha_hasta: str | None, excluir_estados: bool = True):
+    """Condiciones para tomar una rebanada del cubo por tipo y rango de días"""
+    condiciones = [ArcEstadistica.tipo == tipo]
+    if fecha_desde:
+        condiciones.append(ArcEstadistica.dia >= fecha_desde)
+    if fecha_hasta:
+        condiciones.append(ArcEstadistica.dia <= fecha_hasta)
+    if excluir_estados:
+        condiciones.append(ArcEstadistica.estado.notin_(ESTADOS_EXCLUIDOS[tipo]))
+    return condiciones
+
+
+def _cantidad():
+    """Suma de las cantidades de la rebanada"""
+    return func.sum(ArcEstadistica.cantidad).label("cantidad")
+
+
+def totales(tipo: str, fecha_desde, fecha_hasta) -> int:
+    """Cantidad total en el rango de días"""
+    consulta = database.session.query(func.coalesce(func.sum(ArcEstadistica.cantidad), 0))
+    return int(consulta.filter(*_rebanada(tipo, fecha_desde, fecha_hasta)).scalar())
+
+
+def por_distritos(tipo: str, fecha_desde, fecha_hasta):
+    """Consulta con las cantidades por distrito judicial"""
+    consulta = database.session.query(Distrito.nombre_corto.label("etiqueta"), _cantidad())
+    consulta = consulta.select_from(ArcEstadistica).join(Autoridad).join(Distrito)
+    consulta = consulta.filter(*_rebanada(tipo, fecha_desde, fecha_hasta))
+    consulta = consulta.filter(Distrito.es_distrito == True).filter(Distrito.es_distrito_judicial == True)
+    consulta = consulta.filter(Distrito.es_jurisdiccional == True).filter(Distrito.estatus == "A")
+    consulta = consulta.filter(Autoridad.estatus == "A")
+    return consulta.group_by(Distrito.nombre_corto).order_by(Distrito.nombre_corto)
+
+
+def por_instancias(tipo: str, fecha_desde, fecha_hasta):
+    """Consulta con las cantidades por instancia (autoridad solicitante)"""
+    consulta = database.session.query(Autoridad.clave.label("etiqueta"), _cantidad())
+    consulta = consulta.select_from(ArcEstadistica).join(Autoridad)
+    consulta = consulta.filter(*_rebanada(tipo, fecha_desde, fecha_hasta))
+    consulta = consulta.filter(Autoridad.es_archivo_solicitante == True).filter(Autoridad.estatus == "A")
+    return consulta.group_by(Autoridad.clave).order_by(Autoridad.clave)
+
+
+def por_archivistas(tipo: str, fecha_desde, fecha_hasta):
+    """Consulta con las cantidades por archivista asignado"""
+    consulta = database.session.query(Usuario.email.label("etiqueta"), _cantidad())
+    consulta = consulta.select_from(ArcEstadistica).join(Usuario)
+    consulta = consulta.filter(*_rebanada(tipo, fecha_desde, fecha_hasta)).filter(Usuario.estatus == "A")
+    return consulta.group_by(Usuario.email).order_by(Usuario.email)
+
+
+def por_estados(tipo: str, fecha_desde, fecha_hasta):
+    """Consulta con las cantidades por estado, incluyendo los cancelados y pendientes"""
+    consulta = database.session.query(ArcEstadistica.estado.label("etiqueta"), _cantidad())
+    consulta = consulta.filter(*_rebanada(tipo, fecha_desde, fecha_hasta, excluir_estados=False))
+    return consulta.group_by(ArcEstadistica.estado).order_by(ArcEstadistica.estado)
@@ -0,0 +1,31 @@
+"""
+Archivo - Archivo, modelos
+"""
+
+from datetime import date
+
+from sqlalchemy import Date, ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from hercules.extensions import database
+
+
+class ArcEstadistica(database.Model):
+    """ArcEstadistica, cubo con la cantidad de solicitudes o remesas por día, autoridad, archivista y estado"""
+
+    # Nombre de la tabla
+    __tablename__ = "arc_estadisticas"
+
+    # Clave primaria, las dimensiones del cubo
+    tipo: Mapped[str] = mapped_column(String(16), primary_key=True)  # solicitudes o remesas
+    dia: Mapped[date] = mapped_column(Date(), primary_key=True)
+    autoridad_id: Mapped[int] = mapped_column(ForeignKey("autoridades.id"), primary_key=True)
+    usuario_asignado_id: Mapped[int] = mapped_column(ForeignKey("usuarios.id"), primary_key=True)
+    estado: Mapped[str] = mapped_column(String(32), primary_key=True)
+
+    # Columnas
+    cantidad: Mapped[int] = mapped_column(default=0)
+
+    def __repr__(self):
+        """Representación"""
+        return f"<ArcEstadistica {self.tipo} {self.dia} {self.estado} {self.cantidad}>"
@@ -0,0 +1,30 @@
+"""
+Archivo - Archivo, tareas para ejecutar en el fondo
+"""
+
+import logging
+
+from hercules.app import create_app
+from hercules.blueprints.arc_archivos.estadisticas import actualizar
+from hercules.extensions import database
+
+# Bitácora logs/arc_archivos.log
+bitacora = logging.getLogger(__name__)
+bitacora.setLevel(logging.INFO)
+formato = logging.Formatter("%(asctime)s:%(levelname)s:%(message)s")
+empunadura = logging.FileHandler("logs/arc_archivos.log")
+empunadura.setFormatter(formato)
+bitacora.addHandler(empunadura)
+
+# Cargar la aplicación para tener acceso a la base de datos
+app = create_app()
+app.app_context().push()
+database.app = app
+
+
+def actualizar_estadisticas(completo: bool = False) -> str:
+    """Actualizar el cubo de estadísticas de solicitudes y remesas"""
+    cantidad = actualizar(completo)
+    mensaje = f"Se actualizaron {cantidad} renglones de las estadísticas del archivo"
+    bitacora.info(mensaje)
+    return mensaje
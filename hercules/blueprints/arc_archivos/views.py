@@ -6,10 +6,8 @@ import json
 from datetime import date
 from flask import Blueprint, flash, redirect, render_template, request, url_for, current_app
 from flask_login import current_user, login_required
-from sqlalchemy.sql.functions import count
-from hercules.extensions import database
-from sqlalchemy import func
 
+from lib.cache import cache_coalescente
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_string, safe_message
 
@@ -22,9 +20,8 @@ from hercules.blueprints.arc_solicitudes.models import ArcSolicitud
 
 from hercules.blueprints.arc_remesas.models import ArcRemesa
 from hercules.blueprints.distritos.models import Distrito
-from hercules.blueprints.autoridades.models import Autoridad
-from hercules.blueprints.usuarios.models import Usuario
 
+from hercules.blueprints.arc_archivos import estadisticas
 from hercules.blueprints.arc_archivos.forms import ArcEstadisticasDateRangeForm
 
 MODULO = "ARC ARCHIVOS"
@@ -355,14 +352,8 @@ def stats_solicitudes():
             fecha_desde, fecha_hasta = fecha_hasta, fecha_desde
         # Case para botones de reportes
         if "totales" in request.form:
-            # Cálculo de solicitudes totales
-            solicitudes = (
-                ArcSolicitud.query.filter(ArcSolicitud.creado >= fecha_desde)
-                .filter(ArcSolicitud.creado <= fecha_hasta)
-                .filter_by(estatus="A")
-                .filter(ArcSolicitud.estado != "CANCELADO")
-                .count()
-            )
+            # Cálculo de solicitudes totales con el cubo de estadísticas
+            solicitudes = estadisticas.totales("solicitudes", fecha_desde, fecha_hasta)
             return render_template(
                 "arc_archivos/stats_solicitudes_totales.jinja2",
                 fecha_desde=fecha_desde,
@@ -435,15 +426,8 @@ def stats_remesas():
             fecha_desde, fecha_hasta = fecha_hasta, fecha_desde
         # Case para botones de reportes
         if "totales" in request.form:
-            # Cálculo de solicitudes totales
-            remesas = (
-                ArcRemesa.query.filter(ArcRemesa.creado >= fecha_desde)
-                .filter(ArcRemesa.creado <= fecha_hasta)
-                .filter_by(estatus="A")
-                .filter(ArcRemesa.estado != "CANCELADO")
-                .filter(ArcRemesa.estado != "PENDIENTE")
-                .count()
-            )
+            # Cálculo de remesas totales con el cubo de estadísticas
+            remesas = estadisticas.totales("remesas", fecha_desde, fecha_hasta)
             return render_template(
                 "arc_archivos/stats_remesas_totales.jinja2",
                 fecha_desde=fecha_desde,
@@ -503,31 +487,13 @@ def stats_remesas():
 
 
 @arc_archivos.route("/arc_archivos/datatable_json_solicitudes_por_distrito", methods=["GET", "POST"])
+@cache_coalescente(fresco=300, rancio=3600, alcance="publico")
 def datatable_json_solicitudes_por_distrito():
-    """DataTable JSON para listado de solicitudes y remesas por distrito"""
+    """DataTable JSON para listado de solicitudes por distrito"""
     # Tomar parámetros de Datatables
     draw, start, rows_per_page = get_datatable_parameters()
-    # SQLAlchemy database session
-    consulta = database.session.query((Distrito.nombre_corto).label("distritos"), func.count(Distrito.id).label("solicitudes"))
-    # Consultar
-    consulta = consulta.select_from(Autoridad).join(ArcSolicitud).join(Distrito)
-    consulta = (
-        consulta.filter(Distrito.es_distrito == True)
-        .filter(Distrito.es_distrito_judicial == True)
-        .filter(Distrito.es_jurisdiccional == True)
-    )
-    if "fecha_desde" in request.form:
-        consulta = consulta.filter(ArcSolicitud.creado >= request.form["fecha_desde"])
-    if "fecha_hasta" in request.form:
-        consulta = consulta.filter(ArcSolicitud.creado <= request.form["fecha_hasta"])
-    consulta = (
-        consulta.filter(Autoridad.estatus == "A")
-        .filter(ArcSolicitud.estatus == "A")
-        .filter(Distrito.estatus == "A")
-        .filter(ArcSolicitud.estado != "CANCELADO")
-    )
-    consulta = consulta.group_by(Distrito.nombre_corto)
-    consulta = consulta.order_by(Distrito.nombre_corto)
+    # Consultar el cubo de estadísticas
+    consulta = estadisticas.por_distritos("solicitudes", request.form.get("fecha_desde"), request.form.get("fecha_hasta"))
     resultado = consulta.offset(start).limit(rows_per_page).all()
     total = consulta.count()
     # Elaborar datos para DataTable
@@ -535,8 +501,8 @@ def datatable_json_solicitudes_por_distrito():
     for registro in resultado:
         data.append(
             {
-                "distritos": registro.distritos,
-                "solicitudes": registro.solicitudes,
+                "distritos": registro.etiqueta,
+                "solicitudes": int(registro.cantidad),
             }
         )
     # Entregar JSON
@@ -544,31 +510,13 @@ def datatable_json_solicitudes_por_distrito():
 
 
 @arc_archivos.route("/arc_archivos/datatable_json_remesas_por_distrito", methods=["GET", "POST"])
+@cache_coalescente(fresco=300, rancio=3600, alcance="publico")
 def datatable_json_remesas_por_distrito():
-    """DataTable JSON para listado de remesas y remesas por distrito"""
+    """DataTable JSON para listado de remesas por distrito"""
     # Tomar parámetros de Datatables
     draw, start, rows_per_page = get_datatable_parameters()
-    # SQLAlchemy database session
-    consulta = database.session.query((Distrito.nombre_corto).label("distritos"), func.count(Distrito.id).label("remesas"))
-    # Consultar
-    consulta = consulta.select_from(Autoridad).join(ArcRemesa).join(Distrito)
-    consulta = (
-        consulta.filter(Distrito.es_distrito == True)
-        .filter(Distrito.es_distrito_judicial == True)
-        .filter(Distrito.es_jurisdiccional == True)
-    )
-    if "fecha_desde" in request.form:
-        consulta = consulta.filter(ArcRemesa.creado >= request.form["fecha_desde"])
-    if "fecha_hasta" in request.form:
-        consulta = consulta.filter(ArcRemesa.creado <= request.form["fecha_hasta"])
-    consulta = (
-        consulta.filter(Autoridad.estatus == "A")
-        .filter(ArcRemesa.estatus == "A")
-        .filter(ArcRemesa.estado != "CANCELADO")
-        .filter(ArcRemesa.estado != "PENDIENTE")
-    )
-    consulta = consulta.group_by(Distrito.nombre_corto)
-    consulta = consulta.order_by(Distrito.nombre_corto)
+    # Consultar el cubo de estadísticas
+    consulta = estadisticas.por_distritos("remesas", request.form.get("fecha_desde"), request.form.get("fecha_hasta"))
     resultado = consulta.offset(start).limit(rows_per_page).all()
     total = consulta.count()
     # Elaborar datos para DataTable
@@ -576,8 +524,8 @@ def datatable_json_remesas_por_distrito():
     for registro in resultado:
         data.append(
             {
-                "distritos": registro.distritos,
-                "remesas": registro.remesas,
+                "distritos": registro.etiqueta,
+                "remesas": int(registro.cantidad),
             }
         )
     # Entregar JSON
@@ -585,22 +533,13 @@ def datatable_json_remesas_por_distrito():
 
 
 @arc_archivos.route("/arc_archivos/datatable_json_solicitudes_por_instancias", methods=["GET", "POST"])
+@cache_coalescente(fresco=300, rancio=3600, alcance="publico")
 def datatable_json_solicitudes_por_instancias():
-    """DataTable JSON para listado de solicitudes y remesas por instancias"""
+    """DataTable JSON para listado de solicitudes por instancias"""
     # Tomar parámetros de Datatables
     draw, start, rows_per_page = get_datatable_parameters()
-    # SQLAlchemy database session
-    consulta = database.session.query((Autoridad.clave).label("juzgados"), func.count(Autoridad.id).label("solicitudes"))
-    # Consultar
-    consulta = consulta.select_from(Autoridad).join(ArcSolicitud)
-    consulta = consulta.filter(Autoridad.es_archivo_solicitante == True).filter(Autoridad.estatus == "A")
-    if "fecha_desde" in request.form:
-        consulta = consulta.filter(ArcSolicitud.creado >= request.form["fecha_desde"])
-    if "fecha_hasta" in request.form:
-        consulta = consulta.filter(ArcSolicitud.creado <= request.form["fecha_hasta"])
-    consulta = consulta.filter(ArcSolicitud.estatus == "A").filter(ArcSolicitud.estado != "CANCELADO")
-    consulta = consulta.group_by(Autoridad.clave)
-    consulta = consulta.order_by(Autoridad.clave)
+    # Consultar el cubo de estadísticas
+    consulta = estadisticas.por_instancias("solicitudes", request.form.get("fecha_desde"), request.form.get("fecha_hasta"))
     resultado = consulta.offset(start).limit(rows_per_page).all()
     total = consulta.count()
     # Elaborar datos para DataTable
@@ -608,8 +547,8 @@ def datatable_json_solicitudes_por_instancias():
     for registro in resultado:
         data.append(
             {
-                "instancias": registro.juzgados,
-                "solicitudes": registro.solicitudes,
+                "instancias": registro.etiqueta,
+                "solicitudes": int(registro.cantidad),
             }
         )
     # Entregar JSON
@@ -617,33 +556,13 @@ def datatable_json_solicitudes_por_instancias():
 
 
 @arc_archivos.route("/arc_archivos/datatable_json_remesas_por_instancias", methods=["GET", "POST"])
+@cache_coalescente(fresco=300, rancio=3600, alcance="publico")
 def datatable_json_remesas_por_instancias():
-    """DataTable JSON para listado de remesas y remesas por instancias"""
+    """DataTable JSON para listado de remesas por instancias"""
     # Tomar parámetros de Datatables
     draw, start, rows_per_page = get_datatable_parameters()
-    # SQLAlchemy database session
-    # database = current_app.extensions["sqlalchemy"].db.session
-    # Dos columnas en la consulta
-    # consulta = database.query(
-    #     Autoridad.clave.label("juzgados"),
-    #     count("*").label("remesas"),
-    # )
-    consulta = database.session.query((Autoridad.clave.label("juzgados")), func.count(Autoridad.id).label("remesas"))
-    # Consultar
-    consulta = consulta.select_from(Autoridad).join(ArcRemesa)
-    consulta = consulta.filter(Autoridad.es_archivo_solicitante == True).filter(Autoridad.estatus == "A")
-    if "fecha_desde" in request.form:
-        consulta = consulta.filter(ArcRemesa.creado >= request.form["fecha_desde"])
-    if "fecha_hasta" in request.form:
-        consulta = consulta.filter(ArcRemesa.creado <= request.form["fecha_hasta"])
-    consulta = (
-        consulta.filter(ArcRemesa.estatus == "A")
-        .filter(ArcRemesa.estatus == "A")
-        .filter(ArcRemesa.estado != "CANCELADO")
-        .filter(ArcRemesa.estado != "PENDIENTE")
-    )
-    consulta = consulta.group_by(Autoridad.clave)
-    consulta = consulta.order_by(Autoridad.clave)
+    # Consultar el cubo de estadísticas
+    consulta = estadisticas.por_instancias("remesas", request.form.get("fecha_desde"), request.form.get("fecha_hasta"))
     resultado = consulta.offset(start).limit(rows_per_page).all()
     total = consulta.count()
     # Elaborar datos para DataTable
@@ -651,8 +570,8 @@ def datatable_json_remesas_por_instancias():
     for registro in resultado:
         data.append(
             {
-                "instancias": registro.juzgados,
-                "remesas": registro.remesas,
+                "instancias": registro.etiqueta,
+                "remesas": int(registro.cantidad),
             }
         )
     # Entregar JSON
@@ -660,22 +579,13 @@ def datatable_json_remesas_por_instancias():
 
 
 @arc_archivos.route("/arc_archivos/datatable_json_solicitudes_por_archivistas", methods=["GET", "POST"])
+@cache_coalescente(fresco=300, rancio=3600, alcance="publico")
 def datatable_json_solicitudes_por_archivistas():
-    """DataTable JSON para listado de solicitudes y remesas por archivistas"""
+    """DataTable JSON para listado de solicitudes por archivistas"""
     # Tomar parámetros de Datatables
     draw, start, rows_per_page = get_datatable_parameters()
-    # SQLAlchemy database session
-    consulta = database.session.query((Usuario.email).label("archivistas"), func.count(Usuario.id).label("solicitudes"))
-    # Consultar
-    consulta = consulta.select_from(Usuario).join(ArcSolicitud, Usuario.id == ArcSolicitud.usuario_asignado_id)
-    consulta = consulta.filter(Usuario.estatus == "A")
-    if "fecha_desde" in request.form:
-        consulta = consulta.filter(ArcSolicitud.creado >= request.form["fecha_desde"])
-    if "fecha_hasta" in request.form:
-        consulta = consulta.filter(ArcSolicitud.creado <= request.form["fecha_hasta"])
-    consulta = consulta.filter(ArcSolicitud.estatus == "A").filter(ArcSolicitud.estado != "CANCELADO")
-    consulta = consulta.group_by(Usuario.email)
-    consulta = consulta.order_by(Usuario.email)
+    # Consultar el cubo de estadísticas
+    consulta = estadisticas.por_archivistas("solicitudes", request.form.get("fecha_desde"), request.form.get("fecha_hasta"))
     resultado = consulta.offset(start).limit(rows_per_page).all()
     total = consulta.count()
     # Elaborar datos para DataTable
@@ -683,8 +593,8 @@ def datatable_json_solicitudes_por_archivistas():
     for registro in resultado:
         data.append(
             {
-                "archivistas": registro.archivistas,
-                "solicitudes": registro.solicitudes,
+                "archivistas": registro.etiqueta,
+                "solicitudes": int(registro.cantidad),
             }
         )
     # Entregar JSON
@@ -692,21 +602,13 @@ def datatable_json_solicitudes_por_archivistas():
 
 
 @arc_archivos.route("/arc_archivos/datatable_json_solicitudes_por_estados", methods=["GET", "POST"])
+@cache_coalescente(fresco=300, rancio=3600, alcance="publico")
 def datatable_json_solicitudes_por_estados():
-    """DataTable JSON para listado de solicitudes y remesas por estados"""
+    """DataTable JSON para listado de solicitudes por estados"""
     # Tomar parámetros de Datatables
     draw, start, rows_per_page = get_datatable_parameters()
-    # SQLAlchemy database session
-    consulta = database.session.query((ArcSolicitud.estado).label("estados"), func.count(ArcSolicitud.id).label("solicitudes"))
-    # Consultar
-    consulta = consulta.select_from(ArcSolicitud)
-    if "fecha_desde" in request.form:
-        consulta = consulta.filter(ArcSolicitud.creado >= request.form["fecha_desde"])
-    if "fecha_hasta" in request.form:
-        consulta = consulta.filter(ArcSolicitud.creado <= request.form["fecha_hasta"])
-    consulta = consulta.filter(ArcSolicitud.estatus == "A")
-    consulta = consulta.group_by(ArcSolicitud.estado)
-    consulta = consulta.order_by(ArcSolicitud.estado)
+    # Consultar el cubo de estadísticas
+    consulta = estadisticas.por_estados("solicitudes", request.form.get("fecha_desde"), request.form.get("fecha_hasta"))
     resultado = consulta.offset(start).limit(rows_per_page).all()
     total = consulta.count()
     # Elaborar datos para DataTable
@@ -714,8 +616,8 @@ def datatable_json_solicitudes_por_estados():
     for registro in resultado:
         data.append(
             {
-                "estados": registro.estados,
-                "solicitudes": registro.solicitudes,
+                "estados": registro.etiqueta,
+                "solicitudes": int(registro.cantidad),
             }
         )
     # Entregar JSON
@@ -723,27 +625,13 @@ def datatable_json_solicitudes_por_estados():
 
 
 @arc_archivos.route("/arc_archivos/datatable_json_remesas_por_archivistas", methods=["GET", "POST"])
+@cache_coalescente(fresco=300, rancio=3600, alcance="publico")
 def datatable_json_remesas_por_archivistas():
-    """DataTable JSON para listado de remesas y remesas por archivistas"""
+    """DataTable JSON para listado de remesas por archivistas"""
     # Tomar parámetros de Datatables
     draw, start, rows_per_page = get_datatable_parameters()
-    # SQLAlchemy database session
-    consulta = database.session.query((Usuario.email).label("archivistas"), func.count(Usuario.id).label("remesas"))
-    # Consultar
-    consulta = consulta.select_from(Usuario).join(ArcRemesa, Usuario.id == ArcRemesa.usuario_asignado_id)
-    consulta = consulta.filter(Usuario.estatus == "A")
-    if "fecha_desde" in request.form:
-        consulta = consulta.filter(ArcRemesa.creado >= request.form["fecha_desde"])
-    if "fecha_hasta" in request.form:
-        consulta = consulta.filter(ArcRemesa.creado <= request.form["fecha_hasta"])
-    consulta = (
-        consulta.filter(ArcRemesa.estatus == "A")
-        .filter(ArcRemesa.estatus == "A")
-        .filter(ArcRemesa.estado != "CANCELADO")
-        .filter(ArcRemesa.estado != "PENDIENTE")
-    )
-    consulta = consulta.group_by(Usuario.email)
-    consulta = consulta.order_by(Usuario.email)
+    # Consultar el cubo de estadísticas
+    consulta = estadisticas.por_archivistas("remesas", request.form.get("fecha_desde"), request.form.get("fecha_hasta"))
     resultado = consulta.offset(start).limit(rows_per_page).all()
     total = consulta.count()
     # Elaborar datos para DataTable
@@ -751,8 +639,8 @@ def datatable_json_remesas_por_archivistas():
     for registro in resultado:
         data.append(
             {
-                "archivistas": registro.archivistas,
-                "remesas": registro.remesas,
+                "archivistas": registro.etiqueta,
+                "remesas": int(registro.cantidad),
             }
         )
     # Entregar JSON
@@ -760,21 +648,13 @@ def datatable_json_remesas_por_archivistas():
 
 
 @arc_archivos.route("/arc_archivos/datatable_json_remesas_por_estados", methods=["GET", "POST"])
+@cache_coalescente(fresco=300, rancio=3600, alcance="publico")
 def datatable_json_remesas_por_estados():
-    """DataTable JSON para listado de remesas y remesas por estados"""
+    """DataTable JSON para listado de remesas por estados"""
     # Tomar parámetros de Datatables
     draw, start, rows_per_page = get_datatable_parameters()
-    # SQLAlchemy database session
-    consulta = database.session.query((ArcRemesa.estado).label("estados"), func.count(ArcRemesa.id).label("remesas"))
-    # Consultar
-    consulta = consulta.select_from(ArcRemesa)
-    if "fecha_desde" in request.form:
-        consulta = consulta.filter(ArcRemesa.creado >= request.form["fecha_desde"])
-    if "fecha_hasta" in request.form:
-        consulta = consulta.filter(ArcRemesa.creado <= request.form["fecha_hasta"])
-    consulta = consulta.filter(ArcRemesa.estatus == "A").filter(ArcRemesa.estatus == "A")
-    consulta = consulta.group_by(ArcRemesa.estado)
-    consulta = consulta.order_by(ArcRemesa.estado)
+    # Consultar el cubo de estadísticas
+    consulta = estadisticas.por_estados("remesas", request.form.get("fecha_desde"), request.form.get("fecha_hasta"))
     resultado = consulta.offset(start).limit(rows_per_page).all()
     total = consulta.count()
     # Elaborar datos para DataTable
@@ -782,8 +662,8 @@ def datatable_json_remesas_por_estados():
     for registro in resultado:
         data.append(
             {
-                "estados": registro.estados,
-                "remesas": registro.remesas,
+                "estados": registro.etiqueta,
+                "remesas": int(registro.cantidad),
             }
         )
     # Entregar JSON
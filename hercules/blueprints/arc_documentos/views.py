@@ -9,13 +9,16 @@ from flask import Blueprint, flash, redirect, render_template, request, url_for,
 from flask_login import current_user, login_required
 from datetime import date
 from dotenv import load_dotenv
-from sqlalchemy import or_
+from sqlalchemy import literal, or_, select
 
+from lib.acciones_masivas import AccionMasiva, ejecutar as ejecutar_accion_masiva, separar_ids
+from lib.acciones_masivas import registrar as registrar_accion_masiva
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
+from lib.exceptions import MyNotValidParamError
 from lib.safe_string import safe_string, safe_message, safe_expediente, extract_expediente_num, extract_expediente_anio
 
 from hercules.blueprints.bitacoras.models import Bitacora
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
 from hercules.blueprints.arc_documentos.models import ArcDocumento
@@ -24,6 +27,7 @@ from hercules.blueprints.arc_documentos_bitacoras.models import ArcDocumentoBita
 from hercules.blueprints.arc_documentos_tipos.models import ArcDocumentoTipo
 from hercules.blueprints.arc_juzgados_extintos.models import ArcJuzgadoExtinto
 from hercules.blueprints.arc_solicitudes.models import ArcSolicitud
+from hercules.blueprints.expedientes_indices.fuentes import sincronizar_ids
 
 
 from hercules.blueprints.arc_documentos.forms import (
@@ -49,6 +53,33 @@ DATAWAREHOUSE_ANIO_SAJI = 2025
 arc_documentos = Blueprint("arc_documentos", __name__, template_folder="templates")
 
 
+def _al_actualizar_en_lote(conexion, accion, ids, usuario_id):
+    """Añadir la acción a la bitácora de cada documento y sincronizar el índice de expedientes"""
+    tabla = ArcDocumento.__table__
+    consulta = select(
+        tabla.c.id,
+        literal(usuario_id),
+        tabla.c.fojas,
+        literal("ELIMINADO" if accion == "eliminar" else "RECUPERADO"),
+        literal("Acción masiva"),
+    ).where(tabla.c.id.in_(ids))
+    columnas = ["arc_documento_id", "usuario_id", "fojas", "accion", "observaciones"]
+    conexion.execute(ArcDocumentoBitacora.__table__.insert().from_select(columnas, consulta))
+    sincronizar_ids(conexion, "arc_documentos", ids)
+
+
+# Acciones masivas, sólo eliminar y recuperar porque la ubicación cambia con las remesas y solicitudes
+registrar_accion_masiva(
+    AccionMasiva(
+        modelo=ArcDocumento,
+        modulo=MODULO,
+        etiqueta="Expedientes",
+        al_actualizar=_al_actualizar_en_lote,
+        otras_tablas=("arc_documentos_bitacoras", "expedientes_indices"),
+    )
+)
+
+
 @arc_documentos.before_request
 @login_required
 @permission_required(MODULO, Permiso.VER)
@@ -56,51 +87,57 @@ def before_request():
     """Permiso por defecto"""
 
 
-@arc_documentos.route("/arc_documentos/datatable_json", methods=["GET", "POST"])
-def datatable_json():
-    """DataTable JSON para listado de Documentos"""
-    # Tomar parámetros de Datatables
-    draw, start, rows_per_page = get_datatable_parameters()
-    # Consultar
+def _consultar(form):
+    """Consultar con los filtros del listado, para el DataTable y las acciones masivas"""
     consulta = ArcDocumento.query
     # Primero filtrar por columnas propias
-    if "estatus" in request.form:
-        consulta = consulta.filter(ArcDocumento.estatus == request.form["estatus"])
+    if "estatus" in form:
+        consulta = consulta.filter(ArcDocumento.estatus == form["estatus"])
     else:
         consulta = consulta.filter(ArcDocumento.estatus == "A")
-    if "expediente" in request.form:
-        if request.form["expediente"].isnumeric():
-            consulta = consulta.filter(ArcDocumento.expediente.contains(request.form["expediente"]))
+    if "expediente" in form:
+        if form["expediente"].isnumeric():
+            consulta = consulta.filter(ArcDocumento.expediente.contains(form["expediente"]))
         else:
-            consulta = consulta.filter_by(expediente=safe_expediente(request.form["expediente"]))
-    if "juicio" in request.form:
-        juicio = safe_string(request.form["juicio"], save_enie=True)
+            consulta = consulta.filter_by(expediente=safe_expediente(form["expediente"]))
+    if "juicio" in form:
+        juicio = safe_string(form["juicio"], save_enie=True)
         consulta = consulta.filter(ArcDocumento.juicio.contains(juicio))
-    if "partes" in request.form:
+    if "partes" in form:
         consulta = consulta.filter(
             or_(
-                ArcDocumento.actor.contains(safe_string(request.form["partes"], save_enie=True)),
-                ArcDocumento.demandado.contains(safe_string(request.form["partes"], save_enie=True)),
+                ArcDocumento.actor.contains(safe_string(form["partes"], save_enie=True)),
+                ArcDocumento.demandado.contains(safe_string(form["partes"], save_enie=True)),
             )
         )
-    if "tipo" in request.form:
-        consulta = consulta.filter_by(arc_documento_tipo_id=int(request.form["tipo"]))
-    if "ubicacion" in request.form:
-        consulta = consulta.filter_by(ubicacion=request.form["ubicacion"])
-    if "juzgado_id" in request.form:
-        consulta = consulta.filter_by(autoridad_id=int(request.form["juzgado_id"]))
-    if "juzgado_extinto_id" in request.form:
-        consulta = consulta.filter_by(arc_juzgado_origen_id=int(request.form["juzgado_extinto_id"]))
-    if "juzgado_extinto_clave" in request.form:
-        consulta = consulta.filter(ArcDocumento.arc_juzgados_origen_claves.contains(request.form["juzgado_extinto_clave"]))
+    if "tipo" in form:
+        consulta = consulta.filter_by(arc_documento_tipo_id=int(form["tipo"]))
+    if "ubicacion" in form:
+        consulta = consulta.filter_by(ubicacion=form["ubicacion"])
+    if "juzgado_id" in form:
+        consulta = consulta.filter_by(autoridad_id=int(form["juzgado_id"]))
+    if "juzgado_extinto_id" in form:
+        consulta = consulta.filter_by(arc_juzgado_origen_id=int(form["juzgado_extinto_id"]))
+    if "juzgado_extinto_clave" in form:
+        consulta = consulta.filter(ArcDocumento.arc_juzgados_origen_claves.contains(form["juzgado_extinto_clave"]))
     # Luego filtrar por columnas de otras tablas
-    if "distrito_id" in request.form:
-        distrito_id = int(request.form["distrito_id"])
+    if "distrito_id" in form:
+        distrito_id = int(form["distrito_id"])
         consulta = consulta.join(Autoridad)
         consulta = consulta.filter(Autoridad.distrito_id == distrito_id)
-    if "sede" in request.form:
+    if "sede" in form:
         consulta = consulta.join(Autoridad)
-        consulta = consulta.filter(Autoridad.sede == request.form["sede"])
+        consulta = consulta.filter(Autoridad.sede == form["sede"])
+    return consulta
+
+
+@arc_documentos.route("/arc_documentos/datatable_json", methods=["GET", "POST"])
+def datatable_json():
+    """DataTable JSON para listado de Documentos"""
+    # Tomar parámetros de Datatables
+    draw, start, rows_per_page = get_datatable_parameters()
+    # Consultar
+    consulta = _consultar(request.form)
     # Definir un set con los campos
     set_campos = {"expediente", "juicio", "partes", "tipo", "ubicacion", "juzgado_extinto_id", "distrito_id", "sede"}
     # Si se filtra por cualquiera de los campos mencionado, el orden es por número de expediente
@@ -351,7 +388,7 @@ def new():
             )
             documento_bitacora.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Alta de Documento {documento.id}"),
                 url=url_for("arc_documentos.detail", documento_id=documento.id),
@@ -478,7 +515,7 @@ def edit(arc_documento_id):
             documento_bitacora.save()
             documento.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Edición de Documento {documento.id}"),
                 url=url_for("arc_documentos.detail", documento_id=documento.id),
@@ -640,7 +677,7 @@ def delete(arc_documento_id):
     if arc_documento.estatus == "A":
         arc_documento.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Expediente {arc_documento.id}"),
             url=url_for("arc_documentos.detail", documento_id=arc_documento.id),
@@ -664,7 +701,7 @@ def recover(arc_documento_id):
     if arc_documento.estatus == "B":
         arc_documento.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado el Expediente {arc_documento.id}"),
             url=url_for("arc_documentos.detail", documento_id=arc_documento.id),
@@ -678,3 +715,22 @@ def recover(arc_documento_id):
         ).save()
         flash(bitacora.descripcion, "success")
     return redirect(url_for("arc_documentos.detail", documento_id=arc_documento.id))
+
+
+@arc_documentos.route("/arc_documentos/acciones_masivas", methods=["POST"])
+@permission_required(MODULO, Permiso.MODIFICAR)
+def bulk_action():
+    """Eliminar o recuperar los Expedientes seleccionados o todos los filtrados"""
+    if request.form.get("todos") == "1":
+        ids = [renglon.id for renglon in _consultar(request.form).with_entities(ArcDocumento.id)]
+    else:
+        ids = separar_ids(request.form.get("ids", ""))
+    try:
+        mensaje = ejecutar_accion_masiva(
+            "arc_documentos", request.form.get("accion", ""), ids, url_for("arc_documentos.list_active")
+        )
+    except MyNotValidParamError as error:
+        flash(str(error), "warning")
+        return redirect(url_for("arc_documentos.list_active"))
+    flash(mensaje, "success")
+    return redirect(url_for("arc_documentos.list_active"))
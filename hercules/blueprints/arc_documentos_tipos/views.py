@@ -6,11 +6,11 @@ import json
 from flask import Blueprint, flash, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
 
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_string, safe_message
 
 from hercules.blueprints.bitacoras.models import Bitacora
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
 from hercules.blueprints.arc_documentos_tipos.models import ArcDocumentoTipo
@@ -111,7 +111,7 @@ def new():
         arc_documento_tipo = ArcDocumentoTipo(nombre=nombre)
         arc_documento_tipo.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nuevo Archivo - Tipo de Documento {arc_documento_tipo.nombre}"),
             url=url_for("arc_documentos_tipos.detail", arc_documento_tipo_id=arc_documento_tipo.id),
@@ -139,7 +139,7 @@ def edit(arc_documento_tipo_id):
         arc_documento_tipo.nombre = nombre
         arc_documento_tipo.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Editado Archivo - Tipo Documento {arc_documento_tipo.nombre}"),
             url=url_for("arc_documentos_tipos.detail", arc_documento_tipo_id=arc_documento_tipo.id),
@@ -159,7 +159,7 @@ def delete(arc_documento_tipo_id):
     if arc_documento_tipo.estatus == "A":
         arc_documento_tipo.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Archivo - Tipo de Documento {arc_documento_tipo.nombre}"),
             url=url_for("arc_documentos_tipos.detail", arc_documento_tipo_id=arc_documento_tipo.id),
@@ -177,7 +177,7 @@ def recover(arc_documento_tipo_id):
     if arc_documento_tipo.estatus == "B":
         arc_documento_tipo.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Archivo - Tipo de Documento {arc_documento_tipo.nombre}"),
             url=url_for("arc_documentos_tipos.detail", arc_documento_tipo_id=arc_documento_tipo.id),
@@ -6,11 +6,11 @@ import json
 from flask import Blueprint, flash, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
 
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_string, safe_message, safe_clave
 
 from hercules.blueprints.bitacoras.models import Bitacora
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
 from hercules.blueprints.arc_juzgados_extintos.models import ArcJuzgadoExtinto
@@ -133,7 +133,7 @@ def new():
             )
             arc_juzgado_extinto.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Nuevo Juzgado Extinto {arc_juzgado_extinto.clave}"),
                 url=url_for("arc_juzgados_extintos.detail", arc_juzgado_extinto_id=arc_juzgado_extinto.id),
@@ -162,7 +162,7 @@ def edit(arc_juzgado_extinto_id):
             arc_juzgado_extinto.descripcion = safe_string(form.descripcion.data, save_enie=True)
             arc_juzgado_extinto.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Editado Juzgado Extinto {arc_juzgado_extinto.clave}"),
                 url=url_for("arc_juzgados_extintos.detail", arc_juzgado_extinto_id=arc_juzgado_extinto.id),
@@ -186,7 +186,7 @@ def delete(arc_juzgado_extinto_id):
     if arc_juzgado_extinto.estatus == "A":
         arc_juzgado_extinto.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Juzgado Extinto {arc_juzgado_extinto.clave}"),
             url=url_for("arc_juzgados_extintos.detail", arc_juzgado_extinto_id=arc_juzgado_extinto.id),
@@ -204,7 +204,7 @@ def recover(arc_juzgado_extinto_id):
     if arc_juzgado_extinto.estatus == "B":
         arc_juzgado_extinto.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Juzgado Extinto {arc_juzgado_extinto.clave}"),
             url=url_for("arc_juzgados_extintos.detail", arc_juzgado_extinto_id=arc_juzgado_extinto.id),
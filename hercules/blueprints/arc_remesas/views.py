@@ -9,12 +9,12 @@ from flask_login import current_user, login_required
 from sqlalchemy import or_
 from sqlalchemy import func
 
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_string, safe_message, safe_expediente, extract_expediente_anio
 
 from hercules.extensions import database
 from hercules.blueprints.bitacoras.models import Bitacora
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
 from hercules.blueprints.arc_remesas.models import ArcRemesa
@@ -438,7 +438,7 @@ def new():
             ).save()
             # Guardado de registro en bitacora del sistema
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Nueva Remesa creada {remesa.id}"),
                 url=url_for("arc_archivos.list_active"),
@@ -662,7 +662,7 @@ def send(remesa_id):
     ).save()
     # Guardado de registro en bitacora del sistema
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_id=obtener_modulo_id(MODULO),
         usuario=current_user,
         descripcion=safe_message(f"Remesa enviada {remesa.id}"),
         url=url_for("arc_archivos.list_active"),
@@ -971,7 +971,7 @@ def complete(remesa_id):
         ).save()
     # Guardado de registro en bitacora del sistema
     Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_id=obtener_modulo_id(MODULO),
         usuario=current_user,
         descripcion=safe_message(f"Remesa Archivada: {remesa.id}"),
         url=url_for("arc_archivos.list_active"),
@@ -7,12 +7,12 @@ from flask import Blueprint, flash, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
 from sqlalchemy import text
 
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_string, safe_message
 
 from hercules.extensions import database
 from hercules.blueprints.bitacoras.models import Bitacora
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
 from hercules.blueprints.arc_remesas_documentos.models import ArcRemesaDocumento
@@ -359,7 +359,7 @@ def archive(arc_remesa_documento_id):
                 documento_bitacora.save()
                 # Añadir acción a la bitácora del sistema
                 bitacora = Bitacora(
-                    modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                    modulo_id=obtener_modulo_id(MODULO),
                     usuario=current_user,
                     descripcion=safe_message(f"Documento {documento.id} Archivado con Anomalía."),
                     url=url_for("arc_archivos.list_active"),
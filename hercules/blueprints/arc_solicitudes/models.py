@@ -5,7 +5,7 @@ Archivo - Solicitudes, modelos
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, JSON, Integer, String, Text, Uuid
+from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Index, JSON, Integer, String, Text, Uuid
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql.functions import now
 
@@ -35,6 +35,9 @@ class ArcSolicitud(database.Model, UniversalMixin):
     # Nombre de la tabla
     __tablename__ = "arc_solicitudes"
 
+    # Índice para actualizar las estadísticas del archivo con los registros modificados
+    __table_args__ = (Index("arc_solicitudes_modificado", "modificado"),)
+
     # Clave primaria
     id: Mapped[int] = mapped_column(primary_key=True)
 
@@ -7,6 +7,7 @@ from datetime import datetime
 from flask import Blueprint, flash, redirect, render_template, request, url_for, abort
 from flask_login import current_user, login_required
 
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_string, safe_message, safe_expediente
 
@@ -16,7 +17,6 @@ from hercules.blueprints.arc_solicitudes.models import ArcSolicitud
 from hercules.blueprints.arc_documentos.models import ArcDocumento
 from hercules.blueprints.arc_documentos_bitacoras.models import ArcDocumentoBitacora
 from hercules.blueprints.bitacoras.models import Bitacora
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
 from hercules.blueprints.autoridades.models import Autoridad
@@ -345,7 +345,7 @@ def new(documento_id):
         ).save()
         # Añadir acción a la bitácora del Sistema
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nueva Solicitud de Documento {solicitud.id}"),
             url=url_for("arc_archivos.list_active"),
@@ -402,7 +402,7 @@ def assign(solicitud_id):
             ).save()
             # Añadir acción a la bitácora del Sistem
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Nueva Asignación de Archivista a Solicitud {solicitud.id}"),
                 url=url_for("arc_archivos.list_active"),
@@ -437,7 +437,7 @@ def cancel(solicitud_id):
         ).save()
         # Añadir acción a la bitácora del Sistema
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Se ha cancelado con éxito la Solicitud: {solicitud.id}"),
             url=url_for("arc_archivos.list_active"),
@@ -472,7 +472,7 @@ def history(solicitud_id):
         ).save()
         # Añadir acción a la bitácora del Sistema
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Solicitud {solicitud.id} pasada al Historial."),
             url=url_for("arc_archivos.list_active"),
@@ -526,7 +526,7 @@ def found(solicitud_id):
         # Añadir acción a la bitácora del Sistema
         solicitud.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Solicitud Encontrada {solicitud.id}"),
             url=url_for("arc_archivos.list_active"),
@@ -571,7 +571,7 @@ def no_found(solicitud_id):
         ).save()
         # Añadir acción a la bitácora del Sistema
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Solicitud NO Encontrada {solicitud.id}"),
             url=url_for("arc_archivos.list_active"),
@@ -607,7 +607,7 @@ def send(solicitud_id):
         ).save()
         # Añadir acción a la bitácora del Sistema
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Solicitud Enviada {solicitud.id}"),
             url=url_for("arc_archivos.list_active"),
@@ -647,7 +647,7 @@ def receive(solicitud_id):
         ).save()
         # Añadir acción a la bitácora del Sistema
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Solicitud Recibida {solicitud.id}"),
             url=url_for("arc_archivos.list_active"),
@@ -690,7 +690,7 @@ def delete(solicitud_id):
     if solicitud.estatus == "A":
         solicitud.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado solicitud {solicitud.id}"),
             url=url_for("arc_solicitudes.detail", solicitud_id=solicitud.id),
@@ -714,7 +714,7 @@ def recover(solicitud_id):
     if solicitud.estatus == "B":
         solicitud.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado solicitud {solicitud.id}"),
             url=url_for("arc_solicitudes.detail", solicitud_id=solicitud.id),
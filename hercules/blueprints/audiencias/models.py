@@ -3,13 +3,14 @@ Audiencias, modelos
 """
 
 from datetime import datetime
-from typing import List, Optional
+from typing import List
 
-from sqlalchemy import JSON, Boolean, DateTime, Enum, ForeignKey, Integer, String, Text, Uuid
+from sqlalchemy import JSON, Boolean, DateTime, Enum, ForeignKey, Index, Integer, String, Text, Uuid
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql.functions import now
 
 from hercules.extensions import database
+from lib.indices import indices_activos
 from lib.universal_mixin import UniversalMixin
 
 
@@ -25,6 +26,16 @@ class Audiencia(database.Model, UniversalMixin):
     # Nombre de la tabla
     __tablename__ = "audiencias"
 
+    # Índice de trigramas para el filtro por tipo de audiencia e índices parciales de los registros activos
+    __table_args__ = (
+        Index(
+            "audiencias_tipo_audiencia_trgm",
+            "tipo_audiencia",
+            postgresql_using="gin",
+            postgresql_ops={"tipo_audiencia": "gin_trgm_ops"},
+        ),
+    ) + indices_activos("audiencias", ("autoridad_id", "tiempo"), ("tiempo",))
+
     # Clave primaria
     id: Mapped[int] = mapped_column(primary_key=True)
 
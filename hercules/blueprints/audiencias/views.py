@@ -13,14 +13,16 @@ from hercules.blueprints.audiencias.forms import AudienciaDipeForm, AudienciaGen
 from hercules.blueprints.audiencias.models import Audiencia
 from hercules.blueprints.autoridades.models import Autoridad
 from hercules.blueprints.bitacoras.models import Bitacora
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import consultar_por_id, obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
+from lib.indices import Listado
 from lib.safe_string import safe_clave, safe_expediente, safe_message, safe_string
 from lib.time_utc import join_for_message
 
 MODULO = "AUDIENCIAS"
+LISTADO = Listado(Audiencia, ("autoridad_id",), "tiempo", "tiempo")  # Filtros y orden de datatable_json
 
 audiencias = Blueprint("audiencias", __name__, template_folder="templates")
 
@@ -60,9 +62,9 @@ def datatable_json():
     else:
         consulta = consulta.filter_by(estatus="A")
     if "autoridad_id" in request.form:
-        autoridad = Autoridad.query.get(request.form["autoridad_id"])
+        autoridad = consultar_por_id("autoridades", request.form["autoridad_id"])
         if autoridad:
-            consulta = consulta.filter_by(autoridad=autoridad)
+            consulta = consulta.filter(Audiencia.autoridad_id == autoridad.id)
     # Obtener valores de tiempo desde y hasta
     tiempo_desde = None
     tiempo_hasta = None
@@ -85,7 +87,7 @@ def datatable_json():
     if "tipo_audiencia" in request.form:
         tipo_audiencia = safe_string(request.form["tipo_audiencia"], save_enie=True)
         if tipo_audiencia != "":
-            consulta = consulta.filter(Audiencia.tipo_audiencia.contains(tipo_audiencia))
+            consulta = consulta.filter(Audiencia.tipo_audiencia.contains(tipo_audiencia))  # Índice de trigramas
     if "expediente" in request.form:
         try:
             expediente = safe_expediente(request.form["expediente"])
@@ -93,7 +95,7 @@ def datatable_json():
         except (IndexError, ValueError):
             pass
     # Ordenar y paginar
-    registros = consulta.order_by(Audiencia.tiempo.desc()).offset(start).limit(rows_per_page).all()
+    registros = consulta.order_by(LISTADO.orden_descendente()).offset(start).limit(rows_per_page).all()
     total = consulta.count()
     # Elaborar datos para DataTable
     data = []
@@ -141,9 +143,9 @@ def datatable_json_admin():
         except ValueError:
             pass
     if "autoridad_id" in request.form:
-        autoridad = Autoridad.query.get(request.form["autoridad_id"])
+        autoridad = consultar_por_id("autoridades", request.form["autoridad_id"])
         if autoridad:
-            consulta = consulta.filter_by(autoridad=autoridad)
+            consulta = consulta.filter(Audiencia.autoridad_id == autoridad.id)
     if "autoridad_clave" in request.form:
         try:
             autoridad_clave = safe_clave(request.form["autoridad_clave"])
@@ -173,7 +175,7 @@ def datatable_json_admin():
     if "tipo_audiencia" in request.form:
         tipo_audiencia = safe_string(request.form["tipo_audiencia"], save_enie=True)
         if tipo_audiencia != "":
-            consulta = consulta.filter(Audiencia.tipo_audiencia.contains(tipo_audiencia))
+            consulta = consulta.filter(Audiencia.tipo_audiencia.contains(tipo_audiencia))  # Índice de trigramas
     # Ordenar y paginar
     registros = consulta.order_by(Audiencia.creado.desc()).offset(start).limit(rows_per_page).all()
     total = consulta.count()
@@ -377,7 +379,7 @@ def new_dipe():
 
         # Mostrar mensaje de éxito e ir al detalle
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nueva audiencia en {autoridad.clave} para {tiempo_mensaje}"),
             url=url_for("audiencias.detail", audiencia_id=audiencia.id),
@@ -443,7 +445,7 @@ def new_generica():
 
         # Mostrar mensaje de éxito e ir al detalle
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nueva audiencia en {autoridad.clave} para {tiempo_mensaje}"),
             url=url_for("audiencias.detail", audiencia_id=audiencia.id),
@@ -505,7 +507,7 @@ def new_mapo():
 
         # Mostrar mensaje de éxito e ir al detalle
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nueva audiencias en {autoridad.clave} para {tiempo_mensaje}"),
             url=url_for("audiencias.detail", audiencia_id=audiencia.id),
@@ -569,7 +571,7 @@ def new_sape():
         )
         audiencia.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nuevo Audiencia SALAS {autoridad.clave} para {tiempo_mensaje}"),
             url=url_for("audiencias.detail", audiencia_id=audiencia.id),
@@ -664,7 +666,7 @@ def edit_generica(audiencia_id):
 
         # Registrar en bitácora e ir al detalle
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Editada la audiencia de {autoridad.clave} para {tiempo_mensaje}"),
             url=url_for("audiencias.detail", audiencia_id=audiencia.id),
@@ -744,7 +746,7 @@ def edit_dipe(audiencia_id):
 
         # Registrar en bitácora e ir al detalle
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Editada la audiencia de {autoridad.clave} para {tiempo_mensaje}"),
             url=url_for("audiencias.detail", audiencia_id=audiencia.id),
@@ -818,7 +820,7 @@ def edit_mapo(audiencia_id):
 
         # Registrar en bitácora e ir al detalle
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Editada la audiencia de {autoridad.clave} para {tiempo_mensaje}"),
             url=url_for("audiencias.detail", audiencia_id=audiencia.id),
@@ -896,7 +898,7 @@ def edit_sape(audiencia_id):
 
         # Registar en bitácora e ir al detalle
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Editado Audiencia {autoridad.clave} para {tiempo_mensaje}"),
             url=url_for("audiencias.detail", audiencia_id=audiencia.id),
@@ -930,7 +932,7 @@ def delete(audiencia_id):
     if audiencia.estatus == "A":
         audiencia.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminada la audiencia {audiencia.id}"),
             url=url_for("audiencias.detail", audiencia_id=audiencia.id),
@@ -948,7 +950,7 @@ def recover(audiencia_id):
     if audiencia.estatus == "B":
         audiencia.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Audiencia {audiencia.id}"),
             url=url_for("audiencias.detail", audiencia_id=audiencia.id),
@@ -12,9 +12,10 @@ from hercules.blueprints.autoridades.forms import AutoridadEditForm, AutoridadNe
 from hercules.blueprints.autoridades.models import Autoridad
 from hercules.blueprints.bitacoras.models import Bitacora
 from hercules.blueprints.distritos.models import Distrito
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.cache import cache_condicional, cache_json
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_clave, safe_message, safe_string
 
@@ -186,7 +187,7 @@ def new():
         )
         autoridad.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nueva Autoridad {autoridad.clave}"),
             url=url_for("autoridades.detail", autoridad_id=autoridad.id),
@@ -262,7 +263,7 @@ def edit(autoridad_id):
             autoridad.con_copias_emails = form.con_copias_emails.data
             autoridad.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Editada Autoridad {autoridad.clave}"),
                 url=url_for("autoridades.detail", autoridad_id=autoridad.id),
@@ -311,7 +312,7 @@ def delete(autoridad_id):
     if autoridad.estatus == "A":
         autoridad.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Autoridad {autoridad.clave}"),
             url=url_for("autoridades.detail", autoridad_id=autoridad.id),
@@ -329,7 +330,7 @@ def recover(autoridad_id):
     if autoridad.estatus == "B":
         autoridad.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Autoridad {autoridad.clave}"),
             url=url_for("autoridades.detail", autoridad_id=autoridad.id),
@@ -340,6 +341,7 @@ def recover(autoridad_id):
 
 
 @autoridades.route("/autoridades/select_json/<int:distrito_id>", methods=["GET", "POST"])
+@cache_condicional(Autoridad)
 def query_autoridades_json(distrito_id):
     """Proporcionar el JSON de autoridades para elegir con un Select"""
     # Consultar
@@ -392,6 +394,8 @@ def query_autoridades_json(distrito_id):
 
 
 @autoridades.route("/autoridades/select_json", methods=["GET", "POST"])
+@cache_condicional(Autoridad)
+@cache_json(tablas=["autoridades"])
 def select_autoridades_json():
     """Proporcionar el JSON de autoridades para elegir con un Select"""
     # Consultar
@@ -420,6 +424,7 @@ def select_autoridades_json():
 
 
 @autoridades.route("/autoridades/select2_json", methods=["GET", "POST"])
+@cache_json(tablas=["autoridades"])
 def select2_json():
     """Proporcionar el JSON de autoridades para elegir con un Select2"""
     consulta = Autoridad.query.filter(Autoridad.estatus == "A")
@@ -434,6 +439,7 @@ def select2_json():
 
 
 @autoridades.route("/autoridades/tablero_json", methods=["GET", "POST"])
+@cache_json(tablas=["autoridades"])
 def tablero_json():
     """Proporcionar el JSON de autoridades con pagina_cabecera_url para elaborar un tablero"""
     consulta = (
@@ -11,9 +11,9 @@ from hercules.blueprints.autoridades.models import Autoridad
 from hercules.blueprints.autoridades_funcionarios.models import AutoridadFuncionario
 from hercules.blueprints.bitacoras.models import Bitacora
 from hercules.blueprints.funcionarios.models import Funcionario
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import consultar_por_id, obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_clave, safe_message, safe_string
 
@@ -42,7 +42,7 @@ def datatable_json():
     else:
         consulta = consulta.filter_by(estatus="A")
     if "autoridad_id" in request.form:
-        autoridad = Autoridad.query.get(request.form["autoridad_id"])
+        autoridad = consultar_por_id("autoridades", request.form["autoridad_id"])
         if autoridad:
             consulta = consulta.filter(AutoridadFuncionario.autoridad_id == autoridad.id)
     if "autoridad_clave" in request.form:
@@ -136,7 +136,7 @@ def delete(autoridad_funcionario_id):
     if autoridad_funcionario.estatus == "A":
         autoridad_funcionario.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Autoridad-Funcionario {autoridad_funcionario.descripcion}"),
             url=url_for("autoridades_funcionarios.detail", autoridad_funcionario_id=autoridad_funcionario.id),
@@ -154,7 +154,7 @@ def recover(autoridad_funcionario_id):
     if autoridad_funcionario.estatus == "B":
         autoridad_funcionario.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Autoridad-Funcionario {autoridad_funcionario.descripcion}"),
             url=url_for("autoridades_funcionarios.detail", autoridad_funcionario_id=autoridad_funcionario.id),
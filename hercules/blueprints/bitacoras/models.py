@@ -2,10 +2,14 @@
 Bitácoras
 """
 
+from datetime import datetime
+
 from sqlalchemy import ForeignKey, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from hercules.extensions import database
+from lib.indices import indices_activos
+from lib.particiones import columna_creado_particion, particion_por_mes
 from lib.universal_mixin import UniversalMixin
 
 
@@ -14,9 +18,12 @@ class Bitacora(database.Model, UniversalMixin):
 
     # Nombre de la tabla
     __tablename__ = "bitacoras"
+    __table_args__ = indices_activos("bitacoras", ("modulo_id", "id"), ("usuario_id", "id")) + (particion_por_mes(),)
 
-    # Clave primaria
-    id: Mapped[int] = mapped_column(primary_key=True)
+    # Clave primaria, en la tabla es (id, creado) porque está particionada por mes
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    creado: Mapped[datetime] = columna_creado_particion()
+    __mapper_args__ = {"primary_key": [id]}
 
     # Claves foráneas
     modulo_id: Mapped[int] = mapped_column(ForeignKey("modulos.id"))
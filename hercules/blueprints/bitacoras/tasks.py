@@ -62,14 +62,14 @@ def enviar_reporte_diario(
         logs.error(mensaje)
         raise MyNotValidParamError(mensaje)
 
-    # Definir el tiempo para filtrar a partir de las últimas horas
+    # Definir el tiempo para filtrar a partir de las últimas horas, con creado sólo se consultan las particiones recientes
     desde_dt = datetime.now() - timedelta(hours=horas)
 
     # Si hay usuario_email, consultar la bitácora filtrando por el módulo, las últimas horas y el usuario
     if usuario_email != "":
         bitacoras = (
             Bitacora.query.join(Usuario)
-            .filter(Bitacora.modificado >= desde_dt)
+            .filter(Bitacora.creado >= desde_dt)
             .filter(Bitacora.modulo_id == modulo.id)
             .filter(Usuario.email == usuario_email)
             .filter(Bitacora.estatus == "A")
@@ -79,7 +79,7 @@ def enviar_reporte_diario(
     else:
         # Consultar la bitácora filtrando por el módulo y las últimas horas
         bitacoras = (
-            Bitacora.query.filter(Bitacora.modificado >= desde_dt)
+            Bitacora.query.filter(Bitacora.creado >= desde_dt)
             .filter(Bitacora.modulo_id == modulo.id)
             .filter(Bitacora.estatus == "A")
             .order_by(Bitacora.id.desc())
@@ -3,8 +3,9 @@ Bitácoras
 """
 
 import json
+import re
 
-from flask import Blueprint, render_template, request, url_for
+from flask import Blueprint, abort, make_response, render_template, request, url_for
 from flask_login import current_user, login_required
 
 from hercules.blueprints.bitacoras.models import Bitacora
@@ -13,9 +14,15 @@ from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
 from hercules.blueprints.usuarios.models import Usuario
 from lib.datatables import get_datatable_parameters, output_datatable_json
+from lib.indices import Listado
+from lib.perfilador import consultar_perfil, consultar_perfiles
 from lib.safe_string import safe_email, safe_string
+from lib.trazas_sql import consultar_traza, consultar_trazas
 
 MODULO = "BITACORAS"
+LISTADO = Listado(Bitacora, ("modulo_id", "usuario_id"), None, "id")  # Filtros y orden de datatable_json
+TRAZA_ID_REGEXP = re.compile(r"^\d+-\d+$")
+PERFIL_ID_REGEXP = re.compile(r"^[0-9a-f-]{32,36}$")
 
 bitacoras = Blueprint("bitacoras", __name__, template_folder="templates")
 
@@ -52,7 +59,7 @@ def datatable_json():
         except ValueError:
             pass
     # Ordenar y paginar
-    registros = consulta.order_by(Bitacora.id.desc()).offset(start).limit(rows_per_page).all()
+    registros = consulta.order_by(LISTADO.orden_descendente()).offset(start).limit(rows_per_page).all()
     total = consulta.count()
     # Elaborar datos para DataTable
     data = []
@@ -100,3 +107,44 @@ def list_active():
         filtros=json.dumps(filtros),
         titulo=titulo,
     )
+
+
+@bitacoras.route("/bitacoras/trazas_sql")
+@permission_required(MODULO, Permiso.ADMINISTRAR)
+def list_trazas_sql():
+    """Listado de las trazas SQL más recientes"""
+    return render_template("bitacoras/trazas_sql_list.jinja2", trazas=consultar_trazas())
+
+
+@bitacoras.route("/bitacoras/trazas_sql/<traza_id>")
+@permission_required(MODULO, Permiso.ADMINISTRAR)
+def detail_traza_sql(traza_id):
+    """Detalle de una traza SQL"""
+    if TRAZA_ID_REGEXP.match(traza_id) is None:
+        abort(404)
+    traza = consultar_traza(traza_id)
+    if traza is None:
+        abort(404)
+    return render_template("bitacoras/trazas_sql_detail.jinja2", traza=traza)
+
+
+@bitacoras.route("/bitacoras/perfiles")
+@permission_required(MODULO, Permiso.ADMINISTRAR)
+def list_perfiles():
+    """Listado de los perfiles más recientes"""
+    return render_template("bitacoras/perfiles_list.jinja2", perfiles=consultar_perfiles())
+
+
+@bitacoras.route("/bitacoras/perfiles/<perfil_id>.speedscope.json")
+@permission_required(MODULO, Permiso.ADMINISTRAR)
+def download_perfil(perfil_id):
+    """Descargar el perfil para abrirlo en speedscope"""
+    if PERFIL_ID_REGEXP.match(perfil_id) is None:
+        abort(404)
+    contenido = consultar_perfil(perfil_id)
+    if contenido is None:
+        abort(404)
+    response = make_response(contenido)
+    response.headers["Content-Type"] = "application/json"
+    response.headers["Content-Disposition"] = f"attachment; filename={perfil_id}.speedscope.json"
+    return response
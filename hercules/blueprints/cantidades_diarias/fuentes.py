@@ -0,0 +1,147 @@
+"""
+Cantidades Diarias, fuentes
+
+Los tableros contaban los registros por día con un GROUP BY sobre toda la tabla en cada
+carga. Ahora cada tabla fuente suma o resta en cantidades_diarias al insertar, modificar
+el estatus o la autoridad, o eliminar un registro por medio del ORM, en la misma transacción.
+
+Las modificaciones masivas con query.update() no pasan por aquí, para corregirlas
+se recalculan los últimos días programando cada pocos minutos
+
+    cli cantidades_diarias reconstruir --dias 2
+"""
+
+from datetime import date, timedelta
+
+from sqlalchemy import Date, DateTime, and_, cast, delete, event, func, inspect, literal, select
+from sqlalchemy.dialects.postgresql import insert
+
+from hercules.blueprints.autoridades.models import Autoridad
+from hercules.blueprints.cantidades_diarias.models import CantidadDiaria
+from hercules.blueprints.edictos.models import Edicto
+from hercules.blueprints.glosas.models import Glosa
+from hercules.blueprints.listas_de_acuerdos.models import ListaDeAcuerdo
+from hercules.blueprints.sentencias.models import Sentencia
+from hercules.extensions import database
+from lib.cache import invalidar_tablas
+
+FUENTES = {
+    "edictos": Edicto,
+    "glosas": Glosa,
+    "listas_de_acuerdos": ListaDeAcuerdo,
+    "sentencias": Sentencia,
+}
+
+
+def _dia(registro):
+    """Día de creación del registro, si no está cargado se toma de la base de datos"""
+    creado = inspect(registro).attrs.creado.loaded_value
+    if hasattr(creado, "date"):
+        return creado.date()
+    modelo = type(registro)
+    return select(cast(modelo.creado, Date)).where(modelo.id == registro.id).scalar_subquery()
+
+
+def _sumar(connection, tabla: str, autoridad_id: int, dia, cantidad: int) -> None:
+    """Sumar (o restar) la cantidad en el renglón de la tabla, autoridad y día"""
+    sentencia = insert(CantidadDiaria.__table__).values(tabla=tabla, autoridad_id=autoridad_id, dia=dia, cantidad=cantidad)
+    connection.execute(
+        sentencia.on_conflict_do_update(
+            index_elements=["tabla", "autoridad_id", "dia"],
+            set_={"cantidad": CantidadDiaria.__table__.c.cantidad + sentencia.excluded.cantidad},
+        )
+    )
+
+
+def _al_insertar(mapper, connection, registro) -> None:
+    """Después de insertar"""
+    if registro.estatus == "A":
+        _sumar(connection, registro.__tablename__, registro.autoridad_id, _dia(registro), 1)
+
+
+def _al_modificar(mapper, connection, registro) -> None:
+    """Después de modificar, sólo si cambió el estatus o la autoridad"""
+    estado = inspect(registro)
+    estatus = estado.attrs.estatus.history
+    autoridad_id = estado.attrs.autoridad_id.history
+    if not estatus.has_changes() and not autoridad_id.has_changes():
+        return
+    estatus_anterior = estatus.deleted[0] if estatus.deleted else registro.estatus
+    autoridad_id_anterior = autoridad_id.deleted[0] if autoridad_id.deleted else registro.autoridad_id
+    if estatus_anterior == "A":
+        _sumar(connection, registro.__tablename__, autoridad_id_anterior, _dia(registro), -1)
+    if registro.estatus == "A":
+        _sumar(connection, registro.__tablename__, registro.autoridad_id, _dia(registro), 1)
+
+
+def _al_eliminar(mapper, connection, registro) -> None:
+    """Antes de eliminar de la base de datos, mientras el registro aún existe"""
+    if registro.estatus == "A":
+        _sumar(connection, registro.__tablename__, registro.autoridad_id, _dia(registro), -1)
+
+
+for _modelo in FUENTES.values():
+    event.listen(_modelo, "after_insert", _al_insertar)
+    event.listen(_modelo, "after_update", _al_modificar)
+    event.listen(_modelo, "before_delete", _al_eliminar)
+
+
+def reconstruir(tabla: str, desde: date | None = None) -> int:
+    """Recalcular las cantidades de una fuente desde el día dado o de toda la historia, entrega la cantidad de renglones"""
+    modelo = FUENTES[tabla]
+    cantidades = CantidadDiaria.__table__
+    dia = cast(modelo.creado, Date)
+    borrar = delete(cantidades).where(cantidades.c.tabla == tabla)
+    consulta = select(literal(tabla), modelo.autoridad_id, dia, func.count()).where(modelo.estatus == "A")
+    if desde is not None:
+        borrar = borrar.where(cantidades.c.dia >= desde)
+        consulta = consulta.where(modelo.creado >= desde)
+    conexion = database.session.connection()
+    conexion.execute(borrar)
+    consulta = consulta.group_by(modelo.autoridad_id, dia)
+    resultado = conexion.execute(insert(cantidades).from_select(["tabla", "autoridad_id", "dia", "cantidad"], consulta))
+    database.session.commit()
+    invalidar_tablas(tabla, CantidadDiaria.__tablename__)  # Los tableros en cache tienen las cantidades anteriores
+    return resultado.rowcount
+
+
+def cantidades_por_dia(tabla: str, cantidad_dias: int, autoridad_id: int | None = None) -> dict:
+    """Cantidades por día de los últimos días hasta ayer, los días sin registros se completan con cero en SQL"""
+    hasta = date.today() - timedelta(days=1)
+    desde = hasta - timedelta(days=cantidad_dias - 1)
+    dias = func.generate_series(cast(desde, DateTime), cast(hasta, DateTime), timedelta(days=1)).table_valued("dia")
+    dia = cast(dias.c.dia, Date)
+    condiciones = [CantidadDiaria.tabla == tabla, CantidadDiaria.dia == dia]
+    if autoridad_id is not None:
+        condiciones.append(CantidadDiaria.autoridad_id == autoridad_id)
+    consulta = (
+        database.session.query(dia.label("dia"), func.coalesce(func.sum(CantidadDiaria.cantidad), 0).label("cantidad"))
+        .select_from(dias)
+        .outerjoin(CantidadDiaria, and_(*condiciones))
+        .group_by(dia)
+        .order_by(dia)
+        .all()
+    )
+    return {
+        "labels": [renglon.dia.strftime("%Y-%m-%d") for renglon in consulta],
+        "data": [int(renglon.cantidad) for renglon in consulta],
+    }
+
+
+def cantidades_por_autoridad(tabla: str, cantidad_dias: int) -> dict:
+    """Cantidades por autoridad de los últimos días"""
+    consulta = (
+        database.session.query(Autoridad.clave.label("autoridad_clave"), func.sum(CantidadDiaria.cantidad).label("cantidad"))
+        .select_from(CantidadDiaria)
+        .join(Autoridad)
+        .filter(CantidadDiaria.tabla == tabla)
+        .filter(CantidadDiaria.dia >= date.today() - timedelta(days=cantidad_dias))
+        .group_by(Autoridad.clave)
+        .having(func.sum(CantidadDiaria.cantidad) > 0)
+        .order_by(Autoridad.clave)
+        .all()
+    )
+    return {
+        "labels": [renglon.autoridad_clave for renglon in consulta],
+        "data": [int(renglon.cantidad) for renglon in consulta],
+    }
@@ -0,0 +1,32 @@
+"""
+Cantidades Diarias, modelos
+"""
+
+from datetime import date
+
+from sqlalchemy import Date, ForeignKey, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from hercules.extensions import database
+
+
+class CantidadDiaria(database.Model):
+    """CantidadDiaria, cantidad de registros activos creados por tabla, autoridad y día"""
+
+    # Nombre de la tabla
+    __tablename__ = "cantidades_diarias"
+
+    # Índice para los tableros de todas las autoridades
+    __table_args__ = (Index("cantidades_diarias_tabla_dia", "tabla", "dia"),)
+
+    # Clave primaria
+    tabla: Mapped[str] = mapped_column(String(64), primary_key=True)
+    autoridad_id: Mapped[int] = mapped_column(ForeignKey("autoridades.id"), primary_key=True)
+    dia: Mapped[date] = mapped_column(Date(), primary_key=True)
+
+    # Columnas
+    cantidad: Mapped[int] = mapped_column(default=0)
+
+    def __repr__(self):
+        """Representación"""
+        return f"<CantidadDiaria {self.tabla} {self.autoridad_id} {self.dia} {self.cantidad}>"
@@ -10,9 +10,9 @@ from flask_login import current_user, login_required
 from hercules.blueprints.bitacoras.models import Bitacora
 from hercules.blueprints.cid_areas.forms import CIDAreaForm
 from hercules.blueprints.cid_areas.models import CIDArea
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_clave, safe_message, safe_string
 
@@ -132,7 +132,7 @@ def new():
             )
             cid_area.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Nuevo cid_area {cid_area.clave}"),
                 url=url_for("cid_areas.detail", cid_area_id=cid_area.id),
@@ -166,7 +166,7 @@ def edit(cid_area_id):
             cid_area.descripcion = safe_string(form.descripcion.data, save_enie=True)
             cid_area.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Editada area {cid_area.clave}"),
                 url=url_for("cid_areas.detail", cid_area_id=cid_area.id),
@@ -188,7 +188,7 @@ def delete(cid_area_id):
     if cid_area.estatus == "A":
         cid_area.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminada área {cid_area.nombre}"),
             url=url_for("cid_areas.detail", cid_area_id=cid_area.id),
@@ -206,7 +206,7 @@ def recover(cid_area_id):
     if cid_area.estatus == "B":
         cid_area.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperada área {cid_area.nombre}"),
             url=url_for("cid_areas.detail", cid_area_id=cid_area.id),
@@ -15,9 +15,9 @@ from hercules.blueprints.cid_areas_autoridades.models import CIDAreaAutoridad
 from hercules.blueprints.cid_formatos.forms import CIDFormatoEdit, CIDFormatoForm
 from hercules.blueprints.cid_formatos.models import CIDFormato
 from hercules.blueprints.cid_procedimientos.models import CIDProcedimiento
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.exceptions import (
     MyBucketNotFoundError,
@@ -371,7 +371,7 @@ def new(cid_procedimiento_id):
             if es_exitoso:
                 # Registrar la acción en la bitácora
                 bitacora = Bitacora(
-                    modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                    modulo_id=obtener_modulo_id(MODULO),
                     usuario=current_user,
                     descripcion=safe_message(f"Nuevo formato {cid_formato.descripcion}"),
                     url=url_for("cid_formatos.detail", cid_formato_id=cid_formato.id),
@@ -395,7 +395,7 @@ def edit(cid_formato_id):
         cid_formato.descripcion = safe_string(form.descripcion.data, save_enie=True)
         cid_formato.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Editado el formato {cid_formato.descripcion}"),
             url=url_for("cid_formatos.detail", cid_formato_id=cid_formato.id),
@@ -417,7 +417,7 @@ def delete(cid_formato_id):
     if cid_formato.estatus == "A":
         cid_formato.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado el formato {cid_formato.descripcion}"),
             url=url_for("cid_formatos.detail", cid_formato_id=cid_formato.id),
@@ -435,7 +435,7 @@ def recover(cid_formato_id):
     if cid_formato.estatus == "B":
         cid_formato.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado el formato {cid_formato.descripcion}"),
             url=url_for("cid_formatos.detail", cid_formato_id=cid_formato.id),
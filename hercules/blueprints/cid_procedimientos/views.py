@@ -21,13 +21,13 @@ from hercules.blueprints.cid_procedimientos.forms import (
     CIDProcedimientosNewReview,
 )
 from hercules.blueprints.cid_procedimientos.models import CIDProcedimiento
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.roles.models import Rol
 from hercules.blueprints.usuarios.decorators import permission_required
 from hercules.blueprints.usuarios.models import Usuario
 from hercules.blueprints.usuarios_roles.models import UsuarioRol
 from hercules.extensions import database
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_clave, safe_email, safe_message, safe_string
 
@@ -468,7 +468,7 @@ def new():
         )
         cid_procedimiento.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nuevo Procedimiento {cid_procedimiento.titulo_procedimiento}"),
             url=url_for("cid_procedimientos.detail", cid_procedimiento_id=cid_procedimiento.id),
@@ -586,7 +586,7 @@ def edit(cid_procedimiento_id):
         cid_procedimiento.control_cambios_html = "<strong>POR PROGRAMAR</strong>"
         cid_procedimiento.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Editado Procedimiento {cid_procedimiento.titulo_procedimiento}."),
             url=url_for("cid_procedimientos.detail", cid_procedimiento_id=cid_procedimiento.id),
@@ -726,7 +726,7 @@ def copiar_procedimiento_con_revision(cid_procedimiento_id):
         nueva_copia.save()
         # Bitácora y redirección a la vista de detalle
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nueva revisión del procedimiento {cid_procedimiento.titulo_procedimiento}."),
             url=url_for("cid_procedimientos.detail", cid_procedimiento_id=nueva_copia.id),
@@ -763,7 +763,7 @@ def cambiar_area(cid_procedimiento_id):
         cid_procedimiento.save()
         # Registrar en bitacora
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Cambiada el Área del Procedimiento {cid_procedimiento_id}."),
             url=url_for("cid_procedimientos.detail", cid_procedimiento_id=cid_procedimiento.id),
@@ -994,7 +994,7 @@ def accept_reject(cid_procedimiento_id):
                     cid_formato.save()
             # Bitacora
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Aceptado el Procedimiento {nuevo.titulo_procedimiento}."),
                 url=url_for("cid_procedimientos.detail", cid_procedimiento_id=nuevo.id),
@@ -1087,7 +1087,7 @@ def delete(cid_procedimiento_id):
         for cid_formato in cid_procedimiento.cid_formatos:
             cid_formato.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Procedimiento {cid_procedimiento.titulo_procedimiento}."),
             url=url_for("cid_procedimientos.detail", cid_procedimiento_id=cid_procedimiento.id),
@@ -1121,7 +1121,7 @@ def recover(cid_procedimiento_id):
         for cid_formato in cid_procedimiento.cid_formatos:
             cid_formato.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Procedimiento {cid_procedimiento.titulo_procedimiento}."),
             url=url_for("cid_procedimientos.detail", cid_procedimiento_id=cid_procedimiento.id),
@@ -1208,7 +1208,7 @@ def archivar_procedimiento(cid_procedimiento_id):
         procedimiento_actual = CIDProcedimiento.query.filter_by(id=procedimiento_actual.anterior_id).first()
     # Guardado de acciones en bitacora
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_id=obtener_modulo_id(MODULO),
         usuario=current_user,
         descripcion=safe_message(
             f"Se archiva el procedimiento {cid_procedimiento.codigo}  {cid_procedimiento.titulo_procedimiento} y sus procedimientos anteriores."
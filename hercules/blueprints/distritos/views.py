@@ -10,9 +10,10 @@ from flask_login import current_user, login_required
 from hercules.blueprints.bitacoras.models import Bitacora
 from hercules.blueprints.distritos.forms import DistritoForm
 from hercules.blueprints.distritos.models import Distrito
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.cache import cache_condicional
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_clave, safe_message, safe_string
 
@@ -97,6 +98,7 @@ def list_inactive():
 
 
 @distritos.route("/distritos/<int:distrito_id>")
+@cache_condicional(Distrito, "distrito_id", vigencia=300)
 def detail(distrito_id):
     """Detalle de un Distrito"""
     distrito = Distrito.query.get_or_404(distrito_id)
@@ -132,7 +134,7 @@ def new():
             )
             distrito.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Nuevo Distrito {distrito.clave}"),
                 url=url_for("distritos.detail", distrito_id=distrito.id),
@@ -175,7 +177,7 @@ def edit(distrito_id):
             distrito.es_jurisdiccional = form.es_jurisdiccional.data
             distrito.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Editado Distrito {distrito.clave}"),
                 url=url_for("distritos.detail", distrito_id=distrito.id),
@@ -200,7 +202,7 @@ def delete(distrito_id):
     if distrito.estatus == "A":
         distrito.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Distrito {distrito.clave}"),
             url=url_for("distritos.detail", distrito_id=distrito.id),
@@ -218,7 +220,7 @@ def recover(distrito_id):
     if distrito.estatus == "B":
         distrito.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Distrito {distrito.clave}"),
             url=url_for("distritos.detail", distrito_id=distrito.id),
@@ -229,6 +231,7 @@ def recover(distrito_id):
 
 
 @distritos.route("/distritos/select_json", methods=["GET", "POST"])
+@cache_condicional(Distrito)
 def query_distritos_json():
     """Proporcionar el JSON de distritos para elegir con un Select"""
     # Consultar
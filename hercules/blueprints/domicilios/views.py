@@ -10,9 +10,9 @@ from flask_login import current_user, login_required
 from hercules.blueprints.bitacoras.models import Bitacora
 from hercules.blueprints.domicilios.forms import DomicilioForm
 from hercules.blueprints.domicilios.models import Domicilio
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_message, safe_string
 
@@ -135,7 +135,7 @@ def new():
         )
         domicilio.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nuevo Domicilio {domicilio.edificio}"),
             url=url_for("domicilios.detail", domicilio_id=domicilio.id),
@@ -175,7 +175,7 @@ def edit(domicilio_id):
             domicilio.completo = f"{domicilio.calle} #{domicilio.num_ext} {domicilio.num_int}, {domicilio.colonia}, {domicilio.municipio}, {domicilio.estado}, C.P. {domicilio.cp}"
             domicilio.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Editado Domicilio {domicilio.edificio}"),
                 url=url_for("domicilios.detail", domicilio_id=domicilio.id),
@@ -203,7 +203,7 @@ def delete(domicilio_id):
     if domicilio.estatus == "A":
         domicilio.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Domicilio {domicilio.edificio}"),
             url=url_for("domicilios.detail", domicilio_id=domicilio.id),
@@ -221,7 +221,7 @@ def recover(domicilio_id):
     if domicilio.estatus == "B":
         domicilio.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Domicilio {domicilio.edificio}"),
             url=url_for("domicilios.detail", domicilio_id=domicilio.id),
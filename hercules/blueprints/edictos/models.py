@@ -5,10 +5,13 @@ Edictos, modelos
 from datetime import date, datetime
 from typing import List, Optional
 
-from sqlalchemy import JSON, Date, ForeignKey, String
+from sqlalchemy import JSON, Date, ForeignKey, LargeBinary, String
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from hercules.extensions import database
+from lib.busqueda import columna_buscador, indices_busqueda
+from lib.indices import indices_activos
 from lib.universal_mixin import UniversalMixin
 
 
@@ -18,6 +21,11 @@ class Edicto(database.Model, UniversalMixin):
     # Nombre de la tabla
     __tablename__ = "edictos"
 
+    # Índices para la búsqueda de texto completo e índices parciales de los registros activos
+    __table_args__ = indices_busqueda("edictos", "descripcion", contenido=True) + indices_activos(
+        "edictos", ("autoridad_id", "fecha"), ("autoridad_id", "id")
+    )
+
     # Clave primaria
     id: Mapped[int] = mapped_column(primary_key=True)
 
@@ -36,6 +44,14 @@ class Edicto(database.Model, UniversalMixin):
     edicto_id_original: Mapped[int] = mapped_column(default=0)
     es_declaracion_de_ausencia: Mapped[bool] = mapped_column(default=False)
 
+    # Columna generada para la búsqueda de texto completo
+    buscador: Mapped[Optional[str]] = columna_buscador("descripcion")
+
+    # Columnas para el texto extraído del archivo PDF, se llenan con una tarea en el fondo
+    contenido_fue_extraido_tiempo: Mapped[Optional[datetime]]
+    contenido_texto: Mapped[Optional[bytes]] = mapped_column(LargeBinary, deferred=True)
+    contenido_buscador: Mapped[Optional[str]] = mapped_column(TSVECTOR, deferred=True)
+
     # Columnas para Retrieval-Augmented Generation (RAG)
     rag_fue_analizado_tiempo: Mapped[Optional[datetime]]
     rag_analisis: Mapped[Optional[dict]] = mapped_column(JSON)
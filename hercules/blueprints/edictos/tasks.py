@@ -0,0 +1,43 @@
+"""
+Edictos, tareas para ejecutar en el fondo
+"""
+
+import logging
+
+from hercules.app import create_app
+from hercules.blueprints.edictos.models import Edicto
+from hercules.extensions import database
+from lib.contenidos import extraer_contenidos, extraer_pendientes
+from lib.tasks import set_task_progress
+
+# Bitácora logs/edictos.log
+bitacora = logging.getLogger(__name__)
+bitacora.setLevel(logging.INFO)
+formato = logging.Formatter("%(asctime)s:%(levelname)s:%(message)s")
+empunadura = logging.FileHandler("logs/edictos.log")
+empunadura.setFormatter(formato)
+bitacora.addHandler(empunadura)
+
+# Cargar la aplicación para tener acceso a la base de datos
+app = create_app()
+app.app_context().push()
+database.app = app
+
+
+def extraer_contenido(edicto_id: int) -> str:
+    """Extraer el texto del archivo PDF de un edicto para la búsqueda por contenido"""
+    con_texto = extraer_contenidos(Edicto, app.config["CLOUD_STORAGE_DEPOSITO_EDICTOS"], [edicto_id])
+    mensaje = f"Se extrajo el contenido del edicto {edicto_id}" if con_texto else f"El edicto {edicto_id} no tiene texto"
+    set_task_progress(100, mensaje)
+    bitacora.info(mensaje)
+    return mensaje
+
+
+def extraer_contenidos_pendientes(lote: int = 50, limite: int | None = None) -> str:
+    """Extraer por lotes el texto de los edictos que aún no lo tienen"""
+    set_task_progress(0, "Inicia extraer el contenido de los edictos pendientes")
+    procesados, con_texto = extraer_pendientes(Edicto, app.config["CLOUD_STORAGE_DEPOSITO_EDICTOS"], lote, limite)
+    mensaje_final = f"Termina extraer el contenido de {procesados} edictos, {con_texto} con texto"
+    set_task_progress(100, mensaje_final)
+    bitacora.info(mensaje_final)
+    return mensaje_final
@@ -9,18 +9,21 @@ from datetime import date, datetime, timedelta
 from flask import Blueprint, current_app, flash, make_response, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
 from pytz import timezone
-from sqlalchemy import Date, func
+from sqlalchemy.orm import undefer
 from werkzeug.datastructures import CombinedMultiDict
 from werkzeug.exceptions import NotFound
 
 from hercules.blueprints.autoridades.models import Autoridad
 from hercules.blueprints.bitacoras.models import Bitacora
+from hercules.blueprints.cantidades_diarias.fuentes import cantidades_por_dia
 from hercules.blueprints.edictos.forms import EdictoEditForm, EdictoNewForm
 from hercules.blueprints.edictos.models import Edicto
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
-from hercules.extensions import database
+from lib.busqueda import consulta_tsquery, filtrar_por_texto
+from lib.cache import cache_coalescente, cache_condicional
+from lib.catalogos import consultar_por_id, obtener_modulo_id
+from lib.contenidos import buscar_contenidos, encolar_extraccion
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.exceptions import (
     MyBucketNotFoundError,
@@ -32,8 +35,10 @@ from lib.exceptions import (
     MyUnknownExtensionError,
 )
 from lib.google_cloud_storage import get_blob_name_from_url, get_file_from_gcs, get_media_type_from_filename
+from lib.indices import Listado
 from lib.safe_string import safe_clave, safe_expediente, safe_message, safe_numero_publicacion, safe_string
 from lib.storage import GoogleCloudStorage
+from lib.texto_pdf import descomprimir_texto, elaborar_fragmento
 from lib.time_to_text import dia_mes_ano
 
 # Zona horaria
@@ -42,6 +47,7 @@ local_tz = timezone(TIMEZONE)
 
 # Constantes de este módulo
 MODULO = "EDICTOS"
+LISTADO = Listado(Edicto, ("autoridad_id",), "fecha", "id")  # Filtros y orden de datatable_json
 DASHBOARD_CANTIDAD_DIAS = 15
 LIMITE_DIAS = 365  # Un anio
 LIMITE_DIAS_EDITAR = LIMITE_DIAS_ELIMINAR = LIMITE_DIAS_RECUPERAR = 7
@@ -52,6 +58,13 @@ edictos = Blueprint("edictos", __name__, template_folder="templates")
 
 
 @edictos.route("/edictos/acuses/<id_hashed>")
+@cache_condicional(
+    Edicto,
+    "id_hashed",
+    identificar=Edicto.decode_id,
+    tablas=["autoridades", "distritos"],
+    alcance="publico",
+)
 def checkout(id_hashed):
     """Acuse"""
     edicto = Edicto.query.get_or_404(Edicto.decode_id(id_hashed))
@@ -82,7 +95,7 @@ def datatable_json():
     else:
         consulta = consulta.filter(Edicto.estatus == "A")
     if "autoridad_id" in request.form:
-        autoridad = Autoridad.query.get(request.form["autoridad_id"])
+        autoridad = consultar_por_id("autoridades", request.form["autoridad_id"])
         if autoridad:
             consulta = consulta.filter(Edicto.autoridad_id == autoridad.id)
     elif "autoridad_clave" in request.form:
@@ -92,7 +105,7 @@ def datatable_json():
     if "descripcion" in request.form:
         descripcion = safe_string(request.form["descripcion"], save_enie=True)
         if descripcion != "":
-            consulta = consulta.filter(Edicto.descripcion.contains(descripcion))
+            consulta = filtrar_por_texto(consulta, Edicto, descripcion)
     if "expediente" in request.form:
         try:
             expediente = safe_expediente(request.form["expediente"])
@@ -121,7 +134,7 @@ def datatable_json():
         consulta = consulta.filter(Edicto.fecha <= fecha_hasta)
 
     # Ordenar y paginar
-    registros = consulta.order_by(Edicto.id.desc()).offset(start).limit(rows_per_page).all()
+    registros = consulta.order_by(LISTADO.orden_descendente()).offset(start).limit(rows_per_page).all()
     total = consulta.count()
 
     # Elaborar datos para DataTable
@@ -162,7 +175,7 @@ def admin_datatable_json():
     else:
         consulta = consulta.filter(Edicto.estatus == "A")
     if "autoridad_id" in request.form:
-        autoridad = Autoridad.query.get(request.form["autoridad_id"])
+        autoridad = consultar_por_id("autoridades", request.form["autoridad_id"])
         if autoridad:
             consulta = consulta.filter(Edicto.autoridad_id == autoridad.id)
     elif "autoridad_clave" in request.form:
@@ -172,7 +185,7 @@ def admin_datatable_json():
     if "descripcion" in request.form:
         descripcion = safe_string(request.form["descripcion"], save_enie=True)
         if descripcion != "":
-            consulta = consulta.filter(Edicto.descripcion.contains(descripcion))
+            consulta = filtrar_por_texto(consulta, Edicto, descripcion)
     if "expediente" in request.form:
         try:
             expediente = safe_expediente(request.form["expediente"])
@@ -227,6 +240,53 @@ def admin_datatable_json():
     return output_datatable_json(draw, total, data)
 
 
+@edictos.route("/edictos/buscar_contenido_json", methods=["GET", "POST"])
+def search_content_json():
+    """DataTable JSON con Edictos que contienen el texto en su archivo PDF, ordenados por relevancia"""
+
+    # Tomar parámetros de Datatables
+    draw, start, rows_per_page = get_datatable_parameters()
+
+    # Sin texto no hay resultados
+    texto = safe_string(request.form.get("texto", ""), save_enie=True)
+    if texto == "":
+        return output_datatable_json(draw, 0, [])
+
+    # Consultar con el índice del contenido
+    consulta = Edicto.query.filter(Edicto.estatus == "A")
+    if "autoridad_id" in request.form:
+        autoridad = consultar_por_id("autoridades", request.form["autoridad_id"])
+        if autoridad:
+            consulta = consulta.filter(Edicto.autoridad_id == autoridad.id)
+    total = consulta.filter(Edicto.contenido_buscador.op("@@")(consulta_tsquery(texto))).count()
+    registros = (
+        buscar_contenidos(consulta, Edicto, texto)
+        .options(undefer(Edicto.contenido_texto))
+        .offset(start)
+        .limit(rows_per_page)
+        .all()
+    )
+
+    # Elaborar datos para DataTable
+    data = []
+    for edicto in registros:
+        data.append(
+            {
+                "fecha": edicto.fecha.strftime("%Y-%m-%d 00:00:00"),
+                "autoridad_clave": edicto.autoridad.clave,
+                "detalle": {
+                    "descripcion": edicto.descripcion,
+                    "url": url_for("edictos.detail", edicto_id=edicto.id),
+                },
+                "expediente": edicto.expediente,
+                "fragmento": elaborar_fragmento(descomprimir_texto(edicto.contenido_texto), texto),
+            }
+        )
+
+    # Entregar JSON
+    return output_datatable_json(draw, total, data)
+
+
 @edictos.route("/edictos")
 def list_active():
     """Listado de Edictos activos"""
@@ -419,8 +479,9 @@ def new():
             edicto.archivo = gcstorage.filename  # Conservar el nombre original
             edicto.url = gcstorage.url
             edicto.save()
+            encolar_extraccion("edictos.tasks.extraer_contenido", "Extraer el contenido del edicto", edicto.id)
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Nuevo Edicto de {autoridad.clave} sobre {edicto.descripcion}"),
                 url=url_for("edictos.detail", edicto_id=edicto.id),
@@ -569,8 +630,9 @@ def new_with_autoridad_id(autoridad_id):
             edicto.archivo = gcstorage.filename  # Conservar el nombre original
             edicto.url = gcstorage.url
             edicto.save()
+            encolar_extraccion("edictos.tasks.extraer_contenido", "Extraer el contenido del edicto", edicto.id)
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Nuevo Edicto de {autoridad.clave} sobre {edicto.descripcion}"),
                 url=url_for("edictos.detail", edicto_id=edicto.id),
@@ -670,7 +732,7 @@ def edit(edicto_id):
             edicto.es_declaracion_de_ausencia = es_declaracion_de_ausencia
             edicto.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Editado el Edicto de {edicto.autoridad.clave} sobre {edicto.descripcion}"),
                 url=url_for("edictos.detail", edicto_id=edicto.id),
@@ -721,7 +783,7 @@ def delete(edicto_id):
     if current_user.can_admin(MODULO):
         edicto.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=descripcion,
             url=detalle_url,
@@ -739,7 +801,7 @@ def delete(edicto_id):
     if edicto.creado >= datetime.now(tz=local_tz) - timedelta(days=LIMITE_DIAS_ELIMINAR):
         edicto.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=descripcion,
             url=detalle_url,
@@ -774,7 +836,7 @@ def recover(edicto_id):
     if current_user.can_admin(MODULO):
         edicto.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=descripcion,
             url=detalle_url,
@@ -792,7 +854,7 @@ def recover(edicto_id):
     if edicto.creado >= datetime.now(tz=local_tz) - timedelta(days=LIMITE_DIAS_RECUPERAR):
         edicto.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=descripcion,
             url=detalle_url,
@@ -853,6 +915,7 @@ def download_file_pdf(edicto_id):
 
 @edictos.route("/edictos/tablero_cantidades_por_dia_json")
 @permission_required(MODULO, Permiso.VER)
+@cache_coalescente(fresco=60, rancio=600, alcance="publico")
 def dashboard_amounts_per_day_json():
     """Calcular las cantidades de Edictos por día"""
 
@@ -874,55 +937,8 @@ def dashboard_amounts_per_day_json():
     except (TypeError, ValueError):
         cantidad_dias = DASHBOARD_CANTIDAD_DIAS
 
-    # Consultar
-    if autoridad is None:
-        consulta = (
-            database.session.query(
-                func.cast(Edicto.creado, Date).label("creado"),
-                func.count(Edicto.id).label("cantidad"),
-            )
-            .select_from(Edicto)
-            .where(Edicto.estatus == "A")
-            .where(Edicto.creado >= datetime.now() + timedelta(days=-cantidad_dias))
-            .group_by(func.cast(Edicto.creado, Date))
-            .order_by(func.cast(Edicto.creado, Date).desc())
-            .limit(cantidad_dias)
-            .all()
-        )
-    else:
-        consulta = (
-            database.session.query(
-                func.cast(Edicto.creado, Date).label("creado"),
-                func.count(Edicto.id).label("cantidad"),
-            )
-            .select_from(Edicto)
-            .join(Autoridad)
-            .where(Autoridad.id == autoridad.id)
-            .where(Edicto.estatus == "A")
-            .where(Edicto.creado >= datetime.now() + timedelta(days=-cantidad_dias))
-            .group_by(func.cast(Edicto.creado, Date))
-            .order_by(func.cast(Edicto.creado, Date).desc())
-            .limit(cantidad_dias)
-            .all()
-        )
-
-    # Bucle por cada día para agregar los que faltan con cantidad cero
-    consulta_completo = []
-    puntero = datetime.now() + timedelta(days=-cantidad_dias)
-    while puntero < datetime.now() + timedelta(days=-1):
-        dia = puntero.date()
-        if len(consulta) > 0 and consulta[-1].creado == dia:
-            item = consulta.pop()
-            consulta_completo.append({"creado": item.creado, "cantidad": item.cantidad})
-        else:
-            consulta_completo.append({"creado": dia, "cantidad": 0})
-        puntero += timedelta(days=1)
-
-    # Entregar JSON
-    return {
-        "labels": [item["creado"].strftime("%Y-%m-%d") for item in consulta_completo],
-        "data": [item["cantidad"] for item in consulta_completo],
-    }
+    # Consultar las cantidades diarias, los días sin registros vienen con cero
+    return cantidades_por_dia("edictos", cantidad_dias, autoridad.id if autoridad else None)
 
 
 @edictos.route("/edictos/tablero")
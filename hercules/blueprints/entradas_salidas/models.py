@@ -2,10 +2,13 @@
 Entradas-Salidas
 """
 
+from datetime import datetime
+
 from sqlalchemy import Enum, ForeignKey, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from hercules.extensions import database
+from lib.particiones import columna_creado_particion, particion_por_mes
 from lib.universal_mixin import UniversalMixin
 
 
@@ -19,9 +22,12 @@ class EntradaSalida(database.Model, UniversalMixin):
 
     # Nombre de la tabla
     __tablename__ = "entradas_salidas"
+    __table_args__ = (particion_por_mes(),)
 
-    # Clave primaria
-    id: Mapped[int] = mapped_column(primary_key=True)
+    # Clave primaria, en la tabla es (id, creado) porque está particionada por mes
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    creado: Mapped[datetime] = columna_creado_particion()
+    __mapper_args__ = {"primary_key": [id]}
 
     # Claves foráneas
     usuario_id: Mapped[int] = mapped_column(ForeignKey("usuarios.id"))
@@ -6,6 +6,7 @@ import json
 from flask import Blueprint, render_template, request, url_for
 from flask_login import login_required
 
+from lib.cache import cache_condicional, cache_json
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_string
 
@@ -68,6 +69,8 @@ def datatable_json():
 
 
 @estados.route("/estados/select_json", methods=["GET", "POST"])
+@cache_condicional(Estado)
+@cache_json(tablas=["estados"])
 def select_json():
     """Proporcionar el JSON para elegir con un select tradicional"""
     consulta = Estado.query.filter_by(estatus="A").order_by(Estado.nombre)
@@ -83,6 +86,8 @@ def select_json():
 
 
 @estados.route("/estados/select2_json", methods=["GET", "POST"])
+@cache_condicional(Estado)
+@cache_json(tablas=["estados"])
 def select2_json():
     """Proporcionar el JSON para elegir con un Select2"""
     consulta = Estado.query.filter(Estado.estatus == "A")
@@ -108,6 +113,7 @@ def list_active():
 
 
 @estados.route("/estados/<int:estado_id>")
+@cache_condicional(Estado, "estado_id", vigencia=300)
 def detail(estado_id):
     """Detalle de un Estado"""
     estado = Estado.query.get_or_404(estado_id)
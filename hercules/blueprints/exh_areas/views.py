@@ -10,9 +10,9 @@ from flask_login import current_user, login_required
 from hercules.blueprints.bitacoras.models import Bitacora
 from hercules.blueprints.exh_areas.forms import ExhAreaForm
 from hercules.blueprints.exh_areas.models import ExhArea
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_clave, safe_message, safe_string
 
@@ -108,7 +108,7 @@ def new():
         )
         exh_area.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nueva Área {exh_area.clave}"),
             url=url_for("exh_areas.detail", exh_area_id=exh_area.id),
@@ -140,7 +140,7 @@ def edit(exh_area_id):
             exh_area.nombre = safe_string(form.nombre.data)
             exh_area.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Editada Área {exh_area.clave}"),
                 url=url_for("exh_areas.detail", exh_area_id=exh_area.id),
@@ -161,7 +161,7 @@ def delete(exh_area_id):
     if exh_area.estatus == "A":
         exh_area.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminada Área {exh_area.clave}"),
             url=url_for("exh_areas.detail", exh_area_id=exh_area.id),
@@ -179,7 +179,7 @@ def recover(exh_area_id):
     if exh_area.estatus == "B":
         exh_area.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperada Área {exh_area.clave}"),
             url=url_for("exh_areas.detail", exh_area_id=exh_area.id),
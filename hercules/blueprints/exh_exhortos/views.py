@@ -23,10 +23,10 @@ from hercules.blueprints.exh_areas.models import ExhArea
 from hercules.blueprints.exh_exhortos.models import ExhExhorto
 from hercules.blueprints.exh_externos.models import ExhExterno
 from hercules.blueprints.exh_tipos_diligencias.models import ExhTipoDiligencia
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.municipios.models import Municipio
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.pwgen import generar_identificador
 from lib.safe_string import safe_expediente, safe_message, safe_string
@@ -276,7 +276,7 @@ def new():
             )
             exh_exhorto.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Nuevo Exhorto {exh_exhorto.exhorto_origen_id}"),
                 url=url_for("exh_exhortos.detail", exh_exhorto_id=exh_exhorto.id),
@@ -406,7 +406,7 @@ def edit(exh_exhorto_id):
             exh_exhorto.observaciones = safe_string(form.observaciones.data, save_enie=True, max_len=1024)
             exh_exhorto.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Editado Exhorto {exh_exhorto.exhorto_origen_id}"),
                 url=url_for("exh_exhortos.detail", exh_exhorto_id=exh_exhorto.id),
@@ -456,7 +456,7 @@ def delete(exh_exhorto_id):
     if exh_exhorto.estatus == "A":
         exh_exhorto.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Exhorto ID {exh_exhorto.id}"),
             url=url_for("exh_exhortos.detail", exh_exhorto_id=exh_exhorto.id),
@@ -474,7 +474,7 @@ def recover(exh_exhorto_id):
     if exh_exhorto.estatus == "B":
         exh_exhorto.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Exhorto ID {exh_exhorto.id}"),
             url=url_for("exh_exhortos.detail", exh_exhorto_id=exh_exhorto.id),
@@ -515,7 +515,7 @@ def launch_task_query(exh_exhorto_id):
         return redirect(url_for("exh_exhortos.detail", exh_exhorto_id=exh_exhorto.id))
     # Insertar en la bitácora
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_id=obtener_modulo_id(MODULO),
         usuario=current_user,
         descripcion=safe_message(f"Se ha CONSULTADO el exhorto {exh_exhorto.exhorto_origen_id}"),
         url=url_for("exh_exhortos.detail", exh_exhorto_id=exh_exhorto.id),
@@ -570,7 +570,7 @@ def launch_task_send(exh_exhorto_id):
         return redirect(url_for("exh_exhortos.detail", exh_exhorto_id=exh_exhorto.id))
     # Insertar en la bitácora
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_id=obtener_modulo_id(MODULO),
         usuario=current_user,
         descripcion=safe_message(f"Se ha ENVIADO el exhorto {exh_exhorto.exhorto_origen_id}"),
         url=url_for("exh_exhortos.detail", exh_exhorto_id=exh_exhorto.id),
@@ -608,7 +608,7 @@ def change_to_archive(exh_exhorto_id):
     exh_exhorto.estado = "ARCHIVADO"
     exh_exhorto.save()
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_id=obtener_modulo_id(MODULO),
         usuario=current_user,
         descripcion=safe_message("Se ha ARCHIVADO el exhorto"),
         url=url_for("exh_exhortos.detail", exh_exhorto_id=exh_exhorto.id),
@@ -643,7 +643,7 @@ def change_to_cancel(exh_exhorto_id):
     exh_exhorto.estado = "CANCELADO"
     exh_exhorto.save()
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_id=obtener_modulo_id(MODULO),
         usuario=current_user,
         descripcion=safe_message("Se ha CANCELADO el exhorto"),
         url=url_for("exh_exhortos.detail", exh_exhorto_id=exh_exhorto.id),
@@ -678,7 +678,7 @@ def change_to_pending(exh_exhorto_id):
     exh_exhorto.estado = "PENDIENTE"
     exh_exhorto.save()
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_id=obtener_modulo_id(MODULO),
         usuario=current_user,
         descripcion=safe_message("Se ha cambiado a PENDIENTE el exhorto"),
         url=url_for("exh_exhortos.detail", exh_exhorto_id=exh_exhorto.id),
@@ -716,7 +716,7 @@ def change_to_process(exh_exhorto_id):
         exh_exhorto.estado = "PROCESANDO"
         exh_exhorto.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message("Se ha cambiado a PROCESANDO el exhorto"),
             url=url_for("exh_exhortos.detail", exh_exhorto_id=exh_exhorto.id),
@@ -765,7 +765,7 @@ def change_to_refuse(exh_exhorto_id):
         exh_exhorto.respuesta_tipo_diligenciado = 0
         exh_exhorto.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message("Se ha RECHAZADO el exhorto"),
             url=url_for("exh_exhortos.detail", exh_exhorto_id=exh_exhorto.id),
@@ -826,7 +826,7 @@ def change_to_send(exh_exhorto_id):
     exh_exhorto.por_enviar_intentos = 0
     exh_exhorto.save()
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_id=obtener_modulo_id(MODULO),
         usuario=current_user,
         descripcion=safe_message("Se ha cambiado a POR ENVIAR el exhorto"),
         url=url_for("exh_exhortos.detail", exh_exhorto_id=exh_exhorto.id),
@@ -861,7 +861,7 @@ def change_to_transfer(exh_exhorto_id):
         exh_exhorto.estado = "TRANSFIRIENDO"
         exh_exhorto.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message("Se ha cambiado a TRANSFIRIENDO el exhorto"),
             url=url_for("exh_exhortos.detail", exh_exhorto_id=exh_exhorto.id),
@@ -12,9 +12,9 @@ from hercules.blueprints.bitacoras.models import Bitacora
 from hercules.blueprints.exh_exhortos.models import ExhExhorto
 from hercules.blueprints.exh_exhortos_actualizaciones.forms import ExhExhortoActualizacionForm
 from hercules.blueprints.exh_exhortos_actualizaciones.models import ExhExhortoActualizacion
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.pwgen import generar_identificador
 from lib.safe_string import safe_clave, safe_message, safe_string
@@ -135,7 +135,7 @@ def new_with_exh_exhorto(exh_exhorto_id):
         )
         exh_exhorto_actualizacion.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nuevo Actualización {exh_exhorto_actualizacion.id}"),
             url=url_for("exh_exhortos_actualizaciones.detail", exh_exhorto_actualizacion_id=exh_exhorto_actualizacion.id),
@@ -169,7 +169,7 @@ def edit(exh_exhorto_actualizacion_id):
         exh_exhorto_actualizacion.descripcion = safe_string(form.descripcion.data)
         exh_exhorto_actualizacion.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Editado Actualización {exh_exhorto_actualizacion.descripcion}"),
             url=url_for("exh_exhortos_actualizaciones.detail", exh_exhorto_actualizacion_id=exh_exhorto_actualizacion.id),
@@ -196,7 +196,7 @@ def delete(exh_exhorto_actualizacion_id):
     if exh_exhorto_actualizacion.estatus == "A":
         exh_exhorto_actualizacion.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Actualización {exh_exhorto_actualizacion.id}"),
             url=url_for("exh_exhortos_actualizaciones.detail", exh_exhorto_actualizacion_id=exh_exhorto_actualizacion.id),
@@ -214,7 +214,7 @@ def recover(exh_exhorto_actualizacion_id):
     if exh_exhorto_actualizacion.estatus == "B":
         exh_exhorto_actualizacion.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Actualización {exh_exhorto_actualizacion.id}"),
             url=url_for("exh_exhortos_actualizaciones.detail", exh_exhorto_actualizacion_id=exh_exhorto_actualizacion.id),
@@ -277,7 +277,7 @@ def change_to_cancel(exh_exhorto_actualizacion_id):
         exh_exhorto_actualizacion.estado = "CANCELADO"
         exh_exhorto_actualizacion.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message("Se ha CANCELADO la actualización"),
             url=url_for("exh_exhortos_actualizaciones.detail", exh_exhorto_actualizacion_id=exh_exhorto_actualizacion.id),
@@ -311,7 +311,7 @@ def change_to_pending(exh_exhorto_actualizacion_id):
         exh_exhorto_actualizacion.estado = "PENDIENTE"
         exh_exhorto_actualizacion.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message("Se ha cambiado a PENDIENTE la actualización"),
             url=url_for("exh_exhortos_actualizaciones.detail", exh_exhorto_actualizacion_id=exh_exhorto_actualizacion.id),
@@ -345,7 +345,7 @@ def change_to_send(exh_exhorto_actualizacion_id):
         exh_exhorto_actualizacion.estado = "POR ENVIAR"
         exh_exhorto_actualizacion.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message("Se ha cambiado a POR ENVIAR la actualización"),
             url=url_for("exh_exhortos_actualizaciones.detail", exh_exhorto_actualizacion_id=exh_exhorto_actualizacion.id),
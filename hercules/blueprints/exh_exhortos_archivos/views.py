@@ -16,9 +16,9 @@ from hercules.blueprints.bitacoras.models import Bitacora
 from hercules.blueprints.exh_exhortos.models import ExhExhorto
 from hercules.blueprints.exh_exhortos_archivos.forms import ExhExhortoArchivoEditForm, ExhExhortoArchivoNewForm
 from hercules.blueprints.exh_exhortos_archivos.models import ExhExhortoArchivo
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.exceptions import MyBucketNotFoundError, MyFileNotFoundError, MyNotValidParamError, MyUploadError
 from lib.google_cloud_storage import get_blob_name_from_url, get_file_from_gcs, upload_file_to_gcs
@@ -175,7 +175,7 @@ def new_with_exh_exhorto(exh_exhorto_id):
 
         # Insertar en la Bitácora
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nuevo Archivo {exh_exhorto_archivo.nombre_archivo}"),
             url=url_for("exh_exhortos_archivos.detail", exh_exhorto_archivo_id=exh_exhorto_archivo.id),
@@ -209,7 +209,7 @@ def edit(exh_exhorto_archivo_id):
         exh_exhorto_archivo.fecha_hora_recepcion = datetime.now()
         exh_exhorto_archivo.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Editado Archivo {exh_exhorto_archivo.nombre_archivo}"),
             url=url_for("exh_exhortos_archivos.detail", exh_exhorto_archivo_id=exh_exhorto_archivo.id),
@@ -239,7 +239,7 @@ def delete(exh_exhorto_archivo_id):
     if exh_exhorto_archivo.estatus == "A":
         exh_exhorto_archivo.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Archivo {exh_exhorto_archivo.id}"),
             url=url_for("exh_exhortos_archivos.detail", exh_exhorto_archivo_id=exh_exhorto_archivo.id),
@@ -258,7 +258,7 @@ def recover(exh_exhorto_archivo_id):
     if exh_exhorto_archivo.estatus == "B":
         exh_exhorto_archivo.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Archivo {exh_exhorto_archivo.id}"),
             url=url_for("exh_exhortos_archivos.detail", exh_exhorto_archivo_id=exh_exhorto_archivo.id),
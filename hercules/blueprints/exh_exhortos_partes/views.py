@@ -11,9 +11,9 @@ from hercules.blueprints.bitacoras.models import Bitacora
 from hercules.blueprints.exh_exhortos.models import ExhExhorto
 from hercules.blueprints.exh_exhortos_partes.forms import ExhExhortoParteForm
 from hercules.blueprints.exh_exhortos_partes.models import ExhExhortoParte
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_email, safe_message, safe_string, safe_telefono
 
@@ -156,7 +156,7 @@ def new_with_exh_exhorto(exh_exhorto_id):
             )
             exh_exhorto_parte.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Nueva Parte {exh_exhorto_parte.nombre_completo}"),
                 url=url_for("exh_exhortos_partes.detail", exh_exhorto_parte_id=exh_exhorto_parte.id),
@@ -232,7 +232,7 @@ def edit(exh_exhorto_parte_id):
             exh_exhorto_parte.telefono = safe_telefono(form.telefono.data)
             exh_exhorto_parte.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Editado Parte {exh_exhorto_parte.nombre_completo}"),
                 url=url_for("exh_exhortos_partes.detail", exh_exhorto_parte_id=exh_exhorto_parte.id),
@@ -264,7 +264,7 @@ def delete(exh_exhorto_parte_id):
     if exh_exhorto_parte.estatus == "A":
         exh_exhorto_parte.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Parte {exh_exhorto_parte.nombre_completo}"),
             url=url_for("exh_exhortos_partes.detail", exh_exhorto_parte_id=exh_exhorto_parte.id),
@@ -283,7 +283,7 @@ def recover(exh_exhorto_parte_id):
     if exh_exhorto_parte.estatus == "B":
         exh_exhorto_parte.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Parte {exh_exhorto_parte.nombre_completo}"),
             url=url_for("exh_exhortos_partes.detail", exh_exhorto_parte_id=exh_exhorto_parte.id),
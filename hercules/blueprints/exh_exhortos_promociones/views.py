@@ -12,10 +12,10 @@ from hercules.blueprints.bitacoras.models import Bitacora
 from hercules.blueprints.exh_exhortos.models import ExhExhorto
 from hercules.blueprints.exh_exhortos_promociones.forms import ExhExhortoPromocionForm
 from hercules.blueprints.exh_exhortos_promociones.models import ExhExhortoPromocion
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.municipios.models import Municipio
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.pwgen import generar_identificador
 from lib.safe_string import safe_message, safe_string
@@ -142,7 +142,7 @@ def new_with_exh_exhorto(exh_exhorto_id):
 
         # Insertar en la Bitácora
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nueva Promoción {exh_exhorto_promocion.folio_origen_promocion}"),
             url=url_for("exh_exhortos_promociones.detail", exh_exhorto_promocion_id=exh_exhorto_promocion.id),
@@ -183,7 +183,7 @@ def edit(exh_exhorto_promocion_id):
         exh_exhorto_promocion.observaciones = safe_string(form.observaciones.data, max_len=1024)
         exh_exhorto_promocion.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Editado Promoción {exh_exhorto_promocion.folio_origen_promocion}"),
             url=url_for("exh_exhortos_promociones.detail", exh_exhorto_promocion_id=exh_exhorto_promocion.id),
@@ -209,7 +209,7 @@ def delete(exh_exhorto_promocion_id):
     if exh_exhorto_promocion.estatus == "A":
         exh_exhorto_promocion.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Promoción {exh_exhorto_promocion.id}"),
             url=url_for("exh_exhortos_promociones.detail", exh_exhorto_promocion_id=exh_exhorto_promocion.id),
@@ -227,7 +227,7 @@ def recover(exh_exhorto_promocion_id):
     if exh_exhorto_promocion.estatus == "B":
         exh_exhorto_promocion.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Promoción {exh_exhorto_promocion.id}"),
             url=url_for("exh_exhortos_promociones.detail", exh_exhorto_promocion_id=exh_exhorto_promocion.id),
@@ -272,7 +272,7 @@ def launch_task_send(exh_exhorto_promocion_id):
         return redirect(url_for("exh_exhortos_promociones.detail", exh_exhorto_promocion_id=exh_exhorto_promocion.id))
     # Insertar en la bitácora
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_id=obtener_modulo_id(MODULO),
         usuario=current_user,
         descripcion=safe_message(f"Se ha ENVIADO la promoción {exh_exhorto_promocion.folio_origen_promocion}"),
         url=url_for("exh_exhortos_promociones.detail", exh_exhorto_promocion_id=exh_exhorto_promocion.id),
@@ -312,7 +312,7 @@ def change_to_cancel(exh_exhorto_promocion_id):
         exh_exhorto_promocion.estado = "CANCELADO"
         exh_exhorto_promocion.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message("Se ha CANCELADO la promoción"),
             url=url_for("exh_exhortos_promociones.detail", exh_exhorto_promocion_id=exh_exhorto_promocion.id),
@@ -346,7 +346,7 @@ def change_to_pending(exh_exhorto_promocion_id):
         exh_exhorto_promocion.estado = "PENDIENTE"
         exh_exhorto_promocion.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message("Se ha cambiado a PENDIENTE la promoción"),
             url=url_for("exh_exhortos_promociones.detail", exh_exhorto_promocion_id=exh_exhorto_promocion.id),
@@ -396,7 +396,7 @@ def change_to_send(exh_exhorto_promocion_id):
         exh_exhorto_promocion.estado = "POR ENVIAR"
         exh_exhorto_promocion.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message("Se ha cambiado a POR ENVIAR la promoción"),
             url=url_for("exh_exhortos_promociones.detail", exh_exhorto_promocion_id=exh_exhorto_promocion.id),
@@ -19,9 +19,9 @@ from hercules.blueprints.exh_exhortos_promociones_archivos.forms import (
     ExhExhortoPromocionArchivoNewForm,
 )
 from hercules.blueprints.exh_exhortos_promociones_archivos.models import ExhExhortoPromocionArchivo
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.exceptions import MyBucketNotFoundError, MyFileNotFoundError, MyNotValidParamError, MyUploadError
 from lib.google_cloud_storage import get_blob_name_from_url, get_file_from_gcs, upload_file_to_gcs
@@ -185,7 +185,7 @@ def new_with_exh_exhorto_promocion(exh_exhorto_promocion_id):
 
         # Insertar en la Bitácora
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nuevo Archivo {exh_exhorto_promocion_archivo.nombre_archivo}"),
             url=url_for(
@@ -229,7 +229,7 @@ def edit(exh_exhorto_promocion_archivo_id):
         exh_exhorto_promocion_archivo.fecha_hora_recepcion = datetime.now()
         exh_exhorto_promocion_archivo.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Editado Archivo {exh_exhorto_promocion_archivo.nombre_archivo}"),
             url=url_for(
@@ -259,7 +259,7 @@ def delete(exh_exhorto_promocion_archivo_id):
     if exh_exhorto_promocion_archivo.estatus == "A":
         exh_exhorto_promocion_archivo.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Archivo {exh_exhorto_promocion_archivo.id}"),
             url=url_for(
@@ -281,7 +281,7 @@ def recover(exh_exhorto_promocion_archivo_id):
     if exh_exhorto_promocion_archivo.estatus == "B":
         exh_exhorto_promocion_archivo.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Archivo {exh_exhorto_promocion_archivo.id}"),
             url=url_for(
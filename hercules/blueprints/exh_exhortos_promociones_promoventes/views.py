@@ -11,9 +11,9 @@ from hercules.blueprints.bitacoras.models import Bitacora
 from hercules.blueprints.exh_exhortos_promociones.models import ExhExhortoPromocion
 from hercules.blueprints.exh_exhortos_promociones_promoventes.forms import ExhExhortoPromocionPromoventeForm
 from hercules.blueprints.exh_exhortos_promociones_promoventes.models import ExhExhortoPromocionPromovente
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_email, safe_message, safe_string, safe_telefono
 
@@ -162,7 +162,7 @@ def new_with_exh_exhorto_promocion(exh_exhorto_promocion_id):
             )
             exh_exhorto_promocion_promovente.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Nuevo Promovente {exh_exhorto_promocion_promovente.nombre}"),
                 url=url_for(
@@ -257,7 +257,7 @@ def edit(exh_exhorto_promocion_promovente_id):
             exh_exhorto_promocion_promovente.telefono = safe_telefono(form.telefono.data)
             exh_exhorto_promocion_promovente.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Editado Parte {exh_exhorto_promocion_promovente.nombre}"),
                 url=url_for(
@@ -303,7 +303,7 @@ def delete(exh_exhorto_promocion_promovente_id):
     if exh_exhorto_promocion_promovente.estatus == "A":
         exh_exhorto_promocion_promovente.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Promovente {exh_exhorto_promocion_promovente.id}"),
             url=url_for(
@@ -331,7 +331,7 @@ def recover(exh_exhorto_promocion_promovente_id):
     if exh_exhorto_promocion_promovente.estatus == "B":
         exh_exhorto_promocion_promovente.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Promovente {exh_exhorto_promocion_promovente.id}"),
             url=url_for(
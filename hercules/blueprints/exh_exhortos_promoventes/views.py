@@ -11,9 +11,9 @@ from hercules.blueprints.bitacoras.models import Bitacora
 from hercules.blueprints.exh_exhortos.models import ExhExhorto
 from hercules.blueprints.exh_exhortos_promoventes.forms import ExhExhortoPromoventeForm
 from hercules.blueprints.exh_exhortos_promoventes.models import ExhExhortoPromovente
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_email, safe_message, safe_string, safe_telefono
 
@@ -156,7 +156,7 @@ def new_with_exh_exhorto(exh_exhorto_id):
             )
             exh_exhorto_promovente.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Nueva Parte {exh_exhorto_promovente.nombre_completo}"),
                 url=url_for("exh_exhortos_promoventes.detail", exh_exhorto_promovente_id=exh_exhorto_promovente.id),
@@ -232,7 +232,7 @@ def edit(exh_exhorto_promovente_id):
             exh_exhorto_promovente.telefono = safe_telefono(form.telefono.data)
             exh_exhorto_promovente.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Editado Parte {exh_exhorto_promovente.nombre_completo}"),
                 url=url_for("exh_exhortos_promoventes.detail", exh_exhorto_promovente_id=exh_exhorto_promovente.id),
@@ -264,7 +264,7 @@ def delete(exh_exhorto_promovente_id):
     if exh_exhorto_promovente.estatus == "A":
         exh_exhorto_promovente.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Promovente {exh_exhorto_promovente.nombre_completo}"),
             url=url_for("exh_exhortos_promoventes.detail", exh_exhorto_promovente_id=exh_exhorto_promovente.id),
@@ -283,7 +283,7 @@ def recover(exh_exhorto_promovente_id):
     if exh_exhorto_promovente.estatus == "B":
         exh_exhorto_promovente.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Promovente {exh_exhorto_promovente.nombre_completo}"),
             url=url_for("exh_exhortos_promoventes.detail", exh_exhorto_promovente_id=exh_exhorto_promovente.id),
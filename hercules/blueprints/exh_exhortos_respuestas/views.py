@@ -13,10 +13,10 @@ from hercules.blueprints.exh_areas.models import ExhArea
 from hercules.blueprints.exh_exhortos.models import ExhExhorto
 from hercules.blueprints.exh_exhortos_respuestas.forms import ExhExhortoRespuestaForm
 from hercules.blueprints.exh_exhortos_respuestas.models import ExhExhortoRespuesta
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.municipios.models import Municipio
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.pwgen import generar_identificador
 from lib.safe_string import safe_expediente, safe_message, safe_string
@@ -187,7 +187,7 @@ def new_with_exh_exhorto(exh_exhorto_id):
 
         # Insertar en la Bitácora
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nueva Respuesta {exh_exhorto_respuesta.respuesta_origen_id}"),
             url=url_for("exh_exhortos_respuestas.detail", exh_exhorto_respuesta_id=exh_exhorto_respuesta.id),
@@ -252,7 +252,7 @@ def edit(exh_exhorto_respuesta_id):
 
         # Insertar en la Bitácora
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Editada Respuesta {exh_exhorto_respuesta.respuesta_origen_id}"),
             url=url_for("exh_exhortos_respuestas.detail", exh_exhorto_respuesta_id=exh_exhorto_respuesta.id),
@@ -281,7 +281,7 @@ def delete(exh_exhorto_respuesta_id):
     if exh_exhorto_respuesta.estatus == "A":
         exh_exhorto_respuesta.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado respuesta {exh_exhorto_respuesta.id}"),
             url=url_for("exh_exhortos_respuestas.detail", exh_exhorto_respuesta_id=exh_exhorto_respuesta.id),
@@ -299,7 +299,7 @@ def recover(exh_exhorto_respuesta_id):
     if exh_exhorto_respuesta.estatus == "B":
         exh_exhorto_respuesta.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado respuesta {exh_exhorto_respuesta.id}"),
             url=url_for("exh_exhortos_respuestas.detail", exh_exhorto_respuesta_id=exh_exhorto_respuesta.id),
@@ -336,7 +336,7 @@ def launch_task_send(exh_exhorto_respuesta_id):
         return redirect(url_for("exh_exhortos_respuestas.detail", exh_exhorto_respuesta_id=exh_exhorto_respuesta.id))
     # Insertar en la Bitácora
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_id=obtener_modulo_id(MODULO),
         usuario=current_user,
         descripcion=safe_message(f"Se ha ENVIADO la respuesta {exh_exhorto_respuesta.respuesta_origen_id}"),
         url=url_for("exh_exhortos_respuestas.detail", exh_exhorto_respuesta_id=exh_exhorto_respuesta.id),
@@ -376,7 +376,7 @@ def change_to_cancel(exh_exhorto_respuesta_id):
         exh_exhorto_respuesta.estado = "CANCELADO"
         exh_exhorto_respuesta.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message("Se ha CANCELADO la respuesta"),
             url=url_for("exh_exhortos_respuestas.detail", exh_exhorto_respuesta_id=exh_exhorto_respuesta.id),
@@ -410,7 +410,7 @@ def change_to_pending(exh_exhorto_respuesta_id):
         exh_exhorto_respuesta.estado = "PENDIENTE"
         exh_exhorto_respuesta.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message("Se ha cambiado a PENDIENTE la respuesta"),
             url=url_for("exh_exhortos_respuestas.detail", exh_exhorto_respuesta_id=exh_exhorto_respuesta.id),
@@ -452,7 +452,7 @@ def change_to_send(exh_exhorto_respuesta_id):
         exh_exhorto_respuesta.estado = "POR ENVIAR"
         exh_exhorto_respuesta.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message("Se ha cambiado a POR ENVIAR la respuesta"),
             url=url_for("exh_exhortos_respuestas.detail", exh_exhorto_respuesta_id=exh_exhorto_respuesta.id),
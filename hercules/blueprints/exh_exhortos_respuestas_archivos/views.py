@@ -19,9 +19,9 @@ from hercules.blueprints.exh_exhortos_respuestas_archivos.forms import (
     ExhExhortoRespuestaArchivoNewForm,
 )
 from hercules.blueprints.exh_exhortos_respuestas_archivos.models import ExhExhortoRespuestaArchivo
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.exceptions import MyBucketNotFoundError, MyFileNotFoundError, MyNotValidParamError, MyUploadError
 from lib.google_cloud_storage import get_blob_name_from_url, get_file_from_gcs, upload_file_to_gcs
@@ -180,7 +180,7 @@ def new_with_exh_exhorto_respuesta(exh_exhorto_respuesta_id):
 
         # Insertar en la Bitácora
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nuevo Archivo a la Respuesta {exh_exhorto_respuesta_archivo.nombre_archivo}"),
             url=url_for(
@@ -223,7 +223,7 @@ def edit(exh_exhorto_respuesta_archivo_id):
         exh_exhorto_respuesta_archivo.tipo_documento = form.tipo_documento.data
         exh_exhorto_respuesta_archivo.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Editado Archivo {exh_exhorto_respuesta_archivo.nombre_archivo}"),
             url=url_for(
@@ -253,7 +253,7 @@ def delete(exh_exhorto_respuesta_archivo_id):
     if exh_exhorto_respuesta_archivo.estatus == "A":
         exh_exhorto_respuesta_archivo.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado archivo de respuesta {exh_exhorto_respuesta_archivo.id}"),
             url=url_for("exh_exhortos_respuestas_archivos.detail", instance_id=exh_exhorto_respuesta_archivo.id),
@@ -273,7 +273,7 @@ def recover(exh_exhorto_respuesta_archivo_id):
     if exh_exhorto_respuesta_archivo.estatus == "B":
         exh_exhorto_respuesta_archivo.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado archivo de respuesta {exh_exhorto_respuesta_archivo.id}"),
             url=url_for(
@@ -12,9 +12,9 @@ from hercules.blueprints.bitacoras.models import Bitacora
 from hercules.blueprints.exh_exhortos_respuestas.models import ExhExhortoRespuesta
 from hercules.blueprints.exh_exhortos_respuestas_videos.forms import ExhExhortoRespuestaVideoForm
 from hercules.blueprints.exh_exhortos_respuestas_videos.models import ExhExhortoRespuestaVideo
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_message, safe_string, safe_url
 
@@ -120,7 +120,7 @@ def new_with_exh_exhorto_respuesta(exh_exhorto_respuesta_id):
         exh_exhorto_respuesta_video.save()
         # Insertar en la Bitácora
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nuevo Video a la Respuesta {exh_exhorto_respuesta_video.titulo}"),
             url=url_for("exh_exhortos_respuestas_videos.detail", exh_exhorto_respuesta_video_id=exh_exhorto_respuesta_video.id),
@@ -158,7 +158,7 @@ def edit(exh_exhorto_respuesta_video_id):
         exh_exhorto_respuesta_video.url_acceso = safe_url(form.url_acceso.data)
         exh_exhorto_respuesta_video.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Editado Exhorto Video {exh_exhorto_respuesta_video.titulo}"),
             url=url_for("exh_exhortos_respuestas_videos.detail", exh_exhorto_respuesta_video_id=exh_exhorto_respuesta_video.id),
@@ -184,7 +184,7 @@ def delete(exh_exhorto_respuesta_video_id):
     if exh_exhorto_respuesta_video.estatus == "A":
         exh_exhorto_respuesta_video.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Exhorto Video {exh_exhorto_respuesta_video.id}"),
             url=url_for("exh_exhortos_respuestas_videos.detail", exh_exhorto_respuesta_video_id=exh_exhorto_respuesta_video.id),
@@ -204,7 +204,7 @@ def recover(exh_exhorto_respuesta_video_id):
     if exh_exhorto_respuesta_video.estatus == "B":
         exh_exhorto_respuesta_video.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Exhorto Video {exh_exhorto_respuesta_video.id}"),
             url=url_for("exh_exhortos_respuestas_videos.detail", exh_exhorto_respuesta_video_id=exh_exhorto_respuesta_video.id),
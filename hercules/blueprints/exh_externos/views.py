@@ -10,9 +10,9 @@ from flask_login import current_user, login_required
 from hercules.blueprints.bitacoras.models import Bitacora
 from hercules.blueprints.exh_externos.forms import ExhExternoForm
 from hercules.blueprints.exh_externos.models import ExhExterno
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_clave, safe_message, safe_string
 
@@ -142,7 +142,7 @@ def new():
         )
         exh_externo.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nuevo Externo {exh_externo.clave}"),
             url=url_for("exh_externos.detail", exh_externo_id=exh_externo.id),
@@ -191,7 +191,7 @@ def edit(exh_externo_id):
             exh_externo.endpoint_recibir_promocion_archivo = form.endpoint_recibir_promocion_archivo.data
             exh_externo.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Editado Externo {exh_externo.clave}"),
                 url=url_for("exh_externos.detail", exh_externo_id=exh_externo.id),
@@ -225,7 +225,7 @@ def delete(exh_externo_id):
     if exh_externo.estatus == "A":
         exh_externo.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Externo {exh_externo.clave}"),
             url=url_for("exh_externos.detail", exh_externo_id=exh_externo.id),
@@ -243,7 +243,7 @@ def recover(exh_externo_id):
     if exh_externo.estatus == "B":
         exh_externo.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Externo {exh_externo.clave}"),
             url=url_for("exh_externos.detail", exh_externo_id=exh_externo.id),
@@ -12,6 +12,7 @@ from hercules.blueprints.exh_tipos_diligencias.models import ExhTipoDiligencia
 from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.cache import cache_condicional
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_clave, safe_message, safe_string
 
@@ -67,6 +68,7 @@ def datatable_json():
 
 
 @exh_tipos_diligencias.route("/exh_tipos_diligencias/select_json", methods=["GET", "POST"])
+@cache_condicional(ExhTipoDiligencia)
 def select_json():
     """Proporcionar el JSON para elegir con un select tradicional"""
     consulta = ExhTipoDiligencia.query.order_by(ExhTipoDiligencia.descripcion)
@@ -0,0 +1,196 @@
+"""
+Expedientes Índices, fuentes
+
+Cada módulo con expediente es una fuente del índice. Al insertar, modificar o eliminar
+un registro por medio del ORM se actualiza su renglón en expedientes_indices en la
+misma transacción. Las modificaciones masivas con query.update() no pasan por aquí,
+para esos casos está la orden
+
+    cli expedientes_indices reconstruir
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime
+
+from sqlalchemy import delete, event, inspect
+from sqlalchemy.dialects.postgresql import insert
+
+from hercules.blueprints.arc_documentos.models import ArcDocumento
+from hercules.blueprints.audiencias.models import Audiencia
+from hercules.blueprints.edictos.models import Edicto
+from hercules.blueprints.exh_exhortos.models import ExhExhorto
+from hercules.blueprints.expedientes_indices.models import ExpedienteIndice
+from hercules.blueprints.sentencias.models import Sentencia
+from hercules.blueprints.ubicaciones_expedientes.models import UbicacionExpediente
+from hercules.extensions import database
+from lib.safe_string import extract_expediente_anio, extract_expediente_num, safe_expediente
+
+RESTRICCION_UNICA = "expedientes_indices_tabla_registro_id_key"
+
+
+@dataclass(frozen=True)
+class Fuente:
+    """Módulo que alimenta el índice de expedientes"""
+
+    modelo: type
+    modulo: str  # Nombre del módulo para revisar los permisos
+    columna_expediente: str
+    columna_fecha: str
+    columna_descripcion: str
+    detalle: str  # Endpoint del detalle
+    detalle_parametro: str
+
+
+FUENTES = {
+    "sentencias": Fuente(Sentencia, "SENTENCIAS", "expediente", "fecha", "descripcion", "sentencias.detail", "sentencia_id"),
+    "edictos": Fuente(Edicto, "EDICTOS", "expediente", "fecha", "descripcion", "edictos.detail", "edicto_id"),
+    "audiencias": Fuente(
+        Audiencia, "AUDIENCIAS", "expediente", "tiempo", "tipo_audiencia", "audiencias.detail", "audiencia_id"
+    ),
+    "arc_documentos": Fuente(
+        ArcDocumento, "ARC DOCUMENTOS", "expediente", "creado", "juicio", "arc_documentos.detail", "documento_id"
+    ),
+    "ubicaciones_expedientes": Fuente(
+        UbicacionExpediente,
+        "UBICACIONES EXPEDIENTES",
+        "expediente",
+        "modificado",
+        "ubicacion",
+        "ubicaciones_expedientes.detail",
+        "ubicacion_expediente_id",
+    ),
+    "exh_exhortos": Fuente(
+        ExhExhorto,
+        "EXH EXHORTOS",
+        "numero_expediente_origen",
+        "creado",
+        "tipo_juicio_asunto_delitos",
+        "exh_exhortos.detail",
+        "exh_exhorto_id",
+    ),
+}
+
+
+def descomponer_expediente(texto: str) -> tuple[str, int, int, str] | None:
+    """Entregar (expediente, número, año, sufijo) o None si no es un expediente válido"""
+    try:
+        expediente = safe_expediente(texto)
+    except (IndexError, ValueError):
+        return None
+    if expediente == "":
+        return None
+    sufijo = expediente.split("/", 1)[1][4:].lstrip("-")
+    return expediente, extract_expediente_num(expediente), extract_expediente_anio(expediente), sufijo
+
+
+def elaborar_renglon(tabla: str, registro) -> dict | None:
+    """Elaborar el renglón del índice para el registro, None si no debe estar en el índice"""
+    fuente = FUENTES[tabla]
+    if registro.estatus != "A":
+        return None
+    partes = descomponer_expediente(getattr(registro, fuente.columna_expediente))
+    if partes is None:
+        return None
+    expediente, expediente_num, expediente_anio, expediente_sufijo = partes
+    fecha = getattr(registro, fuente.columna_fecha)
+    if isinstance(fecha, datetime):
+        fecha = fecha.date()
+    return {
+        "autoridad_id": registro.autoridad_id,
+        "tabla": tabla,
+        "registro_id": registro.id,
+        "fecha": fecha if isinstance(fecha, date) else None,
+        "descripcion": str(getattr(registro, fuente.columna_descripcion) or "")[:256],
+        "expediente": expediente,
+        "expediente_num": expediente_num,
+        "expediente_anio": expediente_anio,
+        "expediente_sufijo": expediente_sufijo,
+    }
+
+
+def _guardar(connection, renglones: list) -> None:
+    """Insertar o actualizar los renglones del índice"""
+    sentencia = insert(ExpedienteIndice.__table__)
+    columnas = [columna for columna in renglones[0] if columna not in ("tabla", "registro_id")]
+    connection.execute(
+        sentencia.on_conflict_do_update(
+            constraint=RESTRICCION_UNICA,
+            set_={columna: sentencia.excluded[columna] for columna in columnas},
+        ),
+        renglones,
+    )
+
+
+def _quitar(connection, tabla: str, registro_id: int) -> None:
+    """Quitar el renglón del índice"""
+    indice = ExpedienteIndice.__table__
+    connection.execute(delete(indice).where(indice.c.tabla == tabla).where(indice.c.registro_id == registro_id))
+
+
+def _sincronizar(connection, registro) -> None:
+    """Guardar o quitar el renglón del registro en el índice"""
+    renglon = elaborar_renglon(registro.__tablename__, registro)
+    if renglon is None:
+        _quitar(connection, registro.__tablename__, registro.id)
+    else:
+        _guardar(connection, [renglon])
+
+
+def _al_insertar(mapper, connection, registro) -> None:
+    """Después de insertar"""
+    _sincronizar(connection, registro)
+
+
+def _al_modificar(mapper, connection, registro) -> None:
+    """Después de modificar, sólo si cambió alguna columna que está en el índice"""
+    fuente = FUENTES[registro.__tablename__]
+    estado = inspect(registro)
+    columnas = ("autoridad_id", "estatus", fuente.columna_expediente, fuente.columna_fecha, fuente.columna_descripcion)
+    if any(estado.attrs[columna].history.has_changes() for columna in columnas):
+        _sincronizar(connection, registro)
+
+
+def _al_eliminar(mapper, connection, registro) -> None:
+    """Después de eliminar de la base de datos"""
+    _quitar(connection, registro.__tablename__, registro.id)
+
+
+for _fuente in FUENTES.values():
+    event.listen(_fuente.modelo, "after_insert", _al_insertar)
+    event.listen(_fuente.modelo, "after_update", _al_modificar)
+    event.listen(_fuente.modelo, "after_delete", _al_eliminar)
+
+
+def reconstruir(tabla: str, lote: int = 1000) -> int:
+    """Reconstruir los renglones del índice de una fuente, entrega la cantidad de renglones"""
+    modelo = FUENTES[tabla].modelo
+    conexion = database.session.connection()
+    indice = ExpedienteIndice.__table__
+    conexion.execute(delete(indice).where(indice.c.tabla == tabla))
+    cantidad = 0
+    ultimo_id = 0
+    while True:
+        consulta = modelo.query.filter(modelo.id > ultimo_id).filter(modelo.estatus == "A")
+        registros = consulta.order_by(modelo.id).limit(lote).all()
+        if len(registros) == 0:
+            break
+        renglones = [renglon for renglon in (elaborar_renglon(tabla, registro) for registro in registros) if renglon]
+        if len(renglones) > 0:
+            _guardar(conexion, renglones)
+        cantidad += len(renglones)
+        ultimo_id = registros[-1].id
+        database.session.expunge_all()  # Liberar la memoria de los registros del lote
+    database.session.commit()
+    return cantidad
+
+
+def sincronizar_ids(connection, tabla: str, ids: list[int]) -> None:
+    """Sincronizar los renglones del índice de los ids modificados con un UPDATE masivo"""
+    modelo = FUENTES[tabla].modelo
+    indice = ExpedienteIndice.__table__
+    connection.execute(delete(indice).where(indice.c.tabla == tabla).where(indice.c.registro_id.in_(ids)))
+    consulta = database.session.query(modelo).populate_existing()  # Tomar los valores que dejó el UPDATE
+    registros = consulta.filter(modelo.id.in_(ids)).filter(modelo.estatus == "A").all()
+    renglones = [renglon for renglon in (elaborar_renglon(tabla, registro) for registro in registros) if renglon]
+    if len(renglones) > 0:
+        _guardar(connection, renglones)
@@ -0,0 +1,53 @@
+"""
+Expedientes Índices, modelos
+"""
+
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import Date, ForeignKey, Index, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from hercules.extensions import database
+
+
+class ExpedienteIndice(database.Model):
+    """ExpedienteIndice, un renglón por cada registro de otro módulo que tiene un expediente"""
+
+    # Nombre de la tabla
+    __tablename__ = "expedientes_indices"
+
+    # Restricción única e índices para buscar con y sin autoridad
+    __table_args__ = (
+        UniqueConstraint("tabla", "registro_id", name="expedientes_indices_tabla_registro_id_key"),
+        Index(
+            "expedientes_indices_autoridad_expediente",
+            "autoridad_id",
+            "expediente_num",
+            "expediente_anio",
+            "expediente_sufijo",
+        ),
+        Index("expedientes_indices_expediente", "expediente_num", "expediente_anio"),
+    )
+
+    # Clave primaria
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    # Clave foránea
+    autoridad_id: Mapped[int] = mapped_column(ForeignKey("autoridades.id"))
+
+    # Columnas del registro en el otro módulo
+    tabla: Mapped[str] = mapped_column(String(64))
+    registro_id: Mapped[int]
+    fecha: Mapped[Optional[date]] = mapped_column(Date())
+    descripcion: Mapped[str] = mapped_column(String(256), default="")
+
+    # Columnas del expediente normalizado con safe_expediente
+    expediente: Mapped[str] = mapped_column(String(16))
+    expediente_num: Mapped[int]
+    expediente_anio: Mapped[int]
+    expediente_sufijo: Mapped[str] = mapped_column(String(16), default="")
+
+    def __repr__(self):
+        """Representación"""
+        return f"<ExpedienteIndice {self.tabla} {self.registro_id}>"
@@ -0,0 +1,66 @@
+"""
+Expedientes Índices, vistas
+"""
+
+from flask import Blueprint, request, url_for
+from flask_login import current_user, login_required
+
+from hercules.blueprints.expedientes_indices.fuentes import FUENTES, descomponer_expediente
+from hercules.blueprints.expedientes_indices.models import ExpedienteIndice
+from lib.catalogos import consultar_por_id
+
+LIMITE = 200
+
+expedientes_indices = Blueprint("expedientes_indices", __name__, template_folder="templates")
+
+
+@expedientes_indices.before_request
+@login_required
+def before_request():
+    """Sólo usuarios autenticados, los permisos se revisan por cada módulo de las fuentes"""
+
+
+@expedientes_indices.route("/expedientes_indices/buscar_json", methods=["GET", "POST"])
+def search_json():
+    """JSON con los registros de todos los módulos que tienen el expediente"""
+
+    # Validar el expediente
+    partes = descomponer_expediente(request.values.get("expediente", ""))
+    if partes is None:
+        return {"success": False, "message": "Expediente no válido", "data": []}
+    expediente, expediente_num, expediente_anio, expediente_sufijo = partes
+
+    # Sólo los módulos que puede ver el usuario
+    tablas = [tabla for tabla, fuente in FUENTES.items() if current_user.can_view(fuente.modulo)]
+    if len(tablas) == 0:
+        return {"success": False, "message": "No tiene permiso para ver ningún módulo con expedientes", "data": []}
+
+    # Consultar con el índice, el sufijo sólo se filtra si viene en el expediente
+    consulta = ExpedienteIndice.query.filter(ExpedienteIndice.expediente_num == expediente_num)
+    consulta = consulta.filter(ExpedienteIndice.expediente_anio == expediente_anio)
+    if "autoridad_id" in request.values:
+        autoridad = consultar_por_id("autoridades", request.values["autoridad_id"])
+        if autoridad:
+            consulta = consulta.filter(ExpedienteIndice.autoridad_id == autoridad.id)
+    if expediente_sufijo != "":
+        consulta = consulta.filter(ExpedienteIndice.expediente_sufijo == expediente_sufijo)
+    consulta = consulta.filter(ExpedienteIndice.tabla.in_(tablas))
+
+    # Elaborar los datos
+    data = []
+    for renglon in consulta.order_by(ExpedienteIndice.fecha.desc(), ExpedienteIndice.id.desc()).limit(LIMITE).all():
+        fuente = FUENTES[renglon.tabla]
+        autoridad = consultar_por_id("autoridades", renglon.autoridad_id)
+        data.append(
+            {
+                "modulo": fuente.modulo,
+                "fecha": renglon.fecha.strftime("%Y-%m-%d") if renglon.fecha else "",
+                "autoridad_clave": autoridad.clave if autoridad else "",
+                "expediente": renglon.expediente,
+                "descripcion": renglon.descripcion,
+                "url": url_for(fuente.detalle, **{fuente.detalle_parametro: renglon.registro_id}),
+            }
+        )
+
+    # Entregar JSON
+    return {"success": True, "message": f"Se encontraron {len(data)} registros de {expediente}", "data": data}
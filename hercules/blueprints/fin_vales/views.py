@@ -23,12 +23,12 @@ from hercules.blueprints.fin_vales.forms import (
     FinValeStep6ArchiveForm,
 )
 from hercules.blueprints.fin_vales.models import FinVale
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.roles.models import Rol
 from hercules.blueprints.usuarios.decorators import permission_required
 from hercules.blueprints.usuarios.models import Usuario
 from hercules.blueprints.usuarios_roles.models import UsuarioRol
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_email, safe_message, safe_string
 
@@ -461,7 +461,7 @@ def edit(fin_vale_id):
             fin_vale.monto = float(form.monto.data)
             fin_vale.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Editado Vale {fin_vale.justificacion}"),
                 url=url_for("fin_vales.detail", fin_vale_id=fin_vale.id),
@@ -529,7 +529,7 @@ def step_1_create():
         )
         fin_vale.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nuevo Vale de Gasolina {fin_vale.id}"),
             url=url_for("fin_vales.detail", fin_vale_id=fin_vale.id),
@@ -796,7 +796,7 @@ def step_4_deliver(fin_vale_id):
         fin_vale.estado = "ENTREGADO"
         fin_vale.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Entregado el Vale de Gasolina {fin_vale.id}"),
             url=url_for("fin_vales.detail", fin_vale_id=fin_vale.id),
@@ -848,7 +848,7 @@ def step_5_attachments(fin_vale_id):
         fin_vale.estado = "POR REVISAR"
         fin_vale.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Por revisar Vale {fin_vale.id}"),
             url=url_for("fin_vales.detail", fin_vale_id=fin_vale.id),
@@ -901,7 +901,7 @@ def step_6_archive(fin_vale_id):
         fin_vale.estado = "ARCHIVADO"
         fin_vale.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Archivado Vale {fin_vale.id}"),
             url=url_for("fin_vales.detail", fin_vale_id=fin_vale.id),
@@ -923,7 +923,7 @@ def delete(fin_vale_id):
     if fin_vale.estatus == "A":
         fin_vale.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado FinVale {fin_vale.id}"),
             url=url_for("fin_vales.detail", fin_vale_id=fin_vale.id),
@@ -941,7 +941,7 @@ def recover(fin_vale_id):
     if fin_vale.estatus == "B":
         fin_vale.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado FinVale {fin_vale.id}"),
             url=url_for("fin_vales.detail", fin_vale_id=fin_vale.id),
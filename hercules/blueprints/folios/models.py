@@ -0,0 +1,44 @@
+"""
+Folios, modelos
+"""
+
+from sqlalchemy import ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from hercules.extensions import database
+
+
+class Folio(database.Model):
+    """Folio, el último número asignado por tabla, autoridad y año"""
+
+    # Nombre de la tabla
+    __tablename__ = "folios"
+
+    # Clave primaria
+    tabla: Mapped[str] = mapped_column(String(64), primary_key=True)
+    autoridad_id: Mapped[int] = mapped_column(ForeignKey("autoridades.id"), primary_key=True)
+    anio: Mapped[int] = mapped_column(primary_key=True)
+
+    # Columnas
+    ultimo: Mapped[int] = mapped_column(default=0)
+
+    def __repr__(self):
+        """Representación"""
+        return f"<Folio {self.tabla} {self.autoridad_id} {self.anio} {self.ultimo}>"
+
+
+class FolioLiberado(database.Model):
+    """FolioLiberado, número que se liberó al cancelar o eliminar y se vuelve a asignar antes que uno nuevo"""
+
+    # Nombre de la tabla
+    __tablename__ = "folios_liberados"
+
+    # Clave primaria
+    tabla: Mapped[str] = mapped_column(String(64), primary_key=True)
+    autoridad_id: Mapped[int] = mapped_column(ForeignKey("autoridades.id"), primary_key=True)
+    anio: Mapped[int] = mapped_column(primary_key=True)
+    numero: Mapped[int] = mapped_column(primary_key=True)
+
+    def __repr__(self):
+        """Representación"""
+        return f"<FolioLiberado {self.tabla} {self.autoridad_id} {self.anio} {self.numero}>"
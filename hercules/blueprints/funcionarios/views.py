@@ -11,9 +11,9 @@ from hercules.blueprints.bitacoras.models import Bitacora
 from hercules.blueprints.centros_trabajos.models import CentroTrabajo
 from hercules.blueprints.funcionarios.forms import FuncionarioAdminForm
 from hercules.blueprints.funcionarios.models import Funcionario
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_email, safe_message, safe_string
 
@@ -213,7 +213,7 @@ def new():
             )
             funcionario.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Nuevo funcionario {funcionario.nombre}"),
                 url=url_for("funcionarios.detail", funcionario_id=funcionario.id),
@@ -267,7 +267,7 @@ def edit(funcionario_id):
             funcionario.ingreso_fecha = form.ingreso_fecha.data
             funcionario.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Editado funcionario {funcionario.nombre}"),
                 url=url_for("funcionarios.detail", funcionario_id=funcionario.id),
@@ -300,7 +300,7 @@ def delete(funcionario_id):
     if funcionario.estatus == "A":
         funcionario.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Funcionario {funcionario.nombre}"),
             url=url_for("funcionarios.detail", funcionario_id=funcionario.id),
@@ -318,7 +318,7 @@ def recover(funcionario_id):
     if funcionario.estatus == "B":
         funcionario.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Funcionario {funcionario.nombre}"),
             url=url_for("funcionarios.detail", funcionario_id=funcionario.id),
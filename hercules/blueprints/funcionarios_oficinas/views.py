@@ -11,10 +11,10 @@ from hercules.blueprints.bitacoras.models import Bitacora
 from hercules.blueprints.funcionarios.models import Funcionario
 from hercules.blueprints.funcionarios_oficinas.forms import FuncionarioOficinaForm, FuncionarioOficinaWithDomicilioForm
 from hercules.blueprints.funcionarios_oficinas.models import FuncionarioOficina
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.oficinas.models import Oficina
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_clave, safe_message, safe_string
 
@@ -186,7 +186,7 @@ def delete(funcionario_oficina_id):
     if funcionario_oficina.estatus == "A":
         funcionario_oficina.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Funcionario-Oficina {funcionario_oficina.descripcion}"),
             url=url_for("funcionarios_oficinas.detail", funcionario_oficina_id=funcionario_oficina.id),
@@ -204,7 +204,7 @@ def recover(funcionario_oficina_id):
     if funcionario_oficina.estatus == "B":
         funcionario_oficina.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Funcionario-Oficina {funcionario_oficina.descripcion}"),
             url=url_for("funcionarios_oficinas.detail", funcionario_oficina_id=funcionario_oficina.id),
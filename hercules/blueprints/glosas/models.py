@@ -3,11 +3,14 @@ Glosas, modelos
 """
 
 from datetime import date
+from typing import Optional
 
 from sqlalchemy import Date, Enum, ForeignKey, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from hercules.extensions import database
+from lib.busqueda import columna_buscador, indices_busqueda
+from lib.indices import indices_activos
 from lib.universal_mixin import UniversalMixin
 
 
@@ -31,6 +34,11 @@ class Glosa(database.Model, UniversalMixin):
     # Nombre de la tabla
     __tablename__ = "glosas"
 
+    # Índices para la búsqueda de texto completo e índices parciales de los registros activos
+    __table_args__ = indices_busqueda("glosas", "descripcion") + indices_activos(
+        "glosas", ("autoridad_id", "fecha"), ("autoridad_id", "id")
+    )
+
     # Clave primaria
     id: Mapped[int] = mapped_column(primary_key=True)
 
@@ -46,6 +54,9 @@ class Glosa(database.Model, UniversalMixin):
     archivo: Mapped[str] = mapped_column(String(256), default="", server_default="")
     url: Mapped[str] = mapped_column(String(512), default="", server_default="")
 
+    # Columna generada para la búsqueda de texto completo
+    buscador: Mapped[Optional[str]] = columna_buscador("descripcion")
+
     @property
     def descargar_url(self):
         """URL para descargar el archivo desde el sitio web"""
@@ -14,11 +14,14 @@ from werkzeug.exceptions import NotFound
 
 from hercules.blueprints.autoridades.models import Autoridad
 from hercules.blueprints.bitacoras.models import Bitacora
+from hercules.blueprints.cantidades_diarias.fuentes import cantidades_por_dia
 from hercules.blueprints.glosas.forms import GlosaEditForm, GlosaNewForm
 from hercules.blueprints.glosas.models import Glosa
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.busqueda import filtrar_por_texto
+from lib.cache import cache_coalescente
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.exceptions import (
     MyBucketNotFoundError,
@@ -30,6 +33,7 @@ from lib.exceptions import (
     MyUnknownExtensionError,
 )
 from lib.google_cloud_storage import get_blob_name_from_url, get_file_from_gcs
+from lib.indices import Listado
 from lib.safe_string import safe_clave, safe_expediente, safe_message, safe_string
 from lib.storage import GoogleCloudStorage
 
@@ -39,6 +43,7 @@ local_tz = timezone(TIMEZONE)
 
 # Constantes de este módulo
 MODULO = "GLOSAS"
+LISTADO = Listado(Glosa, ("autoridad_id",), "fecha", "id")  # Filtros y orden de datatable_json
 DASHBOARD_CANTIDAD_DIAS = 15
 LIMITE_DIAS = 365  # Un año
 LIMITE_DIAS_EDITAR = LIMITE_DIAS_ELIMINAR = LIMITE_DIAS_RECUPERAR = 7
@@ -79,7 +84,7 @@ def datatable_json():
     if "descripcion" in request.form:
         descripcion = safe_string(request.form["descripcion"], save_enie=True)
         if descripcion != "":
-            consulta = consulta.filter(Glosa.descripcion.contains(descripcion))
+            consulta = filtrar_por_texto(consulta, Glosa, descripcion)
     if "expediente" in request.form:
         try:
             expediente = safe_expediente(request.form["expediente"])
@@ -102,7 +107,7 @@ def datatable_json():
         consulta = consulta.filter(Glosa.fecha <= fecha_hasta)
 
     # Ordenar y paginar
-    registros = consulta.order_by(Glosa.id.desc()).offset(start).limit(rows_per_page).all()
+    registros = consulta.order_by(LISTADO.orden_descendente()).offset(start).limit(rows_per_page).all()
     total = consulta.count()
 
     # Elaborar datos para DataTable
@@ -150,7 +155,7 @@ def admin_datatable_json():
     if "descripcion" in request.form:
         descripcion = safe_string(request.form["descripcion"], save_enie=True)
         if descripcion != "":
-            consulta = consulta.filter(Glosa.descripcion.contains(descripcion))
+            consulta = filtrar_por_texto(consulta, Glosa, descripcion)
     if "expediente" in request.form:
         try:
             expediente = safe_expediente(request.form["expediente"])
@@ -382,7 +387,7 @@ def new():
             glosa.url = gcstorage.url
             glosa.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Nueva Glosa de {autoridad.clave} sobre {glosa.descripcion}"),
                 url=url_for("glosas.detail", glosa_id=glosa.id),
@@ -515,7 +520,7 @@ def new_with_autoridad_id(autoridad_id):
             glosa.url = gcstorage.url
             glosa.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Nueva Glosa de {autoridad.clave} sobre {glosa.descripcion}"),
                 url=url_for("glosas.detail", glosa_id=glosa.id),
@@ -597,7 +602,7 @@ def edit(glosa_id):
             glosa.expediente = expediente
             glosa.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Editada la Glosa de {glosa.autoridad.clave} sobre {glosa.descripcion}"),
                 url=url_for("glosas.detail", glosa_id=glosa.id),
@@ -637,7 +642,7 @@ def delete(glosa_id):
     if current_user.can_admin(MODULO):
         glosa.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=descripcion,
             url=detalle_url,
@@ -655,7 +660,7 @@ def delete(glosa_id):
     if glosa.creado >= datetime.now(tz=local_tz) - timedelta(days=LIMITE_DIAS_ELIMINAR):
         glosa.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=descripcion,
             url=detalle_url,
@@ -690,7 +695,7 @@ def recover(glosa_id):
     if current_user.can_admin(MODULO):
         glosa.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=descripcion,
             url=detalle_url,
@@ -708,7 +713,7 @@ def recover(glosa_id):
     if glosa.creado >= datetime.now(tz=local_tz) - timedelta(days=LIMITE_DIAS_RECUPERAR):
         glosa.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=descripcion,
             url=detalle_url,
@@ -767,6 +772,34 @@ def download_file_pdf(glosa_id):
     return response
 
 
+@glosas.route("/glosas/tablero_cantidades_por_dia_json")
+@permission_required(MODULO, Permiso.VER)
+@cache_coalescente(fresco=60, rancio=600, alcance="publico")
+def dashboard_amounts_per_day_json():
+    """Calcular las cantidades de Glosas por día"""
+
+    # Si viene autoridad_id o autoridad_clave en la URL, validar
+    autoridad = None
+    try:
+        if "autoridad_id" in request.args:
+            autoridad = Autoridad.query.get(int(request.args.get("autoridad_id")))
+        elif "autoridad_clave" in request.args:
+            autoridad = Autoridad.query.filter_by(clave=safe_clave(request.args.get("autoridad_clave"))).first()
+    except (TypeError, ValueError):
+        autoridad = None
+
+    # Si viene la cantidad_dias en la URL, validar
+    cantidad_dias = DASHBOARD_CANTIDAD_DIAS  # Por defecto
+    try:
+        if "cantidad_dias" in request.args:
+            cantidad_dias = int(request.args.get("cantidad_dias"))
+    except (TypeError, ValueError):
+        cantidad_dias = DASHBOARD_CANTIDAD_DIAS
+
+    # Consultar las cantidades diarias, los días sin registros vienen con cero
+    return cantidades_por_dia("glosas", cantidad_dias, autoridad.id if autoridad else None)
+
+
 @glosas.route("/glosas/tablero")
 @permission_required(MODULO, Permiso.VER)
 def dashboard():
@@ -10,9 +10,9 @@ from flask_login import current_user, login_required
 from hercules.blueprints.bitacoras.models import Bitacora
 from hercules.blueprints.identidades_generos.forms import IdentidadGeneroForm
 from hercules.blueprints.identidades_generos.models import IdentidadGenero
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_expediente, safe_message, safe_string
 
@@ -145,7 +145,7 @@ def new():
             )
             identidad_genero.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Nueva identidad de género {identidad_genero.procedimiento}"),
                 url=url_for("identidades_generos.detail", identidad_genero_id=identidad_genero.id),
@@ -189,7 +189,7 @@ def edit(identidad_genero_id):
             identidad_genero.procedimiento = procedimiento
             identidad_genero.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Editado identidad de género {identidad_genero.nombre_actual}"),
                 url=url_for("identidades_generos.detail", identidad_genero_id=identidad_genero.id),
@@ -217,7 +217,7 @@ def delete(identidad_genero_id):
     if identidad_genero.estatus == "A":
         identidad_genero.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Identidad de Género {identidad_genero.nombre_actual}"),
             url=url_for("identidades_generos.detail", identidad_genero_id=identidad_genero.id),
@@ -235,7 +235,7 @@ def recover(identidad_genero_id):
     if identidad_genero.estatus == "B":
         identidad_genero.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Identidad de Género {identidad_genero.nombre_actual}"),
             url=url_for("identidades_generos.detail", identidad_genero_id=identidad_genero.id),
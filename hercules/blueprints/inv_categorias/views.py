@@ -10,9 +10,9 @@ from flask_login import current_user, login_required
 from hercules.blueprints.bitacoras.models import Bitacora
 from hercules.blueprints.inv_categorias.forms import InvCategoriaForm
 from hercules.blueprints.inv_categorias.models import InvCategoria
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_message, safe_string
 
@@ -109,7 +109,7 @@ def new():
         inv_categoria.save()
         # Guardar bitácora
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nueva InvCategoria {inv_categoria.nombre}"),
             url=url_for("inv_categorias.detail", inv_categoria_id=inv_categoria.id),
@@ -141,7 +141,7 @@ def edit(inv_categoria_id):
             inv_categoria.save()
             # Guardar bitácora
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Editado InvCategoria {inv_categoria.nombre}"),
                 url=url_for("inv_categorias.detail", inv_categoria_id=inv_categoria.id),
@@ -162,7 +162,7 @@ def delete(inv_categoria_id):
     if inv_categoria.estatus == "A":
         inv_categoria.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado InvCategoria {inv_categoria.nombre}"),
             url=url_for("inv_categorias.detail", inv_categoria_id=inv_categoria.id),
@@ -180,7 +180,7 @@ def recover(inv_categoria_id):
     if inv_categoria.estatus == "B":
         inv_categoria.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado InvCategoria {inv_categoria.nombre}"),
             url=url_for("inv_categorias.detail", inv_categoria_id=inv_categoria.id),
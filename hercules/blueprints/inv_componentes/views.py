@@ -11,9 +11,9 @@ from hercules.blueprints.bitacoras.models import Bitacora
 from hercules.blueprints.inv_componentes.forms import InvComponenteForm
 from hercules.blueprints.inv_componentes.models import InvComponente
 from hercules.blueprints.inv_equipos.models import InvEquipo
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_message, safe_string
 
@@ -128,7 +128,7 @@ def new_with_inv_equipo_id(inv_equipo_id):
         inv_componente.save()
         # Guardar bitácora
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nuevo InvComponente {inv_componente.descripcion}"),
             url=url_for("inv_componentes.detail", inv_componente_id=inv_componente.id),
@@ -156,7 +156,7 @@ def edit(inv_componente_id):
         inv_componente.save()
         # Guardar bitácora
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Editado InvComponente {inv_componente.id}"),
             url=url_for("inv_componentes.detail", inv_componente_id=inv_componente.id),
@@ -181,7 +181,7 @@ def delete(inv_componente_id):
     if inv_componente.estatus == "A":
         inv_componente.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado InvComponente {inv_componente.id}"),
             url=url_for("inv_componentes.detail", inv_componente_id=inv_componente.id),
@@ -199,7 +199,7 @@ def recover(inv_componente_id):
     if inv_componente.estatus == "B":
         inv_componente.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado InvComponente {inv_componente.id}"),
             url=url_for("inv_componentes.detail", inv_componente_id=inv_componente.id),
@@ -14,12 +14,12 @@ from hercules.blueprints.domicilios.models import Domicilio
 from hercules.blueprints.inv_custodias.forms import InvCustodiaForm
 from hercules.blueprints.inv_custodias.models import InvCustodia
 from hercules.blueprints.inv_equipos.models import InvEquipo
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.oficinas.models import Oficina
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
 from hercules.blueprints.usuarios.models import Usuario
 from hercules.extensions import database
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_message, safe_string
 
@@ -265,7 +265,7 @@ def new_with_usuario_id(usuario_id):
         inv_custodia.save()
         # Guardar bitácora
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nueva InvCustodia {inv_custodia.id} de {usuario.email}"),
             url=url_for("inv_custodias.detail", inv_custodia_id=inv_custodia.id),
@@ -298,7 +298,7 @@ def edit(inv_custodia_id):
         inv_custodia.save()
         # Guardar bitácora
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Editado InvCustodia {inv_custodia.id} de {inv_custodia.usuario.email}"),
             url=url_for("inv_custodias.detail", inv_custodia_id=inv_custodia.id),
@@ -327,7 +327,7 @@ def delete(inv_custodia_id):
                 inv_componente.delete()
         # Agregar a la bitácora
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado InvCustodia {inv_custodia.id} de {inv_custodia.usuario.email}"),
             url=url_for("inv_custodias.detail", inv_custodia_id=inv_custodia.id),
@@ -352,7 +352,7 @@ def recover(inv_custodia_id):
             for inv_componente in inv_equipo.inv_componentes:
                 inv_componente.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado InvCustodia {inv_custodia.id} de {inv_custodia.usuario.email}"),
             url=url_for("inv_custodias.detail", inv_custodia_id=inv_custodia.id),
@@ -12,10 +12,11 @@ from hercules.blueprints.bitacoras.models import Bitacora
 from hercules.blueprints.inv_custodias.models import InvCustodia
 from hercules.blueprints.inv_equipos.forms import InvEquipoEditForm, InvEquipoNewForm
 from hercules.blueprints.inv_equipos.models import InvEquipo
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
 from hercules.extensions import database
+from lib.cache import cache_coalescente_consulta
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_ip_address, safe_mac_address, safe_message, safe_string
 
@@ -194,7 +195,7 @@ def new_with_inv_custodia_id(inv_custodia_id):
         inv_equipo.save()
         # Guardar bitácora
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nuevo InvEquipo {inv_equipo.id} {inv_equipo.descripcion}"),
             url=url_for("inv_equipos.detail", inv_equipo_id=inv_equipo.id),
@@ -232,7 +233,7 @@ def edit(inv_equipo_id):
         inv_equipo.save()
         # Guardar bitácora
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Editado InvEquipo {inv_equipo.id} {inv_equipo.descripcion}"),
             url=url_for("inv_equipos.detail", inv_equipo_id=inv_equipo.id),
@@ -270,7 +271,7 @@ def delete(inv_equipo_id):
             inv_componente.delete()
         # Agregar a la bitácora
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado InvEquipo {inv_equipo.id}"),
             url=url_for("inv_equipos.detail", inv_equipo_id=inv_equipo.id),
@@ -293,7 +294,7 @@ def recover(inv_equipo_id):
             inv_componente.recover()
         # Agregar a la bitácora
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado InvEquipo {inv_equipo.id}"),
             url=url_for("inv_equipos.detail", inv_equipo_id=inv_equipo.id),
@@ -303,13 +304,12 @@ def recover(inv_equipo_id):
     return redirect(url_for("inv_equipos.detail", inv_equipo_id=inv_equipo.id))
 
 
-@inv_equipos.route("/inv_equipos/tablero")
-@permission_required(MODULO, Permiso.MODIFICAR)
-def dashboard():
-    """Tablero de InvEquipo"""
+@cache_coalescente_consulta(fresco=300, rancio=3600)
+def consultar_cantidades_tablero() -> dict:
+    """Consultar las cantidades para el tablero, se comparte entre peticiones simultáneas"""
 
     # Cantidades de equipos por tipo
-    inv_equipos_cantidades_por_tipo = (
+    cantidades_por_tipo = (
         database.session.query(InvEquipo.tipo, func.count(InvEquipo.id))
         .where(InvEquipo.estatus == "A")
         .group_by(InvEquipo.tipo)
@@ -318,7 +318,7 @@ def dashboard():
     )
 
     # Cantidades de equipos por tipo y año de fabricación
-    inv_equipos_cantidades_por_tipo_y_fabricacion_anio = (
+    cantidades_por_tipo_y_fabricacion_anio = (
         database.session.query(InvEquipo.fecha_fabricacion_anio, InvEquipo.tipo, func.count(InvEquipo.id))
         .where(InvEquipo.fecha_fabricacion_anio.isnot(None))
         .where(InvEquipo.estatus == "A")
@@ -326,6 +326,23 @@ def dashboard():
         .all()
     )
 
+    # Entregar listas para que se puedan guardar como JSON
+    return {
+        "por_tipo": [list(renglon) for renglon in cantidades_por_tipo],
+        "por_tipo_y_fabricacion_anio": [list(renglon) for renglon in cantidades_por_tipo_y_fabricacion_anio],
+    }
+
+
+@inv_equipos.route("/inv_equipos/tablero")
+@permission_required(MODULO, Permiso.MODIFICAR)
+def dashboard():
+    """Tablero de InvEquipo"""
+
+    # Consultar las cantidades
+    cantidades = consultar_cantidades_tablero()
+    inv_equipos_cantidades_por_tipo = cantidades["por_tipo"]
+    inv_equipos_cantidades_por_tipo_y_fabricacion_anio = cantidades["por_tipo_y_fabricacion_anio"]
+
     # Estructurar para hacer una tabla con Jinja2 con los años en renglones y los tipos en columnas
     inv_equipos_matriz_tipos_anios = {}
     for fabricacion_anio, tipo, cantidad in inv_equipos_cantidades_por_tipo_y_fabricacion_anio:
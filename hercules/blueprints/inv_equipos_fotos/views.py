@@ -12,9 +12,9 @@ from hercules.blueprints.bitacoras.models import Bitacora
 from hercules.blueprints.inv_equipos.models import InvEquipo
 from hercules.blueprints.inv_equipos_fotos.forms import InvEquipoFotoForm
 from hercules.blueprints.inv_equipos_fotos.models import InvEquipoFoto
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.exceptions import MyFilenameError, MyNotAllowedExtensionError, MyUnknownExtensionError
 from lib.safe_string import safe_message, safe_string
@@ -149,7 +149,7 @@ def new_with_inv_equipo_id(inv_equipo_id):
                 flash("Error desconocido al subir el archivo a GCS.", "danger")
             # Guardar bitácora
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Nueva InvEquipoFoto {inv_equipo_foto.archivo} del InvEquipo {inv_equipo.id}"),
                 url=url_for("inv_equipos.detail", inv_equipo_id=inv_equipo.id),
@@ -170,7 +170,7 @@ def delete(inv_equipo_foto_id):
     if inv_equipo_foto.estatus == "A":
         inv_equipo_foto.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado InvEquipoFoto {inv_equipo_foto.id}"),
             url=url_for("inv_equipos_fotos.detail", inv_equipo_foto_id=inv_equipo_foto.id),
@@ -188,7 +188,7 @@ def recover(inv_equipo_foto_id):
     if inv_equipo_foto.estatus == "B":
         inv_equipo_foto.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado InvEquipoFoto {inv_equipo_foto.id}"),
             url=url_for("inv_equipos_fotos.detail", inv_equipo_foto_id=inv_equipo_foto.id),
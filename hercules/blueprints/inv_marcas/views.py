@@ -10,9 +10,9 @@ from flask_login import current_user, login_required
 from hercules.blueprints.bitacoras.models import Bitacora
 from hercules.blueprints.inv_marcas.forms import InvMarcaForm
 from hercules.blueprints.inv_marcas.models import InvMarca
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_message, safe_string
 
@@ -108,7 +108,7 @@ def new():
         inv_marca.save()
         # Guardar bitácora
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nueva InvMarca {inv_marca.nombre}"),
             url=url_for("inv_marcas.detail", inv_marca_id=inv_marca.id),
@@ -140,7 +140,7 @@ def edit(inv_marca_id):
             inv_marca.save()
             # Guardar bitácora
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Editado InvMarca {inv_marca.nombre}"),
                 url=url_for("inv_marcas.detail", inv_marca_id=inv_marca.id),
@@ -161,7 +161,7 @@ def delete(inv_marca_id):
     if inv_marca.estatus == "A":
         inv_marca.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado InvMarca {inv_marca.nombre}"),
             url=url_for("inv_marcas.detail", inv_marca_id=inv_marca.id),
@@ -179,7 +179,7 @@ def recover(inv_marca_id):
     if inv_marca.estatus == "B":
         inv_marca.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado InvMarca {inv_marca.nombre}"),
             url=url_for("inv_marcas.detail", inv_marca_id=inv_marca.id),
@@ -12,9 +12,9 @@ from hercules.blueprints.bitacoras.models import Bitacora
 from hercules.blueprints.inv_marcas.models import InvMarca
 from hercules.blueprints.inv_modelos.forms import InvModeloForm
 from hercules.blueprints.inv_modelos.models import InvModelo
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_message, safe_string
 
@@ -124,7 +124,7 @@ def new(inv_marca_id):
         inv_modelo.save()
         # Guardar bitácora
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nuevo InvModelo {inv_modelo.descripcion} de {inv_marca.nombre}"),
             url=url_for("inv_modelos.detail", inv_modelo_id=inv_modelo.id),
@@ -156,7 +156,7 @@ def edit(inv_modelo_id):
             inv_modelo.save()
             # Guardar bitácora
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Editado InvModelo {inv_modelo.descripcion} de {inv_modelo.inv_marca.nombre}"),
                 url=url_for("inv_modelos.detail", inv_modelo_id=inv_modelo.id),
@@ -177,7 +177,7 @@ def delete(inv_modelo_id):
     if inv_modelo.estatus == "A":
         inv_modelo.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado InvModelo {inv_modelo.descripcion} de {inv_modelo.inv_marca.nombre}"),
             url=url_for("inv_modelos.detail", inv_modelo_id=inv_modelo.id),
@@ -195,7 +195,7 @@ def recover(inv_modelo_id):
     if inv_modelo.estatus == "B":
         inv_modelo.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado InvModelo {inv_modelo.descripcion} de {inv_modelo.inv_marca.nombre}"),
             url=url_for("inv_modelos.detail", inv_modelo_id=inv_modelo.id),
@@ -10,9 +10,9 @@ from flask_login import current_user, login_required
 from hercules.blueprints.bitacoras.models import Bitacora
 from hercules.blueprints.inv_redes.forms import InvRedForm
 from hercules.blueprints.inv_redes.models import InvRed
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_message, safe_string
 
@@ -116,7 +116,7 @@ def new():
         inv_red.save()
         # Guardar bitácora
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nueva InvRed {inv_red.nombre}"),
             url=url_for("inv_redes.detail", inv_red_id=inv_red.id),
@@ -149,7 +149,7 @@ def edit(inv_red_id):
             inv_red.save()
             # Guardar bitácora
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Editado InvRed {inv_red.nombre}"),
                 url=url_for("inv_redes.detail", inv_red_id=inv_red.id),
@@ -171,7 +171,7 @@ def delete(inv_red_id):
     if inv_red.estatus == "A":
         inv_red.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado InvRed {inv_red.nombre}"),
             url=url_for("inv_redes.detail", inv_red_id=inv_red.id),
@@ -189,7 +189,7 @@ def recover(inv_red_id):
     if inv_red.estatus == "B":
         inv_red.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado InvRed {inv_red.nombre}"),
             url=url_for("inv_redes.detail", inv_red_id=inv_red.id),
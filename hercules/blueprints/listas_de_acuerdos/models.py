@@ -9,6 +9,8 @@ from sqlalchemy import JSON, ForeignKey, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from hercules.extensions import database
+from lib.busqueda import columna_buscador, indices_busqueda
+from lib.indices import indices_activos
 from lib.universal_mixin import UniversalMixin
 
 
@@ -18,6 +20,11 @@ class ListaDeAcuerdo(database.Model, UniversalMixin):
     # Nombre de la tabla
     __tablename__ = "listas_de_acuerdos"
 
+    # Índices para la búsqueda de texto completo e índices parciales de los registros activos
+    __table_args__ = indices_busqueda("listas_de_acuerdos", "descripcion") + indices_activos(
+        "listas_de_acuerdos", ("autoridad_id", "fecha"), ("autoridad_id", "id")
+    )
+
     # Clave primaria
     id: Mapped[int] = mapped_column(primary_key=True)
 
@@ -31,6 +38,9 @@ class ListaDeAcuerdo(database.Model, UniversalMixin):
     archivo: Mapped[str] = mapped_column(String(256), default="")
     url: Mapped[str] = mapped_column(String(512), default="")
 
+    # Columna generada para la búsqueda de texto completo
+    buscador: Mapped[Optional[str]] = columna_buscador("descripcion")
+
     # Columnas para Retrieval-Augmented Generation (RAG)
     rag_fue_analizado_tiempo: Mapped[Optional[datetime]]
     rag_analisis: Mapped[Optional[dict]] = mapped_column(JSON)
@@ -14,13 +14,16 @@ from werkzeug.exceptions import NotFound
 
 from hercules.blueprints.autoridades.models import Autoridad
 from hercules.blueprints.bitacoras.models import Bitacora
+from hercules.blueprints.cantidades_diarias.fuentes import cantidades_por_dia
 from hercules.blueprints.listas_de_acuerdos.forms import ListaDeAcuerdoMateriaNewForm, ListaDeAcuerdoNewForm
 from hercules.blueprints.listas_de_acuerdos.models import ListaDeAcuerdo
 from hercules.blueprints.materias.models import Materia
 from hercules.blueprints.materias_tipos_juicios.models import MateriaTipoJuicio
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.busqueda import filtrar_por_texto
+from lib.cache import cache_coalescente, cache_condicional
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.exceptions import (
     MyBucketNotFoundError,
@@ -32,6 +35,7 @@ from lib.exceptions import (
     MyUnknownExtensionError,
 )
 from lib.google_cloud_storage import get_blob_name_from_url, get_file_from_gcs
+from lib.indices import Listado
 from lib.safe_string import safe_clave, safe_message, safe_string
 from lib.storage import GoogleCloudStorage
 from lib.time_to_text import dia_mes_ano
@@ -43,6 +47,7 @@ medianoche = time.min
 
 # Constantes de este módulo
 MODULO = "LISTAS DE ACUERDOS"
+LISTADO = Listado(ListaDeAcuerdo, ("autoridad_id",), "fecha", "id")  # Filtros y orden de datatable_json
 DASHBOARD_CANTIDAD_DIAS = 15
 HORAS_BUENO = 14
 HORAS_CRITICO = 16
@@ -59,6 +64,13 @@ listas_de_acuerdos = Blueprint("listas_de_acuerdos", __name__, template_folder="
 
 
 @listas_de_acuerdos.route("/listas_de_acuerdos/acuses/<id_hashed>")
+@cache_condicional(
+    ListaDeAcuerdo,
+    "id_hashed",
+    identificar=ListaDeAcuerdo.decode_id,
+    tablas=["autoridades", "distritos"],
+    alcance="publico",
+)
 def checkout(id_hashed):
     """Acuse"""
     lista_de_acuerdo = ListaDeAcuerdo.query.get_or_404(ListaDeAcuerdo.decode_id(id_hashed))
@@ -100,6 +112,10 @@ def datatable_json():
         autoridad_clave = safe_clave(request.form["autoridad_clave"])
         if autoridad_clave != "":
             consulta = consulta.join(Autoridad).filter(Autoridad.clave.contains(autoridad_clave))
+    if "descripcion" in request.form:
+        descripcion = safe_string(request.form["descripcion"], save_enie=True)
+        if descripcion != "":
+            consulta = filtrar_por_texto(consulta, ListaDeAcuerdo, descripcion)
 
     # Filtrar por fechas, si vienen invertidas se corrigen
     fecha_desde = None
@@ -116,7 +132,7 @@ def datatable_json():
         consulta = consulta.filter(ListaDeAcuerdo.fecha <= fecha_hasta)
 
     # Ordenar y paginar
-    registros = consulta.order_by(ListaDeAcuerdo.id.desc()).offset(start).limit(rows_per_page).all()
+    registros = consulta.order_by(LISTADO.orden_descendente()).offset(start).limit(rows_per_page).all()
     total = consulta.count()
 
     # Elaborar datos para DataTable
@@ -178,6 +194,10 @@ def admin_datatable_json():
         autoridad_clave = safe_clave(request.form["autoridad_clave"])
         if autoridad_clave != "":
             consulta = consulta.join(Autoridad).filter(Autoridad.clave.contains(autoridad_clave))
+    if "descripcion" in request.form:
+        descripcion = safe_string(request.form["descripcion"], save_enie=True)
+        if descripcion != "":
+            consulta = filtrar_por_texto(consulta, ListaDeAcuerdo, descripcion)
 
     # Filtrar por creado, si vienen invertidas se corrigen
     creado_desde = None
@@ -463,7 +483,7 @@ def new():
                 bitacora_descripcion = "Nueva "
             bitacora_descripcion += f"Lista de Acuerdos de {autoridad.clave} del {lista_de_acuerdo.fecha.strftime('%Y-%m-%d')}"
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(bitacora_descripcion),
                 url=url_for("listas_de_acuerdos.detail", lista_de_acuerdo_id=lista_de_acuerdo.id),
@@ -635,7 +655,7 @@ def new_with_autoridad_id(autoridad_id):
                 bitacora_descripcion = "Nueva "
             bitacora_descripcion += f"Lista de Acuerdos del {lista_de_acuerdo.fecha.strftime('%Y-%m-%d')} de {autoridad.clave}"
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(bitacora_descripcion),
                 url=url_for("listas_de_acuerdos.detail", lista_de_acuerdo_id=lista_de_acuerdo.id),
@@ -685,7 +705,7 @@ def delete(lista_de_acuerdo_id):
     if current_user.can_admin(MODULO):
         lista_de_acuerdo.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=descripcion,
             url=detalle_url,
@@ -703,7 +723,7 @@ def delete(lista_de_acuerdo_id):
     if lista_de_acuerdo.creado >= datetime.now(tz=local_tz) - timedelta(days=LIMITE_DIAS_ELIMINAR):
         lista_de_acuerdo.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=descripcion,
             url=detalle_url,
@@ -749,7 +769,7 @@ def recover(lista_de_acuerdo_id):
     if current_user.can_admin(MODULO):
         lista_de_acuerdo.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=descripcion,
             url=detalle_url,
@@ -767,7 +787,7 @@ def recover(lista_de_acuerdo_id):
     if lista_de_acuerdo.creado >= datetime.now(tz=local_tz) - timedelta(days=LIMITE_DIAS_RECUPERAR):
         lista_de_acuerdo.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=descripcion,
             url=detalle_url,
@@ -826,6 +846,34 @@ def download_file_pdf(lista_de_acuerdo_id):
     return response
 
 
+@listas_de_acuerdos.route("/listas_de_acuerdos/tablero_cantidades_por_dia_json")
+@permission_required(MODULO, Permiso.VER)
+@cache_coalescente(fresco=60, rancio=600, alcance="publico")
+def dashboard_amounts_per_day_json():
+    """Calcular las cantidades de Listas de Acuerdos por día"""
+
+    # Si viene autoridad_id o autoridad_clave en la URL, validar
+    autoridad = None
+    try:
+        if "autoridad_id" in request.args:
+            autoridad = Autoridad.query.get(int(request.args.get("autoridad_id")))
+        elif "autoridad_clave" in request.args:
+            autoridad = Autoridad.query.filter_by(clave=safe_clave(request.args.get("autoridad_clave"))).first()
+    except (TypeError, ValueError):
+        autoridad = None
+
+    # Si viene la cantidad_dias en la URL, validar
+    cantidad_dias = DASHBOARD_CANTIDAD_DIAS  # Por defecto
+    try:
+        if "cantidad_dias" in request.args:
+            cantidad_dias = int(request.args.get("cantidad_dias"))
+    except (TypeError, ValueError):
+        cantidad_dias = DASHBOARD_CANTIDAD_DIAS
+
+    # Consultar las cantidades diarias, los días sin registros vienen con cero
+    return cantidades_por_dia("listas_de_acuerdos", cantidad_dias, autoridad.id if autoridad else None)
+
+
 @listas_de_acuerdos.route("/listas_de_acuerdos/tablero")
 @permission_required(MODULO, Permiso.VER)
 def dashboard():
@@ -10,9 +10,10 @@ from flask_login import current_user, login_required
 from hercules.blueprints.bitacoras.models import Bitacora
 from hercules.blueprints.materias.forms import MateriaForm
 from hercules.blueprints.materias.models import Materia
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.cache import cache_condicional, cache_json
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_clave, safe_message, safe_string
 
@@ -62,6 +63,8 @@ def datatable_json():
 
 
 @materias.route("/materias/select_json", methods=["GET", "POST"])
+@cache_condicional(Materia)
+@cache_json(tablas=["materias"])
 def select_json():
     """Select JSON para materias"""
     # Consultar
@@ -103,6 +106,7 @@ def list_inactive():
 
 
 @materias.route("/materias/<int:materia_id>")
+@cache_condicional(Materia, "materia_id", vigencia=300)
 def detail(materia_id):
     """Detalle de una Materia"""
     materia = Materia.query.get_or_404(materia_id)
@@ -136,7 +140,7 @@ def new():
             )
             materia.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Nueva materia {materia.nombre}"),
                 url=url_for("materias.detail", materia_id=materia.id),
@@ -178,7 +182,7 @@ def edit(materia_id):
             materia.en_exh_exhortos = form.en_exh_exhortos.data
             materia.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Editada materia {materia.nombre}"),
                 url=url_for("materias.detail", materia_id=materia.id),
@@ -202,7 +206,7 @@ def delete(materia_id):
     if materia.estatus == "A":
         materia.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminada materia {materia.nombre}"),
             url=url_for("materias.detail", materia_id=materia.id),
@@ -220,7 +224,7 @@ def recover(materia_id):
     if materia.estatus == "B":
         materia.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperada materia {materia.nombre}"),
             url=url_for("materias.detail", materia_id=materia.id),
@@ -11,9 +11,10 @@ from hercules.blueprints.bitacoras.models import Bitacora
 from hercules.blueprints.materias.models import Materia
 from hercules.blueprints.materias_tipos_juicios.forms import MateriaTipoJuicioForm
 from hercules.blueprints.materias_tipos_juicios.models import MateriaTipoJuicio
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.cache import cache_condicional, cache_json
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_message, safe_string
 
@@ -71,6 +72,8 @@ def datatable_json():
 
 
 @materias_tipos_juicios.route("/materias_tipos_juicios/select_json/<int:materia_id>", methods=["GET", "POST"])
+@cache_condicional(MateriaTipoJuicio)
+@cache_json(tablas=["materias_tipos_juicios"])
 def select_json(materia_id=None):
     """Select JSON para materias tipos juicios"""
     # Si materia_id es None, entonces no se entregan tipos juicios
@@ -135,7 +138,7 @@ def new():
         )
         materia_tipo_juicio.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(
                 f"Nuevo Tipo de Juicio {materia_tipo_juicio.descripcion} en {materia_tipo_juicio.materia.nombre}"
@@ -159,7 +162,7 @@ def edit(materia_tipo_juicio_id):
         materia_tipo_juicio.descripcion = safe_string(form.descripcion.data)
         materia_tipo_juicio.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(
                 f"Editado Materia Tipo de Juicio {materia_tipo_juicio.descripcion} en {materia_tipo_juicio.materia.nombre}"
@@ -182,7 +185,7 @@ def delete(materia_tipo_juicio_id):
     if materia_tipo_juicio.estatus == "A":
         materia_tipo_juicio.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Tipo de Juicio {materia_tipo_juicio.descripcion}"),
             url=url_for("materias_tipos_juicios.detail", materia_tipo_juicio_id=materia_tipo_juicio.id),
@@ -200,7 +203,7 @@ def recover(materia_tipo_juicio_id):
     if materia_tipo_juicio.estatus == "B":
         materia_tipo_juicio.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Tipo de Juicio {materia_tipo_juicio.descripcion}"),
             url=url_for("materias_tipos_juicios.detail", materia_tipo_juicio_id=materia_tipo_juicio.id),
@@ -12,6 +12,8 @@ from hercules.blueprints.modulos.forms import ModuloForm
 from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.cache import cache_json
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_message, safe_string
 
@@ -126,7 +128,7 @@ def new():
         )
         modulo.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nuevo Modulo {modulo.nombre}"),
             url=url_for("modulos.detail", modulo_id=modulo.id),
@@ -166,7 +168,7 @@ def edit(modulo_id):
             modulo.en_portal_notarias = form.en_portal_notarias.data
             modulo.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Editado Modulo {modulo.nombre}"),
                 url=url_for("modulos.detail", modulo_id=modulo.id),
@@ -200,7 +202,7 @@ def delete(modulo_id):
             permiso.delete()
         # Guardar en la bitacora
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Modulo {este_modulo.nombre}"),
             url=url_for("modulos.detail", modulo_id=este_modulo.id),
@@ -223,7 +225,7 @@ def recover(modulo_id):
             permiso.recover()
         # Guardar en la bitacora
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Modulo {este_modulo.nombre}"),
             url=url_for("modulos.detail", modulo_id=este_modulo.id),
@@ -234,6 +236,7 @@ def recover(modulo_id):
 
 
 @modulos.route("/modulos/select2_json", methods=["POST"])
+@cache_json(tablas=["modulos"])
 def select2_json():
     """Proporcionar el JSON de modulos para elegir con un Select2, se usa para filtrar en DataTables"""
     consulta = Modulo.query.filter(Modulo.estatus == "A")
@@ -6,6 +6,7 @@ import json
 from flask import Blueprint, render_template, request, url_for
 from flask_login import login_required
 
+from lib.cache import cache_condicional, cache_json
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_string
 
@@ -71,6 +72,8 @@ def datatable_json():
 
 
 @municipios.route("/municipios/select_json/<int:estado_id>", methods=["GET", "POST"])
+@cache_condicional(Municipio)
+@cache_json(tablas=["municipios"])
 def select_json(estado_id=None):
     """Proporcionar el JSON para elegir con un select tradicional"""
     if estado_id is None:
@@ -88,6 +91,8 @@ def select_json(estado_id=None):
 
 
 @municipios.route("/municipios/select2_json/<int:estado_id>", methods=["GET", "POST"])
+@cache_condicional(Municipio)
+@cache_json(tablas=["municipios"])
 def select2_json(estado_id=None):
     """Proporcionar el JSON de Municipio para elegir con un Select2"""
     if estado_id is None:
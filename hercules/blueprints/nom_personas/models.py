@@ -7,6 +7,7 @@ from typing import Optional
 from sqlalchemy import String
 from sqlalchemy.orm import Mapped, mapped_column
 
+from lib.nombres import columna_nombre_buscador, columna_nombre_fonetico, indices_nombres
 from lib.universal_mixin import UniversalMixin
 from hercules.extensions import database
 
@@ -17,6 +18,9 @@ class NomPersona(database.Model, UniversalMixin):
     # Nombre de la tabla
     __tablename__ = "nom_personas"
 
+    # Índices para la búsqueda por nombre
+    __table_args__ = indices_nombres("nom_personas")
+
     # Clave primaria
     id: Mapped[int] = mapped_column(primary_key=True)
 
@@ -26,6 +30,10 @@ class NomPersona(database.Model, UniversalMixin):
     apellido_primero: Mapped[str] = mapped_column(String(128))
     apellido_segundo: Mapped[Optional[str]] = mapped_column(String(128))
 
+    # Columnas generadas para la búsqueda por nombre
+    nombre_buscador: Mapped[Optional[str]] = columna_nombre_buscador("nombres", "apellido_primero", "apellido_segundo")
+    nombre_fonetico: Mapped[Optional[str]] = columna_nombre_fonetico("nombres", "apellido_primero", "apellido_segundo")
+
     def __repr__(self):
         """Representación"""
         return f"<NomPersona {self.id}>"
@@ -7,6 +7,7 @@ from flask import Blueprint, flash, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
 
 from lib.datatables import get_datatable_parameters, output_datatable_json
+from lib.nombres import filtrar_por_nombre
 from lib.safe_string import safe_string, safe_message
 
 from hercules.blueprints.bitacoras.models import Bitacora
@@ -39,6 +40,10 @@ def datatable_json():
         consulta = consulta.filter_by(estatus=request.form["estatus"])
     else:
         consulta = consulta.filter_by(estatus="A")
+    if "nombre" in request.form:
+        nombre = safe_string(request.form["nombre"], save_enie=True)
+        if nombre != "":
+            consulta = filtrar_por_nombre(consulta, NomPersona, nombre)
     # if "persona_id" in request.form:
     #     consulta = consulta.filter_by(persona_id=request.form["persona_id"])
     # Luego filtrar por columnas de otras tablas
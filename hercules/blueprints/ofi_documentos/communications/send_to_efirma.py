@@ -9,6 +9,7 @@ from io import BytesIO
 
 import requests
 from dotenv import load_dotenv
+from sqlalchemy.orm import undefer_group
 from xhtml2pdf import pisa
 
 from hercules.app import create_app
@@ -108,7 +109,7 @@ def enviar_a_efirma(ofi_documento_id: str) -> tuple[str, str, str]:
     ofi_documento_id = safe_uuid(ofi_documento_id)
     if not ofi_documento_id:
         raise MyNotValidParamError("ID de oficio inválido")
-    ofi_documento = OfiDocumento.query.get(ofi_documento_id)
+    ofi_documento = OfiDocumento.query.options(undefer_group("contenido")).get(ofi_documento_id)
     if not ofi_documento:
         raise MyNotExistsError("El oficio no existe")
 
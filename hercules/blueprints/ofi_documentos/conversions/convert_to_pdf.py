@@ -7,6 +7,7 @@ from io import BytesIO
 import os
 
 from dotenv import load_dotenv
+from sqlalchemy.orm import undefer_group
 from xhtml2pdf import pisa
 
 from hercules.app import create_app
@@ -44,7 +45,7 @@ def convertir_a_pdf(ofi_documento_id: str) -> tuple[str, str, str]:
         error = "ID de oficio inválido"
         bitacora.error(error)
         raise MyNotValidParamError(error)
-    ofi_documento = OfiDocumento.query.get(ofi_documento_id)
+    ofi_documento = OfiDocumento.query.options(undefer_group("contenido")).get(ofi_documento_id)
     if not ofi_documento:
         error = "El oficio no existe"
         bitacora.error(error)
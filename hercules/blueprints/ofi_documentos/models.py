@@ -11,6 +11,7 @@ from sqlalchemy import Enum, ForeignKey, String, Text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from lib.indices import indices_activos
 from lib.universal_mixin import UniversalMixin
 from hercules.extensions import database
 
@@ -26,6 +27,7 @@ class OfiDocumento(database.Model, UniversalMixin):
 
     # Nombre de la tabla
     __tablename__ = "ofi_documentos"
+    __table_args__ = indices_activos("ofi_documentos", ("usuario_id", "creado"), ("estado", "creado"), ("creado",))
 
     # Clave primaria
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -49,10 +51,11 @@ class OfiDocumento(database.Model, UniversalMixin):
     folio_anio: Mapped[Optional[int]]
     folio_num: Mapped[Optional[int]]
 
-    # Columnas contenido
-    contenido_html: Mapped[Optional[str]] = mapped_column(Text)
-    contenido_md: Mapped[Optional[str]] = mapped_column(Text)
-    contenido_sfdt: Mapped[Optional[JSONB]] = mapped_column(JSONB)
+    # Columnas contenido, diferidas para que los listados sólo carguen las columnas de resumen
+    # Donde se necesite el contenido, cargarlo en la misma consulta con .options(undefer_group("contenido"))
+    contenido_html: Mapped[Optional[str]] = mapped_column(Text, deferred=True, deferred_group="contenido")
+    contenido_md: Mapped[Optional[str]] = mapped_column(Text, deferred=True, deferred_group="contenido")
+    contenido_sfdt: Mapped[Optional[JSONB]] = mapped_column(JSONB, deferred=True, deferred_group="contenido")
 
     # Columnas firma simple
     firma_simple: Mapped[str] = mapped_column(String(256), default="")
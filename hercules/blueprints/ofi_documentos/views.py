@@ -9,11 +9,12 @@ import re
 from flask import Blueprint, current_app, flash, make_response, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
 from lxml.html.clean import Cleaner
+from sqlalchemy import func, select
+from sqlalchemy.orm import undefer_group
 from werkzeug.exceptions import NotFound
 
 from hercules.blueprints.autoridades.models import Autoridad
 from hercules.blueprints.bitacoras.models import Bitacora
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
 from hercules.blueprints.ofi_documentos.models import OfiDocumento
@@ -26,9 +27,22 @@ from hercules.blueprints.ofi_documentos.forms import (
 from hercules.blueprints.ofi_documentos_destinatarios.models import OfiDocumentoDestinatario
 from hercules.blueprints.ofi_plantillas.models import OfiPlantilla
 from hercules.blueprints.usuarios.models import Usuario
+from hercules.extensions import database
+from lib.cache import cache_condicional
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
-from lib.folio import validar_folio
+from lib.folio import (
+    cambiar_numero_folio,
+    formar_folio,
+    liberar_folio,
+    reemplazar_folio,
+    reservar_folio,
+    siguiente_folio,
+    validar_folio,
+)
+from lib.indices import Listado
 from lib.safe_string import safe_clave, safe_email, safe_message, safe_string, safe_uuid
+from lib.universal_mixin import save_all
 from lib.exceptions import MyBucketNotFoundError, MyFileNotFoundError, MyNotValidParamError
 from lib.google_cloud_storage import get_blob_name_from_url, get_file_from_gcs
 
@@ -77,6 +91,7 @@ cleaner = Cleaner(
 )
 
 MODULO = "OFI DOCUMENTOS"
+LISTADO = Listado(OfiDocumento, ("usuario_id", "estado"), None, "creado")  # Filtros y orden de datatable_json
 
 ofi_documentos = Blueprint("ofi_documentos", __name__, template_folder="templates")
 
@@ -88,6 +103,37 @@ def before_request():
     """Permiso por defecto"""
 
 
+def _maximo_folio(autoridad_id: int, anio: int):
+    """Subconsulta con el último número de folio de la autoridad en el año, sólo para iniciar el contador"""
+    return (
+        select(func.max(OfiDocumento.folio_num))
+        .join(Usuario)
+        .where(Usuario.autoridad_id == autoridad_id)
+        .where(OfiDocumento.folio_anio == anio)
+        .scalar_subquery()
+    )
+
+
+def _sugerir_folio() -> str:
+    """Sugerir el siguiente folio de la autoridad del usuario sin reservarlo"""
+    autoridad_id = current_user.autoridad_id
+    anio = datetime.now().year
+    numero = siguiente_folio(OfiDocumento.__tablename__, autoridad_id, anio, _maximo_folio(autoridad_id, anio))
+    return formar_folio(current_user.autoridad.clave, numero, anio)
+
+
+def _reservar_folio(folio: str, numero_folio: int, anio_folio: int) -> tuple[str, int]:
+    """Reservar el folio en la autoridad del usuario, si ya estaba ocupado se asigna el siguiente"""
+    autoridad_id = current_user.autoridad_id
+    maximo = _maximo_folio(autoridad_id, anio_folio)
+    numero = reservar_folio(OfiDocumento.__tablename__, autoridad_id, anio_folio, numero_folio, maximo)
+    if numero == numero_folio:
+        return folio, numero
+    folio_reservado = cambiar_numero_folio(folio, numero)
+    flash(f"El folio {folio} ya estaba ocupado, se asignó {folio_reservado}", "warning")
+    return folio_reservado, numero
+
+
 @ofi_documentos.route("/ofi_documentos/datatable_json", methods=["GET", "POST"])
 def datatable_json():
     """DataTable JSON para listado de Ofi Documentos"""
@@ -156,7 +202,7 @@ def datatable_json():
             consulta = consulta.filter(OfiDocumentoDestinatario.usuario_id == request.form["usuario_destinatario_id"])
             consulta = consulta.filter(OfiDocumentoDestinatario.estatus == "A")
     # Ordenar y paginar
-    registros = consulta.order_by(OfiDocumento.creado.desc()).offset(start).limit(rows_per_page).all()
+    registros = consulta.order_by(LISTADO.orden_descendente()).offset(start).limit(rows_per_page).all()
     total = consulta.count()
     # Elaborar datos para DataTable
     data = []
@@ -233,6 +279,13 @@ def datatable_json():
 
 
 @ofi_documentos.route("/ofi_documentos/fullscreen_json/<ofi_documento_id>", methods=["GET", "POST"])
+@cache_condicional(
+    OfiDocumento,
+    "ofi_documento_id",
+    identificar=safe_uuid,
+    tablas=["autoridades", "roles", "usuarios_roles"],  # La respuesta depende de los roles ESCRITOR y FIRMANTE
+    alcance="usuario",
+)
 def fullscreen_json(ofi_documento_id):
     """Entregar JSON para la vista de pantalla completa"""
     # Consultar el oficio
@@ -243,7 +296,7 @@ def fullscreen_json(ofi_documento_id):
             "message": "ID de oficio inválido.",
             "data": None,
         }
-    ofi_documento = OfiDocumento.query.get_or_404(ofi_documento_id)
+    ofi_documento = OfiDocumento.query.options(undefer_group("contenido")).get_or_404(ofi_documento_id)
     # Validar que si es BORRADOR o FIRMADO se debe tener el rol ESCRITOR o FIRMANTE para verlo
     roles = current_user.get_roles()
     if (
@@ -390,7 +443,7 @@ def detail(ofi_documento_id):
     if not ofi_documento_id:
         flash("ID de oficio inválido", "warning")
         return redirect(url_for("ofi_documentos.list_active"))
-    ofi_documento = OfiDocumento.query.get_or_404(ofi_documento_id)
+    ofi_documento = OfiDocumento.query.options(undefer_group("contenido")).get_or_404(ofi_documento_id)
     # Validar que si es BORRADOR o FIRMADO se debe tener el rol ESCRITOR o FIRMANTE para verlo
     roles = current_user.get_roles()
     if (
@@ -642,6 +695,19 @@ def new(ofi_plantilla_id):
                 contenido_html = contenido_html.replace(f'style="{style}"', f'style="{"; ".join(estilos_permitidos)}"')
             else:
                 contenido_html = contenido_html.replace(f'style="{style}"', "")
+        # Reservar el folio, si se asignó otro número también se cambia en el contenido
+        contenido_md = str(form.contenido_md.data).strip()
+        if es_valido and numero_folio is not None:
+            try:
+                folio_reservado, numero_folio = _reservar_folio(folio, numero_folio, anio_folio)
+            except MyNotValidParamError as error:
+                database.session.rollback()
+                flash(str(error), "warning")
+                es_valido = False
+            else:
+                contenido_html = reemplazar_folio(contenido_html, folio, folio_reservado)
+                contenido_md = reemplazar_folio(contenido_md, folio, folio_reservado)
+                folio = folio_reservado
         # Si es válido, guardar el nuevo oficio
         if es_valido:
             # Guardar el nuevo oficio
@@ -652,61 +718,48 @@ def new(ofi_plantilla_id):
                 folio_anio=anio_folio,
                 folio_num=numero_folio,
                 vencimiento_fecha=vencimiento_fecha,
-                contenido_md=str(form.contenido_md.data).strip(),
+                contenido_md=contenido_md,
                 contenido_html=contenido_html,
                 contenido_sfdt=str(form.contenido_sfdt.data).strip(),
                 estado="BORRADOR",
                 cadena_oficio_id=form.cadena_oficio_id.data if form.cadena_oficio_id.data else None,
             )
-            ofi_documento.save()
+            # Juntar los destinatarios para guardarlos con el oficio en un solo commit
+            destinatarios = []
             # Si la plantilla está compartida y tiene destinatarios_emails
             if ofi_plantilla.esta_compartida and ofi_plantilla.destinatarios_emails:
                 for email in ofi_plantilla.destinatarios_emails.split(","):
                     destinatario = Usuario.query.filter_by(email=email).filter_by(estatus="A").first()
                     if destinatario:
-                        ofi_documento_destinatario = OfiDocumentoDestinatario(
-                            ofi_documento=ofi_documento,
-                            usuario=destinatario,
-                        )
-                        ofi_documento_destinatario.save()
+                        destinatarios.append(OfiDocumentoDestinatario(ofi_documento=ofi_documento, usuario=destinatario))
             elif autoridad and autoridad.destinatarios_emails:
                 for email in autoridad.destinatarios_emails.split(","):
                     destinatario = Usuario.query.filter_by(email=email).filter_by(estatus="A").first()
                     if destinatario:
-                        ofi_documento_destinatario = OfiDocumentoDestinatario(
-                            ofi_documento=ofi_documento,
-                            usuario=destinatario,
-                        )
-                        ofi_documento_destinatario.save()
+                        destinatarios.append(OfiDocumentoDestinatario(ofi_documento=ofi_documento, usuario=destinatario))
             # Si la plantilla está compartida y tiene con_copias_emails
             if ofi_plantilla.esta_compartida and ofi_plantilla.con_copias_emails:
                 for email in ofi_plantilla.con_copias_emails.split(","):
                     con_copia = Usuario.query.filter_by(email=email).filter_by(estatus="A").first()
                     if con_copia:
-                        ofi_documento_destinatario = OfiDocumentoDestinatario(
-                            ofi_documento=ofi_documento,
-                            usuario=con_copia,
-                            con_copia=True,
+                        destinatarios.append(
+                            OfiDocumentoDestinatario(ofi_documento=ofi_documento, usuario=con_copia, con_copia=True)
                         )
-                        ofi_documento_destinatario.save()
             elif autoridad and autoridad.con_copias_emails:
                 for email in autoridad.con_copias_emails:
                     con_copia = Usuario.query.filter_by(email=email).filter_by(estatus="A").first()
                     if con_copia:
-                        ofi_documento_destinatario = OfiDocumentoDestinatario(
-                            ofi_documento=ofi_documento,
-                            usuario=con_copia,
-                            con_copia=True,
+                        destinatarios.append(
+                            OfiDocumentoDestinatario(ofi_documento=ofi_documento, usuario=con_copia, con_copia=True)
                         )
-                        ofi_documento_destinatario.save()
             # Si trae una cadena de oficio, copiar el destinatario propietario
             if ofi_documento_responder:
-                OfiDocumentoDestinatario(
-                    ofi_documento=ofi_documento,
-                    usuario=ofi_documento_responder.usuario,
-                ).save()
+                destinatarios.append(
+                    OfiDocumentoDestinatario(ofi_documento=ofi_documento, usuario=ofi_documento_responder.usuario)
+                )
+            save_all([ofi_documento] + destinatarios)
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Nuevo Oficio Documento {ofi_documento.descripcion}"),
                 url=url_for("ofi_documentos.detail", ofi_documento_id=ofi_documento.id),
@@ -718,18 +771,8 @@ def new(ofi_plantilla_id):
                 return redirect(url_for("ofi_documentos.edit", ofi_documento_id=ofi_documento.id))
             # Si no, redirigir al detalle
             return redirect(bitacora.url)
-    # Sugerir el folio consultando el último documento de la autoridad del usuario
-    ultimo_documento = (
-        OfiDocumento.query.join(Usuario)
-        .filter(Usuario.autoridad_id == current_user.autoridad_id)
-        .filter(OfiDocumento.folio_anio == datetime.now().year)
-        .order_by(OfiDocumento.folio_num.desc())
-        .first()
-    )
-    if ultimo_documento:
-        folio = f"{ultimo_documento.usuario.autoridad.clave}-{ultimo_documento.folio_num + 1}/{datetime.now().year}"
-    else:
-        folio = f"{current_user.autoridad.clave}-1/{datetime.now().year}"  # Tal vez sea el primer oficio del año
+    # Sugerir el folio con el contador de la autoridad del usuario
+    folio = _sugerir_folio()
     # Reemplazar las palabras claves en el contenido HTML
     contenido_html = ofi_plantilla.contenido_html
     contenido_html = contenido_html.replace("[[DIA]]", str(datetime.now().day))
@@ -812,7 +855,7 @@ def edit(ofi_documento_id):
     if not ofi_documento_id:
         flash("ID de oficio inválido", "warning")
         return redirect(url_for("ofi_documentos.list_active"))
-    ofi_documento = OfiDocumento.query.get_or_404(ofi_documento_id)
+    ofi_documento = OfiDocumento.query.options(undefer_group("contenido")).get_or_404(ofi_documento_id)
     # Validar que la autoridad del oficio sea la misma que la del usuario
     if ofi_documento.usuario.autoridad_id != current_user.autoridad_id:
         flash("No tienes permiso para editar este oficio, pertenece a otra autoridad", "warning")
@@ -864,6 +907,22 @@ def edit(ofi_documento_id):
                 contenido_html = contenido_html.replace(f'style="{style}"', f'style="{"; ".join(estilos_permitidos)}"')
             else:
                 contenido_html = contenido_html.replace(f'style="{style}"', "")
+        # Si cambió el folio, liberar el anterior y reservar el nuevo
+        contenido_md = str(form.contenido_md.data).strip()
+        if es_valido and (numero_folio, anio_folio) != (ofi_documento.folio_num, ofi_documento.folio_anio):
+            autoridad_id = ofi_documento.usuario.autoridad_id
+            liberar_folio(OfiDocumento.__tablename__, autoridad_id, ofi_documento.folio_anio, ofi_documento.folio_num)
+            if numero_folio is not None:
+                try:
+                    folio_reservado, numero_folio = _reservar_folio(folio, numero_folio, anio_folio)
+                except MyNotValidParamError as error:
+                    database.session.rollback()  # También se deshace la liberación del folio anterior
+                    flash(str(error), "warning")
+                    es_valido = False
+                else:
+                    contenido_html = reemplazar_folio(contenido_html, folio, folio_reservado)
+                    contenido_md = reemplazar_folio(contenido_md, folio, folio_reservado)
+                    folio = folio_reservado
         # Si es válido, guardar los cambios
         if es_valido:
             ofi_documento.descripcion = safe_string(form.descripcion.data, save_enie=True)
@@ -871,12 +930,12 @@ def edit(ofi_documento_id):
             ofi_documento.folio_anio = anio_folio
             ofi_documento.folio_num = numero_folio
             ofi_documento.vencimiento_fecha = vencimiento_fecha
-            ofi_documento.contenido_md = str(form.contenido_md.data).strip()
+            ofi_documento.contenido_md = contenido_md
             ofi_documento.contenido_html = contenido_html
             ofi_documento.contenido_sfdt = ""
             ofi_documento.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Editado Oficio Documento {ofi_documento.descripcion}"),
                 url=url_for("ofi_documentos.detail", ofi_documento_id=ofi_documento.id),
@@ -893,20 +952,9 @@ def edit(ofi_documento_id):
     form.contenido_md.data = ofi_documento.contenido_md
     form.contenido_html.data = ofi_documento.contenido_html
     form.contenido_sfdt.data = ofi_documento.contenido_sfdt
-    # Si no tiene folio, sugerir el folio consultando el último documento de la autoridad del usuario
+    # Si no tiene folio, sugerir el folio con el contador de la autoridad del usuario
     if ofi_documento.folio is None or ofi_documento.folio == "":
-        ultimo_documento = (
-            OfiDocumento.query.join(Usuario)
-            .filter(Usuario.autoridad_id == current_user.autoridad_id)
-            .filter(OfiDocumento.folio_anio == datetime.now().year)
-            .order_by(OfiDocumento.folio_num.desc())
-            .first()
-        )
-        if ultimo_documento:
-            folio = f"{ultimo_documento.usuario.autoridad.clave}-{ultimo_documento.folio_num + 1}/{datetime.now().year}"
-        else:
-            folio = f"{current_user.autoridad.clave}-1/{datetime.now().year}"  # Tal vez sea el primer oficio del año
-        form.folio.data = folio
+        form.folio.data = _sugerir_folio()
     # Entregar el formulario
     return render_template(
         "ofi_documentos/edit_ckeditor5.jinja2",
@@ -939,7 +987,7 @@ def rename(ofi_documento_id):
         ofi_documento.descripcion = safe_string(form.descripcion.data, save_enie=True)
         ofi_documento.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Renombrado Oficio Documento descripción {ofi_documento.descripcion}"),
             url=url_for("ofi_documentos.detail", ofi_documento_id=ofi_documento.id),
@@ -972,7 +1020,7 @@ def sign(ofi_documento_id):
     if not ofi_documento_id:
         flash("ID de oficio inválido", "warning")
         return redirect(url_for("ofi_documentos.list_active"))
-    ofi_documento = OfiDocumento.query.get_or_404(ofi_documento_id)
+    ofi_documento = OfiDocumento.query.options(undefer_group("contenido")).get_or_404(ofi_documento_id)
     # Validar que la autoridad del oficio sea la misma que la del usuario
     if ofi_documento.usuario.autoridad_id != current_user.autoridad_id:
         flash("No tienes permiso para firmar este oficio, pertenece a otra autoridad", "warning")
@@ -1047,7 +1095,7 @@ def sign(ofi_documento_id):
             descripcion = f"{descripcion} y enviado a {cantidad} destinatarios"
         # Agregar registro a la bitácora
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(descripcion),
             url=url_for("ofi_documentos.detail", ofi_documento_id=ofi_documento.id),
@@ -1118,7 +1166,7 @@ def send(ofi_documento_id):
     )
     # Agregar registro a la bitácora
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_id=obtener_modulo_id(MODULO),
         usuario=current_user,
         descripcion=safe_message(f"Enviado Ofi Documento {ofi_documento.descripcion}"),
         url=url_for("ofi_documentos.detail", ofi_documento_id=ofi_documento.id),
@@ -1158,15 +1206,17 @@ def cancel(ofi_documento_id):
         return redirect(url_for("ofi_documentos.detail", ofi_documento_id=ofi_documento.id))
     # Actualizar esta_cancelado a verdadero
     ofi_documento.esta_cancelado = True
-    # Si el oficio tiene el estado BORRADOR, entonces se limpia el folio
+    # Si el oficio tiene el estado BORRADOR, entonces se libera y se limpia el folio
     if ofi_documento.estado == "BORRADOR":
+        autoridad_id = ofi_documento.usuario.autoridad_id
+        liberar_folio(OfiDocumento.__tablename__, autoridad_id, ofi_documento.folio_anio, ofi_documento.folio_num)
         ofi_documento.folio = None
         ofi_documento.folio_anio = None
         ofi_documento.folio_num = None
     ofi_documento.save()
     # Agregar registro a la bitácora
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_id=obtener_modulo_id(MODULO),
         usuario=current_user,
         descripcion=safe_message(f"Cancelado Oficio Documento {ofi_documento.descripcion}"),
         url=url_for("ofi_documentos.detail", ofi_documento_id=ofi_documento.id),
@@ -1208,7 +1258,7 @@ def uncancel(ofi_documento_id):
     ofi_documento.esta_cancelado = False
     ofi_documento.save()
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_id=obtener_modulo_id(MODULO),
         usuario=current_user,
         descripcion=safe_message(f"Descancelado Oficio Documento {ofi_documento.descripcion}"),
         url=url_for("ofi_documentos.detail", ofi_documento_id=ofi_documento.id),
@@ -1284,18 +1334,8 @@ def response(ofi_documento_id):
         return redirect(url_for("ofi_documentos.list_active"))
     # Formulario
     form = OfiDocumentoNewForm()
-    # Sugerir el folio consultando el último documento de la autoridad del usuario
-    ultimo_documento = (
-        OfiDocumento.query.join(Usuario)
-        .filter(Usuario.autoridad_id == current_user.autoridad_id)
-        .filter(OfiDocumento.folio_anio == datetime.now().year)
-        .order_by(OfiDocumento.folio_num.desc())
-        .first()
-    )
-    if ultimo_documento:
-        folio = f"{ultimo_documento.usuario.autoridad.clave}-{ultimo_documento.folio_num + 1}/{datetime.now().year}"
-    else:
-        folio = f"{current_user.autoridad.clave}-1/{datetime.now().year}"  # Tal vez sea el primer oficio del año
+    # Sugerir el folio con el contador de la autoridad del usuario
+    folio = _sugerir_folio()
     # Reemplazar las palabras claves en el contenido HTML
     contenido_html = ofi_plantilla.contenido_html
     contenido_html = contenido_html.replace("[[DIA]]", str(datetime.now().day))
@@ -1352,7 +1392,7 @@ def archive(ofi_documento_id):
     ofi_documento.save()
     # Agregar registro a la bitácora
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_id=obtener_modulo_id(MODULO),
         usuario=current_user,
         descripcion=safe_message(f"Archivando Oficio Documento {ofi_documento.descripcion}"),
         url=url_for("ofi_documentos.detail", ofi_documento_id=ofi_documento.id),
@@ -1394,7 +1434,7 @@ def unarchive(ofi_documento_id):
     ofi_documento.esta_archivado = False
     ofi_documento.save()
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_id=obtener_modulo_id(MODULO),
         usuario=current_user,
         descripcion=safe_message(f"Desarchivar Oficio Documento {ofi_documento.descripcion}"),
         url=url_for("ofi_documentos.detail", ofi_documento_id=ofi_documento.id),
@@ -1406,6 +1446,7 @@ def unarchive(ofi_documento_id):
 
 
 @ofi_documentos.route("/ofi_documentos/obtener_archivo_pdf_url_json/<ofi_documento_id>", methods=["GET", "POST"])
+@cache_condicional(OfiDocumento, "ofi_documento_id", identificar=safe_uuid, alcance="publico")
 def get_file_pdf_url_json(ofi_documento_id):
     """Obtener el URL del archivo PDF en formato JSON, para usar en el botón de descarga"""
     # Consultar el oficio
@@ -1492,13 +1533,16 @@ def delete(ofi_documento_id):
     if ofi_documento.estatus != "A":
         flash("El oficio ya está eliminado", "warning")
         return redirect(url_for("ofi_documentos.detail", ofi_documento_id=ofi_documento.id))
-    # Eliminar el oficio
+    # Eliminar el oficio, si tiene el estado BORRADOR se libera su folio, los firmados o enviados ya lo usaron
+    if ofi_documento.estado == "BORRADOR":
+        autoridad_id = ofi_documento.usuario.autoridad_id
+        liberar_folio(OfiDocumento.__tablename__, autoridad_id, ofi_documento.folio_anio, ofi_documento.folio_num)
     ofi_documento.folio = None
     ofi_documento.folio_anio = None
     ofi_documento.folio_num = None
     ofi_documento.delete()
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_id=obtener_modulo_id(MODULO),
         usuario=current_user,
         descripcion=safe_message(f"Eliminado Oficio Documento {ofi_documento.descripcion}"),
         url=url_for("ofi_documentos.detail", ofi_documento_id=ofi_documento.id),
@@ -1525,7 +1569,7 @@ def recover(ofi_documento_id):
     # Recuperar el oficio
     ofi_documento.recover()
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_id=obtener_modulo_id(MODULO),
         usuario=current_user,
         descripcion=safe_message(f"Recuperado Oficio Documento {ofi_documento.descripcion}"),
         url=url_for("ofi_documentos.detail", ofi_documento_id=ofi_documento.id),
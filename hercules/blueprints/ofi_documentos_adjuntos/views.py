@@ -13,12 +13,12 @@ from werkzeug.exceptions import NotFound
 from werkzeug.utils import secure_filename
 
 from hercules.blueprints.bitacoras.models import Bitacora
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.ofi_documentos_adjuntos.models import OfiDocumentoAdjunto
 from hercules.blueprints.ofi_documentos_adjuntos.forms import OfiDocumentoAdjuntoForm
 from hercules.blueprints.ofi_documentos.models import OfiDocumento
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.exceptions import (
     MyBucketNotFoundError,
@@ -228,7 +228,7 @@ def new_with_ofi_documento(ofi_documento_id):
 
             # Insertar en la Bitácora
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Nuevo archivo adjunto {ofi_documento_adjunto.descripcion}"),
                 url=url_for("ofi_documentos.detail", ofi_documento_id=ofi_documento_id),
@@ -258,7 +258,7 @@ def remove_all(ofi_documento_id):
     for adjunto in adjuntos:
         adjunto.delete()
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_id=obtener_modulo_id(MODULO),
         usuario=current_user,
         descripcion=safe_message(f"Eliminados todos los archivos adjuntos del oficio {ofi_documento.descripcion}"),
         url=url_for("ofi_documentos.detail", ofi_documento_id=ofi_documento.id),
@@ -276,7 +276,7 @@ def delete(ofi_documento_adjunto_id):
     if ofi_documento_adjunto.estatus == "A":
         ofi_documento_adjunto.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado archivo adjunto {ofi_documento_adjunto.descripcion}"),
             url=url_for("ofi_documentos_adjuntos.detail", ofi_documento_adjunto_id=ofi_documento_adjunto.id),
@@ -296,7 +296,7 @@ def recover(ofi_documento_adjunto_id):
     if ofi_documento_adjunto.estatus == "B":
         ofi_documento_adjunto.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado archivo adjunto {ofi_documento_adjunto.descripcion}"),
             url=url_for("ofi_documentos_adjuntos.detail", ofi_documento_adjunto_id=ofi_documento_adjunto.id),
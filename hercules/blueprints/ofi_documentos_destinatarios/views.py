@@ -6,11 +6,11 @@ import json
 from flask import Blueprint, flash, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
 
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_string, safe_message, safe_uuid
 
 from hercules.blueprints.bitacoras.models import Bitacora
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
 from hercules.blueprints.ofi_documentos_destinatarios.models import OfiDocumentoDestinatario
@@ -227,7 +227,7 @@ def remove_all(ofi_documento_id):
         destinatario.delete()
 
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_id=obtener_modulo_id(MODULO),
         usuario=current_user,
         descripcion=safe_message(f"Eliminado Todos los Destinatarios del Oficio {ofi_documento.descripcion}"),
         url=url_for("ofi_documentos.detail", ofi_documento_id=ofi_documento.id),
@@ -245,7 +245,7 @@ def delete(ofi_documento_destinatario_id):
     if ofi_documento_destinatario.estatus == "A":
         ofi_documento_destinatario.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Oficio-Destinatario {ofi_documento_destinatario.usuario.nombre}"),
             url=url_for("ofi_documentos_destinatarios.detail", ofi_documento_destinatario_id=ofi_documento_destinatario.id),
@@ -267,7 +267,7 @@ def recover(ofi_documento_destinatario_id):
     if ofi_documento_destinatario.estatus == "B":
         ofi_documento_destinatario.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Oficio-Destinatario {ofi_documento_destinatario.usuario.nombre}"),
             url=url_for("ofi_documentos_destinatarios.detail", ofi_documento_destinatario_id=ofi_documento_destinatario.id),
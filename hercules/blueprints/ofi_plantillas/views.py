@@ -11,13 +11,13 @@ from lxml.html.clean import Cleaner
 from sqlalchemy import String, cast
 
 from hercules.blueprints.bitacoras.models import Bitacora
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
 from hercules.blueprints.ofi_plantillas.models import OfiPlantilla
 from hercules.blueprints.ofi_plantillas.forms import OfiPlantillaForm
 from hercules.blueprints.usuarios.models import Usuario
 from hercules.blueprints.autoridades.models import Autoridad
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_string, safe_message, safe_uuid, safe_clave
 
@@ -389,7 +389,7 @@ def new():
         )
         ofi_plantilla.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nuevo Ofi Plantilla {ofi_plantilla.descripcion}"),
             url=url_for("ofi_plantillas.detail", ofi_plantilla_id=ofi_plantilla.id),
@@ -459,7 +459,7 @@ def edit(ofi_plantilla_id):
             ofi_plantilla.esta_compartida = form.esta_compartida.data
             ofi_plantilla.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Editado Ofi Plantilla {ofi_plantilla.descripcion}"),
                 url=url_for("ofi_plantillas.detail", ofi_plantilla_id=ofi_plantilla.id),
@@ -498,7 +498,7 @@ def delete(ofi_plantilla_id):
     if ofi_plantilla.estatus == "A":
         ofi_plantilla.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Ofi Plantilla {ofi_plantilla.descripcion}"),
             url=url_for("ofi_plantillas.detail", ofi_plantilla_id=ofi_plantilla.id),
@@ -520,7 +520,7 @@ def recover(ofi_plantilla_id):
     if ofi_plantilla.estatus == "B":
         ofi_plantilla.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Ofi Plantilla {ofi_plantilla.descripcion}"),
             url=url_for("ofi_plantillas.detail", ofi_plantilla_id=ofi_plantilla.id),
@@ -9,11 +9,11 @@ from flask_login import current_user, login_required
 from sqlalchemy import or_
 
 from hercules.blueprints.bitacoras.models import Bitacora
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.oficinas.forms import OficinaForm
 from hercules.blueprints.oficinas.models import Oficina
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_clave, safe_message, safe_string
 
@@ -136,7 +136,7 @@ def new():
         )
         oficina.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nuevo Oficina {oficina.clave}"),
             url=url_for("oficinas.detail", oficina_id=oficina.id),
@@ -177,7 +177,7 @@ def edit(oficina_id):
             oficina.extension = safe_string(form.extension.data, max_len=24)
             oficina.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Editado Oficina {oficina.clave}"),
                 url=url_for("oficinas.detail", oficina_id=oficina.id),
@@ -207,7 +207,7 @@ def delete(oficina_id):
     if oficina.estatus == "A":
         oficina.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Oficina {oficina.clave}"),
             url=url_for("oficinas.detail", oficina_id=oficina.id),
@@ -225,7 +225,7 @@ def recover(oficina_id):
     if oficina.estatus == "B":
         oficina.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Oficina {oficina.clave}"),
             url=url_for("oficinas.detail", oficina_id=oficina.id),
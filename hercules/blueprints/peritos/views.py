@@ -9,13 +9,14 @@ from flask_login import current_user, login_required
 
 from hercules.blueprints.bitacoras.models import Bitacora
 from hercules.blueprints.distritos.models import Distrito
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.peritos.forms import PeritoForm
 from hercules.blueprints.peritos.models import Perito
 from hercules.blueprints.peritos_tipos.models import PeritoTipo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
+from lib.nombres import filtrar_por_nombre
 from lib.safe_string import safe_email, safe_message, safe_string
 
 MODULO = "PERITOS"
@@ -51,7 +52,7 @@ def datatable_json():
         if distrito_nombre != "":
             consulta = consulta.join(Distrito).filter(Distrito.nombre.contains(distrito_nombre))
     if "nombre" in request.form:
-        consulta = consulta.filter(Perito.nombre.contains(safe_string(request.form["nombre"])))
+        consulta = filtrar_por_nombre(consulta, Perito, safe_string(request.form["nombre"]))
     if "perito_tipo_id" in request.form:
         perito = PeritoTipo.query.get(request.form["perito_tipo_id"])
         if perito:
@@ -134,7 +135,7 @@ def new():
         )
         perito.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(
                 f"Nuevo perito {perito.nombre}, tipo {perito.perito_tipo.nombre} en {perito.distrito.nombre}"
@@ -165,7 +166,7 @@ def edit(perito_id):
         perito.notas = safe_string(form.notas.data)
         perito.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Editado perito {perito.nombre} de {perito.distrito.nombre}"),
             url=url_for("peritos.detail", perito_id=perito.id),
@@ -193,7 +194,7 @@ def delete(perito_id):
     if perito.estatus == "A":
         perito.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado perito {perito.nombre} de {perito.distrito.nombre}"),
             url=url_for("peritos.detail", perito_id=perito.id),
@@ -211,7 +212,7 @@ def recover(perito_id):
     if perito.estatus == "B":
         perito.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado perito {perito.nombre} de {perito.distrito.nombre}"),
             url=url_for("peritos.detail", perito_id=perito.id),
@@ -8,11 +8,11 @@ from flask import Blueprint, flash, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
 
 from hercules.blueprints.bitacoras.models import Bitacora
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.peritos_tipos.forms import PeritoTipoForm
 from hercules.blueprints.peritos_tipos.models import PeritoTipo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_message, safe_string
 
@@ -99,7 +99,7 @@ def new():
         perito_tipo = PeritoTipo(nombre=safe_string(form.nombre.data, save_enie=True))
         perito_tipo.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nuevo Tipo de Perito {perito_tipo.nombre}"),
             url=url_for("peritos_tipos.detail", perito_tipo_id=perito_tipo.id),
@@ -120,7 +120,7 @@ def edit(perito_tipo_id):
         perito_tipo.nombre = safe_string(form.nombre.data, save_enie=True)
         perito_tipo.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Editado Tipo de Perito {perito_tipo.nombre}"),
             url=url_for("peritos_tipos.detail", perito_tipo_id=perito_tipo.id),
@@ -140,7 +140,7 @@ def delete(perito_tipo_id):
     if perito_tipo.estatus == "A":
         perito_tipo.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Tipo de Perito {perito_tipo.nombre}"),
             url=url_for("peritos_tipos.detail", perito_tipo_id=perito_tipo.id),
@@ -158,7 +158,7 @@ def recover(perito_tipo_id):
     if perito_tipo.estatus == "B":
         perito_tipo.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Tipo de Perito {perito_tipo.nombre}"),
             url=url_for("peritos_tipos.detail", perito_tipo_id=perito_tipo.id),
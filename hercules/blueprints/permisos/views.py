@@ -13,6 +13,7 @@ from hercules.blueprints.permisos.forms import PermisoEditForm, PermisoNewWithMo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.roles.models import Rol
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_message, safe_string
 
@@ -210,7 +211,7 @@ def edit(permiso_id):
         permiso.nombre = f"{permiso.rol.nombre} puede {Permiso.NIVELES[permiso.nivel]} en {permiso.modulo.nombre}"
         permiso.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Editado Permiso {permiso.nombre}"),
             url=url_for("permisos.detail", permiso_id=permiso.id),
@@ -232,7 +233,7 @@ def delete(permiso_id):
     if permiso.estatus == "A":
         permiso.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Permiso {permiso.nombre}"),
             url=url_for("permisos.detail", permiso_id=permiso.id),
@@ -250,7 +251,7 @@ def recover(permiso_id):
     if permiso.estatus == "B":
         permiso.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Permiso {permiso.nombre}"),
             url=url_for("permisos.detail", permiso_id=permiso.id),
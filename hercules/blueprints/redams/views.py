@@ -10,11 +10,11 @@ from flask_login import current_user, login_required
 from hercules.blueprints.autoridades.models import Autoridad
 from hercules.blueprints.bitacoras.models import Bitacora
 from hercules.blueprints.distritos.models import Distrito
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.redams.forms import RedamForm
 from hercules.blueprints.redams.models import Redam
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_expediente, safe_message, safe_string
 
@@ -123,7 +123,7 @@ def new():
         )
         redam.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nuevo REDAM {redam.nombre}"),
             url=url_for("redams.detail", redam_id=redam.id),
@@ -163,7 +163,7 @@ def edit(redam_id):
         redam.observaciones = safe_string(form.observaciones.data)
         redam.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Editado REDAM {redam.nombre}"),
             url=url_for("redams.detail", redam_id=redam.id),
@@ -200,7 +200,7 @@ def delete(redam_id):
     if redam.estatus == "A":
         redam.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado REDAM {redam.nombre}"),
             url=url_for("redams.detail", redam_id=redam.id),
@@ -218,7 +218,7 @@ def recover(redam_id):
     if redam.estatus == "B":
         redam.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado REDAM {redam.nombre}"),
             url=url_for("redams.detail", redam_id=redam.id),
@@ -8,6 +8,7 @@ from sqlalchemy import Enum, ForeignKey, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from hercules.extensions import database
+from lib.nombres import columna_nombre_buscador, columna_nombre_fonetico, indices_nombres
 from lib.universal_mixin import UniversalMixin
 
 
@@ -30,6 +31,9 @@ class REPSVMAgresor(database.Model, UniversalMixin):
     # Nombre de la tabla
     __tablename__ = "repsvm_agresores"
 
+    # Índices para la búsqueda por nombre
+    __table_args__ = indices_nombres("repsvm_agresores")
+
     # Clave primaria
     id: Mapped[int] = mapped_column(primary_key=True)
 
@@ -50,6 +54,10 @@ class REPSVMAgresor(database.Model, UniversalMixin):
     tipo_juzgado: Mapped[str] = mapped_column(Enum(*TIPOS_JUZGADOS, name="tipos_juzgados", native_enum=False), index=True)
     tipo_sentencia: Mapped[str] = mapped_column(Enum(*TIPOS_SENTENCIAS, name="tipos_juzgados", native_enum=False), index=True)
 
+    # Columnas generadas para la búsqueda por nombre
+    nombre_buscador: Mapped[Optional[str]] = columna_nombre_buscador("nombre")
+    nombre_fonetico: Mapped[Optional[str]] = columna_nombre_fonetico("nombre")
+
     # Hijos
     repsvm_agresores_delitos: Mapped[List["REPSVMAgresorDelito"]] = relationship(back_populates="repsvm_agresor")
 
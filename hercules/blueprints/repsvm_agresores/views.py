@@ -9,12 +9,13 @@ from flask_login import current_user, login_required
 
 from hercules.blueprints.bitacoras.models import Bitacora
 from hercules.blueprints.distritos.models import Distrito
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.repsvm_agresores.forms import REPSVMAgresorForm
 from hercules.blueprints.repsvm_agresores.models import REPSVMAgresor
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
+from lib.nombres import filtrar_por_nombre
 from lib.safe_string import safe_message, safe_string, safe_text, safe_url
 
 MODULO = "REPSVM AGRESORES"
@@ -46,7 +47,7 @@ def datatable_json():
     if "nombre" in request.form:
         nombre = safe_string(request.form["nombre"], save_enie=True)
         if nombre != "":
-            consulta = consulta.filter(REPSVMAgresor.nombre.contains(nombre))
+            consulta = filtrar_por_nombre(consulta, REPSVMAgresor, nombre)
     if "numero_causa" in request.form:
         numero_causa = safe_string(request.form["numero_causa"])
         if numero_causa != "":
@@ -186,7 +187,7 @@ def new():
         )
         repsvm_agresor.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nuevo Agresor {repsvm_agresor.consecutivo} - {repsvm_agresor.nombre}"),
             url=url_for("repsvm_agresores.detail", repsvm_agresor_id=repsvm_agresor.id),
@@ -220,7 +221,7 @@ def edit(repsvm_agresor_id):
         repsvm_agresor.tipo_sentencia = safe_string(form.tipo_sentencia.data)
         repsvm_agresor.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Editado Agresor {repsvm_agresor.nombre}"),
             url=url_for("repsvm_agresores.detail", repsvm_agresor_id=repsvm_agresor.id),
@@ -250,7 +251,7 @@ def delete(repsvm_agresor_id):
     if repsvm_agresor.estatus == "A":
         repsvm_agresor.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Agresor {repsvm_agresor.nombre}"),
             url=url_for("repsvm_agresores.detail", repsvm_agresor_id=repsvm_agresor.id),
@@ -268,7 +269,7 @@ def recover(repsvm_agresor_id):
     if repsvm_agresor.estatus == "B":
         repsvm_agresor.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Agresor {repsvm_agresor.nombre}"),
             url=url_for("repsvm_agresores.detail", repsvm_agresor_id=repsvm_agresor.id),
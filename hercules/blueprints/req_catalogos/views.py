@@ -6,11 +6,11 @@ import json
 from flask import Blueprint, flash, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
 
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_string, safe_message, safe_clave
 
 from hercules.blueprints.bitacoras.models import Bitacora
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
 from hercules.blueprints.req_catalogos.models import ReqCatalogo
@@ -132,7 +132,7 @@ def new():
             )
             req_catalogo.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Nuevo Req Catalogo {req_catalogo.codigo}"),
                 url=url_for("req_catalogos.detail", req_catalogo_id=req_catalogo.id),
@@ -167,7 +167,7 @@ def new_with_categoria(req_categoria_id):
             )
             req_catalogo.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Nuevo Req Catalogo {req_catalogo.codigo}"),
                 url=url_for("req_catalogos.detail", req_catalogo_id=req_catalogo.id),
@@ -202,7 +202,7 @@ def edit(req_catalogo_id):
             req_catalogo.unidad_medida = form.unidad_medida.data
             req_catalogo.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Editado Req Catálogo {req_catalogo.codigo}"),
                 url=url_for("req_catalogos.detail", req_catalogo_id=req_catalogo.id),
@@ -227,7 +227,7 @@ def delete(req_catalogo_id):
     if req_catalogo.estatus == "A":
         req_catalogo.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Req Catálogo {req_catalogo.codigo}"),
             url=url_for("req_catalogos.detail", req_catalogo_id=req_catalogo.id),
@@ -245,7 +245,7 @@ def recover(req_catalogo_id):
     if req_catalogo.estatus == "B":
         req_catalogo.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Req Catálogo {req_catalogo.codigo}"),
             url=url_for("req_catalogos.detail", req_catalogo_id=req_catalogo.id),
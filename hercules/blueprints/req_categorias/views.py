@@ -6,11 +6,11 @@ import json
 from flask import Blueprint, flash, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
 
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_string, safe_message, safe_clave
 
 from hercules.blueprints.bitacoras.models import Bitacora
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
 from hercules.blueprints.req_categorias.models import ReqCategoria
@@ -119,7 +119,7 @@ def new():
             )
             req_categoria.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Nueva Req Categoría {req_categoria.clave}"),
                 url=url_for("req_categorias.detail", req_categoria_id=req_categoria.id),
@@ -149,7 +149,7 @@ def edit(req_categoria_id):
             req_categoria.descripcion = safe_string(form.descripcion.data)
             req_categoria.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Editado Req Categoría {req_categoria.clave}"),
                 url=url_for("req_categorias.detail", req_categoria_id=req_categoria.id),
@@ -172,7 +172,7 @@ def delete(req_categoria_id):
     if req_categoria.estatus == "A":
         req_categoria.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Req Categoría {req_categoria.clave}"),
             url=url_for("req_categorias.detail", req_categoria_id=req_categoria.id),
@@ -190,7 +190,7 @@ def recover(req_categoria_id):
     if req_categoria.estatus == "B":
         req_categoria.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Req Categoría {req_categoria.clave}"),
             url=url_for("req_categorias.detail", req_categoria_id=req_categoria.id),
@@ -7,16 +7,18 @@ import json
 
 from flask import Blueprint, current_app, flash, make_response, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
+from sqlalchemy import func, select
 from werkzeug.exceptions import NotFound
 
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_string, safe_message, safe_uuid
 from lib.exceptions import MyBucketNotFoundError, MyFileNotFoundError, MyNotValidParamError
 from lib.google_cloud_storage import get_blob_name_from_url, get_file_from_gcs
-from lib.folio import validar_folio
+from lib.folio import cambiar_numero_folio, formar_folio, liberar_folio, reservar_folio, siguiente_folio, validar_folio
+from lib.universal_mixin import save_all, unidad_de_trabajo
 
 from hercules.blueprints.bitacoras.models import Bitacora
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
 from hercules.blueprints.req_requisiciones.models import ReqRequisicion
@@ -52,6 +54,17 @@ def before_request():
     """Permiso por defecto"""
 
 
+def _maximo_folio(autoridad_id: int, anio: int):
+    """Subconsulta con el último número de folio de la autoridad en el año, sólo para iniciar el contador"""
+    return (
+        select(func.max(ReqRequisicion.folio_num))
+        .join(Usuario)
+        .where(Usuario.autoridad_id == autoridad_id)
+        .where(ReqRequisicion.folio_anio == anio)
+        .scalar_subquery()
+    )
+
+
 @req_requisiciones.route("/req_requisiciones/datatable_json", methods=["GET", "POST"])
 def datatable_json():
     """DataTable JSON para listado de Requisiciones"""
@@ -298,6 +311,21 @@ def new():
             if fecha_requerida is not None and fecha_requerida < datetime.now().date():
                 flash("La fecha requerida no puede ser anterior a la fecha actual", "warning")
                 es_valido = False
+        # Reservar el folio, si ya estaba ocupado se asigna el siguiente
+        if es_valido and numero_folio is not None:
+            autoridad_id = current_user.autoridad_id
+            maximo = _maximo_folio(autoridad_id, anio_folio)
+            try:
+                numero = reservar_folio(ReqRequisicion.__tablename__, autoridad_id, anio_folio, numero_folio, maximo)
+            except MyNotValidParamError as error:
+                database.session.rollback()
+                flash(str(error), "warning")
+                es_valido = False
+            else:
+                if numero != numero_folio:
+                    folio_reservado = cambiar_numero_folio(folio, numero)
+                    flash(f"El folio {folio} ya estaba ocupado, se asignó {folio_reservado}", "warning")
+                    folio, numero_folio = folio_reservado, numero
         # Si es válido, guardar registro
         if es_valido:
             # Guardar requisición
@@ -317,21 +345,24 @@ def new():
                 folio_num=numero_folio,
             )
             req_requisicion.save()
-            # Guardar los registros de la requisición
-            for registros in form.articulos:
-                if registros.codigo.data != "":
-                    req_requisicion_registro = ReqRequisicionRegistro(
+            # Guardar los registros de la requisición en un solo commit
+            save_all(
+                [
+                    ReqRequisicionRegistro(
                         req_requisicion_id=req_requisicion.id,
                         req_catalogo_id=registros.idArticulo.data,
                         clave=registros.clave.data,
                         cantidad=registros.cantidad.data,
                         detalle=registros.detalle.data,
                     )
-                    req_requisicion_registro.save()
+                    for registros in form.articulos
+                    if registros.codigo.data != ""
+                ]
+            )
 
             # Guardar en la bitácora
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Requisicion creada {req_requisicion.observaciones}"),
                 url=url_for("req_requisiciones.detail", req_requisicion_id=req_requisicion.id),
@@ -339,20 +370,12 @@ def new():
             bitacora.save()
             flash(bitacora.descripcion, "success")
             return redirect(bitacora.url)
-    # Sugerir el folio consultando la última requisición de la autoridad del usuario
-    ultima_requisicion = (
-        ReqRequisicion.query.join(Usuario)
-        .filter(Usuario.autoridad_id == current_user.autoridad_id)
-        .filter(ReqRequisicion.folio_anio == datetime.now().year)
-        .order_by(ReqRequisicion.folio_num.desc())
-        .first()
-    )
-    if ultima_requisicion:
-        folio = f"{ultima_requisicion.usuario.autoridad.clave}-{ultima_requisicion.folio_num + 1}/{datetime.now().year}"
-    else:
-        folio = f"{current_user.autoridad.clave}-1/{datetime.now().year}"  # Tal vez sea la primer requisición del año
+    # Sugerir el folio con el contador de la autoridad del usuario
+    anio = datetime.now().year
+    maximo = _maximo_folio(current_user.autoridad_id, anio)
+    numero = siguiente_folio(ReqRequisicion.__tablename__, current_user.autoridad_id, anio, maximo)
     # Carga de campos
-    form.folio.data = folio
+    form.folio.data = formar_folio(current_user.autoridad.clave, numero, anio)
     form.area.data = current_user.autoridad.descripcion
     # Entrega del template
     return render_template("req_requisiciones/new.jinja2", titulo="Nueva Requisición", form=form)
@@ -400,32 +423,29 @@ def edit(req_requisicion_id):
     )
 
     if form.validate_on_submit():
-        # Guardar requisicion
-        req_requisicion.justificacion = safe_string(form.justificacion.data, max_len=1024, save_enie=True)
-        req_requisicion.fecha_requerida = form.fechaRequerida.data
-        req_requisicion.save()
-        # Eliminar los articulos registrados antes de la edicion
-        for registro_a_eliminar in articulos:
-            articulo = ReqRequisicionRegistro.query.filter_by(id=registro_a_eliminar.id).first()
-            if articulo:
-                articulo.estatus = "B"
-                articulo.save()
-
-        # Guardar los registros de la requisición
-        for registros in form.articulos:
-            if registros.codigo.data != "":
-                req_requisicion_registro = ReqRequisicionRegistro(
-                    req_requisicion_id=req_requisicion.id,
-                    req_catalogo_id=registros.idArticulo.data,
-                    clave=registros.clave.data,
-                    cantidad=registros.cantidad.data,
-                    detalle=registros.detalle.data,
-                )
-                req_requisicion_registro.save()
+        # Guardar la requisicion y sus articulos en un solo commit
+        with unidad_de_trabajo():
+            req_requisicion.justificacion = safe_string(form.justificacion.data, max_len=1024, save_enie=True)
+            req_requisicion.fecha_requerida = form.fechaRequerida.data
+            req_requisicion.save()
+            # Eliminar los articulos registrados antes de la edicion
+            for registro_a_eliminar in articulos:
+                registro_a_eliminar.estatus = "B"
+                registro_a_eliminar.save()
+            # Guardar los registros de la requisición
+            for registros in form.articulos:
+                if registros.codigo.data != "":
+                    ReqRequisicionRegistro(
+                        req_requisicion_id=req_requisicion.id,
+                        req_catalogo_id=registros.idArticulo.data,
+                        clave=registros.clave.data,
+                        cantidad=registros.cantidad.data,
+                        detalle=registros.detalle.data,
+                    ).save()
 
         # Guardar en la bitacora
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Requisicion actualizada: {req_requisicion.folio}"),
             url=url_for("req_requisiciones.detail", req_requisicion_id=req_requisicion.id),
@@ -528,7 +548,7 @@ def step_2_request(req_requisicion_id):
         req_requisicion.save()
 
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Firmado simple de la Requisición {req_requisicion.folio}"),
             url=url_for("req_requisiciones.detail", req_requisicion_id=req_requisicion.id),
@@ -600,7 +620,7 @@ def step_3_authorize(req_requisicion_id):
         req_requisicion.save()
 
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Autorizado de la Requisición {req_requisicion.folio}"),
             url=url_for("req_requisiciones.detail", req_requisicion_id=req_requisicion.id),
@@ -686,7 +706,7 @@ def step_4_review(req_requisicion_id):
         req_requisicion.save()
 
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Revisado de la Requisición {req_requisicion.folio}"),
             url=url_for("req_requisiciones.detail", req_requisicion_id=req_requisicion.id),
@@ -824,7 +844,7 @@ def create_pdf(req_requisicion_id):
         )
         # Agregar registro a la bitácora
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Generar PDf de requisicion {req_requisicion.id}"),
             url=url_for("req_requisiciones.detail", req_requisicion_id=req_requisicion.id),
@@ -926,9 +946,16 @@ def delete(req_requisicion_id):
         if not puede_eliminarlo:
             flash("No tiene permisos para eliminar o tiene un estado particular", "warning")
             return redirect(url_for("req_requisiciones.detail", req_requisicion_id=req_requisicion_id))
+        # Si tiene el estado BORRADOR se libera su folio, las firmadas o autorizadas ya lo usaron
+        if req_requisicion.estado == "BORRADOR":
+            anio, numero = req_requisicion.folio_anio, req_requisicion.folio_num
+            liberar_folio(ReqRequisicion.__tablename__, req_requisicion.autoridad_id, anio, numero)
+            req_requisicion.folio = None
+            req_requisicion.folio_anio = None
+            req_requisicion.folio_num = None
         req_requisicion.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminada Requisición {req_requisicion.justificacion}"),
             url=url_for("req_requisiciones.detail", req_requisicion_id=req_requisicion.id),
@@ -946,7 +973,7 @@ def recover(req_requisicion_id):
     if req_requisicion.estatus == "B":
         req_requisicion.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Requisición {req_requisicion.id}"),
             url=url_for("req_requisiciones.detail", req_requisicion_id=req_requisicion.id),
@@ -8,6 +8,7 @@ from flask import Blueprint, current_app, flash, redirect, render_template, requ
 from flask_login import current_user, login_required
 from werkzeug.datastructures import CombinedMultiDict
 
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_string, safe_message
 from werkzeug.exceptions import NotFound
@@ -23,7 +24,6 @@ from lib.exceptions import (
 from lib.google_cloud_storage import get_blob_name_from_url, get_file_from_gcs, upload_file_to_gcs
 from lib.storage import GoogleCloudStorage
 from hercules.blueprints.bitacoras.models import Bitacora
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
 from hercules.blueprints.req_requisiciones_adjuntos.models import ReqRequisicionAdjunto
@@ -187,7 +187,7 @@ def new_with_ofi_documento(req_requisicion_id):
                 req_requisicion_adjunto.save()
                 # Salida en bitácora
                 bitacora = Bitacora(
-                    modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                    modulo_id=obtener_modulo_id(MODULO),
                     usuario=current_user,
                     descripcion=safe_message(f"Nueva Requisición - Documento Adjunto {req_requisicion_adjunto.descripcion}"),
                     url=url_for("req_requisiciones_adjuntos.detail", req_requisicion_adjunto_id=req_requisicion_adjunto.id),
@@ -214,7 +214,7 @@ def remove_all(req_requisicion_id):
         adjunto.delete()
 
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_id=obtener_modulo_id(MODULO),
         usuario=current_user,
         descripcion=safe_message(f"Eliminado todos los archivos adjuntos de la Requisición {req_requisicion.descripcion}"),
         url=url_for("req_requisiciones.detail", req_requisicion_id=req_requisicion.id),
@@ -232,7 +232,7 @@ def delete(req_requisicion_adjunto_id):
     if req_requisicion_adjunto.estatus == "A":
         req_requisicion_adjunto.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Requisición documento adjunto {req_requisicion_adjunto.descripcion}"),
             url=url_for("req_requisiciones_adjuntos.detail", req_requisicion_adjunto_id=req_requisicion_adjunto.id),
@@ -254,7 +254,7 @@ def recover(req_requisicion_adjunto_id):
     if req_requisicion_adjunto.estatus == "B":
         req_requisicion_adjunto.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Requisición documento adjunto {req_requisicion_adjunto.descripcion}"),
             url=url_for("req_requisiciones_adjuntos.detail", req_requisicion_adjunto_id=req_requisicion_adjunto.id),
@@ -8,11 +8,12 @@ from flask import Blueprint, flash, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
 
 from hercules.blueprints.bitacoras.models import Bitacora
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.roles.forms import RolForm
 from hercules.blueprints.roles.models import Rol
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.cache import cache_json
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_message, safe_string
 
@@ -107,7 +108,7 @@ def new():
         rol = Rol(nombre=nombre)
         rol.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nuevo Rol {rol.nombre}"),
             url=url_for("roles.detail", rol_id=rol.id),
@@ -138,7 +139,7 @@ def edit(rol_id):
             rol.nombre = nombre
             rol.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Editado Rol {rol.nombre}"),
                 url=url_for("roles.detail", rol_id=rol.id),
@@ -166,7 +167,7 @@ def delete(rol_id):
             usuario_rol.delete()
         # Guardar en la bitacora
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Rol {rol.nombre}"),
             url=url_for("roles.detail", rol_id=rol.id),
@@ -192,7 +193,7 @@ def recover(rol_id):
             usuario_rol.recover()
         # Guardar en la bitacora
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Rol {rol.nombre}"),
             url=url_for("roles.detail", rol_id=rol.id),
@@ -203,6 +204,7 @@ def recover(rol_id):
 
 
 @roles.route("/roles/select2_json", methods=["POST"])
+@cache_json(tablas=["roles"])
 def select2_json():
     """Proporcionar el JSON de roles para elegir con un Select2, se usa para filtrar en DataTables"""
     consulta = Rol.query.filter(Rol.estatus == "A")
@@ -28,6 +28,7 @@ from sendgrid.helpers.mail import (  # type: ignore
 
 from hercules.app import create_app
 from hercules.blueprints.sentencias.models import Sentencia
+from lib.contenidos import extraer_contenidos, extraer_pendientes
 from lib.tasks import set_task_error, set_task_progress
 
 load_dotenv()  # Take environment variables from .env
@@ -156,3 +157,25 @@ def enviar_reporte():
     set_task_progress(100, mensaje_final)
     bitacora.info(mensaje_final)
     return mensaje_final
+
+
+def extraer_contenido(sentencia_id: int) -> str:
+    """Extraer el texto del archivo PDF de una sentencia para la búsqueda por contenido"""
+    con_texto = extraer_contenidos(Sentencia, app.config["CLOUD_STORAGE_DEPOSITO_SENTENCIAS"], [sentencia_id])
+    if con_texto:
+        mensaje = f"Se extrajo el contenido de la sentencia {sentencia_id}"
+    else:
+        mensaje = f"La sentencia {sentencia_id} no tiene texto"
+    set_task_progress(100, mensaje)
+    bitacora.info(mensaje)
+    return mensaje
+
+
+def extraer_contenidos_pendientes(lote: int = 50, limite: int | None = None) -> str:
+    """Extraer por lotes el texto de las sentencias que aún no lo tienen"""
+    set_task_progress(0, "Inicia extraer el contenido de las sentencias pendientes")
+    procesados, con_texto = extraer_pendientes(Sentencia, app.config["CLOUD_STORAGE_DEPOSITO_SENTENCIAS"], lote, limite)
+    mensaje_final = f"Termina extraer el contenido de {procesados} sentencias, {con_texto} con texto"
+    set_task_progress(100, mensaje_final)
+    bitacora.info(mensaje_final)
+    return mensaje_final
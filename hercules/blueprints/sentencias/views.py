@@ -9,20 +9,23 @@ from datetime import date, datetime, timedelta
 from flask import Blueprint, current_app, flash, make_response, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
 from pytz import timezone
-from sqlalchemy import Date, func
+from sqlalchemy.orm import undefer
 from werkzeug.datastructures import CombinedMultiDict
 from werkzeug.exceptions import NotFound
 
 from hercules.blueprints.autoridades.models import Autoridad
 from hercules.blueprints.bitacoras.models import Bitacora
+from hercules.blueprints.cantidades_diarias.fuentes import cantidades_por_autoridad, cantidades_por_dia
 from hercules.blueprints.materias.models import Materia
 from hercules.blueprints.materias_tipos_juicios.models import MateriaTipoJuicio
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.sentencias.forms import SentenciaEditForm, SentenciaNewForm, SentenciaReportForm
 from hercules.blueprints.sentencias.models import Sentencia
 from hercules.blueprints.usuarios.decorators import permission_required
-from hercules.extensions import database
+from lib.busqueda import consulta_tsquery, filtrar_por_texto
+from lib.cache import cache_condicional, cache_json
+from lib.catalogos import consultar_por_id, obtener_modulo_id
+from lib.contenidos import buscar_contenidos, encolar_extraccion
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.exceptions import (
     MyBucketNotFoundError,
@@ -34,6 +37,7 @@ from lib.exceptions import (
     MyUnknownExtensionError,
 )
 from lib.google_cloud_storage import get_blob_name_from_url, get_file_from_gcs, get_media_type_from_filename
+from lib.indices import Listado
 from lib.safe_string import (
     extract_expediente_anio,
     extract_expediente_num,
@@ -44,6 +48,7 @@ from lib.safe_string import (
     safe_string,
 )
 from lib.storage import GoogleCloudStorage
+from lib.texto_pdf import descomprimir_texto, elaborar_fragmento
 from lib.time_to_text import dia_mes_ano
 
 # Zona horaria
@@ -52,6 +57,7 @@ local_tz = timezone(TIMEZONE)
 
 # Constantes de este módulo
 MODULO = "SENTENCIAS"
+LISTADO = Listado(Sentencia, ("autoridad_id",), "fecha", "id")  # Filtros y orden de datatable_json
 DASHBOARD_CANTIDAD_DIAS = 15
 LIMITE_DIAS = 3650  # Diez años
 LIMITE_DIAS_EDITAR = LIMITE_DIAS_ELIMINAR = LIMITE_DIAS_RECUPERAR = 7
@@ -69,6 +75,13 @@ def before_request():
 
 
 @sentencias.route("/sentencias/acuses/<id_hashed>")
+@cache_condicional(
+    Sentencia,
+    "id_hashed",
+    identificar=Sentencia.decode_id,
+    tablas=["autoridades", "distritos"],
+    alcance="publico",
+)
 def checkout(id_hashed):
     """Acuse"""
     sentencia = Sentencia.query.get_or_404(Sentencia.decode_id(id_hashed))
@@ -92,7 +105,7 @@ def datatable_json():
     else:
         consulta = consulta.filter(Sentencia.estatus == "A")
     if "autoridad_id" in request.form:
-        autoridad = Autoridad.query.get(request.form["autoridad_id"])
+        autoridad = consultar_por_id("autoridades", request.form["autoridad_id"])
         if autoridad:
             consulta = consulta.filter(Sentencia.autoridad_id == autoridad.id)
     elif "autoridad_clave" in request.form:
@@ -112,7 +125,7 @@ def datatable_json():
     if "descripcion" in request.form:
         descripcion = safe_string(request.form["descripcion"], save_enie=True)
         if descripcion != "":
-            consulta = consulta.filter(Sentencia.descripcion.contains(descripcion))
+            consulta = filtrar_por_texto(consulta, Sentencia, descripcion)
     if "sentencia" in request.form:
         try:
             sentencia = safe_sentencia(request.form["sentencia"])
@@ -141,7 +154,7 @@ def datatable_json():
         consulta = consulta.filter(Sentencia.fecha <= fecha_hasta)
 
     # Ordenar y paginar
-    registros = consulta.order_by(Sentencia.id.desc()).offset(start).limit(rows_per_page).all()
+    registros = consulta.order_by(LISTADO.orden_descendente()).offset(start).limit(rows_per_page).all()
     total = consulta.count()
 
     # Elaborar datos para DataTable
@@ -184,7 +197,7 @@ def admin_datatable_json():
     else:
         consulta = consulta.filter(Sentencia.estatus == "A")
     if "autoridad_id" in request.form:
-        autoridad = Autoridad.query.get(request.form["autoridad_id"])
+        autoridad = consultar_por_id("autoridades", request.form["autoridad_id"])
         if autoridad:
             consulta = consulta.filter(Sentencia.autoridad_id == autoridad.id)
     elif "autoridad_clave" in request.form:
@@ -204,7 +217,7 @@ def admin_datatable_json():
     if "descripcion" in request.form:
         descripcion = safe_string(request.form["descripcion"], save_enie=True)
         if descripcion != "":
-            consulta = consulta.filter(Sentencia.descripcion.contains(descripcion))
+            consulta = filtrar_por_texto(consulta, Sentencia, descripcion)
     if "sentencia" in request.form:
         try:
             sentencia = safe_sentencia(request.form["sentencia"])
@@ -260,6 +273,53 @@ def admin_datatable_json():
     return output_datatable_json(draw, total, data)
 
 
+@sentencias.route("/sentencias/buscar_contenido_json", methods=["GET", "POST"])
+def search_content_json():
+    """DataTable JSON con Sentencias que contienen el texto en su archivo PDF, ordenados por relevancia"""
+
+    # Tomar parámetros de Datatables
+    draw, start, rows_per_page = get_datatable_parameters()
+
+    # Sin texto no hay resultados
+    texto = safe_string(request.form.get("texto", ""), save_enie=True)
+    if texto == "":
+        return output_datatable_json(draw, 0, [])
+
+    # Consultar con el índice del contenido
+    consulta = Sentencia.query.filter(Sentencia.estatus == "A")
+    if "autoridad_id" in request.form:
+        autoridad = consultar_por_id("autoridades", request.form["autoridad_id"])
+        if autoridad:
+            consulta = consulta.filter(Sentencia.autoridad_id == autoridad.id)
+    total = consulta.filter(Sentencia.contenido_buscador.op("@@")(consulta_tsquery(texto))).count()
+    registros = (
+        buscar_contenidos(consulta, Sentencia, texto)
+        .options(undefer(Sentencia.contenido_texto))
+        .offset(start)
+        .limit(rows_per_page)
+        .all()
+    )
+
+    # Elaborar datos para DataTable
+    data = []
+    for sentencia in registros:
+        data.append(
+            {
+                "fecha": sentencia.fecha.strftime("%Y-%m-%d 00:00:00"),
+                "autoridad_clave": sentencia.autoridad.clave,
+                "detalle": {
+                    "sentencia": sentencia.sentencia,
+                    "url": url_for("sentencias.detail", sentencia_id=sentencia.id),
+                },
+                "expediente": sentencia.expediente,
+                "fragmento": elaborar_fragmento(descomprimir_texto(sentencia.contenido_texto), texto),
+            }
+        )
+
+    # Entregar JSON
+    return output_datatable_json(draw, total, data)
+
+
 @sentencias.route("/sentencias")
 def list_active():
     """Listado de Sentencias activas"""
@@ -478,8 +538,9 @@ def new():
                 sentencia.archivo = gcstorage.filename  # Conservar el nombre original
                 sentencia.url = gcstorage.url
                 sentencia.save()
+                encolar_extraccion("sentencias.task.extraer_contenido", "Extraer el contenido de la sentencia", sentencia.id)
                 bitacora = Bitacora(
-                    modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                    modulo_id=obtener_modulo_id(MODULO),
                     usuario=current_user,
                     descripcion=safe_message(
                         f"Nueva Sentencia de {autoridad.clave} con sentencia {sentencia.sentencia} y del expediente {sentencia.expediente}"
@@ -647,8 +708,9 @@ def new_with_autoridad_id(autoridad_id):
             sentencia.archivo = gcstorage.filename  # Conservar el nombre original
             sentencia.url = gcstorage.url
             sentencia.save()
+            encolar_extraccion("sentencias.task.extraer_contenido", "Extraer el contenido de la sentencia", sentencia.id)
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(
                     f"Nueva Sentencia de {autoridad.clave} con sentencia {sentencia.sentencia} y del expediente {sentencia.expediente}"
@@ -760,7 +822,7 @@ def edit(sentencia_id):
             sentencia.es_perspectiva_genero = es_perspectiva_genero
             sentencia.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(
                     f"Editada la Sentencia de {sentencia.autoridad.clave} con sentencia {sentencia.sentencia} y del expediente {sentencia.expediente}"
@@ -812,7 +874,7 @@ def delete(sentencia_id):
     if current_user.can_admin(MODULO):
         sentencia.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=descripcion,
             url=detalle_url,
@@ -830,7 +892,7 @@ def delete(sentencia_id):
     if sentencia.creado >= datetime.now(tz=local_tz) - timedelta(days=LIMITE_DIAS_ELIMINAR):
         sentencia.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=descripcion,
             url=detalle_url,
@@ -865,7 +927,7 @@ def recover(sentencia_id):
     if current_user.can_admin(MODULO):
         sentencia.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=descripcion,
             url=detalle_url,
@@ -883,7 +945,7 @@ def recover(sentencia_id):
     if sentencia.creado >= datetime.now(tz=local_tz) - timedelta(days=LIMITE_DIAS_RECUPERAR):
         sentencia.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=descripcion,
             url=detalle_url,
@@ -1002,6 +1064,7 @@ def download_file_pdf(sentencia_id):
 
 @sentencias.route("/sentencias/tablero_cantidades_por_dia_json")
 @permission_required(MODULO, Permiso.VER)
+@cache_json(tablas=["sentencias", "autoridades", "cantidades_diarias"])
 def dashboard_amounts_per_day_json():
     """Calcular las cantidades de Sentencias por día"""
 
@@ -1023,82 +1086,18 @@ def dashboard_amounts_per_day_json():
     except (TypeError, ValueError):
         cantidad_dias = DASHBOARD_CANTIDAD_DIAS
 
-    # Consultar
-    if autoridad is None:
-        consulta = (
-            database.session.query(
-                func.cast(Sentencia.creado, Date).label("creado"),
-                func.count(Sentencia.id).label("cantidad"),
-            )
-            .select_from(Sentencia)
-            .where(Sentencia.estatus == "A")
-            .where(Sentencia.creado >= datetime.now() + timedelta(days=-cantidad_dias))
-            .group_by(func.cast(Sentencia.creado, Date))
-            .order_by(func.cast(Sentencia.creado, Date).desc())
-            .limit(cantidad_dias)
-            .all()
-        )
-    else:
-        consulta = (
-            database.session.query(
-                func.cast(Sentencia.creado, Date).label("creado"),
-                func.count(Sentencia.id).label("cantidad"),
-            )
-            .select_from(Sentencia)
-            .join(Autoridad)
-            .where(Autoridad.id == autoridad.id)
-            .where(Sentencia.estatus == "A")
-            .where(Sentencia.creado >= datetime.now() + timedelta(days=-cantidad_dias))
-            .group_by(func.cast(Sentencia.creado, Date))
-            .order_by(func.cast(Sentencia.creado, Date).desc())
-            .limit(cantidad_dias)
-            .all()
-        )
-
-    # Bucle por cada día para agregar los que faltan con cantidad cero
-    consulta_completo = []
-    puntero = datetime.now() + timedelta(days=-cantidad_dias)
-    while puntero < datetime.now() + timedelta(days=-1):
-        dia = puntero.date()
-        if len(consulta) > 0 and consulta[-1].creado == dia:
-            item = consulta.pop()
-            consulta_completo.append({"creado": item.creado, "cantidad": item.cantidad})
-        else:
-            consulta_completo.append({"creado": dia, "cantidad": 0})
-        puntero += timedelta(days=1)
-
-    # Entregar JSON
-    return {
-        "labels": [item["creado"].strftime("%Y-%m-%d") for item in consulta_completo],
-        "data": [item["cantidad"] for item in consulta_completo],
-    }
+    # Consultar las cantidades diarias, los días sin registros vienen con cero
+    return cantidades_por_dia("sentencias", cantidad_dias, autoridad.id if autoridad else None)
 
 
 @sentencias.route("/sentencias/tablero_cantidades_por_autoridad_json")
 @permission_required(MODULO, Permiso.VER)
+@cache_json(tablas=["sentencias", "autoridades", "cantidades_diarias"])
 def dashboard_amounts_per_autoridad_json():
     """Calcular las cantidades de Sentencias creadas por Autoridad"""
 
-    # Consultar
-    sentencias = (
-        database.session.query(
-            Autoridad.clave.label("autoridad_clave"),
-            func.count(Sentencia.id).label("cantidad"),
-        )
-        .select_from(Sentencia)
-        .join(Autoridad)
-        .where(Sentencia.estatus == "A")
-        .where(Sentencia.creado >= datetime.now() + timedelta(days=-DASHBOARD_CANTIDAD_DIAS))
-        .group_by(Autoridad.clave)
-        .order_by(Autoridad.clave)
-        .all()
-    )
-
-    # Entregar JSON
-    return {
-        "labels": [sentencia.autoridad_clave for sentencia in sentencias],
-        "data": [sentencia.cantidad for sentencia in sentencias],
-    }
+    # Consultar las cantidades diarias sumadas por autoridad
+    return cantidades_por_autoridad("sentencias", DASHBOARD_CANTIDAD_DIAS)
 
 
 @sentencias.route("/sentencias/tablero")
@@ -6,11 +6,11 @@ import json
 from flask import Blueprint, flash, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
 
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.safe_string import safe_string, safe_message
 
 from hercules.blueprints.bitacoras.models import Bitacora
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
 from hercules.blueprints.soportes_categorias.models import SoporteCategoria
@@ -126,7 +126,7 @@ def new():
         )
         categoria.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nuevo Soporte Categoría {categoria.nombre}"),
             url=url_for("soportes_categorias.detail", soporte_categoria_id=categoria.id),
@@ -159,7 +159,7 @@ def edit(soporte_categoria_id):
             categoria.departamento = form.departamento.data
             categoria.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Editado Soporte Categoría {categoria.nombre}"),
                 url=url_for("soportes_categorias.detail", soporte_categoria_id=categoria.id),
@@ -182,7 +182,7 @@ def delete(soporte_categoria_id):
     if categoria.estatus == "A":
         categoria.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Soporte Categoría {categoria.nombre}"),
             url=url_for("soportes_categorias.detail", soporte_categoria_id=categoria.id),
@@ -200,7 +200,7 @@ def recover(soporte_categoria_id):
     if categoria.estatus == "B":
         categoria.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Soporte Categoría {categoria.nombre}"),
             url=url_for("soportes_categorias.detail", soporte_categoria_id=categoria.id),
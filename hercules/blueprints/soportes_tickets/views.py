@@ -7,12 +7,9 @@ from datetime import datetime
 
 from flask import Blueprint, flash, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
-from sqlalchemy import or_
-
 from hercules.blueprints.bitacoras.models import Bitacora
 from hercules.blueprints.funcionarios.models import Funcionario
 from hercules.blueprints.funcionarios_oficinas.models import FuncionarioOficina
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.oficinas.models import Oficina
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.soportes_categorias.models import SoporteCategoria
@@ -27,7 +24,10 @@ from hercules.blueprints.soportes_tickets.forms import (
 from hercules.blueprints.soportes_tickets.models import SoporteTicket
 from hercules.blueprints.usuarios.decorators import permission_required
 from hercules.blueprints.usuarios.models import Usuario
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
+from lib.filtros import EspecificacionFiltros, Filtro
+from lib.nombres import condicion_por_nombre
 from lib.safe_string import safe_clave, safe_message, safe_string, safe_text
 
 # Roles necesarios
@@ -37,6 +37,26 @@ MODULO = "SOPORTES TICKETS"
 
 soportes_tickets = Blueprint("soportes_tickets", __name__, template_folder="templates")
 
+# Filtros del listado, los campos permitidos con su operador, normalizador y uniones
+FILTROS = EspecificacionFiltros(
+    SoporteTicket,
+    Filtro("soporte_ticket_id", SoporteTicket.id),
+    Filtro("estado", SoporteTicket.estado),
+    Filtro("categoria_id", SoporteTicket.soporte_categoria_id),
+    Filtro("usuario_id", SoporteTicket.usuario_id),
+    Filtro("funcionario_id", SoporteTicket.funcionario_id),
+    Filtro("descripcion", SoporteTicket.descripcion, "contiene", lambda texto: safe_string(texto, save_enie=True)),
+    Filtro(
+        "tecnico",
+        (Funcionario.nombres, Funcionario.apellido_paterno, Funcionario.apellido_materno),
+        "palabras",
+        lambda texto: safe_string(texto, save_enie=True),
+        unir=(Funcionario,),
+    ),
+    Filtro("oficina", Oficina.clave, "contiene", safe_clave, unir=(Usuario, (Oficina, Oficina.id == Usuario.oficina_id))),
+    Filtro("categoria", SoporteCategoria.nombre, "contiene", safe_string, unir=(SoporteCategoria,)),
+)
+
 
 @soportes_tickets.before_request
 @login_required
@@ -73,73 +93,20 @@ def datatable_json():
     """DataTable JSON para listado de Tickets"""
     # Tomar parámetros de Datatables
     draw, start, rows_per_page = get_datatable_parameters()
-    # Consultar
-    consulta = SoporteTicket.query
-    # Primero filtrar por columnas propias
-    if "estatus" in request.form:
-        consulta = consulta.filter(SoporteTicket.estatus == request.form["estatus"])
-    else:
-        consulta = consulta.filter(SoporteTicket.estatus == "A")
-    if "soporte_ticket_id" in request.form:
-        consulta = consulta.filter(SoporteTicket.id == request.form["soporte_ticket_id"])
-    if "estado" in request.form:
-        consulta = consulta.filter(SoporteTicket.estado == request.form["estado"])
-    if "categoria_id" in request.form:
-        consulta = consulta.filter(SoporteTicket.soporte_categoria_id == request.form["categoria_id"])
-    if "usuario_id" in request.form:
-        consulta = consulta.filter(SoporteTicket.usuario_id == request.form["usuario_id"])
-    if "funcionario_id" in request.form:
-        consulta = consulta.filter(SoporteTicket.funcionario_id == request.form["funcionario_id"])
-    if "descripcion" in request.form:
-        descripcion = safe_string(request.form["descripcion"], save_enie=True)
-        if descripcion != "":
-            consulta = consulta.filter(SoporteTicket.descripcion.contains(descripcion))
-    # Consulta en tablas relacionadas
+    # Compilar los filtros declarados en FILTROS
+    consulta = FILTROS.compilar(request.form)
+    # El nombre del usuario por sus palabras, palabras parecidas o cómo suena
     if "usuario" in request.form:
         nombre = safe_string(request.form["usuario"], save_enie=True)
         if nombre != "":
-            palabras = nombre.split()
-            consulta = consulta.join(Usuario)
-            for palabra in palabras:
-                consulta = consulta.filter(
-                    or_(
-                        Usuario.nombres.contains(palabra),
-                        Usuario.apellido_paterno.contains(palabra),
-                        Usuario.apellido_materno.contains(palabra),
-                    )
-                )
-    if "tecnico" in request.form:
-        nombre = safe_string(request.form["tecnico"], save_enie=True)
-        if nombre != "":
-            palabras = nombre.split()
-            consulta = consulta.join(Funcionario)
-            for palabra in palabras:
-                consulta = consulta.filter(
-                    or_(
-                        Funcionario.nombres.contains(palabra),
-                        Funcionario.apellido_paterno.contains(palabra),
-                        Funcionario.apellido_materno.contains(palabra),
-                    )
-                )
-    if "oficina" in request.form:
-        if "usuario" not in request.form:
-            consulta = consulta.join(Usuario)
-        oficina = safe_clave(request.form["oficina"])
-        if oficina != "":
-            consulta = consulta.join(Oficina, Oficina.id == Usuario.oficina_id)
-            consulta = consulta.filter(Oficina.clave.contains(oficina))
-    if "categoria" in request.form:
-        categoria = safe_string(request.form["categoria"])
-        if categoria != "":
-            consulta = consulta.join(SoporteCategoria)
-            consulta = consulta.filter(SoporteCategoria.nombre.contains(categoria))
+            consulta.unir(Usuario).filtrar(condicion_por_nombre(Usuario, nombre))
     # Obtener el funcionario para saber si es de soporte o no
     funcionario = _get_funcionario_if_is_soporte()
     # Determinar el departamento de soporte
     if not current_user.can_admin(MODULO) and ROL_INFORMATICA in current_user.get_roles():
-        consulta = consulta.filter(SoporteTicket.departamento == SoporteTicket.DEPARTAMENTOS["INFORMATICA"])
+        consulta.filtrar(SoporteTicket.departamento == SoporteTicket.DEPARTAMENTOS["INFORMATICA"])
     elif not current_user.can_admin(MODULO) and ROL_INFRAESTRUCTURA in current_user.get_roles():
-        consulta = consulta.filter(SoporteTicket.departamento == SoporteTicket.DEPARTAMENTOS["INFRAESTRUCTURA"])
+        consulta.filtrar(SoporteTicket.departamento == SoporteTicket.DEPARTAMENTOS["INFRAESTRUCTURA"])
 
     # Si es funcionario de soporte y se van a separar los tickets POR ATENDER
     if funcionario and "soportes_tickets_abiertos" in request.form:
@@ -152,10 +119,7 @@ def datatable_json():
             )
             for funcionario_oficina in funcionarios_oficinas:
                 oficinas_ids.append(funcionario_oficina.oficina_id)
-            if "usuario" in request.form:
-                consulta = consulta.filter(Usuario.oficina_id.in_(oficinas_ids))
-            else:
-                consulta = consulta.join(Usuario).filter(Usuario.oficina_id.in_(oficinas_ids))
+            consulta.unir(Usuario).filtrar(Usuario.oficina_id.in_(oficinas_ids))
         elif request.form["soportes_tickets_abiertos"] == "CATEGORIZADOS":
             # Tickets CATEGORIZADOS
             roles_ids = []
@@ -163,10 +127,7 @@ def datatable_json():
                 if usuario_rol.estatus == "A":
                     roles_ids.append(usuario_rol.rol_id)
             if len(roles_ids) > 0:
-                if "categoria" in request.form:
-                    consulta = consulta.filter(SoporteCategoria.rol_id.in_(roles_ids))
-                else:
-                    consulta = consulta.join(SoporteCategoria).filter(SoporteCategoria.rol_id.in_(roles_ids))
+                consulta.unir(SoporteCategoria).filtrar(SoporteCategoria.rol_id.in_(roles_ids))
         else:  # TODOS
             # Los demás tickets
             roles_ids = []
@@ -174,20 +135,17 @@ def datatable_json():
                 if usuario_rol.estatus == "A":
                     roles_ids.append(usuario_rol.rol_id)
             if len(roles_ids) > 0:
-                if "categoria" in request.form:
-                    consulta = consulta.filter(SoporteCategoria.rol_id.not_in(roles_ids))
-                else:
-                    consulta = consulta.join(SoporteCategoria).filter(SoporteCategoria.rol_id.not_in(roles_ids))
+                consulta.unir(SoporteCategoria).filtrar(SoporteCategoria.rol_id.not_in(roles_ids))
         # Y el orden de los IDs es ascendente, del mas antiguo al mas nuevo
-        consulta = consulta.order_by(SoporteTicket.id)
+        consulta.ordenar(SoporteTicket.id)
     elif funcionario and "soporte_tickets_trabajando" in request.form:
         # Es funcionario de soporte y se van a separar los tickets TRABAJANDO
         if request.form["soporte_tickets_trabajando"] == "MIOS":
-            consulta = consulta.filter(SoporteTicket.funcionario == funcionario)
+            consulta.filtrar(SoporteTicket.funcionario_id == funcionario.id)
         else:  # TODOS
-            consulta = consulta.filter(SoporteTicket.funcionario != funcionario)
+            consulta.filtrar(SoporteTicket.funcionario_id != funcionario.id)
         # Y el orden de los IDs es ascendente, del mas antiguo al mas nuevo
-        consulta = consulta.order_by(SoporteTicket.id)
+        consulta.ordenar(SoporteTicket.id)
     elif funcionario and "estado" in request.form:
         # Mostrar solo Tickets se sus ROLes
         roles_ids = []
@@ -195,19 +153,18 @@ def datatable_json():
             if usuario_rol.estatus == "A":
                 roles_ids.append(usuario_rol.rol_id)
         if len(roles_ids) > 0:
-            consulta = consulta.join(SoporteCategoria).filter(SoporteCategoria.rol_id.in_(roles_ids))
+            consulta.unir(SoporteCategoria).filtrar(SoporteCategoria.rol_id.in_(roles_ids))
     elif funcionario is None:
         # NO es funcionario de soporte, es usuario común, por lo que SOLO ve sus propios tickets
-        consulta = consulta.filter(SoporteTicket.usuario == current_user)
+        consulta.filtrar(SoporteTicket.usuario_id == current_user.id)
         # Y el orden de los IDs es descendente, del mas nuevo al mas antiguo
-        consulta = consulta.order_by(SoporteTicket.id.desc())
+        consulta.ordenar(SoporteTicket.id.desc())
     else:
         # El resto de los listados se ordenan por IDs de forma descendente, del mas nuevo al mas antiguo
-        consulta = consulta.order_by(SoporteTicket.id.desc())  # Luego filtrar por columnas de otras tablas
+        consulta.ordenar(SoporteTicket.id.desc())  # Luego filtrar por columnas de otras tablas
 
-    # Ordenar y paginar
-    registros = consulta.offset(start).limit(rows_per_page).all()
-    total = consulta.count()
+    # Paginar
+    registros, total = consulta.paginar(start, rows_per_page)
     # Elaborar datos para DataTable
     data = []
     for resultado in registros:
@@ -373,7 +330,7 @@ def new():
         )
         ticket.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nuevo ticket {ticket.id}: {ticket.descripcion}"),
             url=url_for("soportes_tickets.detail", soporte_ticket_id=ticket.id),
@@ -410,7 +367,7 @@ def edit(soporte_ticket_id):
         ticket.descripcion = safe_text(form.descripcion.data, save_enie=True)
         ticket.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Editado el ticket {ticket.id}: {ticket.descripcion}"),
             url=detalle_url,
@@ -445,7 +402,7 @@ def cancel(soporte_ticket_id):
     soporte_ticket.estado = "CANCELADO"
     soporte_ticket.save()
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_id=obtener_modulo_id(MODULO),
         usuario=current_user,
         descripcion=safe_message(f"Cancelado el ticket {soporte_ticket.id}: {soporte_ticket.descripcion}"),
         url=detalle_url,
@@ -481,7 +438,7 @@ def take(soporte_ticket_id):
         ticket.estado = "TRABAJANDO"
         ticket.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Tomado el ticket {ticket.id} de {ticket.usuario.nombre}: {ticket.descripcion}"),
             url=detalle_url,
@@ -517,7 +474,7 @@ def release(soporte_ticket_id):
     ticket.estado = "SIN ATENDER"
     ticket.save()
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_id=obtener_modulo_id(MODULO),
         usuario=current_user,
         descripcion=safe_message(f"Soltado el ticket {ticket.id} de {ticket.usuario.nombre}: {ticket.descripcion}"),
         url=detalle_url,
@@ -548,7 +505,7 @@ def categorize(soporte_ticket_id):
         ticket.soporte_categoria_id = form.categoria.data
         ticket.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(
                 f"Categorizado el ticket {ticket.id} de {ticket.usuario.nombre} a {ticket.soporte_categoria.nombre}"
@@ -588,7 +545,7 @@ def close(soporte_ticket_id):
         ticket.resolucion = datetime.now()
         ticket.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Cerrado el ticket {ticket.id} de {ticket.usuario.nombre}: {ticket.descripcion}"),
             url=detalle_url,
@@ -627,7 +584,7 @@ def done(soporte_ticket_id):
         ticket.resolucion = datetime.now()
         ticket.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Terminado el ticket {ticket.id} de {ticket.usuario.nombre}: {ticket.soluciones}"),
             url=detalle_url,
@@ -651,7 +608,7 @@ def delete(soporte_ticket_id):
     if ticket.estatus == "A":
         ticket.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado el ticket {ticket.id}"),
             url=url_for("soportes_tickets.detail", soporte_ticket_id=ticket.id),
@@ -669,7 +626,7 @@ def recover(soporte_ticket_id):
     if ticket.estatus == "B":
         ticket.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado el ticket {ticket.id}"),
             url=url_for("soportes_tickets.detail", soporte_ticket_id=ticket.id),
@@ -2,6 +2,9 @@
 Tareas, modelos
 """
 
+from datetime import datetime
+from typing import Optional
+
 from flask import current_app
 from redis.exceptions import RedisError
 from rq.exceptions import NoSuchJobError
@@ -10,6 +13,7 @@ from sqlalchemy import ForeignKey, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from hercules.extensions import database
+from lib.particiones import columna_creado_particion, particion_por_mes
 from lib.universal_mixin import UniversalMixin
 
 
@@ -18,9 +22,13 @@ class Tarea(database.Model, UniversalMixin):
 
     # Nombre de la tabla
     __tablename__ = "tareas"
+    __table_args__ = (particion_por_mes(),)
 
     # Clave primaria NOTA: El id es string y es el mismo que usa el RQ worker
+    # En la tabla es (id, creado) porque está particionada por mes
     id: Mapped[str] = mapped_column(primary_key=True)
+    creado: Mapped[datetime] = columna_creado_particion()
+    __mapper_args__ = {"primary_key": [id]}
 
     # Clave foránea
     usuario_id: Mapped[int] = mapped_column(ForeignKey("usuarios.id"))
@@ -33,6 +41,13 @@ class Tarea(database.Model, UniversalMixin):
     mensaje: Mapped[str] = mapped_column(String(1024), default="")
     url: Mapped[str] = mapped_column(String(512), default="")
 
+    # Columnas de la medición, las llena lib.tasks.ejecutar() al terminar, nulas si el worker murió antes
+    segundos: Mapped[Optional[float]]
+    cpu_segundos: Mapped[Optional[float]]
+    memoria_mb: Mapped[Optional[float]]
+    sql_sentencias: Mapped[Optional[int]]
+    gcs_bytes: Mapped[Optional[int]]
+
     def get_rq_job(self):
         """Helper method that loads the RQ Job instance"""
         try:
@@ -46,6 +61,8 @@ class Tarea(database.Model, UniversalMixin):
         job = self.get_rq_job()
         return job.meta.get("progress", 0) if job is not None else 100
 
+    COLUMNAS_MEDICION = ("segundos", "cpu_segundos", "memoria_mb", "sql_sentencias", "gcs_bytes")
+
     def __repr__(self):
         """Representación"""
         return f"<Tarea {self.id}>"
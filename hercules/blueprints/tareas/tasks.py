@@ -0,0 +1,39 @@
+"""
+Tareas, tareas para ejecutar en el fondo
+"""
+
+import logging
+
+from hercules.app import create_app
+from hercules.extensions import database
+from lib.acciones_masivas import aplicar
+from lib.tasks import set_task_progress
+
+# Bitácora logs/tareas.log
+bitacora = logging.getLogger(__name__)
+bitacora.setLevel(logging.INFO)
+formato = logging.Formatter("%(asctime)s:%(levelname)s:%(message)s")
+empunadura = logging.FileHandler("logs/tareas.log")
+empunadura.setFormatter(formato)
+bitacora.addHandler(empunadura)
+
+# Cargar la aplicación para tener acceso a la base de datos, al cargarla cada módulo registra sus acciones masivas
+app = create_app()
+app.app_context().push()
+database.app = app
+
+
+def lanzar_accion_masiva(tabla: str, accion: str, ids: list, usuario_id: int, url: str) -> str:
+    """Aplicar una acción masiva por lotes, reportando el avance"""
+    set_task_progress(0, f"Inicia la acción masiva {accion} en {len(ids)} registros de {tabla}")
+    mensaje_termino = aplicar(
+        tabla,
+        accion,
+        ids,
+        usuario_id,
+        url,
+        avance=lambda porcentaje: set_task_progress(porcentaje, f"Acción masiva {accion} en {tabla} al {porcentaje}%"),
+    )
+    bitacora.info(mensaje_termino)
+    set_task_progress(100, mensaje_termino)
+    return mensaje_termino
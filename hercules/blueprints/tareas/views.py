@@ -3,18 +3,23 @@ Tareas, vistas
 """
 
 import json
+from datetime import datetime, timedelta
 
 from flask import Blueprint, current_app, flash, make_response, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
+from sqlalchemy import func, select
 
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.tareas.models import Tarea
 from hercules.blueprints.usuarios.decorators import permission_required
+from hercules.extensions import database
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.exceptions import MyAnyError
 from lib.google_cloud_storage import get_blob_name_from_url, get_file_from_gcs
+from lib.perfilador import existe_perfil
 
 MODULO = "TAREAS"
+ESTADISTICAS_DIAS = 30
 
 tareas = Blueprint("tareas", __name__, template_folder="templates")
 
@@ -97,12 +102,48 @@ def list_inactive():
     )
 
 
+def _percentil(fraccion: float, columna):
+    """Percentil continuo de la columna, no considera los nulos"""
+    return func.percentile_cont(fraccion).within_group(columna)
+
+
+@tareas.route("/tareas/estadisticas")
+@login_required
+@permission_required(MODULO, Permiso.ADMINISTRAR)
+def estadisticas():
+    """Percentiles de tiempo, CPU, memoria, sentencias SQL y bytes de GCS por comando"""
+    consulta = (
+        select(
+            Tarea.comando,
+            func.count().label("cantidad"),
+            func.count().filter(Tarea.segundos.is_(None)).label("sin_medicion"),
+            _percentil(0.5, Tarea.segundos).label("segundos_p50"),
+            _percentil(0.95, Tarea.segundos).label("segundos_p95"),
+            func.max(Tarea.segundos).label("segundos_max"),
+            _percentil(0.95, Tarea.cpu_segundos).label("cpu_segundos_p95"),
+            _percentil(0.95, Tarea.memoria_mb).label("memoria_mb_p95"),
+            func.max(Tarea.memoria_mb).label("memoria_mb_max"),
+            _percentil(0.95, Tarea.sql_sentencias).label("sql_sentencias_p95"),
+            _percentil(0.95, Tarea.gcs_bytes).label("gcs_bytes_p95"),
+        )
+        .where(Tarea.creado >= datetime.now() - timedelta(days=ESTADISTICAS_DIAS))
+        .group_by(Tarea.comando)
+        .order_by(func.max(Tarea.segundos).desc().nulls_last())
+    )
+    return render_template(
+        "tareas/estadisticas.jinja2",
+        renglones=database.session.execute(consulta).all(),
+        dias=ESTADISTICAS_DIAS,
+    )
+
+
 @tareas.route("/tareas/<tarea_id>")
 @login_required
 def detail(tarea_id):
     """Detalle de un Tarea"""
     tarea = Tarea.query.get_or_404(tarea_id)
-    return render_template("tareas/detail.jinja2", tarea=tarea)
+    hay_perfil = current_user.can_admin("BITACORAS") and existe_perfil(tarea.id)
+    return render_template("tareas/detail.jinja2", tarea=tarea, hay_perfil=hay_perfil)
 
 
 @tareas.route("/tareas/<tarea_id>/xlsx")
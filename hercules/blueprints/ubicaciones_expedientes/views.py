@@ -9,18 +9,38 @@ from flask_login import current_user, login_required
 
 from hercules.blueprints.autoridades.models import Autoridad
 from hercules.blueprints.bitacoras.models import Bitacora
-from hercules.blueprints.modulos.models import Modulo
+from hercules.blueprints.expedientes_indices.fuentes import sincronizar_ids
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.ubicaciones_expedientes.forms import UbicacionExpedienteEditForm, UbicacionExpedienteNewForm
 from hercules.blueprints.ubicaciones_expedientes.models import UbicacionExpediente
 from hercules.blueprints.usuarios.decorators import permission_required
+from lib.acciones_masivas import ACCIONES_ESTATUS, AccionMasiva, ejecutar as ejecutar_accion_masiva, separar_ids
+from lib.acciones_masivas import registrar as registrar_accion_masiva
+from lib.catalogos import consultar_por_id, obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
+from lib.exceptions import MyNotValidParamError
 from lib.safe_string import safe_clave, safe_expediente, safe_message, safe_string
 
 MODULO = "UBICACIONES EXPEDIENTES"
 
 ubicaciones_expedientes = Blueprint("ubicaciones_expedientes", __name__, template_folder="templates")
 
+# Acciones masivas, además de eliminar y recuperar se puede cambiar la ubicación
+registrar_accion_masiva(
+    AccionMasiva(
+        modelo=UbicacionExpediente,
+        modulo=MODULO,
+        etiqueta="Ubicaciones de Expedientes",
+        acciones={
+            **ACCIONES_ESTATUS,
+            "ubicar_archivo": {"ubicacion": "ARCHIVO"},
+            "ubicar_juzgado": {"ubicacion": "JUZGADO"},
+        },
+        al_actualizar=lambda conexion, accion, ids, usuario_id: sincronizar_ids(conexion, "ubicaciones_expedientes", ids),
+        otras_tablas=("expedientes_indices",),
+    )
+)
+
 
 @ubicaciones_expedientes.before_request
 @login_required
@@ -29,35 +49,41 @@ def before_request():
     """Permiso por defecto"""
 
 
-@ubicaciones_expedientes.route("/ubicaciones_expedientes/datatable_json", methods=["GET", "POST"])
-def datatable_json():
-    """DataTable JSON para listado de Ubicaciones de Expedientes"""
-    # Tomar parámetros de Datatables
-    draw, start, rows_per_page = get_datatable_parameters()
-    # Consultar
+def _consultar(form):
+    """Consultar con los filtros del listado, para el DataTable y las acciones masivas"""
     consulta = UbicacionExpediente.query
     # Primero filtrar por columnas propias
-    if "estatus" in request.form:
-        consulta = consulta.filter(UbicacionExpediente.estatus == request.form["estatus"])
+    if "estatus" in form:
+        consulta = consulta.filter(UbicacionExpediente.estatus == form["estatus"])
     else:
         consulta = consulta.filter(UbicacionExpediente.estatus == "A")
-    if "autoridad_id" in request.form:
-        autoridad = Autoridad.query.get(request.form["autoridad_id"])
+    if "autoridad_id" in form:
+        autoridad = consultar_por_id("autoridades", form["autoridad_id"])
         if autoridad:
-            consulta = consulta.filter(UbicacionExpediente.autoridad == autoridad)
-    elif "autoridad_clave" in request.form:
+            consulta = consulta.filter(UbicacionExpediente.autoridad_id == autoridad.id)
+    elif "autoridad_clave" in form:
         consulta = consulta.join(Autoridad)
-        consulta = consulta.filter(Autoridad.clave.contains(safe_clave(request.form["autoridad_clave"])))
-    if "expediente" in request.form:
+        consulta = consulta.filter(Autoridad.clave.contains(safe_clave(form["autoridad_clave"])))
+    if "expediente" in form:
         try:
-            expediente = safe_expediente(request.form["expediente"])
+            expediente = safe_expediente(form["expediente"])
             consulta = consulta.filter(UbicacionExpediente.expediente == expediente)
         except (IndexError, ValueError):
             pass
-    if "ubicacion" in request.form:
-        ubicacion = safe_string(request.form["ubicacion"])
+    if "ubicacion" in form:
+        ubicacion = safe_string(form["ubicacion"])
         if ubicacion != "":
             consulta = consulta.filter(UbicacionExpediente.ubicacion == ubicacion)
+    return consulta
+
+
+@ubicaciones_expedientes.route("/ubicaciones_expedientes/datatable_json", methods=["GET", "POST"])
+def datatable_json():
+    """DataTable JSON para listado de Ubicaciones de Expedientes"""
+    # Tomar parámetros de Datatables
+    draw, start, rows_per_page = get_datatable_parameters()
+    # Consultar
+    consulta = _consultar(request.form)
     # Ordenar y paginar
     registros = consulta.order_by(UbicacionExpediente.id.desc()).offset(start).limit(rows_per_page).all()
     total = consulta.count()
@@ -164,7 +190,7 @@ def new():
         )
         ubicacion_expediente.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nuevo Ubicación de Expediente {ubicacion_expediente.expediente}"),
             url=url_for("ubicaciones_expedientes.detail", ubicacion_expediente_id=ubicacion_expediente.id),
@@ -196,7 +222,7 @@ def edit(ubicacion_expediente_id):
         ubicacion_expediente.ubicacion = form.ubicacion.data
         ubicacion_expediente.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Editado Ubicacion de Expediente {ubicacion_expediente.expediente}"),
             url=url_for("ubicaciones_expedientes.detail", ubicacion_expediente_id=ubicacion_expediente.id),
@@ -218,7 +244,7 @@ def delete(ubicacion_expediente_id):
     if ubicacion_expediente.estatus == "A":
         ubicacion_expediente.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Ubicación de Expediente {ubicacion_expediente.expediente}"),
             url=url_for("ubicaciones_expedientes.detail", ubicacion_expediente_id=ubicacion_expediente.id),
@@ -236,7 +262,7 @@ def recover(ubicacion_expediente_id):
     if ubicacion_expediente.estatus == "B":
         ubicacion_expediente.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Ubicación de Expediente {ubicacion_expediente.expediente}"),
             url=url_for("ubicaciones_expedientes.detail", ubicacion_expediente_id=ubicacion_expediente.id),
@@ -244,3 +270,22 @@ def recover(ubicacion_expediente_id):
         bitacora.save()
         flash(bitacora.descripcion, "success")
     return redirect(url_for("ubicaciones_expedientes.detail", ubicacion_expediente_id=ubicacion_expediente.id))
+
+
+@ubicaciones_expedientes.route("/ubicaciones_expedientes/acciones_masivas", methods=["POST"])
+@permission_required(MODULO, Permiso.MODIFICAR)
+def bulk_action():
+    """Acción masiva sobre las Ubicaciones de Expedientes seleccionadas o sobre todas las filtradas"""
+    if request.form.get("todos") == "1":
+        ids = [renglon.id for renglon in _consultar(request.form).with_entities(UbicacionExpediente.id)]
+    else:
+        ids = separar_ids(request.form.get("ids", ""))
+    try:
+        mensaje = ejecutar_accion_masiva(
+            "ubicaciones_expedientes", request.form.get("accion", ""), ids, url_for("ubicaciones_expedientes.list_active")
+        )
+    except MyNotValidParamError as error:
+        flash(str(error), "warning")
+        return redirect(url_for("ubicaciones_expedientes.list_active"))
+    flash(mensaje, "success")
+    return redirect(url_for("ubicaciones_expedientes.list_active"))
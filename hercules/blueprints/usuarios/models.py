@@ -14,6 +14,8 @@ from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.tareas.models import Tarea
 from hercules.blueprints.usuarios_roles.models import UsuarioRol
 from hercules.extensions import database, pwd_context
+from lib.fragmentos import sumar_tareas_en_progreso
+from lib.nombres import columna_nombre_buscador, columna_nombre_fonetico, indices_nombres
 from lib.universal_mixin import UniversalMixin
 
 
@@ -30,6 +32,9 @@ class Usuario(database.Model, UserMixin, UniversalMixin):
     # Nombre de la tabla
     __tablename__ = "usuarios"
 
+    # Índices para la búsqueda por nombre
+    __table_args__ = indices_nombres("usuarios")
+
     # Clave primaria
     id: Mapped[int] = mapped_column(primary_key=True)
 
@@ -49,6 +54,12 @@ class Usuario(database.Model, UserMixin, UniversalMixin):
     titulo: Mapped[Optional[str]] = mapped_column(String(32))
     workspace: Mapped[str] = mapped_column(Enum(*WORKSPACES, name="usuarios_workspaces", native_enum=False), index=True)
 
+    # Columnas generadas para la búsqueda por nombre
+    nombre_buscador: Mapped[Optional[str]] = columna_nombre_buscador(
+        "nombres", "apellido_paterno", "apellido_materno", "email", "puesto"
+    )
+    nombre_fonetico: Mapped[Optional[str]] = columna_nombre_fonetico("nombres", "apellido_paterno", "apellido_materno")
+
     # Columnas para el motor de firma electrónica
     efirma_registro_id: Mapped[Optional[int]]
     efirma_contrasena: Mapped[Optional[str]] = mapped_column(String(256), default="")
@@ -182,9 +193,10 @@ class Usuario(database.Model, UserMixin, UniversalMixin):
 
     def launch_task(self, comando, mensaje, *args, **kwargs):
         """Lanzar tarea en el fondo"""
-        rq_job = current_app.task_queue.enqueue(f"hercules.blueprints.{comando}", *args, **kwargs)
+        rq_job = current_app.task_queue.enqueue("lib.tasks.ejecutar", comando, *args, **kwargs)
         tarea = Tarea(id=rq_job.id, comando=comando, mensaje=mensaje, usuario=self)
         tarea.save()
+        sumar_tareas_en_progreso(self.id, 1)
         return tarea
 
     def get_tasks_in_progress(self):
@@ -11,20 +11,26 @@ import google.oauth2.id_token
 from flask import Blueprint, flash, redirect, render_template, request, url_for
 from flask_login import current_user, login_required, login_user, logout_user
 from pytz import timezone
-from sqlalchemy import or_
+from sqlalchemy import or_, update
 
 from config.firebase import get_firebase_settings
 from hercules.blueprints.autoridades.models import Autoridad
 from hercules.blueprints.bitacoras.models import Bitacora
 from hercules.blueprints.distritos.models import Distrito
 from hercules.blueprints.entradas_salidas.models import EntradaSalida
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.oficinas.models import Oficina
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import anonymous_required, permission_required
 from hercules.blueprints.usuarios.forms import AccesoForm, UsuarioForm
 from hercules.blueprints.usuarios.models import Usuario
+from hercules.blueprints.usuarios_roles.models import UsuarioRol
+from lib.acciones_masivas import ACCIONES_ESTATUS, AccionMasiva, ejecutar as ejecutar_accion_masiva, separar_ids
+from lib.acciones_masivas import registrar as registrar_accion_masiva
+from lib.cache import cache_condicional, cache_json
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
+from lib.exceptions import MyNotValidParamError
+from lib.nombres import filtrar_por_nombre, similitud_nombre
 from lib.pwgen import generar_api_key, generar_contrasena
 from lib.safe_next_url import safe_next_url
 from lib.safe_string import CONTRASENA_REGEXP, EMAIL_REGEXP, TOKEN_REGEXP, safe_email, safe_message, safe_string
@@ -36,6 +42,24 @@ MODULO = "USUARIOS"
 usuarios = Blueprint("usuarios", __name__, template_folder="templates")
 
 
+def _al_actualizar_en_lote(conexion, accion, ids, usuario_id):
+    """Dar de baja o recuperar los roles de los usuarios, igual que al hacerlo uno por uno"""
+    tabla = UsuarioRol.__table__
+    conexion.execute(update(tabla).where(tabla.c.usuario_id.in_(ids)).values(**ACCIONES_ESTATUS[accion]))
+
+
+# Acciones masivas
+registrar_accion_masiva(
+    AccionMasiva(
+        modelo=Usuario,
+        modulo=MODULO,
+        etiqueta="Usuarios",
+        al_actualizar=_al_actualizar_en_lote,
+        otras_tablas=("usuarios_roles",),
+    )
+)
+
+
 @usuarios.route("/login", methods=["GET", "POST"])
 @anonymous_required()
 def login():
@@ -133,6 +157,40 @@ def profile():
     )
 
 
+def _consultar(form):
+    """Consultar con los filtros del listado, para el DataTable y las acciones masivas"""
+    consulta = Usuario.query
+    # Primero filtrar por columnas propias
+    if "estatus" in form:
+        consulta = consulta.filter(Usuario.estatus == form["estatus"])
+    else:
+        consulta = consulta.filter(Usuario.estatus == "A")
+    # Filtrar por autoridad_id u autoridad_id_diferente_a
+    if "autoridad_id" in form:
+        consulta = consulta.filter(Usuario.autoridad_id == form["autoridad_id"])
+    elif "autoridad_id_diferente_a" in form:
+        consulta = consulta.filter(Usuario.autoridad_id != form["autoridad_id_diferente_a"])
+    # Filtrar por oficina_id u oficina_id_diferente_a
+    if "oficina_id" in form:
+        consulta = consulta.filter(Usuario.oficina_id == form["oficina_id"])
+    elif "oficina_id_diferente_a" in form:
+        consulta = consulta.filter(Usuario.oficina_id != form["oficina_id_diferente_a"])
+    # Filtrar por las columnas de texto de Usuario
+    if "nombres" in form:
+        consulta = consulta.filter(Usuario.nombres.contains(safe_string(form["nombres"])))
+    if "apellido_paterno" in form:
+        consulta = consulta.filter(Usuario.apellido_paterno.contains(safe_string(form["apellido_paterno"])))
+    if "apellido_materno" in form:
+        consulta = consulta.filter(Usuario.apellido_materno.contains(safe_string(form["apellido_materno"])))
+    if "curp" in form:
+        consulta = consulta.filter(Usuario.curp.contains(safe_string(form["curp"])))
+    if "puesto" in form:
+        consulta = consulta.filter(Usuario.puesto.contains(safe_string(form["puesto"])))
+    if "email" in form:
+        consulta = consulta.filter(Usuario.email.contains(safe_email(form["email"], search_fragment=True)))
+    return consulta
+
+
 @usuarios.route("/usuarios/datatable_json", methods=["GET", "POST"])
 @login_required
 @permission_required(MODULO, Permiso.VER)
@@ -141,35 +199,7 @@ def datatable_json():
     # Tomar parámetros de Datatables
     draw, start, rows_per_page = get_datatable_parameters()
     # Consultar
-    consulta = Usuario.query
-    # Primero filtrar por columnas propias
-    if "estatus" in request.form:
-        consulta = consulta.filter(Usuario.estatus == request.form["estatus"])
-    else:
-        consulta = consulta.filter(Usuario.estatus == "A")
-    # Filtrar por autoridad_id u autoridad_id_diferente_a
-    if "autoridad_id" in request.form:
-        consulta = consulta.filter(Usuario.autoridad_id == request.form["autoridad_id"])
-    elif "autoridad_id_diferente_a" in request.form:
-        consulta = consulta.filter(Usuario.autoridad_id != request.form["autoridad_id_diferente_a"])
-    # Filtrar por oficina_id u oficina_id_diferente_a
-    if "oficina_id" in request.form:
-        consulta = consulta.filter(Usuario.oficina_id == request.form["oficina_id"])
-    elif "oficina_id_diferente_a" in request.form:
-        consulta = consulta.filter(Usuario.oficina_id != request.form["oficina_id_diferente_a"])
-    # Filtrar por las columnas de texto de Usuario
-    if "nombres" in request.form:
-        consulta = consulta.filter(Usuario.nombres.contains(safe_string(request.form["nombres"])))
-    if "apellido_paterno" in request.form:
-        consulta = consulta.filter(Usuario.apellido_paterno.contains(safe_string(request.form["apellido_paterno"])))
-    if "apellido_materno" in request.form:
-        consulta = consulta.filter(Usuario.apellido_materno.contains(safe_string(request.form["apellido_materno"])))
-    if "curp" in request.form:
-        consulta = consulta.filter(Usuario.curp.contains(safe_string(request.form["curp"])))
-    if "puesto" in request.form:
-        consulta = consulta.filter(Usuario.puesto.contains(safe_string(request.form["puesto"])))
-    if "email" in request.form:
-        consulta = consulta.filter(Usuario.email.contains(safe_email(request.form["email"], search_fragment=True)))
+    consulta = _consultar(request.form)
     # Ordenar y paginar
     registros = consulta.order_by(Usuario.email).offset(start).limit(rows_per_page).all()
     total = consulta.count()
@@ -233,7 +263,7 @@ def request_api_key_json(usuario_id):
         usuario.save()
         mensaje = f"La API Key de {usuario.email} fue eliminada"
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=mensaje,
             url=url_for("usuarios.detail", usuario_id=usuario.id),
@@ -257,7 +287,7 @@ def request_api_key_json(usuario_id):
         usuario.save()
         mensaje = f"Nueva API Key para {usuario.email} con expiración en {days} días"
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=mensaje,
             url=url_for("usuarios.detail", usuario_id=usuario.id),
@@ -376,7 +406,7 @@ def new():
             )
             usuario.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Nuevo Usuario {usuario.email}"),
                 url=url_for("usuarios.detail", usuario_id=usuario.id),
@@ -435,7 +465,7 @@ def edit(usuario_id):
             usuario.efirma_registro_id = form.efirma_registro_id.data
             usuario.save()
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_id=obtener_modulo_id(MODULO),
                 usuario=current_user,
                 descripcion=safe_message(f"Editado Usuario {usuario.email}"),
                 url=url_for("usuarios.detail", usuario_id=usuario.id),
@@ -471,7 +501,7 @@ def delete(usuario_id):
             usuario_rol.delete()
         # Guardar en la bitacora
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Usuario {usuario.email}"),
             url=url_for("usuarios.detail", usuario_id=usuario.id),
@@ -495,7 +525,7 @@ def recover(usuario_id):
             usuario_rol.recover()
         # Guardar en la bitacora
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Usuario {usuario.email}"),
             url=url_for("usuarios.detail", usuario_id=usuario.id),
@@ -505,7 +535,28 @@ def recover(usuario_id):
     return redirect(url_for("usuarios.detail", usuario_id=usuario.id))
 
 
+@usuarios.route("/usuarios/acciones_masivas", methods=["POST"])
+@login_required
+@permission_required(MODULO, Permiso.ADMINISTRAR)
+def bulk_action():
+    """Eliminar o recuperar los Usuarios seleccionados o todos los filtrados, junto con sus roles"""
+    if request.form.get("todos") == "1":
+        consulta = _consultar(request.form).filter(Usuario.id != current_user.id)
+        ids = [renglon.id for renglon in consulta.with_entities(Usuario.id)]
+    else:
+        ids = [usuario_id for usuario_id in separar_ids(request.form.get("ids", "")) if usuario_id != current_user.id]
+    try:
+        mensaje = ejecutar_accion_masiva("usuarios", request.form.get("accion", ""), ids, url_for("usuarios.list_active"))
+    except MyNotValidParamError as error:
+        flash(str(error), "warning")
+        return redirect(url_for("usuarios.list_active"))
+    flash(mensaje, "success")
+    return redirect(url_for("usuarios.list_active"))
+
+
 @usuarios.route("/usuarios/select_json", methods=["GET", "POST"])
+@cache_condicional(Usuario)
+@cache_json(tablas=["usuarios"])
 def select_json():
     """Select JSON para Usuarios"""
     # Consultar
@@ -521,23 +572,14 @@ def select_json():
 
 
 @usuarios.route("/usuarios/select2_json", methods=["POST"])
+@cache_json(tablas=["usuarios"])
 def select2_json():
     """Proporcionar el JSON de usuarios para elegir con un Select2, se usa para filtrar en DataTables"""
     consulta = Usuario.query.filter(Usuario.estatus == "A")
     if "searchString" in request.form:
         texto = safe_string(request.form["searchString"], save_enie=True)
         if texto != "":
-            palabras = texto.split()
-            for palabra in palabras:
-                consulta = consulta.filter(
-                    or_(
-                        Usuario.email.contains(palabra.lower()),
-                        Usuario.nombres.contains(palabra),
-                        Usuario.apellido_paterno.contains(palabra),
-                        Usuario.apellido_materno.contains(palabra),
-                        Usuario.puesto.contains(palabra),
-                    )
-                )
+            consulta = filtrar_por_nombre(consulta, Usuario, texto).order_by(similitud_nombre(Usuario, texto).desc())
     if "workspace" in request.form:
         workspaces_in = safe_string(request.form["workspace"])
         if workspaces_in == "LOCAL":
@@ -9,11 +9,11 @@ from flask_login import current_user, login_required
 from werkzeug.exceptions import NotFound
 
 from hercules.blueprints.bitacoras.models import Bitacora
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
 from hercules.blueprints.usuarios.models import Usuario
 from hercules.blueprints.usuarios_nominas.models import UsuarioNomina
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.exceptions import MyBucketNotFoundError, MyFileNotFoundError, MyNotValidParamError
 from lib.google_cloud_storage import get_blob_name_from_url, get_file_from_gcs
@@ -140,7 +140,7 @@ def download_file_pdf(usuario_nomina_id):
 
     # Guardar en bitácora que se consultó su recibo de nómina
     Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_id=obtener_modulo_id(MODULO),
         usuario=current_user,
         descripcion=safe_message(f"Descargado recibo de nómina {usuario_nomina.archivo_pdf}"),
         url=url_for("usuarios_nominas.list"),
@@ -184,7 +184,7 @@ def download_file_xml(usuario_nomina_id):
 
     # Guardar en bitácora que se consultó su recibo de nómina
     Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_id=obtener_modulo_id(MODULO),
         usuario=current_user,
         descripcion=safe_message(f"Descargado recibo de nómina {usuario_nomina.archivo_xml}"),
         url=url_for("usuarios_nominas.list"),
@@ -4,13 +4,13 @@ Usuarios-Roles, vistas
 
 from flask import Blueprint, flash, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
-from sqlalchemy import or_
 
+from lib.catalogos import obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
+from lib.nombres import filtrar_por_nombre
 from lib.safe_string import safe_email, safe_message, safe_string
 
 from hercules.blueprints.bitacoras.models import Bitacora
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.roles.models import Rol
 from hercules.blueprints.usuarios.decorators import permission_required
@@ -149,7 +149,7 @@ def new_with_rol(rol_id):
         )
         usuario_rol.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nuevo Usuario-Rol {usuario_rol.descripcion}"),
             url=url_for("roles.detail", rol_id=rol.id),
@@ -191,7 +191,7 @@ def new_with_usuario(usuario_id):
         )
         usuario_rol.save()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Nuevo Usuario-Rol {usuario_rol.descripcion}"),
             url=url_for("usuarios.detail", usuario_id=usuario.id),
@@ -218,7 +218,7 @@ def delete(usuario_rol_id):
     if usuario_rol.estatus == "A":
         usuario_rol.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Usuario-Rol {usuario_rol.descripcion}"),
             url=url_for("usuarios_roles.detail", usuario_rol_id=usuario_rol.id),
@@ -236,7 +236,7 @@ def recover(usuario_rol_id):
     if usuario_rol.estatus == "B":
         usuario_rol.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Usuario-Rol {usuario_rol.descripcion}"),
             url=url_for("usuarios_roles.detail", usuario_rol_id=usuario_rol.id),
@@ -282,16 +282,7 @@ def usuarios_con_rol_json():
     if "nombre_usuario" in request.form:
         texto = safe_string(request.form["nombre_usuario"], save_enie=True)
         if texto != "":
-            consulta = consulta.join(Usuario)
-            palabras = texto.split()
-            for palabra in palabras:
-                consulta = consulta.filter(
-                    or_(
-                        Usuario.nombres.contains(palabra),
-                        Usuario.apellido_paterno.contains(palabra),
-                        Usuario.apellido_materno.contains(palabra),
-                    )
-                )
+            consulta = filtrar_por_nombre(consulta.join(Usuario), Usuario, texto)
     if "rol_nombre" in request.form:
         rol_nombre = safe_string(request.form["rol_nombre"])
         consulta = consulta.join(Rol)
@@ -10,11 +10,12 @@ from werkzeug.exceptions import NotFound
 from hercules.blueprints.autoridades.models import Autoridad
 from hercules.blueprints.bitacoras.models import Bitacora
 from hercules.blueprints.materias.models import Materia
-from hercules.blueprints.modulos.models import Modulo
 from hercules.blueprints.permisos.models import Permiso
 from hercules.blueprints.usuarios.decorators import permission_required
 from hercules.blueprints.vsp_digitalizaciones.models import VspDigitalizacion
 from hercules.extensions import database
+from lib.cache import cache_json
+from lib.catalogos import consultar_por_id, obtener_modulo_id
 from lib.datatables import get_datatable_parameters, output_datatable_json
 from lib.exceptions import MyBucketNotFoundError, MyFileNotFoundError, MyNotValidParamError
 from lib.google_cloud_storage import get_blob_name_from_url, get_file_from_gcs
@@ -47,7 +48,7 @@ def datatable_json():
     else:
         consulta = consulta.filter_by(estatus="A")
     if "autoridad_id" in request.form:
-        autoridad = Autoridad.query.get(request.form["autoridad_id"])
+        autoridad = consultar_por_id("autoridades", request.form["autoridad_id"])
         if autoridad:
             consulta = consulta.filter(VspDigitalizacion.autoridad_id == autoridad.id)
     elif "autoridad_clave" in request.form:
@@ -130,7 +131,7 @@ def delete(vsp_digitalizacion_id):
     if vsp_digitalizacion.estatus == "A":
         vsp_digitalizacion.delete()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Eliminado digitalización {vsp_digitalizacion.descripcion}"),
             url=url_for("vsp_digitalizaciones.detail", vsp_digitalizacion_id=vsp_digitalizacion.id),
@@ -148,7 +149,7 @@ def recover(vsp_digitalizacion_id):
     if vsp_digitalizacion.estatus == "B":
         vsp_digitalizacion.recover()
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_id=obtener_modulo_id(MODULO),
             usuario=current_user,
             descripcion=safe_message(f"Recuperado digitalización {vsp_digitalizacion.descripcion}"),
             url=url_for("vsp_digitalizaciones.detail", vsp_digitalizacion_id=vsp_digitalizacion.id),
@@ -159,6 +160,7 @@ def recover(vsp_digitalizacion_id):
 
 
 @vsp_digitalizaciones.route("/vsp_digitalizaciones/obtener_totales_por_materia_por_anio")
+@cache_json(tablas=["vsp_digitalizaciones", "autoridades", "materias"])
 def get_totales_por_materia_por_anio_json():
     """Obtener un listado de totales por materia por año"""
 
@@ -227,7 +229,7 @@ def get_file_url_json(vsp_digitalizacion_id):
 
     # Registrar en la bitácora
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_id=obtener_modulo_id(MODULO),
         usuario=current_user,
         descripcion=safe_message(f"Ha obtenido la URL de {vsp_digitalizacion.autoridad.clave} {vsp_digitalizacion.expediente}"),
         url=url_for("vsp_digitalizaciones.detail", vsp_digitalizacion_id=vsp_digitalizacion.id),
@@ -264,7 +266,7 @@ def view_file_pdf(vsp_digitalizacion_id):
 
     # Registrar en la bitácora
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_id=obtener_modulo_id(MODULO),
         usuario=current_user,
         descripcion=safe_message(f"Ha descargado {vsp_digitalizacion.autoridad.clave} {vsp_digitalizacion.expediente}"),
         url=url_for("vsp_digitalizaciones.detail", vsp_digitalizacion_id=vsp_digitalizacion.id),
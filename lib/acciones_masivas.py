@@ -0,0 +1,120 @@
+"""
+Acciones masivas
+
+Eliminar, recuperar o cambiar de estado un conjunto de registros con un solo
+UPDATE ... WHERE id = ANY(:ids) y una sola entrada en la bitácora, en lugar de
+un delete() con su commit y su bitácora por cada registro.
+
+Cada módulo registra sus acciones con registrar(), la selección llega como una lista
+de ids o como los filtros del listado. Si son más de LIMITE_EN_LINEA se ejecuta
+en el fondo por lotes de TAMANO_LOTE con la tarea tareas.tasks.lanzar_accion_masiva
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable
+
+from flask_login import current_user
+from sqlalchemy import Integer, any_, bindparam, or_, update
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from hercules.blueprints.bitacoras.models import Bitacora
+from hercules.extensions import database
+from lib.cache import invalidar_tablas
+from lib.catalogos import descartar_instantaneas, obtener_modulo_id
+from lib.exceptions import MyNotValidParamError
+from lib.safe_string import safe_message
+
+LIMITE_EN_LINEA = 1000
+TAMANO_LOTE = 5000
+
+ACCIONES_ESTATUS = {
+    "eliminar": {"estatus": "B"},
+    "recuperar": {"estatus": "A"},
+}
+
+
+@dataclass(frozen=True)
+class AccionMasiva:
+    """Acciones masivas de un módulo"""
+
+    modelo: type
+    modulo: str  # Nombre del módulo para la bitácora
+    etiqueta: str  # Nombre en plural para los mensajes
+    acciones: dict = field(default_factory=lambda: dict(ACCIONES_ESTATUS))  # Nombre de la acción y sus valores
+    al_actualizar: Callable | None = None  # Recibe (conexion, accion, ids, usuario_id) en la misma transacción
+    otras_tablas: tuple = ()  # Tablas que también cambia al_actualizar, para invalidar su caché
+
+
+ACCIONES_MASIVAS = {}
+
+
+def registrar(accion_masiva: AccionMasiva) -> AccionMasiva:
+    """Registrar las acciones masivas de un módulo, la llave es el nombre de la tabla"""
+    ACCIONES_MASIVAS[accion_masiva.modelo.__tablename__] = accion_masiva
+    return accion_masiva
+
+
+def separar_ids(texto: str) -> list[int]:
+    """Separar los ids de un texto como 1,2,3, se omiten los que no son números"""
+    return sorted({int(parte) for parte in texto.split(",") if parte.strip().isdigit()})
+
+
+def actualizar_lote(tabla: str, accion: str, ids: list[int], usuario_id: int) -> int:
+    """Actualizar un lote con un solo UPDATE, sólo cambian los registros que tienen otros valores"""
+    accion_masiva = ACCIONES_MASIVAS[tabla]
+    valores = accion_masiva.acciones[accion]
+    columnas = accion_masiva.modelo.__table__.c
+    sentencia = (
+        update(accion_masiva.modelo.__table__)
+        .where(columnas.id == any_(bindparam("ids", ids, type_=ARRAY(Integer))))
+        .where(or_(*(columnas[columna] != valor for columna, valor in valores.items())))
+        .values(**valores)
+        .returning(columnas.id)
+    )
+    conexion = database.session.connection()
+    actualizados = list(conexion.execute(sentencia).scalars())
+    if accion_masiva.al_actualizar is not None and len(actualizados) > 0:
+        accion_masiva.al_actualizar(conexion, accion, actualizados, usuario_id)
+    database.session.commit()
+    return len(actualizados)
+
+
+def aplicar(tabla: str, accion: str, ids: list[int], usuario_id: int, url: str, avance: Callable | None = None) -> str:
+    """Aplicar la acción por lotes y guardar una sola entrada en la bitácora, entrega el mensaje"""
+    accion_masiva = ACCIONES_MASIVAS[tabla]
+    cantidad = 0
+    for inicio in range(0, len(ids), TAMANO_LOTE):
+        cantidad += actualizar_lote(tabla, accion, ids[inicio : inicio + TAMANO_LOTE], usuario_id)
+        if avance is not None:
+            avance(min(99, (inicio + TAMANO_LOTE) * 100 // len(ids)))
+    invalidar_tablas(tabla, *accion_masiva.otras_tablas)
+    descartar_instantaneas(tabla, *accion_masiva.otras_tablas)
+    bitacora = Bitacora(
+        modulo_id=obtener_modulo_id(accion_masiva.modulo),
+        usuario_id=usuario_id,
+        descripcion=safe_message(f"Acción masiva {accion} en {cantidad} de {len(ids)} {accion_masiva.etiqueta}"),
+        url=url,
+    )
+    bitacora.save()
+    return bitacora.descripcion
+
+
+def ejecutar(tabla: str, accion: str, ids: list[int], url: str) -> str:
+    """Ejecutar desde una vista, en línea o en el fondo según la cantidad de ids, entrega el mensaje"""
+    accion_masiva = ACCIONES_MASIVAS[tabla]
+    if accion not in accion_masiva.acciones:
+        raise MyNotValidParamError(f"La acción {accion} no es válida para {accion_masiva.etiqueta}")
+    if len(ids) == 0:
+        raise MyNotValidParamError(f"No hay {accion_masiva.etiqueta} seleccionados")
+    if len(ids) <= LIMITE_EN_LINEA:
+        return aplicar(tabla, accion, ids, current_user.id, url)
+    tarea = current_user.launch_task(
+        comando="tareas.tasks.lanzar_accion_masiva",
+        mensaje=f"Acción masiva {accion} en {len(ids)} {accion_masiva.etiqueta}",
+        tabla=tabla,
+        accion=accion,
+        ids=ids,
+        usuario_id=current_user.id,
+        url=url,
+    )
+    return f"{tarea.mensaje}, se ejecuta en el fondo"
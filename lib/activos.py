@@ -0,0 +1,118 @@
+"""
+Activos
+
+Los archivos de hercules/static se copian a hercules/static/dist con el hash del contenido
+en el nombre, junto con sus versiones comprimidas .gz y .br, y un manifiesto que relaciona
+el nombre original con el nuevo. Se construyen al crear la imagen o con
+
+    cli activos construir
+
+En las plantillas se usa url_activo() en lugar de url_for('static', ...)
+
+    <link rel="stylesheet" href="{{ url_activo('css/bs5-dashboard.css') }}">
+
+Si existe el manifiesto entrega /activos/css/bs5-dashboard.0a1b2c3d.css, que se sirve con
+Cache-Control inmutable por un año y con la versión comprimida que acepte el navegador.
+Si no existe (en desarrollo) entrega la URL de siempre de /static.
+"""
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+
+from flask import abort, current_app, request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DIRECTORIO_ESTATICOS = os.path.join(os.path.dirname(os.path.dirname(__file__)), "hercules", "static")
+DIRECTORIO_DIST = os.path.join(DIRECTORIO_ESTATICOS, "dist")
+MANIFIESTO = "manifest.json"
+EXTENSIONES_COMPRIMIBLES = (".css", ".js", ".json", ".svg", ".ico")
+MAX_AGE_SEGUNDOS = 60 * 60 * 24 * 365
+HASH_LARGO = 8
+SUFIJOS = {"br": ".br", "gzip": ".gz"}
+
+
+def _nombre_con_hash(ruta: str, contenido: bytes) -> str:
+    """Agregar el hash del contenido al nombre, css/quill.css -> css/quill.0a1b2c3d.css"""
+    base, extension = os.path.splitext(ruta)
+    return f"{base}.{hashlib.sha256(contenido).hexdigest()[:HASH_LARGO]}{extension}"
+
+
+def construir(origen: str = DIRECTORIO_ESTATICOS, destino: str = DIRECTORIO_DIST) -> dict:
+    """Copiar los archivos con hash en el nombre, comprimirlos y escribir el manifiesto, entrega el manifiesto"""
+    if os.path.exists(destino):
+        shutil.rmtree(destino)
+    manifiesto = {}
+    for carpeta, subcarpetas, archivos in os.walk(origen):
+        subcarpetas[:] = [subcarpeta for subcarpeta in subcarpetas if os.path.join(carpeta, subcarpeta) != destino]
+        for archivo in sorted(archivos):
+            ruta = os.path.relpath(os.path.join(carpeta, archivo), origen).replace(os.sep, "/")
+            with open(os.path.join(carpeta, archivo), "rb") as entrada:
+                contenido = entrada.read()
+            nuevo = _nombre_con_hash(ruta, contenido)
+            os.makedirs(os.path.dirname(os.path.join(destino, nuevo)), exist_ok=True)
+            with open(os.path.join(destino, nuevo), "wb") as salida:
+                salida.write(contenido)
+            if ruta.endswith(EXTENSIONES_COMPRIMIBLES):
+                with open(os.path.join(destino, nuevo + SUFIJOS["gzip"]), "wb") as salida:
+                    salida.write(gzip.compress(contenido, compresslevel=9, mtime=0))
+                if brotli is not None:
+                    with open(os.path.join(destino, nuevo + SUFIJOS["br"]), "wb") as salida:
+                        salida.write(brotli.compress(contenido, quality=11))
+            manifiesto[ruta] = nuevo
+    with open(os.path.join(destino, MANIFIESTO), "w", encoding="utf-8") as salida:
+        json.dump(manifiesto, salida, indent=2, sort_keys=True)
+    return manifiesto
+
+
+def cargar_manifiesto(destino: str = DIRECTORIO_DIST) -> dict:
+    """Cargar el manifiesto, vacío si no se han construido los activos"""
+    try:
+        with open(os.path.join(destino, MANIFIESTO), encoding="utf-8") as entrada:
+            return json.load(entrada)
+    except (OSError, ValueError):
+        return {}
+
+
+def url_activo(ruta: str) -> str:
+    """URL del activo con hash si está en el manifiesto, si no la de /static"""
+    nuevo = current_app.extensions.get("activos", {}).get(ruta)
+    if nuevo is None:
+        return url_for("static", filename=ruta)
+    return url_for("activos", ruta=nuevo)
+
+
+def servir_activo(ruta: str):
+    """Servir el activo con hash con la versión comprimida que acepte el navegador"""
+    if ruta not in current_app.extensions.get("activos_servibles", set()):
+        abort(404)
+    codificacion = None
+    for candidata in ("br", "gzip"):
+        if request.accept_encodings[candidata] > 0 and os.path.exists(os.path.join(DIRECTORIO_DIST, ruta + SUFIJOS[candidata])):
+            codificacion = candidata
+            break
+    archivo = ruta if codificacion is None else ruta + SUFIJOS[codificacion]
+    respuesta = send_from_directory(DIRECTORIO_DIST, archivo, max_age=MAX_AGE_SEGUNDOS, etag=False)
+    if codificacion is not None:
+        respuesta.headers["Content-Encoding"] = codificacion
+        respuesta.mimetype = mimetypes.guess_type(ruta)[0] or "application/octet-stream"
+    respuesta.vary.add("Accept-Encoding")
+    respuesta.cache_control.public = True
+    respuesta.cache_control.immutable = True
+    return respuesta
+
+
+def registrar(app) -> None:
+    """Cargar el manifiesto y agregar la ruta /activos"""
+    manifiesto = cargar_manifiesto()
+    app.extensions["activos"] = manifiesto
+    app.extensions["activos_servibles"] = set(manifiesto.values())
+    app.add_url_rule("/activos/<path:ruta>", "activos", servir_activo)
+    app.add_template_global(url_activo)
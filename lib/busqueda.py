@@ -0,0 +1,126 @@
+"""
+Búsqueda de texto completo
+
+Los filtros por descripción con contains() se convierten en LIKE '%...%' y recorren toda la tabla.
+Las tablas de publicaciones tienen una columna generada buscador (tsvector) con su índice GIN
+y un índice de trigramas (pg_trgm) para los fragmentos de palabras.
+
+- La configuración es_unaccent es la de español sin acentos, así "resolucion" encuentra "RESOLUCIÓN"
+- Las palabras completas se buscan con el tsvector, con raíces en español
+- Los fragmentos se siguen buscando con LIKE, pero ahora con el índice de trigramas
+
+En el modelo
+
+    buscador: Mapped[Optional[str]] = columna_buscador("descripcion")
+    __table_args__ = indices_busqueda("sentencias", "descripcion")
+
+En el datatable_json
+
+    descripcion = safe_string(request.form["descripcion"], save_enie=True)
+    if descripcion != "":
+        consulta = filtrar_por_texto(consulta, Sentencia, descripcion)
+
+En una base de datos existente se agregan las columnas y los índices con
+
+    cli db preparar-busqueda-texto
+"""
+
+from sqlalchemy import DDL, Computed, Index, cast, event, func, or_
+from sqlalchemy.dialects.postgresql import REGCONFIG, TSVECTOR
+from sqlalchemy.orm import mapped_column
+from sqlalchemy.schema import CreateIndex
+
+from hercules.extensions import database
+
+TS_CONFIGURACION = "es_unaccent"
+COLUMNA_BUSCADOR = "buscador"
+COLUMNA_CONTENIDO_BUSCADOR = "contenido_buscador"
+COLUMNAS_CONTENIDO = ("contenido_fue_extraido_tiempo", "contenido_texto", COLUMNA_CONTENIDO_BUSCADOR)
+
+PREPARAR_EXTENSIONES = DDL(
+    f"""
+CREATE EXTENSION IF NOT EXISTS unaccent;
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = '{TS_CONFIGURACION}') THEN
+        CREATE TEXT SEARCH CONFIGURATION {TS_CONFIGURACION} (COPY = spanish);
+        ALTER TEXT SEARCH CONFIGURATION {TS_CONFIGURACION}
+            ALTER MAPPING FOR hword, hword_part, word WITH unaccent, spanish_stem;
+    END IF;
+END
+$$;
+"""
+)
+
+# Las extensiones, la configuración y las funciones deben existir antes de crear las columnas generadas
+DDL_PREVIOS = []
+
+
+def registrar_ddl_previo(ddl: DDL) -> None:
+    """Registrar una sentencia DDL que se ejecuta antes de crear las tablas y al preparar la búsqueda"""
+    DDL_PREVIOS.append(ddl)
+    event.listen(database.Model.metadata, "before_create", ddl.execute_if(dialect="postgresql"))
+
+
+registrar_ddl_previo(PREPARAR_EXTENSIONES)
+
+
+def columna_buscador(*columnas: str):
+    """Columna generada tsvector con el texto de las columnas, diferida para no cargarla en cada consulta"""
+    expresion = " || ' ' || ".join(f"coalesce({columna}, '')" for columna in columnas)
+    return mapped_column(
+        TSVECTOR,
+        Computed(f"to_tsvector('{TS_CONFIGURACION}'::regconfig, {expresion})", persisted=True),
+        deferred=True,
+    )
+
+
+def indices_busqueda(tabla: str, columna: str, contenido: bool = False) -> tuple:
+    """Índice GIN de la columna buscador e índice de trigramas de la columna de texto"""
+    indices = (
+        Index(f"{tabla}_{COLUMNA_BUSCADOR}_gin", COLUMNA_BUSCADOR, postgresql_using="gin"),
+        Index(f"{tabla}_{columna}_trgm", columna, postgresql_using="gin", postgresql_ops={columna: "gin_trgm_ops"}),
+    )
+    if contenido:
+        indices += (Index(f"{tabla}_{COLUMNA_CONTENIDO_BUSCADOR}_gin", COLUMNA_CONTENIDO_BUSCADOR, postgresql_using="gin"),)
+    return indices
+
+
+def configuracion_ts():
+    """Configuración en español sin acentos como regconfig"""
+    return cast(TS_CONFIGURACION, REGCONFIG)
+
+
+def consulta_tsquery(texto: str):
+    """Consulta tsquery con la configuración en español sin acentos"""
+    return func.plainto_tsquery(configuracion_ts(), texto)
+
+
+def filtrar_por_texto(consulta, modelo, texto: str, columna: str = "descripcion"):
+    """Filtrar por palabras completas (tsvector) o por el fragmento (trigramas), ambos usan índices"""
+    if texto == "":
+        return consulta
+    buscador = getattr(modelo, COLUMNA_BUSCADOR)
+    return consulta.filter(or_(buscador.op("@@")(consulta_tsquery(texto)), getattr(modelo, columna).contains(texto)))
+
+
+def preparar_busqueda() -> list:
+    """Agregar las columnas generadas y los índices GIN a las tablas existentes, entrega los nombres de las tablas"""
+    tablas = []
+    with database.engine.begin() as conexion:
+        for ddl in DDL_PREVIOS:
+            conexion.execute(ddl)
+        for tabla in database.Model.metadata.sorted_tables:
+            columnas = [columna for columna in tabla.c if columna.computed is not None or columna.name in COLUMNAS_CONTENIDO]
+            indices = [indice for indice in tabla.indexes if indice.dialect_options["postgresql"]["using"] == "gin"]
+            if len(columnas) == 0 and len(indices) == 0:
+                continue
+            for columna in columnas:
+                tipo = columna.type.compile(dialect=conexion.dialect)
+                generada = f" GENERATED ALWAYS AS ({columna.computed.sqltext}) STORED" if columna.computed is not None else ""
+                conexion.exec_driver_sql(f"ALTER TABLE {tabla.name} ADD COLUMN IF NOT EXISTS {columna.name} {tipo}{generada}")
+            for indice in indices:
+                conexion.execute(CreateIndex(indice, if_not_exists=True))
+            tablas.append(tabla.name)
+    return tablas
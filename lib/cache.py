@@ -0,0 +1,479 @@
+"""
+Cache de resultados
+
+Guarda en Redis el resultado JSON de las vistas y consultas de sólo lectura.
+
+- La llave se forma con el endpoint, los argumentos normalizados y el alcance de permisos del usuario
+- Cada entrada se etiqueta con las tablas que lee, usando el contador de versión de cada tabla
+- UniversalMixin.save, delete y recover incrementan el contador de su tabla
+- Las actualizaciones y eliminaciones masivas (update, delete) lo incrementan al hacer commit
+- Al cambiar el contador, las entradas anteriores ya no se usan y expiran solas
+- Las entradas incluyen la fecha de hoy, así las consultas por "últimos N días" se renuevan cada día
+
+Ejemplo en una vista
+
+    @edictos.route("/edictos/tablero_cantidades_por_dia_json")
+    @permission_required(MODULO, Permiso.VER)
+    @cache_json(tablas=["edictos"])
+    def dashboard_amounts_per_day_json():
+        ...
+
+Ejemplo en una función de consulta
+
+    @cache_consulta(tablas=["vsp_digitalizaciones", "autoridades", "materias"])
+    def consultar_totales(anio: int) -> list:
+        ...
+
+Si se escribe con SQL directo (sin el ORM) hay que invalidar a mano
+
+    invalidar_tablas("edictos")
+
+Para los detalles y los JSON que se consultan una y otra vez sin cambios, use cache_condicional
+
+- El ETag se forma con el id y el modificado del registro (o el mayor modificado de la tabla) y el alcance
+- Si el navegador envía el mismo ETag en If-None-Match se responde 304 sin ejecutar la vista
+- Sólo aplica a GET y HEAD, y no aplica si hay mensajes flash pendientes
+
+    @edictos.route("/edictos/acuses/<id_hashed>")
+    @cache_condicional(Edicto, "id_hashed", identificar=Edicto.decode_id, tablas=["autoridades", "distritos"])
+    def checkout(id_hashed):
+        ...
+
+Para los tableros con consultas costosas sobre tablas que cambian todo el tiempo, use cache_coalescente
+
+- La primera petición calcula el resultado, las peticiones idénticas concurrentes esperan ese resultado
+- Durante los primeros segundos (fresco) se entrega lo guardado
+- Después y hasta rancio, se entrega lo guardado y se recalcula en el fondo
+- Usa un candado en Redis, así que coalesce entre hilos, procesos e instancias
+
+    @arc_archivos.route("/arc_archivos/datatable_json_solicitudes_por_distrito", methods=["GET", "POST"])
+    @cache_coalescente(fresco=60, rancio=600)
+    def datatable_json_solicitudes_por_distrito():
+        ...
+"""
+
+import hashlib
+import json
+import threading
+import time
+from datetime import date, datetime, timezone
+from functools import wraps
+
+from flask import (
+    copy_current_request_context,
+    current_app,
+    has_app_context,
+    has_request_context,
+    make_response,
+    request,
+    session,
+)
+from flask_login import current_user
+from redis.exceptions import RedisError
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+
+from hercules.extensions import database
+from lib.datatables import get_datatable_parameters
+from lib.respuestas_json import ENCABEZADO_FORMATO, volcar_json
+
+REDIS_PREFIJO = "hercules:cache"
+TTL_SEGUNDOS = 60 * 60 * 24  # Sólo para que expiren las entradas que ya no se usan
+ALCANCES = ("publico", "permisos", "usuario")
+CANDADO_SEGUNDOS = 120  # Tiempo máximo que se conserva el candado si el proceso que calcula muere
+ESPERA_SEGUNDOS = 30  # Tiempo máximo que una petición espera el resultado de otra
+ESPERA_INTERVALO = 0.1
+
+
+def _llave_version(tabla: str) -> str:
+    """Llave en Redis del contador de versión de la tabla"""
+    return f"{REDIS_PREFIJO}:tablas:{tabla}"
+
+
+def invalidar_tablas(*tablas: str) -> None:
+    """Invalidar las entradas etiquetadas con estas tablas"""
+    if len(tablas) == 0 or not has_app_context():
+        return
+    try:
+        with current_app.redis.pipeline(transaction=False) as pipe:
+            for tabla in tablas:
+                pipe.incr(_llave_version(tabla))
+            pipe.execute()
+    except (AttributeError, RedisError):
+        pass
+
+
+def consultar_versiones(tablas: list) -> list:
+    """Consultar los contadores de versión de las tablas"""
+    valores = current_app.redis.mget([_llave_version(tabla) for tabla in tablas])
+    return [int(valor) if valor is not None else 0 for valor in valores]
+
+
+def _alcance_usuario(alcance: str) -> list:
+    """Elaborar la parte de la llave que depende del usuario"""
+    if alcance == "publico" or not current_user or not current_user.is_authenticated:
+        return []
+    if alcance == "usuario":
+        return [current_user.id]
+    return [current_user.autoridad_id, sorted(current_user.permisos.items())]
+
+
+def _elaborar_llave(nombre: str, argumentos: list, tablas: list | None, alcance: str) -> str:
+    """Elaborar la llave a partir del nombre, los argumentos, el alcance y las versiones de las tablas"""
+    partes = [nombre, argumentos, _alcance_usuario(alcance), date.today().isoformat()]
+    if tablas:
+        partes.append(consultar_versiones(tablas))
+    resumen = hashlib.sha1(json.dumps(partes, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    return f"{REDIS_PREFIJO}:{nombre}:{resumen}"
+
+
+def _argumentos_peticion(ignorar: tuple = ("csrf_token",)) -> list:
+    """Normalizar los argumentos de la petición: de la ruta, de la URL, del formulario y el formato solicitado"""
+    return [
+        sorted((request.view_args or {}).items()),
+        sorted(request.args.items(multi=True)),
+        sorted((llave, valor) for llave, valor in request.form.items(multi=True) if llave not in ignorar),
+        request.headers.get(ENCABEZADO_FORMATO, ""),
+    ]
+
+
+def cache_json(tablas: list, alcance: str = "permisos", ttl: int = TTL_SEGUNDOS):
+    """Decorador para guardar en cache la respuesta JSON de una vista"""
+    if alcance not in ALCANCES:
+        raise ValueError(f"El alcance {alcance} no es válido")
+
+    def decorator(f):
+        """Decorador"""
+
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            # Tomar la entrada, si Redis falla se ejecuta la vista sin cache
+            try:
+                llave = _elaborar_llave(request.endpoint, _argumentos_peticion(), tablas, alcance)
+                guardado = current_app.redis.get(llave)
+            except (AttributeError, RedisError):
+                return f(*args, **kwargs)
+            if guardado is not None:
+                return _entregar(json.loads(guardado))
+            # Ejecutar la vista
+            resultado = f(*args, **kwargs)
+            entrada = _elaborar_entrada(resultado)
+            if entrada is None:
+                return resultado  # Las respuestas ya elaboradas (redirect, archivos) no se guardan
+            try:
+                current_app.redis.set(llave, json.dumps(entrada), ex=ttl)
+            except RedisError:
+                pass
+            return _entregar(entrada)
+
+        return decorated_function
+
+    return decorator
+
+
+def _entregar(entrada: dict):
+    """Entregar la entrada guardada como lo haría la vista"""
+    if entrada["json"]:
+        return current_app.response_class(entrada["contenido"], mimetype="application/json")
+    return entrada["contenido"]
+
+
+def cache_consulta(tablas: list, ttl: int = TTL_SEGUNDOS):
+    """Decorador para guardar en cache el resultado de una función de consulta, debe ser serializable a JSON"""
+
+    def decorator(f):
+        """Decorador"""
+
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            nombre = f"{f.__module__}.{f.__qualname__}"
+            try:
+                llave = _elaborar_llave(nombre, [list(args), sorted(kwargs.items())], tablas, "publico")
+                guardado = current_app.redis.get(llave)
+            except (AttributeError, RedisError, TypeError):
+                return f(*args, **kwargs)
+            if guardado is not None:
+                return json.loads(guardado)
+            resultado = f(*args, **kwargs)
+            try:
+                current_app.redis.set(llave, json.dumps(resultado, default=str), ex=ttl)
+            except (RedisError, TypeError):
+                pass
+            return resultado
+
+        return decorated_function
+
+    return decorator
+
+
+def _elaborar_entrada(resultado) -> dict | None:
+    """Convertir el resultado de una vista en una entrada que se puede guardar, None si no se puede"""
+    if isinstance(resultado, (dict, list)):
+        return {"json": True, "contenido": volcar_json(resultado).decode("utf-8")}
+    if isinstance(resultado, str):
+        return {"json": False, "contenido": resultado}
+    return None
+
+
+def _coalescer(llave: str, calcular, fresco: int, rancio: int):
+    """Entregar el valor guardado en la llave, calculándolo una sola vez entre todas las peticiones concurrentes"""
+    redis = current_app.redis
+    candado = redis.lock(f"{llave}:candado", timeout=CANDADO_SEGUNDOS, thread_local=False)  # Se libera desde otro hilo
+
+    # Si hay un valor guardado y es fresco, entregarlo
+    guardado = redis.get(llave)
+    visto = None
+    if guardado is not None:
+        guardado = json.loads(guardado)
+        visto = guardado["tiempo"]
+        edad = time.time() - guardado["tiempo"]
+        if edad < fresco:
+            return guardado["valor"]
+        # Si es rancio, entregarlo y recalcular en el fondo si nadie más lo está haciendo
+        if edad < rancio:
+            if candado.acquire(blocking=False):
+                _recalcular_en_el_fondo(llave, calcular, candado, rancio)
+            return guardado["valor"]
+
+    # No hay valor, si nadie más lo está calculando, calcularlo
+    if candado.acquire(blocking=False):
+        try:
+            return _calcular_y_guardar(llave, calcular, rancio)
+        finally:
+            _liberar(candado)
+
+    # Otra petición lo está calculando, esperar a que termine
+    limite = time.time() + ESPERA_SEGUNDOS
+    while time.time() < limite:
+        time.sleep(ESPERA_INTERVALO)
+        guardado = redis.get(llave)
+        if guardado is not None:
+            guardado = json.loads(guardado)
+            if guardado["tiempo"] != visto:
+                return guardado["valor"]
+        if not candado.locked():
+            break
+
+    # Se agotó la espera, calcular sin candado
+    return _calcular_y_guardar(llave, calcular, rancio)
+
+
+def _calcular_y_guardar(llave: str, calcular, rancio: int):
+    """Calcular el valor y guardarlo con el tiempo en que se calculó"""
+    valor = calcular()
+    if valor is not None:
+        try:
+            current_app.redis.set(llave, json.dumps({"tiempo": time.time(), "valor": valor}, default=str), ex=rancio)
+        except RedisError:
+            pass
+    return valor
+
+
+def _liberar(candado) -> None:
+    """Liberar el candado sin fallar si ya expiró"""
+    try:
+        candado.release()
+    except RedisError:
+        pass
+
+
+def _recalcular_en_el_fondo(llave: str, calcular, candado, rancio: int) -> None:
+    """Recalcular el valor en un hilo aparte, con una copia del contexto de la petición o de la aplicación"""
+
+    def recalcular():
+        try:
+            _calcular_y_guardar(llave, calcular, rancio)
+        except Exception:
+            current_app.logger.exception("Falló el recálculo en el fondo de %s", llave)
+        finally:
+            _liberar(candado)
+
+    if has_request_context():
+        hilo = threading.Thread(target=copy_current_request_context(recalcular), daemon=True)
+    else:
+        app = current_app._get_current_object()
+
+        def recalcular_con_app():
+            with app.app_context():
+                recalcular()
+
+        hilo = threading.Thread(target=recalcular_con_app, daemon=True)
+    hilo.start()
+
+
+def cache_coalescente(fresco: int = 60, rancio: int = 600, alcance: str = "permisos"):
+    """Decorador para vistas costosas: coalesce peticiones idénticas y entrega valores rancios mientras recalcula"""
+    if alcance not in ALCANCES:
+        raise ValueError(f"El alcance {alcance} no es válido")
+
+    def decorator(f):
+        """Decorador"""
+
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            # Las respuestas ya elaboradas (redirect, archivos) no se guardan, se entregan tal cual
+            no_guardables = []
+
+            def calcular():
+                resultado = f(*args, **kwargs)
+                entrada = _elaborar_entrada(resultado)
+                if entrada is None:
+                    no_guardables.append(resultado)
+                return entrada
+
+            # El parámetro draw de DataTables cambia en cada petición, no forma parte de la llave
+            try:
+                llave = _elaborar_llave(request.endpoint, _argumentos_peticion(("csrf_token", "draw")), None, alcance)
+                entrada = _coalescer(llave, calcular, fresco, rancio)
+            except (AttributeError, RedisError):
+                return f(*args, **kwargs)
+            if entrada is None:
+                return no_guardables[0] if no_guardables else f(*args, **kwargs)
+            if entrada["json"] and "draw" in request.form:
+                contenido = json.loads(entrada["contenido"])
+                if isinstance(contenido, dict) and "draw" in contenido:
+                    contenido["draw"] = get_datatable_parameters()[0]
+                    entrada = {"json": True, "contenido": json.dumps(contenido)}
+            return _entregar(entrada)
+
+        return decorated_function
+
+    return decorator
+
+
+def cache_coalescente_consulta(fresco: int = 60, rancio: int = 600):
+    """Decorador para funciones de consulta costosas, el resultado debe ser serializable a JSON"""
+
+    def decorator(f):
+        """Decorador"""
+
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            nombre = f"{f.__module__}.{f.__qualname__}"
+            try:
+                llave = _elaborar_llave(nombre, [list(args), sorted(kwargs.items())], None, "publico")
+                return _coalescer(llave, lambda: f(*args, **kwargs), fresco, rancio)
+            except (AttributeError, RedisError, TypeError):
+                return f(*args, **kwargs)
+
+        return decorated_function
+
+    return decorator
+
+
+def _con_zona_horaria(tiempo):
+    """Agregar la zona horaria de la sesión de la base de datos, now() guarda modificado sin zona en esa hora local"""
+    return func.timezone(func.current_setting("TimeZone"), tiempo)
+
+
+def _consultar_modificado(modelo, identificador) -> tuple:
+    """Consultar el modificado del registro, o el mayor modificado y la cantidad de renglones de la tabla
+
+    Se entrega con zona horaria, así convertirlo a UTC no depende de la zona horaria del servidor de la aplicación.
+    """
+    if identificador is None:
+        consulta = database.session.query(_con_zona_horaria(func.max(modelo.modificado)), func.count(modelo.id))
+        return tuple(consulta.one())
+    consulta = database.session.query(_con_zona_horaria(modelo.modificado)).filter(modelo.id == identificador)
+    return consulta.scalar(), 1
+
+
+def _no_modificado(etag: str, ultima_modificacion: datetime):
+    """Respuesta 304 con los validadores"""
+    respuesta = current_app.response_class(status=304)
+    respuesta.set_etag(etag, weak=True)
+    respuesta.last_modified = ultima_modificacion
+    respuesta.cache_control.private = True
+    respuesta.cache_control.no_cache = True
+    return respuesta
+
+
+def cache_condicional(
+    modelo,
+    argumento: str | None = None,
+    identificar=None,
+    tablas: list | None = None,
+    alcance: str = "permisos",
+    vigencia: int | None = None,
+):
+    """Decorador para responder 304 Not Modified a partir de la columna modificado
+
+    - argumento es el nombre del parámetro de la ruta con el id, si se omite se usa toda la tabla
+    - identificar convierte el parámetro en el id, como safe_uuid o Modelo.decode_id
+    - tablas son las relacionadas que se muestran, se agregan sus contadores de versión
+    - vigencia en segundos para las páginas con formularios, así no se reusa un token CSRF vencido
+    """
+    if alcance not in ALCANCES:
+        raise ValueError(f"El alcance {alcance} no es válido")
+
+    def decorator(f):
+        """Decorador"""
+
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if request.method not in ("GET", "HEAD") or session.get("_flashes"):
+                return f(*args, **kwargs)
+            identificador = None
+            if argumento is not None:
+                try:
+                    identificador = kwargs.get(argumento)
+                    if identificar is not None:
+                        identificador = identificar(identificador)
+                except (IndexError, TypeError, ValueError):
+                    identificador = None
+                if not identificador:
+                    return f(*args, **kwargs)  # La vista entrega el mensaje de error
+            modificado, cantidad = _consultar_modificado(modelo, identificador)
+            if modificado is None:
+                return f(*args, **kwargs)  # No existe, la vista entrega el 404
+            partes = [request.endpoint, _argumentos_peticion(), _alcance_usuario(alcance), modificado.isoformat(), cantidad]
+            if vigencia:
+                partes.append(int(time.time()) // vigencia)
+            if tablas:
+                try:
+                    partes.append(consultar_versiones(tablas))
+                except (AttributeError, RedisError):
+                    return f(*args, **kwargs)
+            etag = hashlib.sha1(json.dumps(partes, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+            ultima_modificacion = modificado.astimezone(timezone.utc).replace(microsecond=0)
+            # Si viene If-None-Match se usa sólo el ETag, si no, If-Modified-Since
+            if request.if_none_match:
+                if request.if_none_match.contains_weak(etag):
+                    return _no_modificado(etag, ultima_modificacion)
+            elif not tablas and not vigencia and request.if_modified_since is not None:
+                if ultima_modificacion <= request.if_modified_since:
+                    return _no_modificado(etag, ultima_modificacion)
+            respuesta = make_response(f(*args, **kwargs))
+            if respuesta.status_code == 200:
+                respuesta.set_etag(etag, weak=True)
+                respuesta.last_modified = ultima_modificacion
+                respuesta.cache_control.private = True
+                respuesta.cache_control.no_cache = True
+            return respuesta
+
+        return decorated_function
+
+    return decorator
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _registrar_escrituras_masivas(orm_execute_state):
+    """Registrar las tablas modificadas por update() o delete() masivos"""
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        tabla = getattr(orm_execute_state.statement, "table", None)
+        if tabla is not None and hasattr(tabla, "name"):
+            orm_execute_state.session.info.setdefault("cache_tablas", set()).add(tabla.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidar_escrituras_masivas(session):
+    """Al hacer commit, invalidar las tablas de las escrituras masivas"""
+    tablas = session.info.pop("cache_tablas", None)
+    if tablas:
+        invalidar_tablas(*tablas)
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_escrituras_masivas(session):
+    """Al hacer rollback, descartar las tablas registradas"""
+    session.info.pop("cache_tablas", None)
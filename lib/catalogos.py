@@ -0,0 +1,236 @@
+"""
+Catálogos en memoria
+
+Las tablas pequeñas que casi no cambian (modulos, materias, autoridades, etc.) se consultan
+en cada petición. Este módulo conserva en cada proceso una instantánea inmutable de cada
+catálogo y la vuelve a cargar sólo cuando cambia el contador de versión de la tabla en Redis,
+el mismo de lib/cache, así cualquier invalidar_tablas() también renueva el catálogo.
+
+- UniversalMixin.save, delete y recover y los update() o delete() masivos del ORM incrementan el contador
+- La versión se revisa una sola vez por petición y por tabla
+- Si Redis no responde, se carga la instantánea desde la base de datos
+
+Ejemplo, en lugar de consultar la autoridad en el datatable_json
+
+    autoridad = consultar_por_id("autoridades", request.form["autoridad_id"])
+    if autoridad:
+        consulta = consulta.filter(Edicto.autoridad_id == autoridad.id)
+
+Ejemplo, en lugar de consultar el módulo para la bitácora
+
+    bitacora = Bitacora(
+        modulo_id=obtener_modulo_id(MODULO),
+        usuario=current_user,
+        ...
+    )
+"""
+
+import threading
+from dataclasses import dataclass, fields
+from types import MappingProxyType
+
+from flask import g, has_app_context, has_request_context
+from redis.exceptions import RedisError
+from sqlalchemy import select
+
+from hercules.extensions import database
+from lib.cache import consultar_versiones
+
+
+@dataclass(frozen=True, slots=True)
+class AutoridadCatalogo:
+    """Autoridad en el catálogo"""
+
+    id: int
+    clave: str
+    descripcion: str
+    descripcion_corta: str
+    distrito_id: int
+    materia_id: int
+    es_jurisdiccional: bool
+    es_notaria: bool
+    estatus: str
+
+
+@dataclass(frozen=True, slots=True)
+class DistritoCatalogo:
+    """Distrito en el catálogo"""
+
+    id: int
+    clave: str
+    nombre: str
+    nombre_corto: str
+    es_distrito_judicial: bool
+    estatus: str
+
+
+@dataclass(frozen=True, slots=True)
+class EstadoCatalogo:
+    """Estado en el catálogo"""
+
+    id: int
+    clave: str
+    nombre: str
+    estatus: str
+
+
+@dataclass(frozen=True, slots=True)
+class MateriaCatalogo:
+    """Materia en el catálogo"""
+
+    id: int
+    clave: str
+    nombre: str
+    estatus: str
+
+
+@dataclass(frozen=True, slots=True)
+class MateriaTipoJuicioCatalogo:
+    """Tipo de juicio de una materia en el catálogo"""
+
+    id: int
+    materia_id: int
+    descripcion: str
+    estatus: str
+
+
+@dataclass(frozen=True, slots=True)
+class ModuloCatalogo:
+    """Módulo en el catálogo"""
+
+    id: int
+    nombre: str
+    nombre_corto: str
+    icono: str
+    ruta: str
+    estatus: str
+
+
+@dataclass(frozen=True, slots=True)
+class MunicipioCatalogo:
+    """Municipio en el catálogo"""
+
+    id: int
+    estado_id: int
+    clave: str
+    nombre: str
+    estatus: str
+
+
+@dataclass(frozen=True, slots=True)
+class RolCatalogo:
+    """Rol en el catálogo"""
+
+    id: int
+    nombre: str
+    estatus: str
+
+
+# Tabla: (clase de la instantánea, columna que sirve como clave de búsqueda)
+CATALOGOS = {
+    "autoridades": (AutoridadCatalogo, "clave"),
+    "distritos": (DistritoCatalogo, "clave"),
+    "estados": (EstadoCatalogo, "clave"),
+    "materias": (MateriaCatalogo, "nombre"),
+    "materias_tipos_juicios": (MateriaTipoJuicioCatalogo, None),
+    "modulos": (ModuloCatalogo, "nombre"),
+    "municipios": (MunicipioCatalogo, None),
+    "roles": (RolCatalogo, "nombre"),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogoSnapshot:
+    """Instantánea inmutable de un catálogo"""
+
+    tabla: str
+    version: int
+    por_id: MappingProxyType
+    por_clave: MappingProxyType
+
+
+_snapshots: dict[str, CatalogoSnapshot] = {}
+_candado = threading.Lock()
+
+
+def descartar_instantaneas(*tablas: str) -> None:
+    """Descartar en este proceso las instantáneas de las tablas, para que la petición en curso no use la anterior"""
+    versiones = g.get("catalogos_versiones", {}) if has_request_context() else {}
+    for tabla in tablas:
+        _snapshots.pop(tabla, None)
+        versiones.pop(tabla, None)
+
+
+def _consultar_version(tabla: str) -> int | None:
+    """Consultar la versión vigente de la tabla, se memoriza durante la petición"""
+    versiones = None
+    if has_request_context():
+        versiones = g.setdefault("catalogos_versiones", {})
+        if tabla in versiones:
+            return versiones[tabla]
+    try:
+        version = consultar_versiones([tabla])[0] if has_app_context() else None
+    except (AttributeError, RedisError, ValueError):
+        version = None
+    if versiones is not None:
+        versiones[tabla] = version
+    return version
+
+
+def _cargar(tabla: str, version: int | None) -> CatalogoSnapshot:
+    """Cargar la instantánea desde la base de datos"""
+    clase, columna_clave = CATALOGOS[tabla]
+    tabla_sql = database.Model.metadata.tables[tabla]
+    columnas = [campo.name for campo in fields(clase)]
+    por_id = {}
+    por_clave = {}
+    for renglon in database.session.execute(select(*[tabla_sql.c[columna] for columna in columnas])):
+        registro = clase(*renglon)
+        por_id[registro.id] = registro
+        if columna_clave is not None:
+            por_clave[getattr(registro, columna_clave)] = registro
+    return CatalogoSnapshot(
+        tabla=tabla,
+        version=-1 if version is None else version,
+        por_id=MappingProxyType(por_id),
+        por_clave=MappingProxyType(por_clave),
+    )
+
+
+def consultar_catalogo(tabla: str) -> CatalogoSnapshot:
+    """Entregar la instantánea vigente del catálogo"""
+    if tabla not in CATALOGOS:
+        raise KeyError(f"La tabla {tabla} no es un catálogo")
+    version = _consultar_version(tabla)
+    snapshot = _snapshots.get(tabla)
+    if snapshot is not None and version is not None and snapshot.version == version:
+        return snapshot
+    with _candado:
+        snapshot = _snapshots.get(tabla)
+        if snapshot is None or version is None or snapshot.version != version:
+            snapshot = _cargar(tabla, version)
+            if version is not None:
+                _snapshots[tabla] = snapshot
+    return snapshot
+
+
+def consultar_por_id(tabla: str, registro_id):
+    """Consultar un registro del catálogo por su id, entrega None si no existe o el id es inválido"""
+    try:
+        registro_id = int(registro_id)
+    except (TypeError, ValueError):
+        return None
+    return consultar_catalogo(tabla).por_id.get(registro_id)
+
+
+def consultar_por_clave(tabla: str, clave: str):
+    """Consultar un registro del catálogo por su clave (o nombre), entrega None si no existe"""
+    return consultar_catalogo(tabla).por_clave.get(clave)
+
+
+def obtener_modulo_id(modulo_nombre: str) -> int | None:
+    """Obtener el id del módulo a partir de su nombre, para usarse en las bitácoras"""
+    modulo = consultar_por_clave("modulos", modulo_nombre)
+    if modulo is None:
+        return None
+    return modulo.id
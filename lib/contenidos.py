@@ -0,0 +1,140 @@
+"""
+Contenidos de los archivos PDF
+
+Después de subir el archivo a Google Cloud Storage se encola la extracción de su texto.
+La tarea en el fondo descarga el PDF, extrae el texto en un ProcessPoolExecutor y guarda
+en el mismo registro el texto comprimido y su vector de búsqueda.
+
+Los modelos que lo usan deben tener las columnas
+
+    contenido_fue_extraido_tiempo: Mapped[Optional[datetime]]
+    contenido_texto: Mapped[Optional[bytes]] = mapped_column(LargeBinary, deferred=True)
+    contenido_buscador: Mapped[Optional[str]] = mapped_column(TSVECTOR, deferred=True)
+
+Después de subir el archivo
+
+    encolar_extraccion("sentencias.task.extraer_contenido", "Extraer el contenido de la sentencia", sentencia.id)
+
+Para los registros que ya existen se extrae por lotes, se puede interrumpir y continuar
+porque sólo se toman los que no tienen contenido_fue_extraido_tiempo. Los archivos que
+no se pudieron descargar se quedan sin contenido_fue_extraido_tiempo y se reintentan
+en la siguiente ejecución; los PDF sin texto se marcan como extraídos con texto vacío.
+
+    cli contenidos extraer sentencias
+"""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from flask_login import current_user
+from redis.exceptions import RedisError
+from sqlalchemy import func, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from hercules.extensions import database
+from lib.busqueda import configuracion_ts, consulta_tsquery
+from lib.exceptions import MyAnyError
+from lib.google_cloud_storage import get_blob_name_from_url, get_file_from_gcs
+from lib.texto_pdf import comprimir_texto, extraer_texto_pdf
+
+LOTE = 50
+PROCESOS = max((os.cpu_count() or 2) - 1, 1)
+
+bitacora = logging.getLogger(__name__)
+
+
+def encolar_extraccion(comando: str, mensaje: str, registro_id: int) -> None:
+    """Lanzar la tarea de extracción del contenido, si falla la cola no se interrumpe la subida del archivo"""
+    try:
+        current_user.launch_task(comando, mensaje, registro_id)
+    except RedisError as error:
+        bitacora.warning("No se pudo encolar %s para %s: %s", comando, registro_id, error)
+
+
+def _descargar(bucket_name: str, url: str) -> bytes:
+    """Descargar el archivo, entrega bytes vacíos si no se encuentra"""
+    try:
+        return get_file_from_gcs(bucket_name=bucket_name, blob_name=get_blob_name_from_url(url))
+    except MyAnyError as error:
+        bitacora.warning("No se pudo descargar %s: %s", url, error)
+        return b""
+
+
+def extraer_contenidos(modelo, bucket_name: str, registros_ids: list) -> int:
+    """Extraer y guardar el contenido de los registros dados, entrega la cantidad con texto"""
+    registros = database.session.query(modelo.id, modelo.url).filter(modelo.id.in_(registros_ids)).all()
+    if len(registros) == 0:
+        return 0
+
+    # Descargar los archivos y extraer el texto en procesos separados
+    archivos = [_descargar(bucket_name, url) if url else b"" for _, url in registros]
+    with ProcessPoolExecutor(max_workers=min(PROCESOS, len(archivos))) as ejecutor:
+        textos = list(ejecutor.map(extraer_texto_pdf, archivos))
+
+    # Guardar cada registro en su propio savepoint, si uno falla no se pierden los demás del lote
+    ahora = datetime.now()
+    con_texto = 0
+    for (registro_id, _), archivo, texto in zip(registros, archivos, textos):
+        if archivo == b"":
+            continue  # No se descargó, queda pendiente para que extraer_pendientes lo vuelva a intentar
+        try:
+            with database.session.begin_nested():
+                database.session.execute(
+                    update(modelo)
+                    .where(modelo.id == registro_id)
+                    .values(
+                        contenido_fue_extraido_tiempo=ahora,
+                        contenido_texto=comprimir_texto(texto),
+                        contenido_buscador=func.to_tsvector(configuracion_ts(), texto),
+                    )
+                )
+        except SQLAlchemyError as error:
+            # Marcar sólo este registro como extraído sin texto, para que no se vuelva a tomar en cada ejecución
+            bitacora.warning("No se pudo guardar el contenido de %s: %s", registro_id, error)
+            database.session.execute(
+                update(modelo)
+                .where(modelo.id == registro_id)
+                .values(contenido_fue_extraido_tiempo=ahora, contenido_texto=comprimir_texto(""), contenido_buscador=None)
+            )
+            continue
+        if texto != "":
+            con_texto += 1
+    database.session.commit()
+    return con_texto
+
+
+def extraer_pendientes(modelo, bucket_name: str, lote: int = LOTE, limite: int | None = None) -> tuple[int, int]:
+    """Extraer por lotes el contenido de los registros que no lo tienen, entrega (procesados, con texto)"""
+    procesados = 0
+    con_texto = 0
+    ultimo_id = 0
+    while limite is None or procesados < limite:
+        tamano = lote if limite is None else min(lote, limite - procesados)
+        registros_ids = [
+            registro_id
+            for (registro_id,) in database.session.query(modelo.id)
+            .filter(modelo.id > ultimo_id)
+            .filter(modelo.contenido_fue_extraido_tiempo.is_(None))
+            .filter(modelo.estatus == "A")
+            .filter(modelo.url != "")
+            .order_by(modelo.id)
+            .limit(tamano)
+            .all()
+        ]
+        if len(registros_ids) == 0:
+            break
+        con_texto += extraer_contenidos(modelo, bucket_name, registros_ids)
+        procesados += len(registros_ids)
+        ultimo_id = registros_ids[-1]
+        bitacora.info("Extraídos %d registros de %s hasta el id %d", procesados, modelo.__tablename__, ultimo_id)
+    return procesados, con_texto
+
+
+def buscar_contenidos(consulta, modelo, texto: str):
+    """Filtrar y ordenar por relevancia con el vector de búsqueda del contenido"""
+    tsquery = consulta_tsquery(texto)
+    return consulta.filter(modelo.contenido_buscador.op("@@")(tsquery)).order_by(
+        func.ts_rank(modelo.contenido_buscador, tsquery).desc(), modelo.id.desc()
+    )
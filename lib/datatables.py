@@ -4,6 +4,8 @@ Datatables
 
 from flask import request
 
+from lib.respuestas_json import en_columnas, formato_columnas
+
 
 def get_datatable_parameters():
     """Tomar parametros"""
@@ -19,10 +21,15 @@ def get_datatable_parameters():
 
 
 def output_datatable_json(draw, total, data):
-    """Entregar JSON"""
-    return {
+    """Entregar JSON, por columnas si el navegador lo solicita con el encabezado X-Formato"""
+    salida = {
         "draw": draw,
         "iTotalRecords": total,
         "iTotalDisplayRecords": total,
-        "aaData": data,
     }
+    columnas = en_columnas(data) if formato_columnas() else None
+    if columnas is None:
+        salida["aaData"] = data
+    else:
+        salida.update(columnas)
+    return salida
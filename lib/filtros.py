@@ -0,0 +1,142 @@
+"""
+Filtros
+
+Especificación declarativa de los filtros de un listado DataTable. Cada módulo declara
+una vez los campos permitidos, su operador, su normalizador de lib/safe_string y las
+tablas que hay que unir; compilar() convierte request.form en las sentencias select()
+de los registros y del total, uniendo cada tabla una sola vez.
+
+    FILTROS = EspecificacionFiltros(
+        SoporteTicket,
+        Filtro("estado", SoporteTicket.estado),
+        Filtro("descripcion", SoporteTicket.descripcion, "contiene", safe_string),
+        Filtro("categoria", SoporteCategoria.nombre, "contiene", safe_string, unir=(SoporteCategoria,)),
+    )
+
+    consulta = FILTROS.compilar(request.form)
+    registros, total = consulta.ordenar(SoporteTicket.id.desc()).paginar(start, rows_per_page)
+
+Operadores, todos usan columnas con índice o con índice de trigramas:
+
+- igual: columna = valor
+- contiene: alguna de las columnas contiene el valor
+- palabras: cada palabra del valor está contenida en alguna de las columnas
+- desde, hasta: columna >= valor, columna <= valor
+"""
+
+from dataclasses import dataclass
+from typing import Callable
+
+from sqlalchemy import and_, func, or_, select
+
+from hercules.extensions import database
+
+OPERADORES = ("igual", "contiene", "palabras", "desde", "hasta")
+
+
+@dataclass(frozen=True)
+class Filtro:
+    """Filtro de un campo del formulario"""
+
+    campo: str  # Nombre del campo en request.form
+    columnas: object  # Una columna o una tupla de columnas
+    operador: str = "igual"
+    normalizar: Callable | None = None  # Función de lib/safe_string, si entrega vacío no se filtra
+    unir: tuple = ()  # Entidades a unir en orden, cada una es la entidad o (entidad, condición)
+
+    def __post_init__(self):
+        """Validar el operador al declarar el filtro"""
+        if self.operador not in OPERADORES:
+            raise ValueError(f"Operador {self.operador} no válido para el filtro {self.campo}")
+
+    def condicion(self, valor):
+        """Elaborar la condición con el valor ya normalizado"""
+        columnas = self.columnas if isinstance(self.columnas, tuple) else (self.columnas,)
+        if self.operador == "contiene":
+            return or_(*(columna.contains(valor) for columna in columnas))
+        if self.operador == "palabras":
+            return and_(*(or_(*(columna.contains(palabra) for columna in columnas)) for palabra in valor.split()))
+        if self.operador == "desde":
+            return columnas[0] >= valor
+        if self.operador == "hasta":
+            return columnas[0] <= valor
+        return columnas[0] == valor
+
+
+class ConsultaFiltrada:
+    """Sentencia compilada a partir de los filtros, se puede seguir filtrando, ordenar y paginar"""
+
+    def __init__(self, modelo):
+        self.modelo = modelo
+        self.unidos = set()
+        self.uniones = []
+        self.condiciones = []
+        self.orden = []
+
+    def unir(self, entidad, condicion=None):
+        """Unir una entidad, sólo una vez"""
+        if entidad in self.unidos:
+            return self
+        self.unidos.add(entidad)
+        self.uniones.append((entidad, condicion))
+        return self
+
+    def filtrar(self, condicion):
+        """Agregar una condición"""
+        self.condiciones.append(condicion)
+        return self
+
+    def ordenar(self, *columnas):
+        """Agregar columnas al orden"""
+        self.orden.extend(columnas)
+        return self
+
+    def sentencias(self):
+        """Entregar las sentencias de los registros y del total"""
+        registros = select(self.modelo)
+        total = select(func.count()).select_from(self.modelo)
+        for entidad, condicion in self.uniones:
+            registros = registros.join(entidad) if condicion is None else registros.join(entidad, condicion)
+            total = total.join(entidad) if condicion is None else total.join(entidad, condicion)
+        registros = registros.where(*self.condiciones).order_by(*self.orden)
+        total = total.where(*self.condiciones)
+        return registros, total
+
+    def paginar(self, start: int, rows_per_page: int) -> tuple[list, int]:
+        """Entregar los registros de la página y el total"""
+        registros, total = self.sentencias()
+        registros = registros.offset(start).limit(rows_per_page)
+        return database.session.execute(registros).scalars().all(), database.session.execute(total).scalar()
+
+
+class EspecificacionFiltros:
+    """Filtros permitidos en el listado de un modelo"""
+
+    def __init__(self, modelo, *filtros: Filtro, estatus: bool = True):
+        self.modelo = modelo
+        self.filtros = filtros
+        self.estatus = estatus  # Filtrar por estatus, por defecto "A"
+
+    def compilar(self, form) -> ConsultaFiltrada:
+        """Compilar los parámetros del formulario, se omiten los vacíos o los que no pasan el normalizador"""
+        consulta = ConsultaFiltrada(self.modelo)
+        if self.estatus:
+            consulta.filtrar(self.modelo.estatus == form.get("estatus", "A"))
+        for filtro in self.filtros:
+            if filtro.campo not in form:
+                continue
+            valor = form[filtro.campo]
+            if filtro.normalizar is not None:
+                try:
+                    valor = filtro.normalizar(valor)
+                except (IndexError, ValueError):
+                    continue
+            if valor is None or valor == "":
+                continue
+            for union in filtro.unir:
+                if isinstance(union, tuple):
+                    consulta.unir(*union)
+                else:
+                    consulta.unir(union)
+            consulta.filtrar(filtro.condicion(valor))
+        return consulta
@@ -1,10 +1,29 @@
 """
 Folio
+
+Los folios se asignan con un contador por tabla, autoridad y año en la tabla folios.
+reservar_folio() lo lee con SELECT ... FOR UPDATE y lo incrementa, el renglón queda bloqueado
+hasta el commit de la transacción que guarda el documento, así dos usuarios de la
+misma autoridad no pueden obtener el mismo número y si falla el guardado no queda hueco.
+
+Al cancelar o eliminar un documento, liberar_folio() regresa el contador si era el
+último o guarda el número en folios_liberados para asignarlo antes que uno nuevo.
+
+Un número solicitado sólo puede saltar hasta SALTO_MAXIMO números después del siguiente,
+así un error de captura como 1000 en lugar de 10 no consume la numeración del año.
 """
 
 import re
 
+from sqlalchemy import delete, func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from hercules.blueprints.folios.models import Folio, FolioLiberado
+from hercules.extensions import database
+from lib.exceptions import MyNotValidParamError
+
 FOLIO_REGEXP = r"^(\w+[-\/])*(\d+)\/(\d{4})$"
+SALTO_MAXIMO = 10
 
 
 def validar_folio(input_str: str) -> list[int]:
@@ -21,3 +40,103 @@ def validar_folio(input_str: str) -> list[int]:
     folio_num = int(match.group(2))
     folio_anio = int(match.group(3))
     return folio_num, folio_anio
+
+
+def formar_folio(clave: str, numero: int, anio: int) -> str:
+    """Formar el folio CLAVE-NN/AAAA"""
+    return f"{clave}-{numero}/{anio}"
+
+
+def cambiar_numero_folio(folio: str, numero: int) -> str:
+    """Cambiar el número del folio conservando el prefijo y el año"""
+    return re.sub(r"(\d+)(\/\d{4})$", lambda match: f"{numero}{match.group(2)}", folio.strip())
+
+
+def reemplazar_folio(texto: str, folio: str, folio_nuevo: str) -> str:
+    """Reemplazar en el contenido sólo la primera aparición completa del folio, no la de otro que lo contenga"""
+    patron = rf"(?<![\w/-]){re.escape(folio)}(?!\d)"
+    return re.sub(patron, lambda _: folio_nuevo, texto, count=1)
+
+
+def _condiciones(tabla, nombre: str, autoridad_id: int, anio: int) -> list:
+    """Condiciones de la llave tabla, autoridad y año"""
+    return [tabla.c.tabla == nombre, tabla.c.autoridad_id == autoridad_id, tabla.c.anio == anio]
+
+
+def siguiente_folio(nombre: str, autoridad_id: int, anio: int, maximo=None) -> int:
+    """Sugerir el siguiente número sin reservarlo, el menor liberado o el último más uno
+
+    El parámetro maximo es una subconsulta escalar con el último número de los documentos,
+    sólo se ejecuta mientras no exista el contador de la autoridad y el año.
+    """
+    folios = Folio.__table__
+    liberados = FolioLiberado.__table__
+    liberado = select(func.min(liberados.c.numero)).where(*_condiciones(liberados, nombre, autoridad_id, anio))
+    ultimo = select(folios.c.ultimo).where(*_condiciones(folios, nombre, autoridad_id, anio))
+    inicial = maximo if maximo is not None else literal(None)
+    ultimo = func.coalesce(ultimo.scalar_subquery(), inicial, 0) + 1
+    return database.session.execute(select(func.coalesce(liberado.scalar_subquery(), ultimo))).scalar()
+
+
+def reservar_folio(nombre: str, autoridad_id: int, anio: int, numero: int | None = None, maximo=None) -> int:
+    """Reservar un número en la transacción en curso, entrega el número asignado
+
+    Si se solicita un número, se entrega ése cuando está liberado o es mayor que el último, los números
+    saltados quedan liberados; de lo contrario está ocupado y se entrega el siguiente.
+    Si salta más de SALTO_MAXIMO números después del siguiente causa MyNotValidParamError.
+    El commit lo hace quien guarda el documento.
+    """
+    folios = Folio.__table__
+    liberados = FolioLiberado.__table__
+    conexion = database.session.connection()
+    # Primero tomar un número liberado, el solicitado o el menor
+    candidato = select(liberados.c.numero).where(*_condiciones(liberados, nombre, autoridad_id, anio))
+    if numero is not None:
+        candidato = candidato.where(liberados.c.numero == numero)
+    candidato = candidato.order_by(liberados.c.numero).limit(1).with_for_update(skip_locked=True)
+    tomado = conexion.execute(
+        delete(liberados)
+        .where(*_condiciones(liberados, nombre, autoridad_id, anio))
+        .where(liberados.c.numero == candidato.scalar_subquery())
+        .returning(liberados.c.numero)
+    ).scalar()
+    if tomado is not None:
+        return tomado
+    # Si es el primero de la autoridad en el año, crear el contador a partir del máximo de los documentos
+    condiciones = _condiciones(folios, nombre, autoridad_id, anio)
+    ultimo = conexion.execute(select(folios.c.ultimo).where(*condiciones).with_for_update()).scalar()
+    if ultimo is None:
+        inicial = func.coalesce(maximo if maximo is not None else literal(None), 0)
+        sentencia = insert(folios).values(tabla=nombre, autoridad_id=autoridad_id, anio=anio, ultimo=inicial)
+        conexion.execute(sentencia.on_conflict_do_nothing(index_elements=["tabla", "autoridad_id", "anio"]))
+        ultimo = conexion.execute(select(folios.c.ultimo).where(*condiciones).with_for_update()).scalar()
+    # Incrementar el contador, si se solicita un número mayor que el último se salta a él
+    if numero is not None and numero > ultimo + 1 + SALTO_MAXIMO:
+        raise MyNotValidParamError(f"El folio {numero} salta más de {SALTO_MAXIMO} números después de {ultimo + 1}")
+    asignado = max(ultimo + 1, numero or 0)
+    conexion.execute(update(folios).where(*condiciones).values(ultimo=asignado))
+    # Los números saltados se liberan para asignarse después, así no quedan huecos
+    if asignado > ultimo + 1:
+        saltados = select(literal(nombre), literal(autoridad_id), literal(anio), func.generate_series(ultimo + 1, asignado - 1))
+        sentencia = insert(liberados).from_select(["tabla", "autoridad_id", "anio", "numero"], saltados)
+        conexion.execute(sentencia.on_conflict_do_nothing())
+    return asignado
+
+
+def liberar_folio(nombre: str, autoridad_id: int, anio: int | None, numero: int | None) -> None:
+    """Liberar un número en la transacción en curso, al cancelar o eliminar el documento"""
+    if anio is None or numero is None:
+        return
+    folios = Folio.__table__
+    conexion = database.session.connection()
+    consulta = select(folios.c.ultimo).where(*_condiciones(folios, nombre, autoridad_id, anio)).with_for_update()
+    ultimo = conexion.execute(consulta).scalar()
+    if ultimo is None or numero > ultimo:
+        return  # No lo asignó el contador
+    if numero == ultimo:
+        conexion.execute(
+            update(folios).where(*_condiciones(folios, nombre, autoridad_id, anio)).values(ultimo=numero - 1)
+        )
+    else:
+        sentencia = insert(FolioLiberado.__table__).values(tabla=nombre, autoridad_id=autoridad_id, anio=anio, numero=numero)
+        conexion.execute(sentencia.on_conflict_do_nothing())
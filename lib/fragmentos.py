@@ -0,0 +1,109 @@
+"""
+Fragmentos
+
+Guarda en Redis el HTML ya elaborado de las partes de la plantilla que se repiten en cada página
+
+- Las opciones del menú principal dependen sólo de los roles activos del usuario y de las tablas
+  modulos, permisos y roles. La llave es el hash de los roles y de los contadores de versión de
+  esas tablas, así los usuarios con la misma combinación de roles comparten la entrada y cualquier
+  cambio de permisos la invalida
+- La cantidad de tareas en progreso de cada usuario es un contador en Redis, se incrementa al lanzar
+  la tarea y se decrementa al terminarla. Si no existe o expiró se cuenta en la base de datos
+
+En la plantilla
+
+    {{ menu_principal(current_user) }}
+    {{ tareas_en_progreso(current_user) }}
+"""
+
+import hashlib
+import json
+
+from flask import current_app, render_template
+from markupsafe import Markup
+from redis.exceptions import RedisError
+from sqlalchemy import func, select
+
+from hercules.blueprints.tareas.models import Tarea
+from hercules.blueprints.usuarios_roles.models import UsuarioRol
+from hercules.extensions import database
+from lib.cache import consultar_versiones
+
+REDIS_PREFIJO = "hercules:fragmentos"
+TTL_SEGUNDOS = 60 * 60 * 24  # Sólo para que expiren las entradas que ya no se usan
+TABLAS_MENU = ["modulos", "permisos", "roles"]
+TAREAS_TTL_SEGUNDOS = 60 * 60  # Si una tarea muere sin terminar, el contador se corrige al expirar
+
+# Sólo incrementa si la llave existe, así no se crea un contador sin la cantidad de la base de datos
+SUMAR_SI_EXISTE = """
+if redis.call("exists", KEYS[1]) == 1 then
+    return redis.call("incrby", KEYS[1], ARGV[1])
+end
+return nil
+"""
+
+
+def _consultar_roles_ids(usuario_id: int) -> list:
+    """Consultar los ids de los roles activos del usuario"""
+    consulta = select(UsuarioRol.rol_id).where(UsuarioRol.usuario_id == usuario_id).where(UsuarioRol.estatus == "A")
+    return sorted(database.session.execute(consulta).scalars())
+
+
+def _elaborar_menu(usuario) -> str:
+    """Elaborar el HTML de las opciones del menú principal"""
+    return render_template("layouts/menu_principal.jinja2", modulos=usuario.modulos_menu_principal)
+
+
+def menu_principal(usuario) -> Markup:
+    """HTML de las opciones del menú principal, compartido por los usuarios con los mismos roles"""
+    try:
+        partes = [_consultar_roles_ids(usuario.id), consultar_versiones(TABLAS_MENU)]
+        resumen = hashlib.sha1(json.dumps(partes).encode("utf-8")).hexdigest()
+        llave = f"{REDIS_PREFIJO}:menu:{resumen}"
+        guardado = current_app.redis.get(llave)
+    except (AttributeError, RedisError):
+        return Markup(_elaborar_menu(usuario))
+    if guardado is not None:
+        return Markup(guardado.decode("utf-8"))
+    html = _elaborar_menu(usuario)
+    try:
+        current_app.redis.set(llave, html, ex=TTL_SEGUNDOS)
+    except RedisError:
+        pass
+    return Markup(html)
+
+
+def _llave_tareas(usuario_id: int) -> str:
+    """Llave en Redis del contador de tareas en progreso del usuario"""
+    return f"{REDIS_PREFIJO}:tareas:{usuario_id}"
+
+
+def _contar_tareas_en_base_de_datos(usuario_id: int) -> int:
+    """Contar en la base de datos las tareas sin terminar del usuario"""
+    consulta = select(func.count()).select_from(Tarea).where(Tarea.usuario_id == usuario_id)
+    return database.session.execute(consulta.where(Tarea.ha_terminado == False)).scalar()
+
+
+def sumar_tareas_en_progreso(usuario_id: int, cantidad: int) -> None:
+    """Sumar al contador de tareas en progreso, si no existe se contará en la siguiente consulta"""
+    try:
+        current_app.redis.eval(SUMAR_SI_EXISTE, 1, _llave_tareas(usuario_id), cantidad)
+    except (AttributeError, RedisError):
+        pass
+
+
+def tareas_en_progreso(usuario) -> int:
+    """Cantidad de tareas en progreso del usuario"""
+    llave = _llave_tareas(usuario.id)
+    try:
+        guardado = current_app.redis.get(llave)
+    except (AttributeError, RedisError):
+        return _contar_tareas_en_base_de_datos(usuario.id)
+    if guardado is not None and int(guardado) >= 0:
+        return int(guardado)
+    cantidad = _contar_tareas_en_base_de_datos(usuario.id)
+    try:
+        current_app.redis.set(llave, cantidad, ex=TAREAS_TTL_SEGUNDOS)
+    except RedisError:
+        pass
+    return cantidad
@@ -20,6 +20,7 @@ from lib.exceptions import (
     MyNotValidParamError,
     MyUploadError,
 )
+from lib.metricas import contar_llamada, sumar_bytes
 
 EXTENSIONS_MEDIA_TYPES = {
     "doc": "application/msword",
@@ -47,6 +48,7 @@ def check_file_exists_from_gcs(
     """
 
     # Get bucket
+    contar_llamada("gcs")
     storage_client = storage.Client()
     try:
         bucket = storage_client.get_bucket(bucket_name)
@@ -99,6 +101,7 @@ def get_file_from_gcs(
     """
 
     # Get bucket
+    contar_llamada("gcs")
     storage_client = storage.Client()
     try:
         bucket = storage_client.get_bucket(bucket_name)
@@ -111,7 +114,9 @@ def get_file_from_gcs(
         raise MyFileNotFoundError("File not found")
 
     # Return file content
-    return blob.download_as_string()
+    content = blob.download_as_string()
+    sumar_bytes("gcs", len(content))
+    return content
 
 
 def get_media_type_from_filename(filename: str) -> str:
@@ -148,6 +153,7 @@ def get_public_url_from_gcs(
     """
 
     # Get bucket
+    contar_llamada("gcs")
     storage_client = storage.Client()
     try:
         bucket = storage_client.get_bucket(bucket_name)
@@ -178,6 +184,7 @@ def get_signed_url_from_gcs(
     """
 
     # Get bucket
+    contar_llamada("gcs")
     storage_client = storage.Client()
     try:
         bucket = storage_client.get_bucket(bucket_name)
@@ -212,6 +219,7 @@ def delete_file_from_gcs(
     """
 
     # Get bucket
+    contar_llamada("gcs")
     storage_client = storage.Client()
     try:
         bucket = storage_client.get_bucket(bucket_name)
@@ -248,6 +256,7 @@ def upload_file_to_gcs(
     #     raise MyFileNotAllowedError("File not allowed")
 
     # Get bucket
+    contar_llamada("gcs")
     storage_client = storage.Client()
     try:
         bucket = storage_client.get_bucket(bucket_name)
@@ -262,6 +271,45 @@ def upload_file_to_gcs(
         blob.upload_from_string(data, content_type=content_type)
     except Exception as error:
         raise MyUploadError("Error uploading file") from error
+    sumar_bytes("gcs", len(data))
+
+    # Return public URL
+    return blob.public_url
+
+
+def upload_stream_to_gcs(
+    bucket_name: str,
+    blob_name: str,
+    content_type: str,
+    file_obj,
+) -> str:
+    """
+    Upload file to Google Cloud Storage from a file object, without loading it in memory
+
+    :param bucket_name: Name of the bucket
+    :param blob_name: Path to the file
+    :param content_type: Content type of the file
+    :param file_obj: File object opened in binary mode, it is rewound before uploading
+    :return: Public URL
+    """
+
+    # Get bucket
+    contar_llamada("gcs")
+    storage_client = storage.Client()
+    try:
+        bucket = storage_client.get_bucket(bucket_name)
+    except NotFound as error:
+        raise MyBucketNotFoundError("Bucket not found") from error
+
+    # Create blob
+    blob = bucket.blob(blob_name)
+
+    # Upload file in chunks
+    try:
+        blob.upload_from_file(file_obj, content_type=content_type, rewind=True)
+    except Exception as error:
+        raise MyUploadError("Error uploading file") from error
+    sumar_bytes("gcs", file_obj.tell())
 
     # Return public URL
     return blob.public_url
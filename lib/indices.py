@@ -0,0 +1,100 @@
+"""
+Índices parciales para los listados
+
+Casi todos los datatable_json filtran por estatus = 'A', luego por la autoridad (o el usuario
+o el módulo), luego por un rango de fechas y ordenan por id o creado descendente. Los índices
+parciales sólo guardan los registros activos, así son más pequeños y el planificador los usa
+para el filtro y para el orden con LIMIT.
+
+En el modelo, agregando a los demás índices de la tabla
+
+    __table_args__ = indices_busqueda("sentencias", "descripcion") + indices_activos(
+        "sentencias", ("autoridad_id", "fecha"), ("autoridad_id", "id")
+    )
+
+En una base de datos existente se crean sin bloquear las escrituras con
+
+    cli db preparar-indices-activos
+
+Cada datatable_json declara junto a su vista los filtros y el orden que usa
+
+    LISTADO = Listado(Sentencia, ("autoridad_id",), "fecha", "id")
+    ...
+    registros = consulta.order_by(LISTADO.orden_descendente()).offset(start).limit(rows_per_page).all()
+
+Y se revisan los planes de los listados con
+
+    cli planes revisar
+"""
+
+from dataclasses import dataclass
+
+from sqlalchemy import Index, text
+from sqlalchemy.schema import CreateIndex
+
+from hercules.extensions import database
+
+CONDICION_ACTIVOS = "estatus = 'A'"
+
+
+@dataclass(frozen=True, slots=True)
+class Listado:
+    """Filtros y orden de un datatable_json, cli planes revisar los usa para revisar sus planes"""
+
+    modelo: type
+    filtros: tuple  # Columnas que filtran por igualdad
+    fecha: str | None  # Columna del rango de fechas
+    orden: str  # Columna del orden descendente
+
+    def orden_descendente(self):
+        """Expresión del orden descendente del listado"""
+        return getattr(self.modelo, self.orden).desc()
+
+
+def indices_activos(tabla: str, *grupos: tuple) -> tuple:
+    """Índices compuestos parciales, uno por cada grupo de columnas, sólo con los registros activos"""
+    return tuple(
+        Index(f"{tabla}_{'_'.join(columnas)}_activos", *columnas, postgresql_where=text(CONDICION_ACTIVOS))
+        for columnas in grupos
+    )
+
+
+def _estado_indice(conexion, nombre: str) -> bool | None:
+    """¿Es válido el índice? None si no existe. CREATE INDEX CONCURRENTLY deja un índice inválido si falla"""
+    return conexion.execute(
+        text(
+            "SELECT i.indisvalid FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid "
+            "WHERE c.relname = :nombre AND c.relnamespace = current_schema()::regnamespace"
+        ),
+        {"nombre": nombre},
+    ).scalar()
+
+
+def preparar_indices() -> tuple[list, list]:
+    """Crear los índices parciales que falten y rehacer los inválidos, entrega los nombres de los creados y los rehechos"""
+    creados = []
+    rehechos = []
+    # CREATE INDEX CONCURRENTLY no puede ejecutarse dentro de una transacción
+    with database.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conexion:
+        for tabla in database.Model.metadata.sorted_tables:
+            for indice in tabla.indexes:
+                if indice.dialect_options["postgresql"]["where"] is None:
+                    continue
+                valido = _estado_indice(conexion, indice.name)
+                if valido:
+                    continue
+                # Las tablas particionadas no admiten CONCURRENTLY, sus índices se crean en cada partición
+                concurrente = not tabla.dialect_options["postgresql"]["partition_by"]
+                if valido is False:
+                    # Quedó inválido de una ejecución anterior que falló, IF NOT EXISTS lo saltaría
+                    conexion.exec_driver_sql(f"DROP INDEX {'CONCURRENTLY ' if concurrente else ''}IF EXISTS {indice.name}")
+                indice.dialect_options["postgresql"]["concurrently"] = concurrente
+                try:
+                    conexion.execute(CreateIndex(indice, if_not_exists=True))
+                finally:
+                    indice.dialect_options["postgresql"]["concurrently"] = False
+                if valido is False:
+                    rehechos.append(indice.name)
+                else:
+                    creados.append(indice.name)
+    return creados, rehechos
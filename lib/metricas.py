@@ -0,0 +1,213 @@
+"""
+Métricas
+
+Mide cada petición por endpoint: latencia (histograma), cantidad y tiempo de las sentencias SQL,
+bytes de la respuesta y llamadas a Redis y a Google Cloud Storage.
+
+- Cada proceso acumula en memoria, con un candado porque gunicorn usa varios hilos
+- Cada INTERVALO_SEGUNDOS el proceso suma lo acumulado a los hashes de Redis, así se juntan
+  los hilos, los procesos y las instancias
+- /metricas entrega lo juntado en el formato de texto de Prometheus, sólo con el encabezado
+  Authorization: Bearer METRICAS_TOKEN, si no está definido METRICAS_TOKEN responde 404
+
+Para contar llamadas a otros servicios y los bytes transferidos
+
+    contar_llamada("gcs")
+    sumar_bytes("gcs", len(contenido))
+
+Fuera de una petición, en el worker de RQ, lib.tasks.ejecutar() mide la tarea en curso con
+iniciar_medicion_tarea() y terminar_medicion_tarea()
+"""
+
+import hmac
+import threading
+import time
+from collections import defaultdict
+
+from flask import current_app, g, has_request_context, request
+from redis import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+REDIS_PREFIJO = "hercules:metricas"
+INTERVALO_SEGUNDOS = 10
+CUBETAS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)  # Segundos, para el histograma de latencia
+SERVICIOS = ("redis", "gcs")
+
+_candado = threading.Lock()
+_acumulado = defaultdict(lambda: defaultdict(float))
+_ultimo_envio = time.monotonic()
+_tarea = {}  # Medición de la tarea en curso, el worker de RQ ejecuta una tarea a la vez por proceso
+
+
+class RedisMedido(Redis):
+    """Cliente de Redis que cuenta sus llamadas en la petición en curso"""
+
+    def execute_command(self, *args, **options):
+        """Contar y ejecutar"""
+        contar_llamada("redis")
+        return super().execute_command(*args, **options)
+
+
+def contar_llamada(servicio: str) -> None:
+    """Contar una llamada a un servicio en la petición o en la tarea en curso"""
+    if has_request_context():
+        llamadas = g.setdefault("metricas_llamadas", defaultdict(int))
+        llamadas[servicio] += 1
+    elif _tarea:
+        _tarea[f"{servicio}_llamadas"] += 1
+
+
+def sumar_bytes(servicio: str, cantidad: int) -> None:
+    """Sumar los bytes enviados o recibidos de un servicio en la tarea en curso"""
+    if _tarea and not has_request_context():
+        _tarea[f"{servicio}_bytes"] += cantidad
+
+
+def iniciar_medicion_tarea() -> None:
+    """Empezar a contar las sentencias SQL y las llamadas de la tarea en curso"""
+    _tarea.clear()
+    _tarea["sql_sentencias"] = 0
+    for servicio in SERVICIOS:
+        _tarea[f"{servicio}_llamadas"] = 0
+        _tarea[f"{servicio}_bytes"] = 0
+
+
+def terminar_medicion_tarea() -> dict:
+    """Dejar de contar y entregar lo contado de la tarea en curso"""
+    medicion = dict(_tarea)
+    _tarea.clear()
+    return medicion
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _antes_de_sql(conn, cursor, statement, parameters, context, executemany):
+    """Tomar el tiempo de inicio de la sentencia"""
+    if has_request_context():
+        conn.info.setdefault("metricas_inicios", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _despues_de_sql(conn, cursor, statement, parameters, context, executemany):
+    """Sumar la sentencia y su tiempo a la petición en curso, o contarla en la tarea en curso"""
+    if _tarea and not has_request_context():
+        _tarea["sql_sentencias"] += 1
+        return
+    inicios = conn.info.get("metricas_inicios")
+    if not inicios or not has_request_context():
+        return
+    g.metricas_sql_cantidad = g.get("metricas_sql_cantidad", 0) + 1
+    g.metricas_sql_segundos = g.get("metricas_sql_segundos", 0.0) + time.perf_counter() - inicios.pop()
+
+
+def _iniciar_peticion():
+    """Tomar el tiempo de inicio de la petición"""
+    g.metricas_inicio = time.perf_counter()
+
+
+def _terminar_peticion(response):
+    """Acumular las métricas de la petición"""
+    inicio = g.get("metricas_inicio")
+    if inicio is None:
+        return response
+    segundos = time.perf_counter() - inicio
+    endpoint = request.endpoint or "sin_endpoint"
+    if response.direct_passthrough or response.is_streamed:
+        tamano = response.content_length or 0
+    else:
+        tamano = len(response.get_data())
+    with _candado:
+        metricas = _acumulado[endpoint]
+        metricas["peticiones"] += 1
+        metricas["segundos"] += segundos
+        for cubeta in CUBETAS:
+            if segundos <= cubeta:
+                metricas[f"cubeta_{cubeta}"] += 1
+        metricas["sql_sentencias"] += g.get("metricas_sql_cantidad", 0)
+        metricas["sql_segundos"] += g.get("metricas_sql_segundos", 0.0)
+        metricas["bytes"] += tamano
+        for servicio, cantidad in g.get("metricas_llamadas", {}).items():
+            metricas[f"{servicio}_llamadas"] += cantidad
+    _enviar_si_toca()
+    return response
+
+
+def _enviar_si_toca() -> None:
+    """Sumar lo acumulado a Redis si ya pasó el intervalo"""
+    global _ultimo_envio
+    with _candado:
+        if time.monotonic() - _ultimo_envio < INTERVALO_SEGUNDOS:
+            return
+        _ultimo_envio = time.monotonic()
+        pendiente = {endpoint: dict(metricas) for endpoint, metricas in _acumulado.items()}
+        _acumulado.clear()
+    try:
+        with current_app.redis.pipeline(transaction=False) as pipe:
+            for endpoint, metricas in pendiente.items():
+                pipe.sadd(f"{REDIS_PREFIJO}:endpoints", endpoint)
+                for campo, valor in metricas.items():
+                    pipe.hincrbyfloat(f"{REDIS_PREFIJO}:{endpoint}", campo, valor)
+            pipe.execute()
+    except (AttributeError, RedisError):
+        pass  # Se pierde este intervalo, no debe fallar la petición
+
+
+def _texto_prometheus() -> str:
+    """Elaborar el texto en el formato de Prometheus con lo juntado en Redis"""
+    redis = current_app.redis
+    endpoints = sorted(valor.decode("utf-8") for valor in redis.smembers(f"{REDIS_PREFIJO}:endpoints"))
+    with redis.pipeline(transaction=False) as pipe:
+        for endpoint in endpoints:
+            pipe.hgetall(f"{REDIS_PREFIJO}:{endpoint}")
+        todas = pipe.execute()
+    renglones = [
+        "# HELP hercules_peticion_segundos Latencia de las peticiones por endpoint",
+        "# TYPE hercules_peticion_segundos histogram",
+    ]
+    contadores = {
+        "sql_sentencias": "Sentencias SQL ejecutadas",
+        "sql_segundos": "Segundos en sentencias SQL",
+        "bytes": "Bytes de las respuestas",
+    }
+    contadores.update({f"{servicio}_llamadas": f"Llamadas a {servicio}" for servicio in SERVICIOS})
+    valores = {}
+    for endpoint, crudas in zip(endpoints, todas):
+        metricas = {campo.decode("utf-8"): float(valor) for campo, valor in crudas.items()}
+        valores[endpoint] = metricas
+        etiqueta = f'endpoint="{endpoint}"'
+        for cubeta in CUBETAS:
+            cantidad = metricas.get(f"cubeta_{cubeta}", 0)
+            renglones.append(f'hercules_peticion_segundos_bucket{{{etiqueta},le="{cubeta}"}} {cantidad:g}')
+        cantidad = metricas.get("peticiones", 0)
+        renglones.append(f'hercules_peticion_segundos_bucket{{{etiqueta},le="+Inf"}} {cantidad:g}')
+        renglones.append(f"hercules_peticion_segundos_sum{{{etiqueta}}} {metricas.get('segundos', 0):g}")
+        renglones.append(f"hercules_peticion_segundos_count{{{etiqueta}}} {metricas.get('peticiones', 0):g}")
+    for campo, ayuda in contadores.items():
+        renglones.append(f"# HELP hercules_{campo}_total {ayuda} por endpoint")
+        renglones.append(f"# TYPE hercules_{campo}_total counter")
+        for endpoint, metricas in valores.items():
+            renglones.append(f'hercules_{campo}_total{{endpoint="{endpoint}"}} {metricas.get(campo, 0):g}')
+    return "\n".join(renglones) + "\n"
+
+
+def exponer_metricas():
+    """Entregar las métricas en el formato de texto de Prometheus"""
+    token = current_app.config.get("METRICAS_TOKEN", "")
+    if token == "":
+        return "", 404
+    autorizacion = request.headers.get("Authorization", "")
+    if not hmac.compare_digest(autorizacion.encode("utf-8"), f"Bearer {token}".encode("utf-8")):
+        return "", 401
+    try:
+        texto = _texto_prometheus()
+    except RedisError:
+        return "", 503
+    return current_app.response_class(texto, mimetype="text/plain; version=0.0.4")
+
+
+def registrar(app) -> None:
+    """Registrar la medición y la ruta /metricas, antes que los demás after_request para medir la respuesta final"""
+    app.before_request(_iniciar_peticion)
+    app.after_request(_terminar_peticion)
+    app.add_url_rule("/metricas", "metricas", exponer_metricas)
@@ -0,0 +1,115 @@
+"""
+Búsqueda de nombres de personas
+
+Los Select2 y los filtros por nombre partían el texto en palabras y hacían varios contains()
+por cada una, cada tecla recorría la tabla completa. Las tablas con personas tienen dos
+columnas generadas con índices de trigramas (pg_trgm)
+
+- nombre_buscador: las columnas del nombre juntas, sin acentos y en mayúsculas
+- nombre_fonetico: clave fonética en español, así "VALDES" encuentra a "BALDEZ"
+
+Cada palabra buscada debe estar en nombre_buscador, en cualquier orden, así "GARCIA JUAN" encuentra
+a "JUAN GARCIA LOPEZ", o el texto debe parecerse por trigramas o por cómo suena.
+
+Las funciones hercules_normalizar y hercules_fonetica son IMMUTABLE para poder usarse
+en las columnas generadas y se aplican igual al texto buscado.
+
+En el modelo
+
+    __table_args__ = indices_nombres("abogados")
+    nombre_buscador: Mapped[Optional[str]] = columna_nombre_buscador("nombre")
+    nombre_fonetico: Mapped[Optional[str]] = columna_nombre_fonetico("nombre")
+
+En la vista
+
+    consulta = filtrar_por_nombre(consulta, Abogado, texto)
+    consulta = consulta.order_by(similitud_nombre(Abogado, texto).desc())
+
+En una base de datos existente se agregan las columnas y los índices con
+
+    cli db preparar-busqueda-texto
+"""
+
+from sqlalchemy import DDL, Computed, Index, String, and_, func, literal, or_
+from sqlalchemy.orm import mapped_column
+
+from lib.busqueda import registrar_ddl_previo
+
+COLUMNA_NOMBRE_BUSCADOR = "nombre_buscador"
+COLUMNA_NOMBRE_FONETICO = "nombre_fonetico"
+
+PREPARAR_FUNCIONES = DDL(
+    r"""
+CREATE OR REPLACE FUNCTION hercules_normalizar(texto text) RETURNS text
+LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE AS
+$$ SELECT btrim(regexp_replace(upper(public.unaccent('public.unaccent'::regdictionary, texto)), '\s+', ' ', 'g')) $$;
+
+CREATE OR REPLACE FUNCTION hercules_fonetica(texto text) RETURNS text
+LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE AS
+$$ SELECT regexp_replace(
+    translate(
+        regexp_replace(regexp_replace(regexp_replace(regexp_replace(regexp_replace(regexp_replace(regexp_replace(
+            hercules_normalizar(texto),
+            'LL', 'Y', 'g'),
+            'CH', '9', 'g'),
+            'G([EI])', 'J\1', 'g'),
+            'GU([EI])', 'G\1', 'g'),
+            'C([EI])', 'S\1', 'g'),
+            'QU([EI])', 'K\1', 'g'),
+            'H', '', 'g'),
+        'CQZVWY', 'KKSBUI'),
+    '([A-Z0-9])\1+', '\1', 'g') $$;
+"""
+)
+
+registrar_ddl_previo(PREPARAR_FUNCIONES)
+
+
+def _concatenar(columnas: tuple) -> str:
+    """Juntar las columnas con espacios, concat_ws no es IMMUTABLE"""
+    return " || ' ' || ".join(f"coalesce({columna}, '')" for columna in columnas)
+
+
+def columna_nombre_buscador(*columnas: str):
+    """Columna generada con el nombre sin acentos y en mayúsculas"""
+    return mapped_column(String, Computed(f"hercules_normalizar({_concatenar(columnas)})", persisted=True), deferred=True)
+
+
+def columna_nombre_fonetico(*columnas: str):
+    """Columna generada con la clave fonética en español del nombre"""
+    return mapped_column(String, Computed(f"hercules_fonetica({_concatenar(columnas)})", persisted=True), deferred=True)
+
+
+def indices_nombres(tabla: str) -> tuple:
+    """Índices de trigramas para el nombre y su clave fonética"""
+    return tuple(
+        Index(f"{tabla}_{columna}_trgm", columna, postgresql_using="gin", postgresql_ops={columna: "gin_trgm_ops"})
+        for columna in (COLUMNA_NOMBRE_BUSCADOR, COLUMNA_NOMBRE_FONETICO)
+    )
+
+
+def condicion_por_nombre(modelo, texto: str):
+    """Condición por las palabras en cualquier orden, por parecido o por cómo suena, usan los índices de trigramas"""
+    buscador = getattr(modelo, COLUMNA_NOMBRE_BUSCADOR)
+    fonetico = getattr(modelo, COLUMNA_NOMBRE_FONETICO)
+    normalizado = func.hercules_normalizar(literal(texto))
+    return or_(
+        and_(*[buscador.contains(func.hercules_normalizar(literal(palabra))) for palabra in texto.split()]),
+        normalizado.op("<%")(buscador),
+        func.hercules_fonetica(literal(texto)).op("<%")(fonetico),
+    )
+
+
+def filtrar_por_nombre(consulta, modelo, texto: str):
+    """Filtrar por todas las palabras en cualquier orden, por palabras parecidas o por cómo suena"""
+    if texto == "":
+        return consulta
+    return consulta.filter(condicion_por_nombre(modelo, texto))
+
+
+def similitud_nombre(modelo, texto: str):
+    """Expresión para ordenar del más al menos parecido"""
+    return func.greatest(
+        func.word_similarity(func.hercules_normalizar(literal(texto)), getattr(modelo, COLUMNA_NOMBRE_BUSCADOR)),
+        func.word_similarity(func.hercules_fonetica(literal(texto)), getattr(modelo, COLUMNA_NOMBRE_FONETICO)),
+    )
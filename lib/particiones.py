@@ -0,0 +1,228 @@
+"""
+Particiones por mes
+
+Las tablas de bitácoras y registros sólo crecen. Se particionan por rango mensual de creado,
+así las consultas de las últimas horas o días sólo tocan las particiones recientes y las
+particiones viejas se archivan en Google Cloud Storage y se quitan de la base de datos.
+
+La clave primaria de una tabla particionada debe incluir la columna de la partición,
+por eso la clave primaria en la tabla es (id, creado) pero el ORM sigue usando id
+
+    __table_args__ = (particion_por_mes(),)
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    creado: Mapped[datetime] = columna_creado_particion()
+    __mapper_args__ = {"primary_key": [id]}
+
+Cada partición se llama como la tabla con el año y mes, por ejemplo bitacoras_202501,
+además la partición bitacoras_default recibe lo que no tenga partición para no perder registros.
+
+En una base de datos existente se convierten las tablas con
+
+    cli particiones convertir bitacoras
+
+Y deben programarse cada mes
+
+    cli particiones crear
+    cli particiones archivar
+"""
+
+import gzip
+import re
+import tempfile
+from datetime import date, datetime
+
+from sqlalchemy import Table, event, text
+from sqlalchemy.orm import mapped_column
+from sqlalchemy.sql.functions import now
+
+from hercules.extensions import database
+from lib.google_cloud_storage import upload_stream_to_gcs
+
+COLUMNA_PARTICION = "creado"
+MESES_ADELANTE = 3
+MESES_RETENCION = 24
+
+
+def particion_por_mes() -> dict:
+    """Argumentos de la tabla para particionarla por rango de creado"""
+    return {"postgresql_partition_by": f"RANGE ({COLUMNA_PARTICION})"}
+
+
+def columna_creado_particion():
+    """Columna creado que forma parte de la clave primaria de la tabla particionada"""
+    return mapped_column(primary_key=True, default=now(), server_default=now())
+
+
+def tablas_particionadas() -> list[Table]:
+    """Tablas particionadas por mes"""
+    return [tabla for tabla in database.Model.metadata.sorted_tables if tabla.dialect_options["postgresql"]["partition_by"]]
+
+
+def _primer_dia(fecha: date, meses: int = 0) -> date:
+    """Primer día del mes que está a la cantidad de meses dada"""
+    indice = fecha.year * 12 + fecha.month - 1 + meses
+    return date(indice // 12, indice % 12 + 1, 1)
+
+
+def _nombre_particion(tabla: str, mes: date) -> str:
+    """Nombre de la partición del mes"""
+    return f"{tabla}_{mes.strftime('%Y%m')}"
+
+
+def listar_particiones(conexion, tabla: str) -> list[tuple[str, date]]:
+    """Particiones mensuales de la tabla como (nombre, primer día del mes), sin la default"""
+    nombres = conexion.execute(
+        text(
+            "SELECT hija.relname FROM pg_inherits "
+            "JOIN pg_class AS madre ON pg_inherits.inhparent = madre.oid "
+            "JOIN pg_class AS hija ON pg_inherits.inhrelid = hija.oid "
+            "WHERE madre.relname = :tabla"
+        ),
+        {"tabla": tabla},
+    ).scalars()
+    particiones = []
+    for nombre in nombres:
+        coincidencia = re.fullmatch(rf"{tabla}_(\d{{4}})(\d{{2}})", nombre)
+        if coincidencia:
+            particiones.append((nombre, date(int(coincidencia.group(1)), int(coincidencia.group(2)), 1)))
+    return sorted(particiones, key=lambda particion: particion[1])
+
+
+def crear_particiones(conexion, tabla: str, desde: date, hasta: date) -> list[str]:
+    """Crear las particiones de los meses entre desde y hasta, y la default, entrega los nombres de las creadas
+
+    Si la default ya tiene registros del mes, PostgreSQL no deja crear la partición, entonces se separa
+    la default, se crea la partición, se mueven los registros y se vuelve a unir la default.
+    """
+    existentes = {nombre for nombre, _ in listar_particiones(conexion, tabla)}
+    default = f"{tabla}_default"
+    hay_default = conexion.execute(text("SELECT to_regclass(:nombre) IS NOT NULL"), {"nombre": default}).scalar()
+    creadas = []
+    mes = _primer_dia(desde)
+    while mes <= hasta:
+        nombre = _nombre_particion(tabla, mes)
+        if nombre not in existentes:
+            rango = f"{COLUMNA_PARTICION} >= '{mes.isoformat()}' AND {COLUMNA_PARTICION} < '{_primer_dia(mes, 1).isoformat()}'"
+            por_mover = False
+            if hay_default:
+                por_mover = conexion.exec_driver_sql(f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {rango})").scalar()
+            if por_mover:
+                conexion.exec_driver_sql(f"ALTER TABLE {tabla} DETACH PARTITION {default}")
+            conexion.exec_driver_sql(
+                f"CREATE TABLE IF NOT EXISTS {nombre} PARTITION OF {tabla} "
+                f"FOR VALUES FROM ('{mes.isoformat()}') TO ('{_primer_dia(mes, 1).isoformat()}')"
+            )
+            if por_mover:
+                conexion.exec_driver_sql(f"INSERT INTO {nombre} SELECT * FROM {default} WHERE {rango}")
+                conexion.exec_driver_sql(f"DELETE FROM {default} WHERE {rango}")
+                conexion.exec_driver_sql(f"ALTER TABLE {tabla} ATTACH PARTITION {default} DEFAULT")
+            creadas.append(nombre)
+        mes = _primer_dia(mes, 1)
+    conexion.exec_driver_sql(f"CREATE TABLE IF NOT EXISTS {default} PARTITION OF {tabla} DEFAULT")
+    return creadas
+
+
+def preparar_particiones(meses: int = MESES_ADELANTE) -> list[str]:
+    """Crear las particiones del mes actual y de los siguientes meses en todas las tablas particionadas"""
+    hoy = date.today()
+    creadas = []
+    with database.engine.begin() as conexion:
+        for tabla in tablas_particionadas():
+            creadas += crear_particiones(conexion, tabla.name, hoy, _primer_dia(hoy, meses))
+    return creadas
+
+
+@event.listens_for(database.Model.metadata, "after_create")
+def _crear_particiones_iniciales(metadata, conexion, **kwargs) -> None:
+    """Al crear las tablas, crear las particiones de los siguientes meses, sin ellas no se puede insertar"""
+    if conexion.dialect.name != "postgresql":
+        return
+    hoy = date.today()
+    for tabla in kwargs.get("tables") or tablas_particionadas():
+        if tabla.dialect_options["postgresql"]["partition_by"]:
+            crear_particiones(conexion, tabla.name, hoy, _primer_dia(hoy, MESES_ADELANTE))
+
+
+def convertir_tabla(tabla: Table) -> int:
+    """Convertir una tabla existente en particionada, entrega la cantidad de registros copiados
+
+    La tabla anterior queda como {tabla}_anterior para revisarla y eliminarla a mano.
+    Los registros se copian un mes de creado a la vez, cada mes en su propia transacción,
+    para no retener los candados ni generar el WAL de toda la tabla en una sola.
+    """
+    anterior = f"{tabla.name}_anterior"
+    columnas = ", ".join(columna.name for columna in tabla.c)
+    with database.engine.begin() as conexion:
+        tipo = conexion.execute(text("SELECT relkind FROM pg_class WHERE relname = :tabla"), {"tabla": tabla.name}).scalar()
+        if tipo != "r":
+            return 0  # No existe o ya está particionada
+
+        # Renombrar la tabla, sus índices y su secuencia, sus nombres se necesitan para la nueva tabla
+        conexion.exec_driver_sql(f"ALTER TABLE {tabla.name} RENAME TO {anterior}")
+        indices = conexion.execute(text("SELECT indexname FROM pg_indexes WHERE tablename = :tabla"), {"tabla": anterior})
+        for indice in indices.scalars().all():
+            conexion.exec_driver_sql(f"ALTER INDEX {indice} RENAME TO {indice[:50]}_anterior")
+        secuencia = conexion.execute(text("SELECT pg_get_serial_sequence(:tabla, 'id')"), {"tabla": anterior}).scalar()
+        if secuencia:
+            conexion.exec_driver_sql(f"ALTER SEQUENCE {secuencia} RENAME TO {anterior}_id_seq")
+
+        # Crear la tabla particionada con las particiones desde el registro más antiguo
+        tabla.create(conexion)
+        desde, hasta = conexion.exec_driver_sql(
+            f"SELECT min({COLUMNA_PARTICION}), max({COLUMNA_PARTICION}) FROM {anterior}"
+        ).one()
+        desde = desde or datetime.now()
+        crear_particiones(conexion, tabla.name, desde.date(), _primer_dia(date.today(), MESES_ADELANTE))
+
+        # Continuar la secuencia desde ya, los registros nuevos no deben repetir los id que se van a copiar
+        if secuencia:
+            conexion.exec_driver_sql(
+                f"SELECT setval(pg_get_serial_sequence('{tabla.name}', 'id'), coalesce(max(id), 1)) FROM {anterior}"
+            )
+
+    # Copiar los registros por meses de creado
+    cantidad = 0
+    mes = _primer_dia(desde.date())
+    final = _primer_dia((hasta or desde).date(), 1)
+    while mes < final:
+        siguiente = _primer_dia(mes, 1)
+        with database.engine.begin() as conexion:
+            cantidad += conexion.execute(
+                text(
+                    f"INSERT INTO {tabla.name} ({columnas}) SELECT {columnas} FROM {anterior} "
+                    f"WHERE {COLUMNA_PARTICION} >= :desde AND {COLUMNA_PARTICION} < :hasta"
+                ),
+                {"desde": mes, "hasta": siguiente},
+            ).rowcount
+        mes = siguiente
+    return cantidad
+
+
+def _archivar(particion: str, bucket_name: str, blob_name: str) -> str:
+    """Copiar la partición a un CSV comprimido y subirlo, entrega el URL del archivo"""
+    conexion_cruda = database.engine.raw_connection()
+    try:
+        with tempfile.TemporaryFile() as temporal:
+            with gzip.GzipFile(fileobj=temporal, mode="wb") as comprimido:
+                conexion_cruda.cursor().copy_expert(f"COPY {particion} TO STDOUT WITH CSV HEADER", comprimido)
+            return upload_stream_to_gcs(bucket_name, blob_name, "application/gzip", temporal)
+    finally:
+        conexion_cruda.close()
+
+
+def archivar_particiones(tabla: str, bucket_name: str, meses: int = MESES_RETENCION) -> list[str]:
+    """Archivar en GCS y quitar las particiones con más meses que la retención, entrega los URLs de los archivos
+
+    Primero se sube el archivo y sólo si tiene éxito se separa y elimina la partición.
+    """
+    limite = _primer_dia(date.today(), -meses)
+    with database.engine.connect() as conexion:
+        viejas = [nombre for nombre, mes in listar_particiones(conexion, tabla) if mes < limite]
+    urls = []
+    for particion in viejas:
+        urls.append(_archivar(particion, bucket_name, f"particiones/{tabla}/{particion}.csv.gz"))
+        with database.engine.begin() as conexion:
+            conexion.exec_driver_sql(f"ALTER TABLE {tabla} DETACH PARTITION {particion}")
+            conexion.exec_driver_sql(f"DROP TABLE {particion}")
+    return urls
+
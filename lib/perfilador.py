@@ -0,0 +1,211 @@
+"""
+Perfilador
+
+Perfilador por muestreo: un hilo toma la pila del hilo perfilado cada INTERVALO_SEGUNDOS,
+el hilo perfilado no se interrumpe y el costo es sólo el de tomar las pilas.
+
+Se activa en Redis para un endpoint, un usuario o un comando de RQ, con la fracción de las
+peticiones o tareas que se perfilan, así se puede dejar en producción con una fracción pequeña
+
+    cli perfilador activar --endpoint sentencias.datatable_json --fraccion 0.05
+    cli perfilador activar --usuario alguien@pjecz.gob.mx
+    cli perfilador activar --comando ofi_documentos.tasks.lanzar_convertir_a_pdf
+    cli perfilador desactivar --endpoint sentencias.datatable_json
+
+Cada perfil se guarda en Redis en el formato de speedscope (https://www.speedscope.app) por
+VIGENCIA_SEGUNDOS y se lista en /bitacoras/perfiles. El perfil de una tarea tiene el mismo id
+que la tarea y se descarga desde su detalle.
+"""
+
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+
+from flask import current_app, g, request
+from flask_login import current_user
+from redis.exceptions import RedisError
+
+from lib.respuestas_json import volcar_json
+
+REDIS_PREFIJO = "hercules:perfilador"
+REDIS_ACTIVOS = f"{REDIS_PREFIJO}:activos"
+REDIS_PERFILES = f"{REDIS_PREFIJO}:perfiles"
+INTERVALO_SEGUNDOS = 0.005
+VIGENCIA_SEGUNDOS = 60 * 60 * 24 * 7
+MAXIMO_PERFILES = 500
+ACTIVOS_TTL_SEGUNDOS = 30  # Cada proceso vuelve a leer los perfiladores activos después de este tiempo
+TIPOS = ("endpoint", "usuario", "comando")
+
+_activos = {"leidos": 0.0, "fracciones": {}}
+
+
+class Muestreador:
+    """Toma muestras de la pila de un hilo desde otro hilo"""
+
+    def __init__(self, nombre: str, intervalo: float = INTERVALO_SEGUNDOS):
+        self.nombre = nombre
+        self.intervalo = intervalo
+        self.hilo_id = threading.get_ident()
+        self.pilas = Counter()
+        self.segundos = 0.0
+        self._inicio = 0.0
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(target=self._muestrear, name="perfilador", daemon=True)
+
+    def _muestrear(self) -> None:
+        """Tomar la pila del hilo perfilado hasta que se detenga"""
+        while not self._detener.wait(self.intervalo):
+            marco = sys._current_frames().get(self.hilo_id)
+            pila = []
+            while marco is not None:
+                codigo = marco.f_code
+                pila.append((codigo.co_name, codigo.co_filename, codigo.co_firstlineno))
+                marco = marco.f_back
+            if pila:
+                self.pilas[tuple(reversed(pila))] += 1
+
+    def iniciar(self) -> "Muestreador":
+        """Iniciar el muestreo"""
+        self._inicio = time.perf_counter()
+        self._hilo.start()
+        return self
+
+    def detener(self) -> dict:
+        """Detener el muestreo y entregar el perfil en el formato de speedscope"""
+        self._detener.set()
+        self._hilo.join()
+        self.segundos = time.perf_counter() - self._inicio
+        marcos, indices, muestras, pesos = [], {}, [], []
+        for pila, veces in self.pilas.most_common():
+            muestra = []
+            for marco in pila:
+                if marco not in indices:
+                    indices[marco] = len(marcos)
+                    marcos.append({"name": marco[0], "file": marco[1], "line": marco[2]})
+                muestra.append(indices[marco])
+            muestras.append(muestra)
+            pesos.append(round(veces * self.intervalo, 6))
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "exporter": "hercules",
+            "name": self.nombre,
+            "shared": {"frames": marcos},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": self.nombre,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": round(sum(pesos), 6),
+                    "samples": muestras,
+                    "weights": pesos,
+                }
+            ],
+        }
+
+
+def _fracciones() -> dict:
+    """Perfiladores activos con su fracción, leídos de Redis cada ACTIVOS_TTL_SEGUNDOS"""
+    if time.monotonic() - _activos["leidos"] >= ACTIVOS_TTL_SEGUNDOS:
+        try:
+            guardados = current_app.redis.hgetall(REDIS_ACTIVOS)
+        except (AttributeError, RedisError):
+            guardados = {}
+        _activos["fracciones"] = {llave.decode("utf-8"): float(valor) for llave, valor in guardados.items()}
+        _activos["leidos"] = time.monotonic()
+    return _activos["fracciones"]
+
+
+def debe_perfilar(*llaves: str) -> bool:
+    """Alguna de las llaves como endpoint:sentencias.datatable_json está activa y le toca por la fracción"""
+    fracciones = _fracciones()
+    if not fracciones:
+        return False
+    fraccion = max((fracciones.get(llave, 0.0) for llave in llaves), default=0.0)
+    return fraccion > 0 and random.random() < fraccion
+
+
+def activar(tipo: str, nombre: str, fraccion: float = 1.0) -> None:
+    """Activar el perfilador para un endpoint, usuario o comando"""
+    current_app.redis.hset(REDIS_ACTIVOS, f"{tipo}:{nombre}", fraccion)
+
+
+def desactivar(tipo: str, nombre: str) -> None:
+    """Desactivar el perfilador para un endpoint, usuario o comando"""
+    current_app.redis.hdel(REDIS_ACTIVOS, f"{tipo}:{nombre}")
+
+
+def consultar_activos() -> dict:
+    """Consultar los perfiladores activos con su fracción"""
+    return {llave.decode("utf-8"): float(valor) for llave, valor in current_app.redis.hgetall(REDIS_ACTIVOS).items()}
+
+
+def guardar_perfil(muestreador: Muestreador, tipo: str, usuario: str = "", perfil_id: str = "") -> str:
+    """Detener el muestreador y guardar el perfil, entrega su id"""
+    perfil = muestreador.detener()
+    perfil_id = perfil_id or uuid.uuid4().hex
+    resumen = {
+        "id": perfil_id,
+        "creado": datetime.now().isoformat(timespec="seconds"),
+        "tipo": tipo,
+        "nombre": muestreador.nombre,
+        "usuario": usuario,
+        "segundos": round(muestreador.segundos, 3),
+        "muestras": sum(muestreador.pilas.values()),
+    }
+    with current_app.redis.pipeline(transaction=False) as pipe:
+        pipe.set(f"{REDIS_PREFIJO}:perfil:{perfil_id}", volcar_json(perfil), ex=VIGENCIA_SEGUNDOS)
+        pipe.xadd(REDIS_PERFILES, {"datos": volcar_json(resumen)}, maxlen=MAXIMO_PERFILES, approximate=True)
+        pipe.execute()
+    return perfil_id
+
+
+def consultar_perfiles(cantidad: int = 100) -> list:
+    """Consultar los resúmenes de los perfiles más recientes"""
+    entradas = current_app.redis.xrevrange(REDIS_PERFILES, count=cantidad)
+    return [current_app.json.loads(campos[b"datos"]) for _, campos in entradas]
+
+
+def consultar_perfil(perfil_id: str) -> bytes | None:
+    """Consultar el perfil en el formato de speedscope, None si ya expiró"""
+    return current_app.redis.get(f"{REDIS_PREFIJO}:perfil:{perfil_id}")
+
+
+def existe_perfil(perfil_id: str) -> bool:
+    """¿Existe el perfil?"""
+    try:
+        return current_app.redis.exists(f"{REDIS_PREFIJO}:perfil:{perfil_id}") == 1
+    except RedisError:
+        return False
+
+
+def _iniciar_perfil():
+    """Iniciar el muestreo si la petición debe perfilarse"""
+    if request.endpoint is None or request.endpoint == "static" or not _fracciones():
+        return
+    llaves = [f"endpoint:{request.endpoint}"]
+    if current_user.is_authenticated:
+        llaves.append(f"usuario:{current_user.email}")
+    if debe_perfilar(*llaves):
+        g.perfilador = Muestreador(request.endpoint).iniciar()
+
+
+def _terminar_perfil(error=None):
+    """Guardar el perfil de la petición, al desmontarla para detener el muestreo aunque haya fallado"""
+    muestreador = g.pop("perfilador", None)
+    if muestreador is not None:
+        usuario = current_user.email if current_user.is_authenticated else ""
+        try:
+            guardar_perfil(muestreador, "endpoint", usuario)
+        except RedisError:
+            pass
+
+
+def registrar(app) -> None:
+    """Registrar el perfilador de las peticiones"""
+    app.before_request(_iniciar_perfil)
+    app.teardown_request(_terminar_perfil)
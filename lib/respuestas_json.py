@@ -0,0 +1,130 @@
+"""
+Respuestas JSON
+
+Capa de respuesta para las vistas JSON (DataTables, select2, tableros)
+
+- ProveedorJSON serializa con orjson si está instalado, si no con json de la biblioteca estándar
+- en_columnas() entrega los renglones de DataTables como columnas y valores, sin repetir las llaves
+- comprimir_respuesta() comprime con brotli (si está instalado) o gzip según Accept-Encoding,
+  sólo las respuestas JSON de al menos COMPRESION_MINIMO bytes
+
+El formato por columnas lo solicita el navegador con el encabezado X-Formato: columnas,
+lo envía config_datatable() de macros/list.jinja2 y macros/detail.jinja2
+
+    {"draw": 1, "iTotalRecords": 2, "iTotalDisplayRecords": 2,
+     "columnas": ["detalle.id", "detalle.url", "estado"],
+     "renglones": [[1, "/soportes_tickets/1", "ABIERTO"], [2, "/soportes_tickets/2", "CERRADO"]]}
+"""
+
+import gzip
+import json
+
+from flask import request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESION_MINIMO = 1024  # Bytes, las respuestas más chicas no se comprimen
+GZIP_NIVEL = 6
+BROTLI_CALIDAD = 5
+ENCABEZADO_FORMATO = "X-Formato"
+
+
+def volcar_json(contenido, default=str) -> bytes:
+    """Serializar a JSON en bytes, con orjson si está instalado"""
+    if orjson is not None:
+        # Las fechas pasan por default como en json, orjson las entregaría en ISO 8601 y Flask las entrega como HTTP-date
+        return orjson.dumps(contenido, default=default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME)
+    return json.dumps(contenido, default=default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class ProveedorJSON(DefaultJSONProvider):
+    """Proveedor JSON de Flask que usa orjson si está instalado"""
+
+    sort_keys = False  # El orden de las llaves no importa a los clientes y ordenarlas cuesta
+
+    def dumps(self, obj, **kwargs) -> str:
+        """Serializar a texto"""
+        if orjson is None or kwargs:
+            kwargs.setdefault("sort_keys", self.sort_keys)
+            return super().dumps(obj, **kwargs)
+        return volcar_json(obj, default=self.default).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        """Deserializar"""
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """Elaborar la respuesta sin pasar por texto"""
+        if orjson is None or self._app.debug:
+            return super().response(*args, **kwargs)
+        contenido = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(volcar_json(contenido, default=self.default), mimetype=self.mimetype)
+
+
+def formato_columnas() -> bool:
+    """El navegador solicita el formato por columnas"""
+    return request.headers.get(ENCABEZADO_FORMATO, "") == "columnas"
+
+
+def _aplanar(renglon: dict, prefijo: str = "") -> dict:
+    """Aplanar los diccionarios anidados de un renglón con llaves como detalle.id"""
+    plano = {}
+    for llave, valor in renglon.items():
+        if isinstance(valor, dict) and valor:
+            plano.update(_aplanar(valor, f"{prefijo}{llave}."))
+        else:
+            plano[f"{prefijo}{llave}"] = valor
+    return plano
+
+
+def en_columnas(data: list) -> dict | None:
+    """Convertir los renglones en columnas y valores, None si no todos tienen las mismas llaves"""
+    planos = [_aplanar(renglon) for renglon in data]
+    columnas = list(planos[0].keys()) if planos else []
+    renglones = []
+    for plano in planos:
+        if list(plano.keys()) != columnas:
+            return None
+        renglones.append(list(plano.values()))
+    return {"columnas": columnas, "renglones": renglones}
+
+
+def _codificacion() -> str | None:
+    """Elegir la codificación aceptada por el navegador, brotli antes que gzip"""
+    if brotli is not None and request.accept_encodings["br"] > 0:
+        return "br"
+    if request.accept_encodings["gzip"] > 0:
+        return "gzip"
+    return None
+
+
+def comprimir_respuesta(response):
+    """Comprimir las respuestas JSON, se registra con app.after_request"""
+    if response.mimetype != "application/json" or response.status_code != 200:
+        return response
+    if response.direct_passthrough or response.is_streamed or "Content-Encoding" in response.headers:
+        return response
+    response.vary.add("Accept-Encoding")
+    codificacion = _codificacion()
+    if codificacion is None:
+        return response
+    contenido = response.get_data()
+    if len(contenido) < COMPRESION_MINIMO:
+        return response
+    if codificacion == "br":
+        response.set_data(brotli.compress(contenido, quality=BROTLI_CALIDAD))
+    else:
+        response.set_data(gzip.compress(contenido, compresslevel=GZIP_NIVEL))
+    response.headers["Content-Encoding"] = codificacion
+    return response
@@ -122,6 +122,7 @@ from unidecode import unidecode
 from werkzeug.utils import secure_filename
 
 from lib.exceptions import MyFilenameError, MyNotAllowedExtensionError, MyUnknownExtensionError
+from lib.metricas import contar_llamada, sumar_bytes
 
 locale.setlocale(locale.LC_TIME, "es_MX.utf8")
 
@@ -240,9 +241,11 @@ class GoogleCloudStorage:
         else:
             month_str = self.upload_date.strftime("%m")
         path_str = str(Path(self.base_directory, year_str, month_str, self.filename))
+        contar_llamada("gcs")
         storage_client = storage.Client()
         bucket = storage_client.bucket(self.bucket_name)
         blob = bucket.blob(path_str)
         blob.upload_from_string(data, self.content_type)
+        sumar_bytes("gcs", len(data))
         self.url = blob.public_url
         return self.url
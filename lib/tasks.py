@@ -1,10 +1,69 @@
 """
 Tareas en el fondo
+
+Usuario.launch_task() encola ejecutar() con el comando, así todas las tareas pasan por aquí
+para medir su tiempo, CPU, memoria máxima, sentencias SQL y bytes de Google Cloud Storage,
+que se guardan en la Tarea, y para perfilarlas si está activo el perfilador para el comando
 """
 
+import importlib
+import resource
+import time
+
+from redis.exceptions import RedisError
 from rq import get_current_job
 
 from hercules.blueprints.tareas.models import Tarea
+from hercules.extensions import database
+from lib.fragmentos import sumar_tareas_en_progreso
+from lib.metricas import iniciar_medicion_tarea, terminar_medicion_tarea
+from lib.perfilador import Muestreador, debe_perfilar, guardar_perfil
+
+PAQUETE = "hercules.blueprints"
+
+
+def _memoria_maxima_mb() -> float:
+    """Memoria residente máxima del proceso en MB, el worker de RQ ejecuta cada tarea en un proceso hijo"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # En Linux ru_maxrss está en KB
+
+
+def _guardar_medicion(medicion: dict, muestreador: Muestreador | None) -> None:
+    """Guardar la medición en la Tarea y el perfil si se tomó"""
+    job = get_current_job()
+    tarea = Tarea.query.get(job.id) if job else None
+    if tarea:
+        tarea.segundos = round(medicion["segundos"], 3)
+        tarea.cpu_segundos = round(medicion["cpu_segundos"], 3)
+        tarea.memoria_mb = round(medicion["memoria_mb"], 1)
+        tarea.sql_sentencias = medicion["sql_sentencias"]
+        tarea.gcs_bytes = medicion["gcs_bytes"]
+        tarea.save()
+    if muestreador is not None:
+        try:
+            guardar_perfil(muestreador, "comando", tarea.usuario.email if tarea else "", job.id if job else "")
+        except RedisError:
+            pass
+
+
+def ejecutar(comando: str, *args, **kwargs):
+    """Importar y ejecutar el comando, como cid_formatos.tasks.lanzar_exportar_xlsx, y guardar su medición"""
+    modulo, funcion = f"{PAQUETE}.{comando}".rsplit(".", 1)
+    tarea_funcion = getattr(importlib.import_module(modulo), funcion)  # El módulo crea la app y su contexto
+    muestreador = Muestreador(comando).iniciar() if debe_perfilar(f"comando:{comando}") else None
+    iniciar_medicion_tarea()
+    inicio, cpu_inicio = time.perf_counter(), time.process_time()
+    try:
+        resultado = tarea_funcion(*args, **kwargs)
+    except BaseException:
+        database.session.rollback()  # Por si la tarea dejó la sesión inválida, también al vencer el tiempo límite
+        raise
+    finally:
+        medicion = terminar_medicion_tarea()
+        medicion["segundos"] = time.perf_counter() - inicio
+        medicion["cpu_segundos"] = time.process_time() - cpu_inicio
+        medicion["memoria_mb"] = _memoria_maxima_mb()
+        _guardar_medicion(medicion, muestreador)
+    return resultado
 
 
 def set_task_progress(progress: int, message: str, archivo: str = "", url: str = "") -> None:
@@ -24,9 +83,11 @@ def set_task_progress(progress: int, message: str, archivo: str = "", url: str =
                 hay_cambios = True
             if progress < 100 and tarea.ha_terminado is True:
                 tarea.ha_terminado = False
+                sumar_tareas_en_progreso(tarea.usuario_id, 1)
                 hay_cambios = True
             if progress >= 100 and tarea.ha_terminado is False:
                 tarea.ha_terminado = True
+                sumar_tareas_en_progreso(tarea.usuario_id, -1)
                 hay_cambios = True
             if message != tarea.mensaje:
                 tarea.mensaje = message
@@ -43,6 +104,8 @@ def set_task_error(message: str) -> str:
         job.save_meta()
         tarea = Tarea.query.get(job.id)
         if tarea:
+            if tarea.ha_terminado is False:
+                sumar_tareas_en_progreso(tarea.usuario_id, -1)
             tarea.ha_terminado = True
             tarea.mensaje = message
             tarea.save()
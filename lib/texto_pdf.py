@@ -0,0 +1,51 @@
+"""
+Texto de archivos PDF
+
+Funciones puras, sin Flask ni base de datos, para que se puedan ejecutar
+en los procesos hijos de un ProcessPoolExecutor.
+"""
+
+import io
+import re
+import zlib
+
+from pypdf import PdfReader
+from unidecode import unidecode
+
+TEXTO_MAXIMO = 500_000  # Caracteres, el tsvector de PostgreSQL no admite más de 1 MB
+FRAGMENTO_MARGEN = 80  # Caracteres alrededor de la palabra encontrada
+
+
+def extraer_texto_pdf(datos: bytes) -> str:
+    """Extraer el texto de todas las páginas de un PDF, entrega texto vacío si no se puede leer"""
+    try:
+        lector = PdfReader(io.BytesIO(datos))
+        paginas = [pagina.extract_text() or "" for pagina in lector.pages]
+    except Exception:  # pypdf lanza muchos tipos de errores con los PDF dañados, un archivo no debe detener el lote
+        return ""
+    texto = re.sub(r"[\s\x00]+", " ", " ".join(paginas)).strip()  # PostgreSQL no admite el caracter NUL en el texto
+    return texto[:TEXTO_MAXIMO]
+
+
+def comprimir_texto(texto: str) -> bytes:
+    """Comprimir el texto para guardarlo en la base de datos"""
+    return zlib.compress(texto.encode("utf8"), level=9)
+
+
+def descomprimir_texto(datos: bytes | None) -> str:
+    """Descomprimir el texto guardado en la base de datos"""
+    if not datos:
+        return ""
+    return zlib.decompress(datos).decode("utf8")
+
+
+def elaborar_fragmento(texto: str, buscado: str) -> str:
+    """Elaborar un fragmento del texto alrededor de la primera palabra buscada que se encuentre"""
+    normalizado = unidecode(texto).upper()
+    for palabra in unidecode(buscado).upper().split():
+        posicion = normalizado.find(palabra)
+        if posicion >= 0:
+            desde = max(posicion - FRAGMENTO_MARGEN, 0)
+            hasta = min(posicion + len(palabra) + FRAGMENTO_MARGEN, len(texto))
+            return ("…" if desde > 0 else "") + texto[desde:hasta] + ("…" if hasta < len(texto) else "")
+    return texto[: FRAGMENTO_MARGEN * 2]
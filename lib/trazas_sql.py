@@ -0,0 +1,159 @@
+"""
+Trazas SQL
+
+Guarda las sentencias SQL de una petición para revisarlas en /bitacoras/trazas_sql
+
+- Se guarda la traza si la solicita un administrador de BITACORAS con el encabezado X-Trazar-SQL: 1
+  o con ?trazar_sql=1 en la URL, o si la petición tarda UMBRAL_SEGUNDOS o más
+- De cada sentencia se guarda el texto con los marcadores, los nombres de los parámetros (nunca sus
+  valores), los milisegundos y los renglones. Si la solicitó el administrador también la línea de
+  la vista que la originó
+- Las sentencias que se repiten N_MAS_1_MINIMO veces o más se señalan como posible N+1
+- Las trazas van a un stream de Redis acotado a MAXIMO_TRAZAS, la respuesta trazada lleva el
+  encabezado X-Traza-SQL con el id para abrirla
+"""
+
+import os
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+
+from flask import current_app, g, has_request_context, request
+from flask_login import current_user
+from redis.exceptions import RedisError
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from lib.respuestas_json import volcar_json
+
+REDIS_STREAM = "hercules:trazas_sql"
+MAXIMO_TRAZAS = 1000
+MAXIMO_SENTENCIAS = 1000  # Por petición, las demás sólo se cuentan
+UMBRAL_SEGUNDOS = 2.0
+N_MAS_1_MINIMO = 5
+ENCABEZADO_SOLICITUD = "X-Trazar-SQL"
+ENCABEZADO_RESPUESTA = "X-Traza-SQL"
+ARGUMENTO_SOLICITUD = "trazar_sql"
+MODULO = "BITACORAS"
+DIRECTORIO_VISTAS = os.path.join("hercules", "blueprints")
+
+
+def _solicitada() -> bool:
+    """La petición pide la traza"""
+    return request.headers.get(ENCABEZADO_SOLICITUD) == "1" or request.args.get(ARGUMENTO_SOLICITUD) == "1"
+
+
+def _redactar(parametros) -> list:
+    """Entregar sólo los nombres de los parámetros, o su cantidad si son posicionales"""
+    if isinstance(parametros, (list, tuple)) and parametros and isinstance(parametros[0], dict):
+        parametros = parametros[0]  # executemany, todos los renglones tienen los mismos nombres
+    if isinstance(parametros, dict):
+        return sorted(parametros.keys())
+    return [f"${numero}" for numero in range(1, len(parametros or ()) + 1)]
+
+
+def _origen() -> str:
+    """Archivo, línea y función de la vista que ejecuta la sentencia"""
+    marco = sys._getframe(2)
+    while marco is not None:
+        if DIRECTORIO_VISTAS in marco.f_code.co_filename:
+            archivo = marco.f_code.co_filename[marco.f_code.co_filename.index(DIRECTORIO_VISTAS) :]
+            return f"{archivo}:{marco.f_lineno} {marco.f_code.co_name}"
+        marco = marco.f_back
+    return ""
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _antes_de_sql(conn, cursor, statement, parameters, context, executemany):
+    """Tomar el tiempo de inicio de la sentencia"""
+    if has_request_context() and "trazas_sql" in g:
+        conn.info.setdefault("trazas_sql_inicios", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _despues_de_sql(conn, cursor, statement, parameters, context, executemany):
+    """Agregar la sentencia a la traza de la petición"""
+    inicios = conn.info.get("trazas_sql_inicios")
+    if not inicios or not has_request_context() or "trazas_sql" not in g:
+        return
+    milisegundos = (time.perf_counter() - inicios.pop()) * 1000
+    g.trazas_sql_cantidad += 1
+    if len(g.trazas_sql) >= MAXIMO_SENTENCIAS:
+        return
+    g.trazas_sql.append(
+        {
+            "sql": statement,
+            "parametros": _redactar(parameters),
+            "ms": round(milisegundos, 3),
+            "renglones": cursor.rowcount,
+            "origen": _origen() if g.trazas_sql_solicitada else "",
+        }
+    )
+
+
+def _iniciar_traza():
+    """Preparar la traza de la petición"""
+    g.trazas_sql = []
+    g.trazas_sql_cantidad = 0
+    g.trazas_sql_solicitada = _solicitada()
+    g.trazas_sql_inicio = time.perf_counter()
+
+
+def _terminar_traza(response):
+    """Guardar la traza si la solicitó un administrador o si la petición fue lenta"""
+    if "trazas_sql" not in g:
+        return response
+    segundos = time.perf_counter() - g.trazas_sql_inicio
+    solicitada = g.trazas_sql_solicitada and current_user.is_authenticated and current_user.can_admin(MODULO)
+    if not solicitada and segundos < UMBRAL_SEGUNDOS:
+        return response
+    repeticiones = Counter(sentencia["sql"] for sentencia in g.trazas_sql)
+    traza = {
+        "creado": datetime.now().isoformat(timespec="seconds"),
+        "motivo": "solicitada" if solicitada else "lenta",
+        "endpoint": request.endpoint or "",
+        "metodo": request.method,
+        "ruta": request.path,
+        "estado": response.status_code,
+        "usuario": current_user.email if current_user.is_authenticated else "",
+        "segundos": round(segundos, 3),
+        "cantidad": g.trazas_sql_cantidad,
+        "sql_ms": round(sum(sentencia["ms"] for sentencia in g.trazas_sql), 3),
+        "n_mas_1": [{"sql": sql, "veces": veces} for sql, veces in repeticiones.most_common() if veces >= N_MAS_1_MINIMO],
+        "sentencias": g.trazas_sql,
+    }
+    try:
+        traza_id = current_app.redis.xadd(REDIS_STREAM, {"datos": volcar_json(traza)}, maxlen=MAXIMO_TRAZAS, approximate=True)
+    except (AttributeError, RedisError):
+        return response
+    if solicitada:
+        response.headers[ENCABEZADO_RESPUESTA] = traza_id.decode("utf-8")
+    return response
+
+
+def _decodificar(traza_id: bytes, campos: dict) -> dict:
+    """Convertir la entrada del stream en la traza con su id"""
+    traza = current_app.json.loads(campos[b"datos"])
+    traza["id"] = traza_id.decode("utf-8")
+    return traza
+
+
+def consultar_trazas(cantidad: int = 100) -> list:
+    """Consultar las trazas más recientes"""
+    entradas = current_app.redis.xrevrange(REDIS_STREAM, count=cantidad)
+    return [_decodificar(traza_id, campos) for traza_id, campos in entradas]
+
+
+def consultar_traza(traza_id: str) -> dict | None:
+    """Consultar una traza por su id, None si no existe o ya salió del stream"""
+    entradas = current_app.redis.xrange(REDIS_STREAM, min=traza_id, max=traza_id, count=1)
+    if not entradas:
+        return None
+    return _decodificar(*entradas[0])
+
+
+def registrar(app) -> None:
+    """Registrar la traza de las peticiones"""
+    app.before_request(_iniciar_traza)
+    app.after_request(_terminar_traza)
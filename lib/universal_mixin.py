@@ -1,7 +1,20 @@
 """
 Universal Mixin
+
+save() hace commit de inmediato. Para guardar varios registros con un solo flush y commit,
+donde los INSERT de una misma tabla se envían juntos (insertmanyvalues), use
+
+    save_all([ofi_documento] + destinatarios)
+
+O agrupe varios save() en una unidad de trabajo, el commit se hace al salir
+
+    with unidad_de_trabajo():
+        for articulo in articulos:
+            articulo.save()
 """
 
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
 
 from hashids import Hashids
@@ -11,10 +24,54 @@ from sqlalchemy.types import CHAR
 
 from config.settings import get_settings
 from hercules.extensions import database
+from lib.cache import invalidar_tablas
+from lib.catalogos import descartar_instantaneas
 
 settings = get_settings()
 hashids = Hashids(salt=settings.SALT, min_length=8)
 
+# Tablas modificadas dentro de la unidad de trabajo en curso, None si no hay una
+_tablas_unidad = ContextVar("tablas_unidad_de_trabajo", default=None)
+
+
+def _despues_de_guardar(tablas: set) -> None:
+    """Avisar al caché y a las instantáneas de catálogos que cambiaron las tablas"""
+    invalidar_tablas(*tablas)
+    descartar_instantaneas(*tablas)
+
+
+@contextmanager
+def unidad_de_trabajo():
+    """Agrupar los save() y save_all() en un solo flush y commit, si algo falla se revierte todo"""
+    if _tablas_unidad.get() is not None:
+        yield  # Ya hay una unidad de trabajo, la exterior hace el commit
+        return
+    tablas = set()
+    token = _tablas_unidad.set(tablas)
+    try:
+        yield
+        database.session.commit()
+    except Exception:
+        database.session.rollback()
+        raise
+    finally:
+        _tablas_unidad.reset(token)
+    _despues_de_guardar(tablas)
+
+
+def save_all(registros: list) -> list:
+    """Guardar varios registros con un solo flush y commit"""
+    if len(registros) == 0:
+        return registros
+    database.session.add_all(registros)
+    tablas = {registro.__tablename__ for registro in registros}
+    if _tablas_unidad.get() is not None:
+        _tablas_unidad.get().update(tablas)
+        return registros
+    database.session.commit()
+    _despues_de_guardar(tablas)
+    return registros
+
 
 class UniversalMixin:
     """Columnas y metodos universales"""
@@ -39,9 +96,13 @@ class UniversalMixin:
         return None
 
     def save(self):
-        """Guardar registro"""
+        """Guardar registro, dentro de una unidad de trabajo el commit se hace al salir de ella"""
         database.session.add(self)
+        if _tablas_unidad.get() is not None:
+            _tablas_unidad.get().add(self.__tablename__)
+            return self
         database.session.commit()
+        _despues_de_guardar({self.__tablename__})
         return self
 
     def encode_id(self) -> str: